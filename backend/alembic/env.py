@@ -30,8 +30,9 @@ from models.income import IncomeSource
 from models.expense import Expense
 from models.asset import Asset
 from models.liability import Liability
-from models.plan import Plan
-from models.net_worth import NetWorthSnapshot
+from models.plan import Plan, PlanResult
+from models.net_worth import NetWorthSnapshot, NetWorthRollup, SnapshotRun
+from models.job import Job
 
 # Import new financial models (Phase 1)
 from models.financials import (
@@ -0,0 +1,54 @@
+"""add net worth rollups and snapshot (portfolio_id, date) index
+
+Revision ID: a5b6c7d8e9f0
+Revises: f4a5b6c7d8e9
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5b6c7d8e9f0'
+down_revision: Union[str, None] = 'f4a5b6c7d8e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_net_worth_snapshots_portfolio_id_date', 'net_worth_snapshots',
+        ['portfolio_id', 'date'], unique=False,
+    )
+    op.create_table(
+        'net_worth_rollups',
+        sa.Column('portfolio_id', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column('resolution', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+        sa.Column('period_start', sa.Date(), nullable=False),
+        sa.Column('user_id', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column('period_end', sa.Date(), nullable=False),
+        sa.Column('first_date', sa.Date(), nullable=False),
+        sa.Column('last_date', sa.Date(), nullable=False),
+        sa.Column('samples', sa.Integer(), nullable=False),
+        sa.Column('net_worth', sa.DECIMAL(precision=19, scale=4), nullable=True),
+        sa.Column('total_assets', sa.DECIMAL(precision=19, scale=4), nullable=True),
+        sa.Column('total_liabilities', sa.DECIMAL(precision=19, scale=4), nullable=True),
+        sa.Column('open_net_worth', sa.DECIMAL(precision=19, scale=4), nullable=True),
+        sa.Column('min_net_worth', sa.DECIMAL(precision=19, scale=4), nullable=True),
+        sa.Column('max_net_worth', sa.DECIMAL(precision=19, scale=4), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['portfolio_id'], ['portfolios.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('portfolio_id', 'resolution', 'period_start'),
+    )
+    op.create_index(op.f('ix_net_worth_rollups_user_id'), 'net_worth_rollups', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_net_worth_rollups_user_id'), table_name='net_worth_rollups')
+    op.drop_table('net_worth_rollups')
+    op.drop_index('ix_net_worth_snapshots_portfolio_id_date', table_name='net_worth_snapshots')
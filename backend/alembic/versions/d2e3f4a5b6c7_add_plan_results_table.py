@@ -0,0 +1,39 @@
+"""add plan_results table
+
+Revision ID: d2e3f4a5b6c7
+Revises: c1d2e3f4a5b6
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2e3f4a5b6c7'
+down_revision: Union[str, None] = 'c1d2e3f4a5b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'plan_results',
+        sa.Column('plan_id', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column('user_id', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column('result_key', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+        sa.Column('series', sa.LargeBinary(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['plan_id'], ['plans.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('plan_id'),
+    )
+    op.create_index(op.f('ix_plan_results_user_id'), 'plan_results', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_plan_results_user_id'), table_name='plan_results')
+    op.drop_table('plan_results')
@@ -4,9 +4,19 @@ from .property import Property, PropertyCreate, PropertyUpdate
 from .income import IncomeSource, IncomeSourceCreate, IncomeSourceUpdate
 from .expense import Expense, ExpenseCreate, ExpenseUpdate
 from .asset import Asset, AssetCreate, AssetUpdate
-from .liability import Liability, LiabilityCreate, LiabilityUpdate
-from .plan import Plan, PlanCreate, PlanUpdate
-from .net_worth import NetWorthSnapshot
+from .liability import (
+    Liability,
+    LiabilityCreate,
+    LiabilityUpdate,
+    DebtPayoffRequest,
+    DebtSummary,
+    DebtPayoff,
+    DebtPayoffStrategyResult,
+    DebtPayoffResponse,
+)
+from .plan import Plan, PlanResult, PlanCreate, PlanUpdate
+from .net_worth import NetWorthSnapshot, NetWorthRollup, SnapshotRun
+from .job import Job, JobCreate, JobResponse
 
 # Financial modeling tables (Phase 1 - Property Portfolio Forecasting)
 from .financials import (
@@ -44,6 +54,23 @@ from .financials import (
     ProjectionYearData,
     PropertyProjectionResponse,
     PortfolioProjectionResponse,
+    HouseholdYearData,
+    HouseholdPortfolioProjection,
+    HouseholdProjectionResponse,
+    ProjectionBatchItem,
+    ProjectionBatchRequest,
+    ProjectionBatchError,
+    ProjectionBatchResponse,
+    PortfolioProjectionJobParams,
+    SensitivityGridRequest,
+    SensitivityCell,
+    SensitivityGridResponse,
+    TornadoBar,
+    TornadoAnalysis,
+    PropertyTornado,
+    TornadoResponse,
+    GoalSeekRequest,
+    GoalSeekResponse,
 )
 
 # Clerk/Stripe billing models (Group B)
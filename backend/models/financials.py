@@ -6,7 +6,7 @@ Extended database schema for property portfolio financial forecasting.
 
 from sqlmodel import SQLModel, Field, Column, Relationship
 from sqlalchemy import DECIMAL, JSON, Enum as SAEnum, Index
-from typing import Optional, List
+from typing import Dict, Optional, List, Union
 from datetime import datetime, date, timezone
 from decimal import Decimal
 from enum import Enum
@@ -447,17 +447,22 @@ class ValuationResponse(SQLModel):
 
 
 class ProjectionYearData(SQLModel):
-    """Single year projection data"""
+    """
+    Single year projection data
+
+    Metrics are None only when excluded by a sparse ?fields= request (and are
+    then omitted from the response).
+    """
     year: int
-    property_value: Decimal
-    total_debt: Decimal
-    equity: Decimal
-    lvr: Decimal  # Loan-to-Value Ratio as percentage
-    rental_income: Decimal
-    expenses: Decimal
-    loan_repayments: Decimal
-    depreciation: Decimal
-    net_cashflow: Decimal
+    property_value: Optional[Decimal] = None
+    total_debt: Optional[Decimal] = None
+    equity: Optional[Decimal] = None
+    lvr: Optional[Decimal] = None  # Loan-to-Value Ratio as percentage
+    rental_income: Optional[Decimal] = None
+    expenses: Optional[Decimal] = None
+    loan_repayments: Optional[Decimal] = None
+    depreciation: Optional[Decimal] = None
+    net_cashflow: Optional[Decimal] = None
 
 
 class PropertyProjectionResponse(SQLModel):
@@ -469,6 +474,20 @@ class PropertyProjectionResponse(SQLModel):
     projections: List[ProjectionYearData]
 
 
+class HouseholdYearData(SQLModel):
+    """One year of a balance sheet (one portfolio, or the whole household)"""
+    year: int
+    property_value: Decimal
+    property_debt: Decimal
+    property_equity: Decimal
+    other_assets: Decimal  # Non-property assets (super, shares, cash, ...)
+    other_liabilities: Decimal  # Non-property debts (car loans, credit cards, HECS, ...)
+    total_assets: Decimal
+    total_liabilities: Decimal
+    net_worth: Decimal
+    net_cashflow: Decimal  # Property net cashflow
+
+
 class PortfolioProjectionResponse(SQLModel):
     """Portfolio projection response"""
     portfolio_id: str
@@ -477,3 +496,157 @@ class PortfolioProjectionResponse(SQLModel):
     end_year: int
     properties: List[PropertyProjectionResponse]
     totals: List[ProjectionYearData]  # Aggregated totals per year
+    balance_sheet: Optional[List[HouseholdYearData]] = None  # With non-property assets and liabilities; omitted with ?fields=
+
+
+class HouseholdPortfolioProjection(SQLModel):
+    """One portfolio's part of a household projection"""
+    portfolio_id: str
+    portfolio_name: str
+    property_count: int
+    asset_count: int
+    liability_count: int
+    property_totals: List[ProjectionYearData]  # Aggregated property totals per year
+    balance_sheet: List[HouseholdYearData]
+
+
+class HouseholdProjectionResponse(SQLModel):
+    """Projection across all of a user's actual portfolios, per portfolio and consolidated"""
+    start_year: int
+    end_year: int
+    portfolios: List[HouseholdPortfolioProjection]
+    property_totals: List[ProjectionYearData]  # Consolidated property totals per year
+    balance_sheet: List[HouseholdYearData]  # Consolidated balance sheet per year
+
+
+class ProjectionBatchItem(SQLModel):
+    """One projection in a batch request — exactly one of property_id / portfolio_id"""
+    key: Optional[str] = None  # Result key; defaults to "property:{id}" / "portfolio:{id}"
+    property_id: Optional[str] = None
+    portfolio_id: Optional[str] = None
+    years: int = 10
+    expense_growth_override: Optional[float] = None
+    interest_rate_offset: Optional[float] = None
+    asset_growth_override: Optional[float] = None
+    fields: Optional[str] = None  # Comma-separated metrics, as for the single endpoints
+
+
+class ProjectionBatchRequest(SQLModel):
+    """Batch projection request"""
+    items: List[ProjectionBatchItem]
+
+
+class ProjectionBatchError(SQLModel):
+    """Per-item failure in a batch (the rest of the batch still succeeds)"""
+    status_code: int
+    detail: str
+
+
+class ProjectionBatchResponse(SQLModel):
+    """Batch projection results keyed by item key"""
+    results: Dict[str, Union[PortfolioProjectionResponse, PropertyProjectionResponse]]
+    errors: Dict[str, ProjectionBatchError] = {}
+
+
+class PortfolioProjectionJobParams(SQLModel):
+    """Parameters of a "projections.portfolio" background job (as for GET /projections/portfolio/{id})"""
+    portfolio_id: str
+    years: int = Field(default=10, ge=1, le=50)
+    expense_growth_override: Optional[float] = None
+    interest_rate_offset: Optional[float] = None
+    asset_growth_override: Optional[float] = None
+    fields: Optional[str] = None
+
+
+class SensitivityGridRequest(SQLModel):
+    """
+    Stress-test grid: every combination of the three override axes.
+
+    None in an override axis means "no override" (the property's own rates).
+    """
+    years: int = 10
+    interest_rate_offsets: List[float] = [0.0]
+    expense_growth_overrides: List[Optional[float]] = [None]
+    asset_growth_overrides: List[Optional[float]] = [None]
+
+
+class SensitivityCell(SQLModel):
+    """Portfolio outcome for one combination of overrides"""
+    interest_rate_offset: float
+    expense_growth_override: Optional[float] = None
+    asset_growth_override: Optional[float] = None
+    final_equity: Decimal
+    min_net_cashflow: Decimal
+    min_net_cashflow_year: int
+    peak_lvr: Decimal
+    peak_lvr_year: int
+
+
+class SensitivityGridResponse(SQLModel):
+    """Sensitivity grid; cells are ordered interest rate → expense growth → asset growth"""
+    portfolio_id: str
+    portfolio_name: str
+    start_year: int
+    end_year: int
+    interest_rate_offsets: List[float]
+    expense_growth_overrides: List[Optional[float]]
+    asset_growth_overrides: List[Optional[float]]
+    cells: List[SensitivityCell]
+
+
+class TornadoBar(SQLModel):
+    """Outcome with one input moved down and up by step (others at baseline)"""
+    input: str  # capital_growth, rent_growth, vacancy_weeks, interest_rate, expense_growth, offset_balance
+    step: Decimal
+    unit: str  # "pp", "weeks" or "$"
+    low: Decimal  # Outcome at -step
+    high: Decimal  # Outcome at +step
+    low_impact: Decimal  # low - baseline
+    high_impact: Decimal  # high - baseline
+    swing: Decimal  # |high - low|; bars are ranked by this
+
+
+class TornadoAnalysis(SQLModel):
+    """Baseline outcome and ranked input impacts"""
+    baseline: Decimal
+    bars: List[TornadoBar]  # Largest swing first
+
+
+class PropertyTornado(TornadoAnalysis):
+    """Tornado analysis for one property"""
+    property_id: str
+    property_address: str
+
+
+class TornadoResponse(SQLModel):
+    """Tornado analysis for a portfolio and each of its properties"""
+    portfolio_id: str
+    portfolio_name: str
+    metric: str  # equity, cumulative_cashflow or net_position
+    start_year: int
+    end_year: int
+    portfolio: TornadoAnalysis  # Each input moved on every property at once
+    properties: List[PropertyTornado]
+
+
+class GoalSeekRequest(SQLModel):
+    """Goal-seek request for one property"""
+    goal: str  # break_even_rent, max_interest_rate or target_equity
+    years: int = 10
+    target_equity: Optional[Decimal] = None  # Required for target_equity (final-year equity)
+    lower: Optional[float] = None  # Initial search range; defaults per goal
+    upper: Optional[float] = None
+
+
+class GoalSeekResponse(SQLModel):
+    """Solved input and the projection outcome it gives"""
+    property_id: str
+    property_address: str
+    goal: str
+    start_year: int
+    end_year: int
+    value: Decimal  # Weekly rent, rate offset (pp) or growth rate (%), per unit
+    unit: str
+    outcome: Decimal  # Lowest yearly net cashflow, or final-year equity, at value
+    evaluations: int  # Engine passes the solver needed
+
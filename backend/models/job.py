@@ -0,0 +1,74 @@
+"""
+Job Model - SQLModel (PostgreSQL)
+Background jobs for calculations too long to hold a request open
+(see utils/jobs.py and routes/jobs.py).
+"""
+
+import uuid
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import JSON, LargeBinary
+from typing import Optional
+from datetime import datetime, timezone
+
+
+# Job lifecycle: queued -> running -> done | failed | cancelled (queued jobs may be cancelled directly)
+JOB_STATUSES = ["queued", "running", "done", "failed", "cancelled"]
+
+# Statuses counted against a user's active-job limit
+JOB_ACTIVE_STATUSES = ["queued", "running"]
+
+# Statuses a job never leaves
+JOB_FINISHED_STATUSES = ["done", "failed", "cancelled"]
+
+
+class Job(SQLModel, table=True):
+    """
+    Jobs table - one row per submitted background calculation
+    """
+    __tablename__ = "jobs"
+
+    # Primary Key
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True, max_length=50)
+
+    # Foreign Keys
+    user_id: str = Field(foreign_key="users.id", index=True, max_length=50)
+
+    # What to run (kind registered in utils/jobs.py, validated parameters)
+    kind: str = Field(max_length=100)
+    params: dict = Field(default_factory=dict, sa_column=Column(JSON))
+
+    # Progress
+    status: str = Field(default="queued", index=True, max_length=20)
+    progress: float = Field(default=0.0)  # 0.0 - 1.0
+    cancel_requested: bool = Field(default=False)
+    error: Optional[str] = Field(default=None, max_length=2000)
+
+    # Result encoded with utils/cache_codec; served by GET /jobs/{id}/result
+    result: Optional[bytes] = Field(default=None, sa_column=Column(LargeBinary, nullable=True))
+
+    # Metadata
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = Field(default=None)
+    finished_at: Optional[datetime] = Field(default=None)
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))  # Heartbeat while running
+
+
+# Pydantic models for API requests/responses
+
+class JobCreate(SQLModel):
+    """Job submission request"""
+    kind: str
+    params: dict = {}
+
+
+class JobResponse(SQLModel):
+    """Job status response"""
+    id: str
+    kind: str
+    status: str
+    progress: float
+    error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    result_url: Optional[str] = None  # Set once the job is done
@@ -7,7 +7,7 @@ Refactored from Pydantic/MongoDB to SQLModel/PostgreSQL
 import uuid
 from sqlmodel import SQLModel, Field, Column
 from sqlalchemy import DECIMAL
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime, date, timezone
 from decimal import Decimal
 
@@ -122,6 +122,53 @@ class LiabilityResponse(SQLModel):
     updated_at: datetime
 
 
+class DebtPayoffRequest(SQLModel):
+    """Debt payoff comparison request"""
+    monthly_surplus: Decimal = Field(default=Decimal("0"), ge=0)  # Paid on top of every debt's regular payment
+    strategies: List[str] = ["avalanche", "snowball"]  # avalanche, snowball, custom; the minimum baseline is always included
+    custom_order: Optional[List[str]] = None  # Debt keys for "custom", highest priority first
+    portfolio_id: Optional[str] = None  # Default: all actual (non-scenario) portfolios
+    include_property_loans: bool = True
+    max_years: int = 50
+
+
+class DebtSummary(SQLModel):
+    """A debt included in the payoff comparison"""
+    key: str  # "liability:{id}" or "loan:{id}"
+    name: str
+    balance: Decimal
+    interest_rate: Decimal
+    monthly_payment: Decimal  # Regular payment, before any surplus
+
+
+class DebtPayoff(SQLModel):
+    """One debt's payoff under a strategy"""
+    key: str
+    payoff_month: Optional[int]  # Months from now; None if not paid off within max_years
+    payoff_date: Optional[date]  # Month of the final payment
+    total_interest: Decimal
+    meets_target: Optional[bool] = None  # Paid off by target_payoff_date, when one is set
+
+
+class DebtPayoffStrategyResult(SQLModel):
+    """Outcome of one payoff strategy"""
+    strategy: str
+    order: List[str]  # Debt keys, highest priority first
+    months_to_debt_free: Optional[int]
+    debt_free_date: Optional[date]
+    total_interest: Decimal
+    total_paid: Decimal
+    interest_saved: Decimal  # Versus the minimum-payment baseline
+    debts: List[DebtPayoff]
+
+
+class DebtPayoffResponse(SQLModel):
+    """Debt payoff strategies compared over the same debts and budget"""
+    monthly_budget: Decimal  # Regular payments plus surplus
+    debts: List[DebtSummary]
+    strategies: Dict[str, DebtPayoffStrategyResult]  # Keyed by strategy, baseline first
+
+
 # Liability types for reference
 LIABILITY_TYPES = [
     "mortgage",
@@ -5,8 +5,8 @@ Refactored from Pydantic/MongoDB to SQLModel/PostgreSQL
 """
 
 from sqlmodel import SQLModel, Field, Column
-from sqlalchemy import DECIMAL, JSON
-from typing import Optional
+from sqlalchemy import DECIMAL, JSON, Index
+from typing import List, Optional
 from datetime import datetime, date as DateType, timezone
 from decimal import Decimal
 
@@ -17,6 +17,8 @@ class NetWorthSnapshot(SQLModel, table=True):
     ⚠️ CRITICAL: All currency fields use DECIMAL(19, 4) for precision
     """
     __tablename__ = "net_worth_snapshots"
+    # Every history, series and rollup query reads one portfolio's snapshots over a date range
+    __table_args__ = (Index("ix_net_worth_snapshots_portfolio_id_date", "portfolio_id", "date"),)
     
     # Primary Key
     id: str = Field(primary_key=True, max_length=50)
@@ -57,6 +59,41 @@ class NetWorthSnapshot(SQLModel, table=True):
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
+class NetWorthRollup(SQLModel, table=True):
+    """
+    Net worth per portfolio per week, month or quarter (utils/snapshot_rollups.py)
+    Maintained as snapshots are written; the only history left once raw
+    snapshots are compacted.
+    ⚠️ CRITICAL: All currency fields use DECIMAL(19, 4) for precision
+    """
+    __tablename__ = "net_worth_rollups"
+
+    # Primary key doubles as the range-query index
+    portfolio_id: str = Field(foreign_key="portfolios.id", primary_key=True, max_length=50)
+    resolution: str = Field(primary_key=True, max_length=20)  # weekly, monthly, quarterly
+    period_start: DateType = Field(primary_key=True)
+
+    user_id: str = Field(foreign_key="users.id", index=True, max_length=50)
+    period_end: DateType
+
+    # Days with a snapshot in the period
+    first_date: DateType
+    last_date: DateType
+    samples: int = Field(default=1)
+
+    # Closing figures (the period's last snapshot)
+    net_worth: Decimal = Field(default=Decimal("0.0000"), sa_column=Column(DECIMAL(19, 4)))
+    total_assets: Decimal = Field(default=Decimal("0.0000"), sa_column=Column(DECIMAL(19, 4)))
+    total_liabilities: Decimal = Field(default=Decimal("0.0000"), sa_column=Column(DECIMAL(19, 4)))
+
+    # Net worth range over the period
+    open_net_worth: Decimal = Field(default=Decimal("0.0000"), sa_column=Column(DECIMAL(19, 4)))
+    min_net_worth: Decimal = Field(default=Decimal("0.0000"), sa_column=Column(DECIMAL(19, 4)))
+    max_net_worth: Decimal = Field(default=Decimal("0.0000"), sa_column=Column(DECIMAL(19, 4)))
+
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
 # Pydantic models for API requests/responses
 
 class AssetBreakdown(SQLModel):
@@ -112,3 +149,45 @@ class NetWorthSnapshotResponse(SQLModel):
     is_manual: bool
     notes: str
     created_at: datetime
+
+
+class NetWorthSeriesPoint(SQLModel):
+    """One point of a net worth time series (a day, or a rollup period)"""
+    period_start: DateType
+    period_end: DateType
+    date: DateType  # the snapshot the closing figures come from
+    net_worth: Decimal
+    total_assets: Decimal
+    total_liabilities: Decimal
+    open_net_worth: Decimal
+    min_net_worth: Decimal
+    max_net_worth: Decimal
+    samples: int
+
+
+class NetWorthSeriesResponse(SQLModel):
+    """Net worth time series response"""
+    portfolio_id: str
+    resolution: str
+    date_from: Optional[DateType] = None
+    date_to: Optional[DateType] = None
+    # Daily snapshots before this date have been compacted into rollups
+    compacted_before: DateType
+    points: List[NetWorthSeriesPoint] = []
+
+
+class SnapshotRun(SQLModel, table=True):
+    """
+    Nightly snapshot run bookkeeping - one row per snapshot date (utils/snapshots.py)
+    ⚠️ CRITICAL: Inserting the row claims the date, so only one instance generates a day
+    """
+    __tablename__ = "snapshot_runs"
+
+    date: DateType = Field(primary_key=True)
+    status: str = Field(default="running", max_length=20)  # running, completed, failed
+    portfolios: int = Field(default=0)  # portfolios processed so far
+    snapshots: int = Field(default=0)  # snapshot rows written so far
+    error: Optional[str] = Field(default=None, max_length=2000)
+    started_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))  # heartbeat
@@ -6,7 +6,7 @@ Refactored from Pydantic/MongoDB to SQLModel/PostgreSQL
 
 import uuid
 from sqlmodel import SQLModel, Field, Column
-from sqlalchemy import DECIMAL, JSON
+from sqlalchemy import DECIMAL, JSON, LargeBinary
 from typing import Optional, List
 from datetime import datetime, timezone
 from decimal import Decimal
@@ -69,6 +69,26 @@ class Plan(SQLModel, table=True):
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
+class PlanResult(SQLModel, table=True):
+    """
+    Plan result store - the last projection computed for a plan
+    (GET /plans/{plan_id}/projections), served until its inputs change.
+    The summary lives on Plan (success_probability, projected_fire_age, ...);
+    this row holds the full projection series.
+    """
+    __tablename__ = "plan_results"
+
+    plan_id: str = Field(foreign_key="plans.id", primary_key=True, max_length=50)
+    user_id: str = Field(foreign_key="users.id", index=True, max_length=50)
+
+    # Portfolio data version, plan revision and calendar year the result was computed for
+    result_key: str = Field(max_length=255)
+    # ProjectionResult encoded with utils/cache_codec (compressed JSON, exact Decimals)
+    series: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+
+    computed_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
 # Pydantic models for API requests/responses
 
 class WithdrawalStrategy(SQLModel):
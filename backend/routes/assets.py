@@ -16,6 +16,7 @@ from models.portfolio import Portfolio
 from models.user import User
 from utils.database_sql import get_session
 from utils.auth import get_current_user
+from utils.data_version import bump_portfolio_version
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/assets", tags=["assets"])
@@ -117,6 +118,7 @@ async def create_asset(
     session.add(asset)
     session.commit()
     session.refresh(asset)
+    await bump_portfolio_version(asset.portfolio_id, current_user.id)
     
     logger.info(f"Asset created: {asset.id} for user: {current_user.id}")
     return asset
@@ -189,6 +191,7 @@ async def update_asset(
     session.add(asset)
     session.commit()
     session.refresh(asset)
+    await bump_portfolio_version(asset.portfolio_id, current_user.id)
     
     logger.info(f"Asset updated: {asset_id} by user: {current_user.id}")
     return asset
@@ -219,8 +222,10 @@ async def delete_asset(
         )
     
     # Delete asset
+    portfolio_id = asset.portfolio_id
     session.delete(asset)
     session.commit()
+    await bump_portfolio_version(portfolio_id, current_user.id)
     
     logger.info(f"Asset deleted: {asset_id} by user: {current_user.id}")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -3,16 +3,19 @@ Dashboard Routes - SQL-Based with Authentication & Data Isolation
 ⚠️ CRITICAL: All queries include .where(Model.user_id == current_user.id) for data isolation
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import func
 from sqlmodel import Session, select
 from pydantic import BaseModel
-from typing import List, Optional, Dict
-from datetime import datetime, timezone
+from typing import Annotated, List, Optional, Dict
+from datetime import date, datetime, timezone
 from decimal import Decimal
 import logging
 import uuid
 
-from models.net_worth import NetWorthSnapshot, AssetBreakdown, LiabilityBreakdown
+from models.net_worth import (
+    NetWorthSnapshot, NetWorthRollup, NetWorthSeriesResponse, AssetBreakdown, LiabilityBreakdown,
+)
 from utils.calculations import annualize_amount
 from models.portfolio import Portfolio
 from models.property import Property
@@ -23,11 +26,19 @@ from models.expense import Expense
 from models.user import User
 from utils.database_sql import get_session
 from utils.auth import get_current_user
+from utils.data_version import get_portfolio_version, get_user_version
+from utils.single_flight import single_flight, make_key
+from utils.cache import summary_cache
+from utils.cache_codec import register_model
+from utils.etag import make_etag, is_not_modified, not_modified, set_etag
+from utils.json_response import TrustedModelRoute
+from utils.snapshot_rollups import RESOLUTIONS, compaction_cutoff, get_series, merge_into_rollups
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+router = APIRouter(prefix="/dashboard", tags=["dashboard"], route_class=TrustedModelRoute)
 
 
+@register_model
 class DashboardSummary(BaseModel):
     net_worth: Decimal = Decimal("0")
     total_assets: Decimal = Decimal("0")
@@ -45,13 +56,63 @@ class DashboardSummary(BaseModel):
 async def get_dashboard_summary(
     portfolio_id: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    request: Request = None,
+    response: Response = None,
 ):
     """
     Get dashboard summary for the user's primary portfolio
     
+    Returns 304 when If-None-Match carries the current ETag (derived from the
+    data version). Concurrent identical requests (same user, portfolio and data
+    version) share one computation.
+    
     ⚠️ Data Isolation: Only returns data owned by current_user
     """
+    if portfolio_id:
+        # Ownership first: a 304 or cached summary must never answer for another user's portfolio
+        owned = session.exec(select(Portfolio.id).where(
+            Portfolio.id == portfolio_id,
+            Portfolio.user_id == current_user.id
+        )).first()
+        if owned is None:
+            return _empty_summary()
+        version = await get_portfolio_version(portfolio_id)
+    else:
+        version = await get_user_version(current_user.id)
+    
+    etag = make_etag(current_user.id, "dashboard.summary", portfolio_id, version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    key = make_key(current_user.id, "dashboard.summary", {"portfolio_id": portfolio_id}, version)
+    
+    cached = await summary_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    summary = await single_flight.do(key, _compute_dashboard_summary, portfolio_id, current_user, bind=session.get_bind())
+    await summary_cache.put(key, summary)
+    return summary
+
+
+def _empty_summary() -> DashboardSummary:
+    """Summary for a user without a (matching) portfolio"""
+    return DashboardSummary(
+        asset_breakdown=AssetBreakdown(),
+        liability_breakdown=LiabilityBreakdown()
+    )
+
+
+def _compute_dashboard_summary(
+    portfolio_id: Optional[str],
+    current_user: User,
+    session: Session,
+) -> DashboardSummary:
+    """
+    Build the dashboard summary (synchronous; runs in the threadpool).
+    """
     # Get portfolio (use first one if not specified)
     if portfolio_id:
         portfolio_stmt = select(Portfolio).where(
@@ -67,10 +128,7 @@ async def get_dashboard_summary(
     
     if not portfolio:
         # Return empty summary if no portfolio
-        return DashboardSummary(
-            asset_breakdown=AssetBreakdown(),
-            liability_breakdown=LiabilityBreakdown()
-        )
+        return _empty_summary()
     
     portfolio_id = portfolio.id
     
@@ -185,28 +243,110 @@ async def get_net_worth_history(
     portfolio_id: Optional[str] = None,
     limit: int = 12,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    request: Request = None,
+    response: Response = None,
 ):
     """
     Get historical net worth snapshots
     
+    Returns 304 when If-None-Match carries the current ETag. Snapshots are
+    only appended, rewritten for the day or compacted away, so the ETag is a
+    hash of the matching rows' count and latest date/creation time, checked
+    with one aggregate query.
+    
     ⚠️ Data Isolation: Only returns snapshots owned by current_user
     """
-    # Build query with data isolation
+    # Build filters with data isolation
+    filters = [NetWorthSnapshot.user_id == current_user.id]
     if portfolio_id:
-        stmt = select(NetWorthSnapshot).where(
-            NetWorthSnapshot.portfolio_id == portfolio_id,
-            NetWorthSnapshot.user_id == current_user.id
-        ).order_by(NetWorthSnapshot.date.desc()).limit(limit)
-    else:
-        stmt = select(NetWorthSnapshot).where(
-            NetWorthSnapshot.user_id == current_user.id
-        ).order_by(NetWorthSnapshot.date.desc()).limit(limit)
+        filters.append(NetWorthSnapshot.portfolio_id == portfolio_id)
+    
+    # Cheap fingerprint of the snapshot set for the ETag
+    count, latest_date, latest_created = session.exec(
+        select(
+            func.count(NetWorthSnapshot.id),
+            func.max(NetWorthSnapshot.date),
+            func.max(NetWorthSnapshot.created_at),
+        ).where(*filters)
+    ).one()
+    etag = make_etag(current_user.id, "dashboard.net_worth_history", portfolio_id, limit, count, latest_date, latest_created)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     
+    stmt = select(NetWorthSnapshot).where(*filters).order_by(NetWorthSnapshot.date.desc()).limit(limit)
     snapshots = session.exec(stmt).all()
     return list(snapshots)
 
 
+@router.get("/net-worth-series", response_model=NetWorthSeriesResponse)
+async def get_net_worth_series(
+    portfolio_id: str,
+    resolution: str = "monthly",
+    date_from: Annotated[Optional[date], Query(alias="from")] = None,
+    date_to: Annotated[Optional[date], Query(alias="to")] = None,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+    request: Request = None,
+    response: Response = None,
+):
+    """
+    Net worth time series for charts: one point per day, week, month or quarter
+    between from and to (inclusive; open-ended when omitted), oldest first.
+
+    Weekly, monthly and quarterly points come from the pre-aggregated rollups
+    (closing, opening, min and max net worth per period); daily points are the
+    raw snapshots kept for the retention horizon (compacted_before).
+    Returns 304 when If-None-Match carries the current ETag.
+
+    ⚠️ Data Isolation: Only returns series for a portfolio owned by current_user
+    """
+    if resolution not in RESOLUTIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid resolution. Must be one of: {', '.join(RESOLUTIONS)}",
+        )
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="'from' must not be after 'to'")
+
+    portfolio = session.exec(select(Portfolio).where(
+        Portfolio.id == portfolio_id,
+        Portfolio.user_id == current_user.id,
+    )).first()
+    if not portfolio:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Portfolio not found or you don't have access"
+        )
+
+    # Cheap fingerprint of the portfolio's series for the ETag
+    if resolution == "daily":
+        fingerprint = select(
+            func.count(NetWorthSnapshot.id), func.max(NetWorthSnapshot.created_at),
+        ).where(NetWorthSnapshot.portfolio_id == portfolio_id)
+    else:
+        fingerprint = select(
+            func.count(NetWorthRollup.period_start), func.max(NetWorthRollup.updated_at),
+        ).where(NetWorthRollup.portfolio_id == portfolio_id, NetWorthRollup.resolution == resolution)
+    count, latest = session.exec(fingerprint).one()
+    compacted_before = compaction_cutoff(datetime.now(timezone.utc).date())
+    etag = make_etag(current_user.id, "dashboard.net_worth_series", portfolio_id, resolution,
+                     date_from, date_to, compacted_before, count, latest)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    return NetWorthSeriesResponse(
+        portfolio_id=portfolio_id,
+        resolution=resolution,
+        date_from=date_from,
+        date_to=date_to,
+        compacted_before=compacted_before,
+        points=get_series(session, portfolio_id, resolution, date_from, date_to),
+    )
+
+
 class SnapshotRequest(BaseModel):
     portfolio_id: str
 
@@ -261,8 +401,9 @@ async def create_net_worth_snapshot(
         savings_rate=Decimal(str(summary.savings_rate))
     )
     
-    # Persist to database
+    # Persist to database (and the weekly/monthly/quarterly rollups)
     session.add(snapshot)
+    merge_into_rollups(session, [snapshot.model_dump()])
     session.commit()
     session.refresh(snapshot)
     
@@ -16,6 +16,7 @@ from models.portfolio import Portfolio
 from models.user import User
 from utils.database_sql import get_session
 from utils.auth import get_current_user
+from utils.data_version import bump_portfolio_version
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/expenses", tags=["expenses"])
@@ -176,6 +177,7 @@ async def create_expense(
     session.add(expense)
     session.commit()
     session.refresh(expense)
+    await bump_portfolio_version(expense.portfolio_id, current_user.id)
     
     logger.info(f"Expense created: {expense.id} for user: {current_user.id}")
     return expense
@@ -243,6 +245,7 @@ async def update_expense(
     session.add(expense)
     session.commit()
     session.refresh(expense)
+    await bump_portfolio_version(expense.portfolio_id, current_user.id)
     
     logger.info(f"Expense updated: {expense_id} by user: {current_user.id}")
     return expense
@@ -273,8 +276,10 @@ async def delete_expense(
         )
     
     # Delete expense
+    portfolio_id = expense.portfolio_id
     session.delete(expense)
     session.commit()
+    await bump_portfolio_version(portfolio_id, current_user.id)
     
     logger.info(f"Expense deleted: {expense_id} by user: {current_user.id}")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
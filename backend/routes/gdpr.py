@@ -22,6 +22,7 @@ from models.asset import Asset
 from models.liability import Liability
 from models.income import IncomeSource
 from models.expense import Expense
+from models.net_worth import NetWorthSnapshot, NetWorthRollup
 from utils.auth import get_current_user
 from utils.database_sql import get_session
 
@@ -309,6 +310,10 @@ async def delete_account(
             session.delete(record)
         for record in session.exec(select(Property).where(Property.user_id == current_user.id)).all():
             session.delete(record)
+        for record in session.exec(select(NetWorthSnapshot).where(NetWorthSnapshot.user_id == current_user.id)).all():
+            session.delete(record)
+        for record in session.exec(select(NetWorthRollup).where(NetWorthRollup.user_id == current_user.id)).all():
+            session.delete(record)
         for record in session.exec(select(Portfolio).where(Portfolio.user_id == current_user.id)).all():
             session.delete(record)
         session.flush()
@@ -318,8 +323,8 @@ async def delete_account(
         current_user.is_active = False
         current_user.email = f"deleted-{current_user.id}@propequitylab.deleted"
         current_user.name = "Deleted User"
-        current_user.country = None
-        current_user.state = None
+        current_user.country = ""  # NOT NULL columns: blank rather than None
+        current_user.state = ""
 
         session.add(current_user)
         session.commit()
@@ -16,6 +16,7 @@ from models.portfolio import Portfolio
 from models.user import User
 from utils.database_sql import get_session
 from utils.auth import get_current_user
+from utils.data_version import bump_portfolio_version
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/income", tags=["income"])
@@ -102,6 +103,7 @@ async def create_income_source(
     session.add(source)
     session.commit()
     session.refresh(source)
+    await bump_portfolio_version(source.portfolio_id, current_user.id)
     
     logger.info(f"Income source created: {source.id} for user: {current_user.id}")
     return source
@@ -169,6 +171,7 @@ async def update_income_source(
     session.add(source)
     session.commit()
     session.refresh(source)
+    await bump_portfolio_version(source.portfolio_id, current_user.id)
     
     logger.info(f"Income source updated: {income_id} by user: {current_user.id}")
     return source
@@ -199,8 +202,10 @@ async def delete_income_source(
         )
     
     # Delete income source
+    portfolio_id = source.portfolio_id
     session.delete(source)
     session.commit()
+    await bump_portfolio_version(portfolio_id, current_user.id)
     
     logger.info(f"Income source deleted: {income_id} by user: {current_user.id}")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
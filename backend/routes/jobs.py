@@ -0,0 +1,155 @@
+"""
+Job Routes - SQL-Based with Authentication & Data Isolation
+Submit long-running calculations as background jobs and poll for the result.
+⚠️ CRITICAL: All queries include .where(Job.user_id == current_user.id) for data isolation
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlmodel import Session, select
+from typing import List
+import logging
+
+from models.job import Job, JobCreate, JobResponse
+from models.user import User
+from utils.database_sql import get_session
+from utils.auth import get_current_user
+from utils.cache_codec import CodecError, decode
+from utils.jobs import job_kinds, job_runner
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+# Most jobs returned by GET /jobs
+MAX_LISTED_JOBS = 50
+
+
+def _job_response(job: Job) -> JobResponse:
+    return JobResponse(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        progress=job.progress,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        result_url=f"/api/jobs/{job.id}/result" if job.status == "done" else None,
+    )
+
+
+def _get_job(job_id: str, user_id: str, session: Session) -> Job:
+    job = session.exec(select(Job).where(
+        Job.id == job_id,
+        Job.user_id == user_id  # CRITICAL: Data isolation filter
+    )).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found or you don't have access"
+        )
+    return job
+
+
+@router.get("/kinds")
+async def get_job_kinds():
+    """Get the job kinds that can be submitted"""
+    return {"kinds": job_kinds()}
+
+
+@router.post("", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(
+    data: JobCreate,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """
+    Queue a background calculation and return its job id immediately.
+
+    Poll GET /jobs/{job_id} for status and progress; fetch the result from
+    GET /jobs/{job_id}/result once the status is "done".
+
+    ⚠️ Data Isolation: Job kinds only read data owned by current_user
+    """
+    job = await job_runner.submit(data.kind, data.params, current_user, session)
+    return _job_response(job)
+
+
+@router.get("", response_model=List[JobResponse])
+async def get_jobs(
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """
+    Get the current user's most recent jobs
+
+    ⚠️ Data Isolation: Only returns jobs owned by current_user
+    """
+    jobs = session.exec(
+        select(Job)
+        .where(Job.user_id == current_user.id)  # CRITICAL: Data isolation filter
+        .order_by(Job.created_at.desc())
+        .limit(MAX_LISTED_JOBS)
+    ).all()
+    return [_job_response(job) for job in jobs]
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """
+    Get a job's status and progress
+
+    ⚠️ Data Isolation: Only returns jobs owned by current_user
+    """
+    return _job_response(_get_job(job_id, current_user.id, session))
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """
+    Get the result of a finished job (same body as the equivalent synchronous endpoint)
+
+    ⚠️ Data Isolation: Only returns results of jobs owned by current_user
+    """
+    job = _get_job(job_id, current_user.id, session)
+    if job.status != "done":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": "Job has no result", "status": job.status, "error": job.error},
+        )
+    try:
+        return decode(job.result)
+    except CodecError:
+        logger.error(f"Undecodable result for job {job_id}")
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Job result is no longer available"
+        )
+
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """
+    Cancel a queued or running job
+
+    Queued jobs are cancelled immediately; running jobs stop at their next
+    progress check (poll the job to see the final status).
+
+    ⚠️ Data Isolation: Only cancels jobs owned by current_user
+    """
+    job = _get_job(job_id, current_user.id, session)
+    job = job_runner.cancel(job, session)
+    logger.info(f"Job cancel requested: {job_id} by user: {current_user.id}")
+    return _job_response(job)
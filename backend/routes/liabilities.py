@@ -5,17 +5,33 @@ Liability Routes - SQL-Based with Authentication & Data Isolation
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlmodel import Session, select
-from typing import List
-from datetime import datetime, timezone
+from typing import List, Optional
+from datetime import date, datetime, timezone
 from decimal import Decimal
 import logging
 import uuid
 
-from models.liability import Liability, LiabilityCreate, LiabilityUpdate, LIABILITY_TYPES
+from models.liability import (
+    Liability,
+    LiabilityCreate,
+    LiabilityUpdate,
+    LIABILITY_TYPES,
+    DebtPayoffRequest,
+    DebtSummary,
+    DebtPayoff,
+    DebtPayoffStrategyResult,
+    DebtPayoffResponse,
+)
 from models.portfolio import Portfolio
+from models.property import Property
+from models.financials import Loan
 from models.user import User
 from utils.database_sql import get_session
 from utils.auth import get_current_user
+from utils.data_version import bump_portfolio_version
+from utils.balance_sheet import monthly_payment, to_currency
+from utils.calculations import calculate_loan_repayment, to_decimal
+from utils.debt_payoff import Debt, DebtPayoffError, PayoffOutcome, compare_strategies
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/liabilities", tags=["liabilities"])
@@ -62,6 +78,163 @@ async def get_portfolio_liabilities(
     return liabilities
 
 
+@router.post("/payoff", response_model=DebtPayoffResponse)
+async def compare_payoff_strategies(
+    data: DebtPayoffRequest,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """
+    Compare debt payoff strategies across the user's liabilities and property loans.
+    
+    Every debt keeps its regular payment (liabilities: minimum_payment, plus
+    extra_payment unless payoff_strategy is "minimum"; loans: their scheduled
+    repayment), and monthly_surplus is allocated on top under each strategy.
+    The minimum-payment baseline is always included.
+    
+    Args:
+        data: Surplus, strategies (avalanche, snowball, custom), custom order
+            of debt keys, and optionally a single portfolio
+    
+    Returns:
+        DebtPayoffResponse with payoff dates and total interest per strategy and debt
+    
+    ⚠️ Data Isolation: Only liabilities and loans owned by current_user are included
+    """
+    if data.max_years < 1 or data.max_years > 100:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="max_years must be between 1 and 100"
+        )
+    
+    portfolio_stmt = select(Portfolio.id).where(Portfolio.user_id == current_user.id)
+    if data.portfolio_id:
+        portfolio_stmt = portfolio_stmt.where(Portfolio.id == data.portfolio_id)
+    else:
+        portfolio_stmt = portfolio_stmt.where(Portfolio.type == "actual")
+    portfolio_ids = session.exec(portfolio_stmt).all()
+    if data.portfolio_id and not portfolio_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Portfolio not found or you don't have access"
+        )
+    
+    liabilities = session.exec(select(Liability).where(
+        Liability.portfolio_id.in_(portfolio_ids),
+        Liability.user_id == current_user.id,  # CRITICAL: Data isolation filter
+        Liability.is_active == True,
+        Liability.current_balance > 0,
+    )).all()
+    loans = []
+    if data.include_property_loans:
+        loans = session.exec(select(Loan, Property).join(Property, Loan.property_id == Property.id).where(
+            Property.portfolio_id.in_(portfolio_ids),
+            Property.user_id == current_user.id,  # CRITICAL: Data isolation filter
+            Loan.current_amount > 0,
+        )).all()
+    
+    debts, names, targets = [], [], []
+    for liability in liabilities:
+        debts.append(Debt(
+            key=f"liability:{liability.id}",
+            balance=float(liability.current_balance),
+            interest_rate=float(liability.interest_rate),
+            payment=monthly_payment(liability),
+        ))
+        names.append(liability.name)
+        targets.append(liability.target_payoff_date)
+    for loan, prop in loans:
+        structure = loan.loan_structure.value if hasattr(loan.loan_structure, 'value') else loan.loan_structure
+        repayment = calculate_loan_repayment(loan.current_amount, loan.interest_rate, structure, loan.remaining_term_years)
+        debts.append(Debt(
+            key=f"loan:{loan.id}",
+            balance=float(loan.current_amount),
+            interest_rate=float(loan.interest_rate),
+            payment=float(repayment["monthly_payment"]),
+            offset_balance=float(loan.offset_balance or 0),
+        ))
+        names.append(f"{prop.address} ({loan.lender_name})")
+        targets.append(None)
+    
+    if not debts:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No debts found"
+        )
+    
+    try:
+        outcomes = compare_strategies(
+            debts,
+            float(data.monthly_surplus),
+            data.strategies,
+            data.custom_order,
+            data.max_years * 12,
+        )
+    except DebtPayoffError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    start = date.today().replace(day=1)
+    baseline_interest = sum(to_currency(outcomes["minimum"].interest), Decimal("0"))
+    regular_payments = to_currency([debt.payment for debt in debts])
+    return DebtPayoffResponse(
+        monthly_budget=sum(regular_payments, Decimal("0")) + to_decimal(data.monthly_surplus),
+        debts=[
+            DebtSummary(
+                key=debt.key,
+                name=name,
+                balance=to_currency([debt.balance])[0],
+                interest_rate=to_decimal(debt.interest_rate),
+                monthly_payment=payment,
+            )
+            for debt, name, payment in zip(debts, names, regular_payments)
+        ],
+        strategies={
+            name: _strategy_result(outcome, debts, targets, start, baseline_interest)
+            for name, outcome in outcomes.items()
+        },
+    )
+
+
+def _add_months(start: date, months: int) -> date:
+    index = start.month - 1 + months
+    return date(start.year + index // 12, index % 12 + 1, 1)
+
+
+def _strategy_result(
+    outcome: PayoffOutcome,
+    debts: List[Debt],
+    targets: List[Optional[date]],
+    start: date,
+    baseline_interest: Decimal,
+) -> DebtPayoffStrategyResult:
+    """Response form of one strategy's outcome; months count from the start of this month"""
+    payoffs = []
+    for debt, target, month, interest in zip(debts, targets, outcome.payoff_months.tolist(), to_currency(outcome.interest)):
+        payoff_date = _add_months(start, month) if month >= 0 else None
+        payoffs.append(DebtPayoff(
+            key=debt.key,
+            payoff_month=month if month >= 0 else None,
+            payoff_date=payoff_date,
+            total_interest=interest,
+            meets_target=None if target is None else payoff_date is not None and payoff_date <= target,
+        ))
+    total_interest = sum((payoff.total_interest for payoff in payoffs), Decimal("0"))
+    months = outcome.months_to_debt_free
+    return DebtPayoffStrategyResult(
+        strategy=outcome.strategy,
+        order=outcome.order,
+        months_to_debt_free=months,
+        debt_free_date=None if months is None else _add_months(start, months),
+        total_interest=total_interest,
+        total_paid=to_currency([outcome.paid.sum()])[0],
+        interest_saved=baseline_interest - total_interest,
+        debts=payoffs,
+    )
+
+
 @router.post("", response_model=Liability, status_code=status.HTTP_201_CREATED)
 async def create_liability(
     data: LiabilityCreate,
@@ -110,6 +283,7 @@ async def create_liability(
     session.add(liability)
     session.commit()
     session.refresh(liability)
+    await bump_portfolio_version(liability.portfolio_id, current_user.id)
     
     logger.info(f"Liability created: {liability.id} for user: {current_user.id}")
     return liability
@@ -177,6 +351,7 @@ async def update_liability(
     session.add(liability)
     session.commit()
     session.refresh(liability)
+    await bump_portfolio_version(liability.portfolio_id, current_user.id)
     
     logger.info(f"Liability updated: {liability_id} by user: {current_user.id}")
     return liability
@@ -207,8 +382,10 @@ async def delete_liability(
         )
     
     # Delete liability
+    portfolio_id = liability.portfolio_id
     session.delete(liability)
     session.commit()
+    await bump_portfolio_version(portfolio_id, current_user.id)
     
     logger.info(f"Liability deleted: {liability_id} by user: {current_user.id}")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
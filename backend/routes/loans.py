@@ -25,7 +25,8 @@ from models.financials import (
 )
 from utils.database_sql import get_session
 from utils.auth import get_current_user
-from utils.property_access import verify_property_access
+from utils.property_access import verify_property_access, get_property_portfolio_id
+from utils.data_version import bump_portfolio_version
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/loans", tags=["loans"])
@@ -102,6 +103,7 @@ async def create_loan(
     session.add(loan)
     session.commit()
     session.refresh(loan)
+    await bump_portfolio_version(get_property_portfolio_id(loan.property_id, session), current_user.id)
     
     logger.info(f"Loan created: {loan.id} for property: {data.property_id}")
     return loan
@@ -161,6 +163,7 @@ async def update_loan(
     session.add(loan)
     session.commit()
     session.refresh(loan)
+    await bump_portfolio_version(get_property_portfolio_id(loan.property_id, session), current_user.id)
     
     logger.info(f"Loan updated: {loan_id}")
     return loan
@@ -189,8 +192,10 @@ async def delete_loan(
         session.delete(item)
     
     # Delete loan
+    property_id = loan.property_id
     session.delete(loan)
     session.commit()
+    await bump_portfolio_version(get_property_portfolio_id(property_id, session), current_user.id)
 
     logger.info(f"Loan deleted: {loan_id}")
     return Response(status_code=204)
@@ -227,6 +232,7 @@ async def add_extra_repayment(
     session.add(repayment)
     session.commit()
     session.refresh(repayment)
+    await bump_portfolio_version(get_property_portfolio_id(loan.property_id, session), current_user.id)
     
     return {"id": repayment.id, "message": "Extra repayment added"}
 
@@ -256,5 +262,6 @@ async def add_lump_sum_payment(
     session.add(payment)
     session.commit()
     session.refresh(payment)
+    await bump_portfolio_version(get_property_portfolio_id(loan.property_id, session), current_user.id)
     
     return {"id": payment.id, "message": "Lump sum payment added"}
@@ -21,6 +21,8 @@ from models.asset import Asset
 from models.liability import Liability
 from utils.database_sql import get_session
 from utils.auth import get_current_user
+from utils.data_version import bump_portfolio_version
+from utils.lanes import batch_lane
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/onboarding", tags=["onboarding"])
@@ -270,29 +272,19 @@ async def reset_onboarding(
     return {"message": "Onboarding reset successfully"}
 
 
-@router.post("/load-demo-data")
-async def load_demo_data(
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
-):
+def _write_demo_data(session: Session, user_id: str) -> Dict[str, Any]:
     """
-    Load a comprehensive demo dataset for the current user.
-
-    Wipes any existing portfolio data and replaces with:
-    - 1 Investment Property (Sydney house with loan + rental)
-    - 3 Assets (Super, Car, ETF)
-    - 2 Liabilities (Car Loan, Credit Card)
-    - 1 Income (Salary)
-    - 6 Expenses (Mortgage, Groceries, Car, Utilities, Insurance, Entertainment)
-    - 1 FIRE Plan
+    Replace the user's portfolio data with the demo dataset (synchronous;
+    runs in the batch lane so seeding never competes with interactive requests
+    for threads or connections).
 
-    Safe to call even if portfolio already exists — existing data is cleared first.
-    ⚠️ Data Isolation: Only affects the authenticated user's data
+    Returns:
+        Portfolio ID and the summary returned by POST /onboarding/load-demo-data
     """
-    try:
+    with batch_lane.connection():
         # Get existing portfolio or create one
         portfolio = session.exec(
-            select(Portfolio).where(Portfolio.user_id == current_user.id)
+            select(Portfolio).where(Portfolio.user_id == user_id)
         ).first()
 
         if portfolio:
@@ -307,7 +299,7 @@ async def load_demo_data(
         else:
             portfolio = Portfolio(
                 id=str(uuid.uuid4()),
-                user_id=current_user.id,
+                user_id=user_id,
                 name="My Portfolio",
                 type="actual",
                 settings={},
@@ -337,7 +329,7 @@ async def load_demo_data(
         # ── Property ──────────────────────────────────────────────
         prop = Property(
             id=str(uuid.uuid4()),
-            user_id=current_user.id,
+            user_id=user_id,
             portfolio_id=portfolio.id,
             address="14 Wentworth Avenue",
             suburb="Surry Hills",
@@ -422,7 +414,7 @@ async def load_demo_data(
         for a in assets_data:
             asset = Asset(
                 id=str(uuid.uuid4()),
-                user_id=current_user.id,
+                user_id=user_id,
                 portfolio_id=portfolio.id,
                 created_at=datetime.now(timezone.utc),
                 updated_at=datetime.now(timezone.utc),
@@ -460,7 +452,7 @@ async def load_demo_data(
         for l in liabilities_data:
             liability = Liability(
                 id=str(uuid.uuid4()),
-                user_id=current_user.id,
+                user_id=user_id,
                 portfolio_id=portfolio.id,
                 created_at=datetime.now(timezone.utc),
                 updated_at=datetime.now(timezone.utc),
@@ -471,7 +463,7 @@ async def load_demo_data(
         # ── Income ────────────────────────────────────────────────
         income = IncomeSource(
             id=str(uuid.uuid4()),
-            user_id=current_user.id,
+            user_id=user_id,
             portfolio_id=portfolio.id,
             name="Primary Salary",
             type="salary",
@@ -494,12 +486,12 @@ async def load_demo_data(
             ("Insurance",       "Insurance",     Decimal("350"),  "Monthly"),
             ("Entertainment",   "Entertainment", Decimal("400"),  "Monthly"),
         ]
-        _add_expenses(session, current_user.id, portfolio.id, expenses_data)
+        _add_expenses(session, user_id, portfolio.id, expenses_data)
 
         # ── FIRE Plan ─────────────────────────────────────────────
         plan = Plan(
             id=str(uuid.uuid4()),
-            user_id=current_user.id,
+            user_id=user_id,
             portfolio_id=portfolio.id,
             name="FIRE by 55",
             description="Retire at 55 with $80k passive income from property and investments.",
@@ -515,12 +507,11 @@ async def load_demo_data(
         )
         session.add(plan)
 
-        _mark_onboarding_complete(session, current_user.id)
+        _mark_onboarding_complete(session, user_id)
         session.commit()
-        logger.info("Demo data loaded for user: %s", current_user.id)
 
         return {
-            "message": "Demo data loaded successfully!",
+            "portfolio_id": portfolio.id,
             "summary": {
                 "portfolio": portfolio.name,
                 "properties": 1,
@@ -532,6 +523,36 @@ async def load_demo_data(
             },
         }
 
+
+@router.post("/load-demo-data")
+async def load_demo_data(
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """
+    Load a comprehensive demo dataset for the current user.
+
+    Wipes any existing portfolio data and replaces with:
+    - 1 Investment Property (Sydney house with loan + rental)
+    - 3 Assets (Super, Car, ETF)
+    - 2 Liabilities (Car Loan, Credit Card)
+    - 1 Income (Salary)
+    - 6 Expenses (Mortgage, Groceries, Car, Utilities, Insurance, Entertainment)
+    - 1 FIRE Plan
+
+    Safe to call even if portfolio already exists — existing data is cleared first.
+    ⚠️ Data Isolation: Only affects the authenticated user's data
+    """
+    try:
+        loaded = await batch_lane.run(_write_demo_data, session, current_user.id)
+        await bump_portfolio_version(loaded["portfolio_id"], current_user.id)
+        logger.info("Demo data loaded for user: %s", current_user.id)
+
+        return {
+            "message": "Demo data loaded successfully!",
+            "summary": loaded["summary"],
+        }
+
     except Exception as e:
         session.rollback()
         logger.error("Failed to load demo data for user %s: %s", current_user.id, str(e))
@@ -791,6 +812,7 @@ async def seed_sample_data(
 
         _mark_onboarding_complete(session, current_user.id)
         session.commit()
+        await bump_portfolio_version(portfolio.id, current_user.id)
 
         logger.info(f"Sample data seeded successfully for user: {current_user.id}")
 
@@ -3,16 +3,18 @@ Plan Routes - SQL-Based with Authentication & Data Isolation
 ⚠️ CRITICAL: All queries include .where(Plan.user_id == current_user.id) for data isolation
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
+from starlette.concurrency import run_in_threadpool
 from sqlmodel import Session, select
-from typing import List, Optional
+from sqlalchemy.exc import SQLAlchemyError
+from typing import Callable, Dict, List, NamedTuple, Optional
 from datetime import datetime, timezone
-from decimal import Decimal
+from decimal import Decimal, ROUND_CEILING
 from pydantic import BaseModel, Field
 import logging
 import uuid
 
-from models.plan import Plan, PlanCreate, PlanUpdate, PLAN_TYPES
+from models.plan import Plan, PlanResult, PlanCreate, PlanUpdate, PLAN_TYPES
 from models.portfolio import Portfolio
 from models.property import Property
 from models.asset import Asset
@@ -22,6 +24,13 @@ from models.expense import Expense
 from models.user import User
 from utils.database_sql import get_session
 from utils.auth import get_current_user
+from utils import fire_solver
+from utils.cache_codec import CodecError, decode, encode, register_model
+from utils.data_version import get_portfolio_version
+from utils.jobs import JobContext, register_job
+from utils.cancellation import CancelToken, OperationCancelled, cancel_scope, cancelled_error
+from utils.lanes import batch_lane
+from utils.balance_sheet import BalanceSheetProjection, project_balance_sheet
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/plans", tags=["plans"])
@@ -60,6 +69,72 @@ class ProjectionResult(BaseModel):
     total_withdrawals: Decimal
 
 
+# Plan results are persisted in plan_results with the cache codec
+register_model(ProjectionYear)
+register_model(ProjectionResult)
+
+
+class PlanVariant(BaseModel):
+    """
+    Projection variant: a saved plan (or the portfolio's current position)
+    with some inputs replaced. Unset fields keep the base values.
+    """
+    key: str
+    base_plan_id: Optional[str] = None
+    current_net_worth: Optional[float] = None
+    annual_savings: Optional[float] = None
+    expected_return: Optional[float] = Field(default=None, ge=-100.0, le=100.0)
+    inflation_rate: Optional[float] = Field(default=None, ge=0.0, le=50.0)
+    withdrawal_rate: Optional[float] = Field(default=None, ge=0.0, le=100.0)
+    current_age: Optional[int] = Field(default=None, ge=0, le=120)
+    retirement_age: Optional[int] = Field(default=None, ge=0, le=120)
+    life_expectancy: Optional[int] = Field(default=None, ge=1, le=120)
+    target_net_worth: Optional[float] = None
+
+
+class PlanBatchRequest(BaseModel):
+    plan_ids: Optional[List[str]] = None  # None: every active plan in the portfolio
+    variants: List[PlanVariant] = []
+
+
+class PlanBatchResponse(BaseModel):
+    portfolio_id: str
+    current_net_worth: Decimal
+    annual_savings: Decimal
+    results: Dict[str, ProjectionResult]  # Keyed by plan ID, then variant key
+
+
+# Batch results are returned by "plans.batch" jobs through the cache codec
+register_model(PlanBatchResponse)
+
+
+class FireSolveInput(ProjectionInput):
+    target_fire_age: Optional[int] = Field(default=None, ge=0, le=120)  # Default: retirement_age
+    success_threshold: float = Field(default=95.0, ge=0.0, le=100.0)
+
+
+class FireSolveResult(BaseModel):
+    fire_number: Decimal
+    years_to_fire: Optional[int]
+    fire_age: Optional[int]
+    fire_year: Optional[int]
+    success_probability: float
+    target_fire_age: int
+    required_annual_savings: Optional[Decimal]  # To reach fire_number by target_fire_age
+    coast_fire_number: Optional[Decimal]  # Net worth needed today to get there with no more savings
+    max_withdrawal_rate: Optional[float]  # Highest rate (%) meeting success_threshold
+
+
+# Most variants accepted by POST /plans/portfolio/{portfolio_id}/projections
+MAX_PLAN_VARIANTS = 50
+
+# Longest projection (life_expectancy - current_age) accepted
+MAX_PLAN_YEARS = 100
+
+# Part of every stored result's key; bump when the projection model changes
+PLAN_MODEL_REVISION = "2"  # 2: assets and liabilities projected item by item
+
+
 @router.get("/types")
 async def get_plan_types():
     """Get list of plan types (static data, no auth required)"""
@@ -69,12 +144,17 @@ async def get_plan_types():
 @router.get("/portfolio/{portfolio_id}", response_model=List[Plan])
 async def get_portfolio_plans(
     portfolio_id: str,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
     """
     Get all plans for a portfolio
     
+    Plans are returned with their persisted summary (success_probability,
+    projected_fire_age, ...). Active plans whose stored result no longer
+    matches the portfolio's data are recomputed in the background.
+    
     ⚠️ Data Isolation: Only returns plans owned by current_user
     """
     # Verify portfolio exists and user has access
@@ -97,6 +177,11 @@ async def get_portfolio_plans(
     )
     plans = session.exec(statement).all()
     
+    version = await get_portfolio_version(portfolio_id)
+    stale = _stale_plan_ids([plan for plan in plans if plan.is_active], version, session)
+    if stale:
+        background_tasks.add_task(batch_lane.run, _refresh_plan_results, session.get_bind(), portfolio_id, current_user.id, stale, version)
+    
     return plans
 
 
@@ -254,7 +339,10 @@ async def delete_plan(
             detail="Plan not found or you don't have access"
         )
     
-    # Delete plan
+    # Delete plan (and its stored result)
+    stored = session.get(PlanResult, plan_id)
+    if stored:
+        session.delete(stored)
     session.delete(plan)
     session.commit()
 
@@ -262,26 +350,32 @@ async def delete_plan(
     return Response(status_code=204)
 
 
-@router.post("/project", response_model=ProjectionResult)
-async def calculate_projection(
-    data: ProjectionInput,
-    current_user: User = Depends(get_current_user),
-):
-    """Calculate financial projections based on input parameters (pure calculation, no DB)"""
-    if data.life_expectancy - data.current_age > 100:
+def _validate_projection_input(data: ProjectionInput) -> None:
+    if data.life_expectancy - data.current_age > MAX_PLAN_YEARS:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Age range too large")
+
+
+def _fire_inputs(data: ProjectionInput) -> fire_solver.FireInputs:
+    return fire_solver.FireInputs(**data.model_dump(include=set(fire_solver.FireInputs._fields)))
+
+
+def _run_projection(data: ProjectionInput, balance_sheet: Optional[BalanceSheetProjection] = None) -> ProjectionResult:
+    """
+    FIRE projection for one set of inputs (pure calculation).
+    
+    With a balance sheet (the portfolio's assets and liabilities, projected
+    for at least the projection's years + 1), each year's returns are those
+    items' own asset growth less liability interest, plus expected_return on
+    the rest of net worth (properties and accumulated savings). Contributions
+    and repayments move money within net worth, so they are not added again.
+    utils/fire_solver.py models the plain inputs only.
+    """
     current_year = datetime.now().year
     nominal_return = data.expected_return / 100
     inflation = data.inflation_rate / 100
     withdrawal_rate = data.withdrawal_rate / 100
     
-    # Calculate FIRE number
-    if data.target_net_worth:
-        fire_number = data.target_net_worth
-    else:
-        # Default: 25x annual expenses (4% rule equivalent)
-        annual_expenses = data.annual_savings * 0.5 if data.annual_savings > 0 else 50000
-        fire_number = annual_expenses * (1 / withdrawal_rate) if withdrawal_rate > 0 else annual_expenses * 25
+    fire_number = fire_solver.fire_number(_fire_inputs(data))
     
     projections = []
     net_worth = data.current_net_worth
@@ -293,13 +387,20 @@ async def calculate_projection(
     # Calculate until life expectancy
     years_to_calculate = data.life_expectancy - data.current_age
     
+    if balance_sheet is not None:
+        itemized_net_worth = balance_sheet.net_worth.tolist()
+        itemized_returns = balance_sheet.net_returns.tolist()
+    
     for year in range(years_to_calculate + 1):
         age = data.current_age + year
         calc_year = current_year + year
         is_retired = age >= data.retirement_age
         
         # Calculate returns and savings/withdrawals
-        investment_returns = net_worth * nominal_return
+        if balance_sheet is None:
+            investment_returns = net_worth * nominal_return
+        else:
+            investment_returns = itemized_returns[year + 1] + (net_worth - itemized_net_worth[year]) * nominal_return
         
         if is_retired:
             # Withdrawal phase - use withdrawal rate
@@ -357,59 +458,84 @@ async def calculate_projection(
     )
 
 
-@router.get("/{plan_id}/projections")
-async def get_plan_projections(
-    plan_id: str,
-    portfolio_id: str,
+@router.post("/project", response_model=ProjectionResult)
+async def calculate_projection(
+    data: ProjectionInput,
+    current_user: User = Depends(get_current_user),
+):
+    """Calculate financial projections based on input parameters (pure calculation, no DB)"""
+    _validate_projection_input(data)
+    return _run_projection(data)
+
+
+@router.post("/solve", response_model=FireSolveResult)
+async def solve_fire(
+    data: FireSolveInput,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
 ):
     """
-    Get projections for a specific plan using portfolio data
-    
-    ⚠️ Data Isolation: Only calculates projections if plan/portfolio owned by current_user
+    Answer FIRE questions directly instead of iterating /plans/project:
+    when FIRE is reached, the savings needed to reach it by a target age,
+    the coast-FIRE number for that age, and the highest withdrawal rate that
+    keeps the success probability at or above a threshold.
+
+    Uses the same model as /plans/project, solved in closed form (see
+    utils/fire_solver.py) rather than simulated year by year.
     """
-    # Get plan with data isolation
-    plan_stmt = select(Plan).where(
-        Plan.id == plan_id,
-        Plan.user_id == current_user.id
-    )
-    plan = session.exec(plan_stmt).first()
-    
-    if not plan:
+    _validate_projection_input(data)
+    target_age = data.retirement_age if data.target_fire_age is None else data.target_fire_age
+    if not data.current_age <= target_age <= data.life_expectancy:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Plan not found or you don't have access"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="target_fire_age must be between current_age and life_expectancy",
         )
-    
-    # Verify portfolio access
-    portfolio_stmt = select(Portfolio).where(
-        Portfolio.id == portfolio_id,
-        Portfolio.user_id == current_user.id
+
+    inputs = _fire_inputs(data)
+    years_to_fire = fire_solver.years_to_fire(inputs)
+    savings = fire_solver.required_savings(inputs, target_age)
+    coast = fire_solver.coast_fire_number(inputs, target_age)
+    return FireSolveResult(
+        fire_number=round(fire_solver.fire_number(inputs), 2),
+        years_to_fire=years_to_fire,
+        fire_age=None if years_to_fire is None else data.current_age + years_to_fire,
+        fire_year=None if years_to_fire is None else datetime.now().year + years_to_fire,
+        success_probability=round(fire_solver.success_probability(inputs), 1),
+        target_fire_age=target_age,
+        # Rounded up so the amount is always enough
+        required_annual_savings=None if savings is None else Decimal(repr(savings)).quantize(Decimal("0.01"), rounding=ROUND_CEILING),
+        coast_fire_number=None if coast is None else Decimal(repr(coast)).quantize(Decimal("0.01"), rounding=ROUND_CEILING),
+        max_withdrawal_rate=fire_solver.max_withdrawal_rate(inputs, data.success_threshold),
     )
-    portfolio = session.exec(portfolio_stmt).first()
-    
-    if not portfolio:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Portfolio not found or you don't have access"
-        )
+
+
+class PortfolioPlanInputs(NamedTuple):
+    """A portfolio's current position, the starting point of every plan projection"""
+    net_worth: float
+    annual_savings: float
+    balance_sheet: BalanceSheetProjection  # Assets and liabilities, MAX_PLAN_YEARS + 1 years
+
+
+def _portfolio_plan_inputs(portfolio_id: str, user_id: str, session: Session) -> PortfolioPlanInputs:
+    """
+    Current net worth, annual savings and projected assets and liabilities of
+    a portfolio.
     
-    # Get portfolio data with data isolation
+    ⚠️ Data Isolation: every query is filtered by user_id
+    """
     properties = session.exec(
-        select(Property).where(Property.portfolio_id == portfolio_id, Property.user_id == current_user.id)
+        select(Property).where(Property.portfolio_id == portfolio_id, Property.user_id == user_id)
     ).all()
     assets = session.exec(
-        select(Asset).where(Asset.portfolio_id == portfolio_id, Asset.user_id == current_user.id, Asset.is_active == True)
+        select(Asset).where(Asset.portfolio_id == portfolio_id, Asset.user_id == user_id, Asset.is_active == True)
     ).all()
     liabilities = session.exec(
-        select(Liability).where(Liability.portfolio_id == portfolio_id, Liability.user_id == current_user.id, Liability.is_active == True)
+        select(Liability).where(Liability.portfolio_id == portfolio_id, Liability.user_id == user_id, Liability.is_active == True)
     ).all()
     income_sources = session.exec(
-        select(IncomeSource).where(IncomeSource.portfolio_id == portfolio_id, IncomeSource.user_id == current_user.id, IncomeSource.is_active == True)
+        select(IncomeSource).where(IncomeSource.portfolio_id == portfolio_id, IncomeSource.user_id == user_id, IncomeSource.is_active == True)
     ).all()
     expenses = session.exec(
-        select(Expense).where(Expense.portfolio_id == portfolio_id, Expense.user_id == current_user.id, Expense.is_active == True)
+        select(Expense).where(Expense.portfolio_id == portfolio_id, Expense.user_id == user_id, Expense.is_active == True)
     ).all()
     
     # Calculate totals using Python sum with Decimal
@@ -431,8 +557,14 @@ async def get_plan_projections(
     monthly_expenses = sum(to_monthly(e.amount, e.frequency) for e in expenses)
     annual_savings = (monthly_income - monthly_expenses) * 12
     
-    # Create projection input from plan settings
-    projection_input = ProjectionInput(
+    # One extra year: the last projected year still records its returns
+    balance_sheet = project_balance_sheet(assets, liabilities, MAX_PLAN_YEARS + 1)
+    return PortfolioPlanInputs(net_worth, annual_savings, balance_sheet)
+
+
+def _plan_projection_input(plan: Plan, net_worth: float, annual_savings: float) -> ProjectionInput:
+    """Projection inputs for a saved plan"""
+    return ProjectionInput(
         current_net_worth=net_worth,
         annual_savings=annual_savings,
         expected_return=7.0,  # Default
@@ -443,5 +575,313 @@ async def get_plan_projections(
         life_expectancy=plan.life_expectancy or 95,
         target_net_worth=float(plan.target_equity) if plan.target_equity and plan.target_equity > 0 else None
     )
+
+
+def _plan_result_key(plan: Plan, version: str) -> str:
+    """Identifies the inputs of a plan's projection: model, portfolio data, plan revision and calendar year"""
+    return f"{PLAN_MODEL_REVISION}:{version}:{plan.updated_at.isoformat()}:{datetime.now().year}"
+
+
+def _load_plan_result(plan: Plan, key: str, session: Session) -> Optional[ProjectionResult]:
+    """Stored result for a plan, if it was computed for exactly these inputs"""
+    stored = session.get(PlanResult, plan.id)
+    if stored is None or stored.result_key != key:
+        return None
+    try:
+        return decode(stored.series)
+    except CodecError:
+        logger.warning(f"Discarding undecodable result for plan {plan.id}")
+        return None
+
+
+def _store_plan_result(plan: Plan, key: str, result: ProjectionResult, session: Session) -> None:
+    """
+    Persist a plan's result and its summary columns.
+    
+    Best effort: a failed write (e.g. a concurrent store of the same plan) is
+    logged and the result is recomputed on a later view.
+    """
+    now = datetime.now(timezone.utc)
+    stored = session.get(PlanResult, plan.id) or PlanResult(plan_id=plan.id, user_id=plan.user_id, result_key=key, series=b"")
+    stored.result_key = key
+    stored.series = encode(result)
+    stored.computed_at = now
+    
+    # Summary columns; updated_at is left alone as it is part of the result key
+    plan.last_calculated = now
+    plan.success_probability = Decimal(str(result.success_probability))
+    plan.projected_fire_age = result.fire_age
+    plan.projected_fire_year = str(result.fire_year) if result.fire_year is not None else None
+    
+    session.add(stored)
+    session.add(plan)
+    try:
+        session.commit()
+    except SQLAlchemyError as e:
+        session.rollback()
+        logger.warning(f"Could not store result for plan {plan.id}: {e}")
+
+
+def _stale_plan_ids(plans: List[Plan], version: str, session: Session) -> List[str]:
+    """Plans with no stored result for their current inputs"""
+    if not plans:
+        return []
+    stored_keys = dict(session.exec(
+        select(PlanResult.plan_id, PlanResult.result_key).where(PlanResult.plan_id.in_([plan.id for plan in plans]))
+    ).all())
+    return [plan.id for plan in plans if stored_keys.get(plan.id) != _plan_result_key(plan, version)]
+
+
+def _refresh_plan_results(bind, portfolio_id: str, user_id: str, plan_ids: List[str], version: str) -> None:
+    """
+    Recompute and store results for stale plans (run as a background task in
+    the batch lane).
+    
+    version must have been read before this runs: if the portfolio changes
+    meanwhile, the results are stored under the old version and never served.
+    """
+    with batch_lane.session(bind) as session:
+        plans = session.exec(select(Plan).where(
+            Plan.id.in_(plan_ids),
+            Plan.portfolio_id == portfolio_id,
+            Plan.user_id == user_id  # CRITICAL: Data isolation filter
+        )).all()
+        if not plans:
+            return
+        position = _portfolio_plan_inputs(portfolio_id, user_id, session)
+        for plan in plans:
+            projection_input = _plan_projection_input(plan, position.net_worth, position.annual_savings)
+            if projection_input.life_expectancy - projection_input.current_age > MAX_PLAN_YEARS:
+                continue
+            result = _run_projection(projection_input, position.balance_sheet)
+            _store_plan_result(plan, _plan_result_key(plan, version), result, session)
+
+
+@router.post("/portfolio/{portfolio_id}/projections", response_model=PlanBatchResponse)
+async def get_portfolio_plan_projections(
+    portfolio_id: str,
+    data: PlanBatchRequest = PlanBatchRequest(),
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+    request: Request = None,
+):
+    """
+    Project several plans of a portfolio, and variants of them, in one call.
+    
+    The portfolio's net worth and savings are loaded once and shared by every
+    projection; identical inputs (e.g. a variant that changes nothing) are
+    computed once.
+    
+    Args:
+        portfolio_id: Portfolio ID
+        data: Plan IDs (default: all active plans) and up to 50 variants
+    
+    Returns:
+        PlanBatchResponse with one ProjectionResult per plan ID and variant key
+    
+    ⚠️ Data Isolation: Only plans and portfolio data owned by current_user are used
+    """
+    # Stop computing if the client goes away or the deadline passes
+    async with cancel_scope(request) as token:
+        try:
+            return await run_in_threadpool(_compute_plan_batch, portfolio_id, data, current_user.id, session, None, token)
+        except OperationCancelled as e:
+            raise cancelled_error(e)
+
+
+def _compute_plan_batch(
+    portfolio_id: str,
+    data: PlanBatchRequest,
+    user_id: str,
+    session: Session,
+    progress: Optional[Callable[[float], None]] = None,
+    cancel: Optional[CancelToken] = None,
+) -> PlanBatchResponse:
+    """
+    Body of POST /plans/portfolio/{portfolio_id}/projections (synchronous;
+    runs in the threadpool, and as the "plans.batch" background job).
+    
+    Args:
+        progress: Called with the fraction of results computed so far
+        cancel: Checked before each projection; raises OperationCancelled once cancelled
+    
+    ⚠️ Data Isolation: every query is filtered by user_id
+    """
+    if len(data.variants) > MAX_PLAN_VARIANTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_PLAN_VARIANTS} variants per request"
+        )
+    
+    # Verify portfolio access
+    portfolio_stmt = select(Portfolio).where(
+        Portfolio.id == portfolio_id,
+        Portfolio.user_id == user_id
+    )
+    portfolio = session.exec(portfolio_stmt).first()
+    
+    if not portfolio:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Portfolio not found or you don't have access"
+        )
+    
+    # All of the portfolio's plans in one query; requested and base plans are picked from it
+    plans = {plan.id: plan for plan in session.exec(select(Plan).where(
+        Plan.portfolio_id == portfolio_id,
+        Plan.user_id == user_id  # CRITICAL: Data isolation filter
+    )).all()}
+    
+    requested = set(data.plan_ids or []) | {v.base_plan_id for v in data.variants if v.base_plan_id}
+    missing = sorted(requested - plans.keys())
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"message": "Plan not found or you don't have access", "plan_ids": missing}
+        )
+    
+    if data.plan_ids is None:
+        selected = [plan for plan in plans.values() if plan.is_active]
+    else:
+        selected = [plans[plan_id] for plan_id in dict.fromkeys(data.plan_ids)]
+    
+    net_worth, annual_savings, balance_sheet = _portfolio_plan_inputs(portfolio_id, user_id, session)
+    base_input = ProjectionInput(current_net_worth=net_worth, annual_savings=annual_savings)
+    
+    inputs: Dict[str, ProjectionInput] = {
+        plan.id: _plan_projection_input(plan, net_worth, annual_savings) for plan in selected
+    }
+    for variant in data.variants:
+        if variant.key in inputs:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Duplicate result key: {variant.key}"
+            )
+        base = (
+            _plan_projection_input(plans[variant.base_plan_id], net_worth, annual_savings)
+            if variant.base_plan_id else base_input
+        )
+        overrides = variant.model_dump(exclude={"key", "base_plan_id"}, exclude_none=True)
+        inputs[variant.key] = base.model_copy(update=overrides)
+    
+    for key, projection_input in inputs.items():
+        if projection_input.life_expectancy - projection_input.current_age > MAX_PLAN_YEARS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Age range too large for {key}"
+            )
+    
+    # Identical inputs are projected once
+    computed: Dict[tuple, ProjectionResult] = {}
+    results = {}
+    for index, (key, projection_input) in enumerate(inputs.items()):
+        if cancel is not None:
+            cancel.check()
+        if progress is not None:
+            progress(index / len(inputs))
+        signature = tuple(projection_input.model_dump().values())
+        if signature not in computed:
+            computed[signature] = _run_projection(projection_input, balance_sheet)
+        results[key] = computed[signature]
+    
+    return PlanBatchResponse(
+        portfolio_id=portfolio_id,
+        current_net_worth=round(Decimal(str(net_worth)), 2),
+        annual_savings=round(Decimal(str(annual_savings)), 2),
+        results=results,
+    )
+
+
+class PlanBatchJobParams(PlanBatchRequest):
+    """Parameters of a "plans.batch" background job"""
+    portfolio_id: str
+
+
+async def _admit_plan_batch_job(params: PlanBatchJobParams, user: User, session: Session) -> None:
+    if len(params.variants) > MAX_PLAN_VARIANTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_PLAN_VARIANTS} variants per request"
+        )
+    portfolio = session.exec(select(Portfolio).where(
+        Portfolio.id == params.portfolio_id,
+        Portfolio.user_id == user.id
+    )).first()
+    if not portfolio:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Portfolio not found or you don't have access"
+        )
+
+
+@register_job("plans.batch", PlanBatchJobParams, admit=_admit_plan_batch_job)
+def _run_plan_batch_job(ctx: JobContext, params: PlanBatchJobParams) -> PlanBatchResponse:
+    """Background equivalent of POST /plans/portfolio/{portfolio_id}/projections"""
+    with ctx.session() as session:
+        return _compute_plan_batch(
+            params.portfolio_id,
+            PlanBatchRequest(plan_ids=params.plan_ids, variants=params.variants),
+            ctx.user_id,
+            session,
+            ctx.progress,
+            ctx.token,
+        )
+
+
+@router.get("/{plan_id}/projections")
+async def get_plan_projections(
+    plan_id: str,
+    portfolio_id: str,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """
+    Get projections for a specific plan using portfolio data
+    
+    Projections of a plan against its own portfolio are persisted (plan_results
+    plus the summary columns on Plan) and served until the plan is edited or
+    the portfolio's data version changes.
+    
+    ⚠️ Data Isolation: Only calculates projections if plan/portfolio owned by current_user
+    """
+    # Get plan with data isolation
+    plan_stmt = select(Plan).where(
+        Plan.id == plan_id,
+        Plan.user_id == current_user.id
+    )
+    plan = session.exec(plan_stmt).first()
+    
+    if not plan:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Plan not found or you don't have access"
+        )
+    
+    # Verify portfolio access
+    portfolio_stmt = select(Portfolio).where(
+        Portfolio.id == portfolio_id,
+        Portfolio.user_id == current_user.id
+    )
+    portfolio = session.exec(portfolio_stmt).first()
+    
+    if not portfolio:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Portfolio not found or you don't have access"
+        )
     
-    return await calculate_projection(projection_input)
+    # Read the version before the data so a concurrent write can only make the stored result stale
+    persist = portfolio_id == plan.portfolio_id
+    if persist:
+        key = _plan_result_key(plan, await get_portfolio_version(portfolio_id))
+        stored = _load_plan_result(plan, key, session)
+        if stored is not None:
+            return stored
+    
+    position = _portfolio_plan_inputs(portfolio_id, current_user.id, session)
+    projection_input = _plan_projection_input(plan, position.net_worth, position.annual_savings)
+    _validate_projection_input(projection_input)
+    result = _run_projection(projection_input, position.balance_sheet)
+    if persist:
+        _store_plan_result(plan, key, result, session)
+    return result
@@ -4,7 +4,7 @@ Portfolio Routes - SQL-Based with Authentication & Data Isolation
 """
 
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlmodel import Session, select, func
 from typing import List
 from datetime import date, datetime, timezone
@@ -20,14 +20,24 @@ from models.income import IncomeSource
 from models.expense import Expense
 from models.asset import Asset
 from models.liability import Liability
-from models.plan import Plan
+from models.plan import Plan, PlanResult
+from models.net_worth import NetWorthSnapshot, NetWorthRollup
 from models.financials import Loan, PropertyValuation, RentalIncome
 from utils.database_sql import get_session
 from utils.auth import get_current_user
 from utils.calculations import annualize_amount
+from utils.data_version import get_portfolio_version, bump_portfolio_version
+from utils.single_flight import single_flight, make_key
+from utils.cache import summary_cache
+from utils.cache_codec import register_model
+from utils.etag import make_etag, is_not_modified, not_modified, set_etag
+from utils.json_response import TrustedModelRoute
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/portfolios", tags=["portfolios"])
+router = APIRouter(prefix="/portfolios", tags=["portfolios"], route_class=TrustedModelRoute)
+
+# Summaries are stored in the shared cache tier
+register_model(PortfolioSummary)
 
 
 @router.get("", response_model=List[Portfolio])
@@ -71,6 +81,8 @@ async def create_portfolio(
     session.add(portfolio)
     session.commit()
     session.refresh(portfolio)
+    # A new portfolio joins the user's household projection
+    await bump_portfolio_version(portfolio.id, current_user.id)
     
     logger.info(f"Portfolio created: {portfolio.id} for user: {current_user.id}")
     return portfolio
@@ -137,6 +149,7 @@ async def update_portfolio(
     session.add(portfolio)
     session.commit()
     session.refresh(portfolio)
+    await bump_portfolio_version(portfolio.id, current_user.id)
     
     logger.info(f"Portfolio updated: {portfolio.id} by user: {current_user.id}")
     return portfolio
@@ -209,11 +222,23 @@ async def delete_portfolio(
     plan_stmt = select(Plan).where(Plan.portfolio_id == portfolio_id)
     plans = session.exec(plan_stmt).all()
     for plan in plans:
+        stored = session.get(PlanResult, plan.id)
+        if stored:
+            session.delete(stored)
         session.delete(plan)
     
+    # Net worth snapshots (written nightly for every actual portfolio) and their rollups
+    snapshot_stmt = select(NetWorthSnapshot).where(NetWorthSnapshot.portfolio_id == portfolio_id)
+    for snapshot in session.exec(snapshot_stmt).all():
+        session.delete(snapshot)
+    rollup_stmt = select(NetWorthRollup).where(NetWorthRollup.portfolio_id == portfolio_id)
+    for rollup in session.exec(rollup_stmt).all():
+        session.delete(rollup)
+    
     # Delete portfolio
     session.delete(portfolio)
     session.commit()
+    await bump_portfolio_version(portfolio_id, current_user.id)
 
     logger.info(f"Portfolio deleted: {portfolio_id} by user: {current_user.id}")
     return Response(status_code=204)
@@ -242,13 +267,55 @@ def _compute_goal_year(goal_settings: Optional[dict], date_of_birth: Optional[st
 async def get_portfolio_summary(
     portfolio_id: str,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    request: Request = None,
+    response: Response = None,
 ):
     """
     Get portfolio summary with calculated totals
     
+    Returns 304 when If-None-Match carries the current ETag. Concurrent
+    identical requests (same user, portfolio and data version) share one
+    computation.
+    
     ⚠️ Data Isolation: Only returns summary if portfolio owned by current_user
     """
+    # Ownership first: a 304 or cached summary must never answer for a portfolio the user doesn't own
+    portfolio_stmt = select(Portfolio.id).where(
+        Portfolio.id == portfolio_id,
+        Portfolio.user_id == current_user.id  # CRITICAL: Data isolation filter
+    )
+    if session.exec(portfolio_stmt).first() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Portfolio not found or you don't have access"
+        )
+    
+    version = await get_portfolio_version(portfolio_id)
+    etag = make_etag(current_user.id, "portfolios.summary", portfolio_id, version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    key = make_key(current_user.id, "portfolios.summary", {"portfolio_id": portfolio_id}, version)
+    
+    cached = await summary_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    summary = await single_flight.do(key, _compute_portfolio_summary, portfolio_id, current_user, bind=session.get_bind())
+    await summary_cache.put(key, summary)
+    return summary
+
+
+def _compute_portfolio_summary(
+    portfolio_id: str,
+    current_user: User,
+    session: Session,
+) -> PortfolioSummary:
+    """
+    Build the portfolio summary (synchronous; runs in the threadpool).
+    """
     # Verify portfolio exists and user has access
     portfolio_stmt = select(Portfolio).where(
         Portfolio.id == portfolio_id,
@@ -5,15 +5,22 @@ Generate multi-year financial projections for properties and portfolios.
 ⚠️ CRITICAL: All queries include .where(Property.user_id == current_user.id) for data isolation
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from sqlmodel import Session, SQLModel, select
+from typing import AsyncIterator, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+from collections import defaultdict
+from functools import partial
 from datetime import datetime
 from decimal import Decimal
+import json
 import logging
 
 from models.property import Property
 from models.portfolio import Portfolio
+from models.asset import Asset
+from models.liability import Liability
 from models.user import User
 from models.financials import (
     Loan,
@@ -25,51 +32,192 @@ from models.financials import (
     ProjectionYearData,
     PropertyProjectionResponse,
     PortfolioProjectionResponse,
+    HouseholdYearData,
+    HouseholdPortfolioProjection,
+    HouseholdProjectionResponse,
+    ProjectionBatchItem,
+    ProjectionBatchRequest,
+    ProjectionBatchError,
+    ProjectionBatchResponse,
+    PortfolioProjectionJobParams,
+    SensitivityGridRequest,
+    SensitivityCell,
+    SensitivityGridResponse,
+    TornadoBar,
+    TornadoAnalysis,
+    PropertyTornado,
+    TornadoResponse,
+    GoalSeekRequest,
+    GoalSeekResponse,
 )
 from utils.database_sql import get_session
 from utils.auth import get_current_user
+from utils.admission import heavy_controller, heavy_request
+from utils.cost_limiter import charge_cost, projection_cost, sensitivity_cost
+from utils.data_version import get_portfolio_version, get_user_version
+from utils.single_flight import single_flight, make_key
+from utils.cache import projection_cache, projection_cache_key
+from utils.cache_codec import register_model
+from utils.etag import make_etag, is_not_modified, not_modified, set_etag
+from utils.json_response import DecimalJSONResponse, TrustedModelRoute
+from utils.columnar import RESPONSE_FORMATS, property_projection_columns, portfolio_projection_columns
+from utils.goal_seek import GOALS, GoalSeekError, goal_seek
+from utils.jobs import JobContext, register_job
+from utils.cancellation import CancelToken, OperationCancelled, cancel_scope, cancelled_error
+from utils.balance_sheet import project_balance_sheet, to_currency
+from utils.solver import SolverError
+from utils.sensitivity import (
+    TORNADO_INPUTS,
+    TORNADO_METRICS,
+    evaluate_grid,
+    property_tornado,
+    rank_bars,
+    tornado_passes,
+)
 from utils.calculations import (
     calculate_property_value,
     calculate_property_equity,
     calculate_rental_income_for_year,
     calculate_expenses_for_year,
     calculate_property_cashflow,
+    calculate_annual_repayments,
     generate_portfolio_projections,
     to_decimal,
 )
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/projections", tags=["projections"])
+router = APIRouter(prefix="/projections", tags=["projections"], route_class=TrustedModelRoute)
+
+# Most items accepted by POST /projections/batch
+MAX_BATCH_ITEMS = 50
+
+# Most values per override axis of a sensitivity grid
+MAX_SENSITIVITY_VALUES = 11
+
+# Projection responses are stored in the shared cache tier
+register_model(PropertyProjectionResponse)
+register_model(PortfolioProjectionResponse)
+register_model(HouseholdProjectionResponse)
+
+
+# Projection metrics and the engine pipelines each one needs
+METRIC_PIPELINES = {
+    "property_value": frozenset({"value"}),
+    "total_debt": frozenset({"debt"}),
+    "equity": frozenset({"value", "debt"}),
+    "lvr": frozenset({"value", "debt"}),
+    "rental_income": frozenset({"rent"}),
+    "expenses": frozenset({"expenses"}),
+    "loan_repayments": frozenset({"repayments"}),
+    "depreciation": frozenset({"depreciation"}),
+    "net_cashflow": frozenset({"rent", "expenses", "repayments"}),
+}
+ALL_PIPELINES = frozenset().union(*METRIC_PIPELINES.values())
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Validate a comma-separated ?fields= value.
+
+    Returns:
+        Requested metrics in canonical order, or None for all metrics
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - METRIC_PIPELINES.keys()
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "message": "Invalid fields",
+                "unknown": sorted(unknown),
+                "valid": list(METRIC_PIPELINES),
+            }
+        )
+    selected = tuple(metric for metric in METRIC_PIPELINES if metric in requested)
+    return None if len(selected) == len(METRIC_PIPELINES) else selected
 
 
-def _get_property_data(property_id: str, session: Session) -> dict:
+def _pipelines_for(fields: Optional[Tuple[str, ...]]) -> FrozenSet[str]:
+    """Engine pipelines needed to compute the requested metrics"""
+    if fields is None:
+        return ALL_PIPELINES
+    return frozenset().union(*(METRIC_PIPELINES[metric] for metric in fields))
+
+
+def _select_fields(rows: List[ProjectionYearData], fields: Optional[Tuple[str, ...]]) -> List[ProjectionYearData]:
+    """Drop metrics computed only as dependencies of the requested ones"""
+    if fields is None:
+        return rows
+    return [
+        ProjectionYearData(year=row.year, **{metric: getattr(row, metric) for metric in fields})
+        for row in rows
+    ]
+
+
+def _validate_format(format: str) -> None:
+    if format not in RESPONSE_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Format must be one of: {', '.join(RESPONSE_FORMATS)}"
+        )
+
+
+def _render_projection(result, format: str, etag: str):
+    """
+    Return the projection in the requested format.
+
+    Columnar payloads bypass response_model validation (they are plain ints and
+    strings), so the ETag is set on the returned response directly.
+    """
+    if format != "columnar":
+        return result
+    if isinstance(result, PortfolioProjectionResponse):
+        content = portfolio_projection_columns(result)
+    else:
+        content = property_projection_columns(result)
+    columnar = DecimalJSONResponse(content=content)
+    set_etag(columnar, etag)
+    return columnar
+
+
+def _get_property_data(property_id: str, session: Session, pipelines: FrozenSet[str] = ALL_PIPELINES) -> dict:
     """
     Fetch all financial data for a property.
     Returns a dict with property, loans, valuations, growth_rates, etc.
+    Tables not needed by the given pipelines are skipped (returned empty).
     """
-    # Get loans
-    loans_stmt = select(Loan).where(Loan.property_id == property_id)
-    loans = session.exec(loans_stmt).all()
+    loans = valuations = growth_rates = rental_incomes = expenses = depreciation = []
     
-    # Get valuations
-    valuations_stmt = select(PropertyValuation).where(PropertyValuation.property_id == property_id)
-    valuations = session.exec(valuations_stmt).all()
+    # Get loans
+    if pipelines & {"debt", "repayments"}:
+        loans_stmt = select(Loan).where(Loan.property_id == property_id)
+        loans = session.exec(loans_stmt).all()
     
-    # Get growth rates
-    growth_stmt = select(GrowthRatePeriod).where(GrowthRatePeriod.property_id == property_id)
-    growth_rates = session.exec(growth_stmt).all()
+    if "value" in pipelines:
+        # Get valuations
+        valuations_stmt = select(PropertyValuation).where(PropertyValuation.property_id == property_id)
+        valuations = session.exec(valuations_stmt).all()
+        
+        # Get growth rates
+        growth_stmt = select(GrowthRatePeriod).where(GrowthRatePeriod.property_id == property_id)
+        growth_rates = session.exec(growth_stmt).all()
     
     # Get rental income
-    rental_stmt = select(RentalIncome).where(RentalIncome.property_id == property_id)
-    rental_incomes = session.exec(rental_stmt).all()
+    if "rent" in pipelines:
+        rental_stmt = select(RentalIncome).where(RentalIncome.property_id == property_id)
+        rental_incomes = session.exec(rental_stmt).all()
     
     # Get expenses
-    expense_stmt = select(ExpenseLog).where(ExpenseLog.property_id == property_id)
-    expenses = session.exec(expense_stmt).all()
+    if "expenses" in pipelines:
+        expense_stmt = select(ExpenseLog).where(ExpenseLog.property_id == property_id)
+        expenses = session.exec(expense_stmt).all()
     
     # Get depreciation
-    depr_stmt = select(DepreciationSchedule).where(DepreciationSchedule.property_id == property_id)
-    depreciation = session.exec(depr_stmt).all()
+    if "depreciation" in pipelines:
+        depr_stmt = select(DepreciationSchedule).where(DepreciationSchedule.property_id == property_id)
+        depreciation = session.exec(depr_stmt).all()
     
     # Convert to dicts for calculation engine
     return {
@@ -121,6 +269,43 @@ def _get_property_data(property_id: str, session: Session) -> dict:
     }
 
 
+def _year_income_and_expenses(
+    property_obj: Property,
+    property_data: dict,
+    year: int,
+    current_year: int,
+    exp_override: Optional[Decimal],
+    pipelines: FrozenSet[str],
+) -> Tuple[Decimal, Decimal]:
+    """
+    Unrounded (rental income, expenses) of a property for one year; zero for
+    whichever of the rent and expenses pipelines is not running.
+    """
+    rental_income = Decimal("0")
+    if "rent" in pipelines:
+        rental_income = calculate_rental_income_for_year(
+            property_data.get("rental_incomes", []), year, current_year
+        )
+        
+        # Fall back to JSON rental details if no RentalIncome records
+        if rental_income == 0 and property_obj.rental_details:
+            weekly_rent = to_decimal(property_obj.rental_details.get("income", 0))
+            rental_growth = to_decimal(property_obj.growth_assumptions.get("rental_growth_rate", 3) if property_obj.growth_assumptions else 3)
+            rental_income = weekly_rent * 52 * ((Decimal("1") + rental_growth / 100) ** (year - current_year))
+    
+    annual_expenses = Decimal("0")
+    if "expenses" in pipelines:
+        annual_expenses = calculate_expenses_for_year(
+            property_data.get("expenses", []), year, current_year, exp_override
+        )
+        
+        # Fall back to JSON expenses if no ExpenseLog records
+        if annual_expenses == 0 and property_obj.expenses:
+            annual_expenses = sum(to_decimal(v) for v in property_obj.expenses.values())
+    
+    return rental_income, annual_expenses
+
+
 def _generate_property_projections(
     property_obj: Property,
     property_data: dict,
@@ -128,9 +313,14 @@ def _generate_property_projections(
     expense_growth_override: Optional[float] = None,
     interest_rate_offset: Optional[float] = None,
     asset_growth_override: Optional[float] = None,
+    pipelines: FrozenSet[str] = ALL_PIPELINES,
+    cancel: Optional[CancelToken] = None,
 ) -> List[ProjectionYearData]:
     """
     Generate projections for a single property.
+    
+    Only the given engine pipelines run; metrics that depend on a skipped
+    pipeline are left as None. The cancel token is checked once per year.
     """
     current_year = datetime.now().year
     end_year = current_year + years
@@ -150,85 +340,190 @@ def _generate_property_projections(
     exp_override = Decimal(str(expense_growth_override)) if expense_growth_override else None
     rate_offset = Decimal(str(interest_rate_offset)) if interest_rate_offset else Decimal("0")
     
+    # Metrics whose pipelines all run
+    computed = [metric for metric, needs in METRIC_PIPELINES.items() if needs <= pipelines]
+    loans = property_data.get("loans", [])
+    
     projections = []
     
     for year in range(current_year, end_year + 1):
-        years_elapsed = year - current_year
-        
-        # Calculate property value
-        projected_value = calculate_property_value(
-            base_value, current_year, year, growth_rates, property_data.get("valuations", [])
-        )
-        
-        # Calculate equity
-        equity_data = calculate_property_equity(
-            projected_value, 
-            property_data.get("loans", []), 
-            year, 
-            current_year, 
-            rate_offset
-        )
-        
-        # Calculate income and expenses
-        rental_income = calculate_rental_income_for_year(
-            property_data.get("rental_incomes", []), year, current_year
-        )
-        
-        # Fall back to JSON rental details if no RentalIncome records
-        if rental_income == 0 and property_obj.rental_details:
-            weekly_rent = to_decimal(property_obj.rental_details.get("income", 0))
-            rental_growth = to_decimal(property_obj.growth_assumptions.get("rental_growth_rate", 3) if property_obj.growth_assumptions else 3)
-            rental_income = weekly_rent * 52 * ((Decimal("1") + rental_growth / 100) ** years_elapsed)
-        
-        annual_expenses = calculate_expenses_for_year(
-            property_data.get("expenses", []), year, current_year, exp_override
-        )
-        
-        # Fall back to JSON expenses if no ExpenseLog records
-        if annual_expenses == 0 and property_obj.expenses:
-            annual_expenses = sum(to_decimal(v) for v in property_obj.expenses.values())
+        if cancel is not None:
+            cancel.check()
+        row = {}
         
-        # Get depreciation for this year
-        depr = Decimal("0")
-        for d in property_data.get("depreciation", []):
-            if d.year == year:
-                depr = d.building_depreciation + d.plant_and_equipment
-                break
+        if pipelines & {"value", "debt"}:
+            # Calculate property value
+            projected_value = Decimal("0")
+            if "value" in pipelines:
+                projected_value = calculate_property_value(
+                    base_value, current_year, year, growth_rates, property_data.get("valuations", [])
+                )
+            
+            # Calculate equity
+            equity_data = calculate_property_equity(
+                projected_value, 
+                loans if "debt" in pipelines else [], 
+                year, 
+                current_year, 
+                rate_offset
+            )
+            row.update(equity_data)
         
-        # Calculate cashflow
-        cashflow_data = calculate_property_cashflow(
-            property_data.get("loans", []),
-            rental_income,
-            annual_expenses,
-            depr,
-            rate_offset
-        )
+        if pipelines & {"rent", "expenses", "repayments", "depreciation"}:
+            # Calculate income and expenses
+            rental_income, annual_expenses = _year_income_and_expenses(
+                property_obj, property_data, year, current_year, exp_override, pipelines
+            )
+            
+            # Get depreciation for this year
+            depr = Decimal("0")
+            for d in property_data.get("depreciation", []):
+                if d.year == year:
+                    depr = d.building_depreciation + d.plant_and_equipment
+                    break
+            
+            # Calculate cashflow
+            cashflow_data = calculate_property_cashflow(
+                loans if "repayments" in pipelines else [],
+                rental_income,
+                annual_expenses,
+                depr,
+                rate_offset
+            )
+            row.update(cashflow_data)
         
         projections.append(ProjectionYearData(
             year=year,
-            property_value=equity_data["property_value"],
-            total_debt=equity_data["total_debt"],
-            equity=equity_data["equity"],
-            lvr=equity_data["lvr"],
-            rental_income=cashflow_data["rental_income"],
-            expenses=cashflow_data["expenses"],
-            loan_repayments=cashflow_data["loan_repayments"],
-            depreciation=cashflow_data["depreciation"],
-            net_cashflow=cashflow_data["net_cashflow"],
+            **{metric: row[metric] for metric in computed},
         ))
     
     return projections
 
 
-@router.get("/{property_id}", response_model=PropertyProjectionResponse)
+# Registered before "/{property_id}", which would otherwise capture the path
+@router.get(
+    "/household",
+    response_model=HouseholdProjectionResponse,
+    dependencies=[Depends(heavy_request)],
+)
+async def get_household_projections(
+    years: int = 10,
+    expense_growth_override: Optional[float] = None,
+    interest_rate_offset: Optional[float] = None,
+    asset_growth_override: Optional[float] = None,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+    request: Request = None,
+    response: Response = None,
+):
+    """
+    Generate multi-year projections across all of the user's actual
+    (non-scenario) portfolios, e.g. personal and SMSF, in one request.
+    
+    Every portfolio's data is loaded with one IN (...) query per table and
+    each property is projected once, feeding both its portfolio's totals and
+    the household totals. Non-property assets and liabilities are included in
+    each balance sheet.
+    
+    Args:
+        years: Number of years to project (default 10, max 50)
+        expense_growth_override: Override expense growth rate
+        interest_rate_offset: Interest rate adjustment for stress testing
+        asset_growth_override: Override property growth rate (percentage)
+    
+    Returns:
+        HouseholdProjectionResponse with per-portfolio and consolidated totals
+    
+    ⚠️ Data Isolation: Only portfolios owned by current_user are loaded
+    """
+    if years < 1 or years > 50:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Years must be between 1 and 50"
+        )
+    
+    portfolios = session.exec(select(Portfolio).where(
+        Portfolio.user_id == current_user.id,  # CRITICAL: Data isolation filter
+        Portfolio.type == "actual",
+    ).order_by(Portfolio.created_at)).all()
+    if not portfolios:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No portfolios found"
+        )
+    
+    # Any write to any of the user's portfolios bumps the user-wide version
+    version = await get_user_version(current_user.id)
+    cache_key = projection_cache_key(
+        current_user.id, "household", current_user.id, version, datetime.now().year, years,
+        expense_growth_override, interest_rate_offset, asset_growth_override,
+    )
+    etag = make_etag(*cache_key)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    cached = await projection_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    properties = session.exec(select(Property).where(
+        Property.portfolio_id.in_([p.id for p in portfolios]),
+        Property.user_id == current_user.id  # CRITICAL: Data isolation filter
+    )).all()
+    
+    # Charge compute cost (properties × years) against the user's tier budget
+    await charge_cost(current_user, "projections.household", projection_cost(len(properties), years))
+    
+    key = make_key(
+        current_user.id,
+        "projections.household",
+        {
+            "years": years,
+            "expense_growth_override": expense_growth_override,
+            "interest_rate_offset": interest_rate_offset,
+            "asset_growth_override": asset_growth_override,
+        },
+        version,
+    )
+    async with cancel_scope(request) as token:
+        try:
+            result = await single_flight.do(
+                key,
+                _compute_household_projections,
+                portfolios,
+                properties,
+                years,
+                expense_growth_override,
+                interest_rate_offset,
+                asset_growth_override,
+                cancel=token,
+                bind=session.get_bind(),
+            )
+        except OperationCancelled as e:
+            raise cancelled_error(e)
+    await projection_cache.put(cache_key, result)
+    return result
+
+
+@router.get(
+    "/{property_id}",
+    response_model=PropertyProjectionResponse,
+    response_model_exclude_none=True,
+    dependencies=[Depends(heavy_request)],
+)
 async def get_property_projections(
     property_id: str,
     years: int = 10,
     expense_growth_override: Optional[float] = None,
     interest_rate_offset: Optional[float] = None,
     asset_growth_override: Optional[float] = None,
+    format: str = "json",
+    fields: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    request: Request = None,
+    response: Response = None,
 ):
     """
     Generate multi-year financial projections for a single property.
@@ -239,6 +534,9 @@ async def get_property_projections(
         expense_growth_override: Override expense growth rate (percentage)
         interest_rate_offset: Interest rate adjustment for stress testing (percentage points)
         asset_growth_override: Override property growth rate (percentage)
+        format: "json" (default) or "columnar" (one fixed-point integer array per metric)
+        fields: Comma-separated metrics to return (default all); only the engine
+            pipelines those metrics depend on are run
     
     Returns:
         PropertyProjectionResponse with year-by-year projections
@@ -249,6 +547,9 @@ async def get_property_projections(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Years must be between 1 and 50"
         )
+    _validate_format(format)
+    selected = _parse_fields(fields)
+    pipelines = _pipelines_for(selected)
     
     # Get property with data isolation
     statement = select(Property).where(
@@ -263,39 +564,76 @@ async def get_property_projections(
             detail="Property not found or you don't have access"
         )
     
-    # Fetch all related financial data
-    property_data = _get_property_data(property_id, session)
-    
-    # Generate projections
-    projections = _generate_property_projections(
-        property_obj,
-        property_data,
-        years,
-        expense_growth_override,
-        interest_rate_offset,
-        asset_growth_override
+    # Serve from cache when the portfolio's data has not changed
+    current_year = datetime.now().year
+    version = await get_portfolio_version(property_obj.portfolio_id)
+    cache_key = projection_cache_key(
+        current_user.id, "property", property_id, version, current_year, years,
+        expense_growth_override, interest_rate_offset, asset_growth_override, selected,
     )
     
-    current_year = datetime.now().year
+    # The cache key plus format covers every input to the body, so it doubles as the ETag source
+    etag = make_etag(*cache_key, format)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    cached = await projection_cache.get(cache_key)
+    if cached is not None:
+        return _render_projection(cached, format, etag)
     
-    return PropertyProjectionResponse(
+    # Charge compute cost against the user's tier budget
+    await charge_cost(current_user, "projections.property", projection_cost(1, years))
+    
+    # Fetch the financial data the requested metrics need
+    property_data = _get_property_data(property_id, session, pipelines)
+    
+    # Generate projections off the event loop, abandoned if the client goes away
+    async with cancel_scope(request) as token:
+        try:
+            projections = await run_in_threadpool(
+                _generate_property_projections,
+                property_obj,
+                property_data,
+                years,
+                expense_growth_override,
+                interest_rate_offset,
+                asset_growth_override,
+                pipelines,
+                token,
+            )
+        except OperationCancelled as e:
+            raise cancelled_error(e)
+    
+    result = PropertyProjectionResponse(
         property_id=property_id,
         property_address=property_obj.address,
         start_year=current_year,
         end_year=current_year + years,
-        projections=projections
+        projections=_select_fields(projections, selected)
     )
+    await projection_cache.put(cache_key, result)
+    return _render_projection(result, format, etag)
 
 
-@router.get("/portfolio/{portfolio_id}", response_model=PortfolioProjectionResponse)
+@router.get(
+    "/portfolio/{portfolio_id}",
+    response_model=PortfolioProjectionResponse,
+    response_model_exclude_none=True,
+    dependencies=[Depends(heavy_request)],
+)
 async def get_portfolio_projections(
     portfolio_id: str,
     years: int = 10,
     expense_growth_override: Optional[float] = None,
     interest_rate_offset: Optional[float] = None,
     asset_growth_override: Optional[float] = None,
+    format: str = "json",
+    fields: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    request: Request = None,
+    response: Response = None,
 ):
     """
     Generate multi-year projections for an entire portfolio.
@@ -306,9 +644,14 @@ async def get_portfolio_projections(
         expense_growth_override: Override expense growth rate
         interest_rate_offset: Interest rate adjustment for stress testing
         asset_growth_override: Override property growth rate (percentage)
+        format: "json" (default) or "columnar" (one fixed-point integer array per metric)
+        fields: Comma-separated metrics to return (default all); only the engine
+            pipelines those metrics depend on are run
     
     Returns:
-        PortfolioProjectionResponse with per-property and aggregated projections
+        PortfolioProjectionResponse with per-property and aggregated projections,
+        and (without fields) a balance sheet with the portfolio's other assets
+        and liabilities projected alongside
     """
     # Validate years
     if years < 1 or years > 50:
@@ -316,6 +659,8 @@ async def get_portfolio_projections(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Years must be between 1 and 50"
         )
+    _validate_format(format)
+    selected = _parse_fields(fields)
     
     # Verify portfolio access
     portfolio_stmt = select(Portfolio).where(
@@ -330,6 +675,16 @@ async def get_portfolio_projections(
             detail="Portfolio not found or you don't have access"
         )
     
+    # Answer revalidations before loading properties
+    version = await get_portfolio_version(portfolio_id)
+    cache_key = projection_cache_key(
+        current_user.id, "portfolio", portfolio_id, version, datetime.now().year, years,
+        expense_growth_override, interest_rate_offset, asset_growth_override, selected,
+    )
+    etag = make_etag(*cache_key, format)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    
     # Get all properties in portfolio
     properties_stmt = select(Property).where(
         Property.portfolio_id == portfolio_id,
@@ -342,28 +697,146 @@ async def get_portfolio_projections(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No properties found in this portfolio"
         )
+    set_etag(response, etag)
     
-    current_year = datetime.now().year
+    # Serve from cache when the portfolio's data has not changed
+    cached = await projection_cache.get(cache_key)
+    if cached is not None:
+        return _render_projection(cached, format, etag)
+    
+    # Charge compute cost (properties × years) against the user's tier budget
+    await charge_cost(current_user, "projections.portfolio", projection_cost(len(properties), years))
+    
+    # Share one computation between concurrent identical requests
+    key = make_key(
+        current_user.id,
+        "projections.portfolio",
+        {
+            "portfolio_id": portfolio_id,
+            "years": years,
+            "expense_growth_override": expense_growth_override,
+            "interest_rate_offset": interest_rate_offset,
+            "asset_growth_override": asset_growth_override,
+            "fields": ",".join(selected) if selected else None,
+        },
+        version,
+    )
+    # Stop computing if the client goes away or the deadline passes
+    async with cancel_scope(request) as token:
+        try:
+            result = await single_flight.do(
+                key,
+                _compute_portfolio_projections,
+                portfolio,
+                properties,
+                years,
+                expense_growth_override,
+                interest_rate_offset,
+                asset_growth_override,
+                fields=selected,
+                cancel=token,
+                bind=session.get_bind(),
+            )
+        except OperationCancelled as e:
+            raise cancelled_error(e)
+    await projection_cache.put(cache_key, result)
+    return _render_projection(result, format, etag)
+
+
+def _job_portfolio(portfolio_id: str, user_id: str, session: Session) -> Tuple[Portfolio, List[Property]]:
+    """Portfolio and its properties for a projection job (404 if either is missing)"""
+    portfolio = session.exec(select(Portfolio).where(
+        Portfolio.id == portfolio_id,
+        Portfolio.user_id == user_id
+    )).first()
+    if not portfolio:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Portfolio not found or you don't have access"
+        )
+    properties = session.exec(select(Property).where(
+        Property.portfolio_id == portfolio_id,
+        Property.user_id == user_id  # CRITICAL: Data isolation
+    )).all()
+    if not properties:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No properties found in this portfolio"
+        )
+    return portfolio, properties
+
+
+async def _admit_portfolio_projection_job(params: PortfolioProjectionJobParams, user: User, session: Session) -> None:
+    _parse_fields(params.fields)
+    _, properties = _job_portfolio(params.portfolio_id, user.id, session)
+    await charge_cost(user, "projections.portfolio", projection_cost(len(properties), params.years))
+
+
+@register_job("projections.portfolio", PortfolioProjectionJobParams, admit=_admit_portfolio_projection_job)
+def _run_portfolio_projection_job(ctx: JobContext, params: PortfolioProjectionJobParams) -> PortfolioProjectionResponse:
+    """
+    Background equivalent of GET /projections/portfolio/{portfolio_id}
+    (same result body), reporting progress per property.
+    """
+    selected = _parse_fields(params.fields)
+    with ctx.session() as session:
+        portfolio, properties = _job_portfolio(params.portfolio_id, ctx.user_id, session)
+        property_data = _load_portfolio_inputs(properties, session, _pipelines_for(selected))
+        balance_items = None if selected else _load_balance_sheet_items([portfolio.id], ctx.user_id, session)[portfolio.id]
+
+    projected = 0
+
+    def generate(*args) -> List[ProjectionYearData]:
+        nonlocal projected
+        ctx.progress(projected / len(properties))
+        rows = _generate_property_projections(*args)
+        projected += 1
+        return rows
 
-    # Pre-fetch all related data for all properties in one query each (fixes N+1)
+    return _assemble_portfolio_projections(
+        portfolio,
+        properties,
+        property_data,
+        params.years,
+        params.expense_growth_override,
+        params.interest_rate_offset,
+        params.asset_growth_override,
+        selected,
+        generate,
+        ctx.token,
+        balance_items,
+    )
+
+
+def _load_portfolio_inputs(
+    properties: List[Property],
+    session: Session,
+    pipelines: FrozenSet[str] = ALL_PIPELINES,
+) -> Dict[str, dict]:
+    """
+    Fetch financial data for every property, keyed by property ID.
+    
+    One query per table for the whole portfolio (fixes N+1); tables not needed
+    by the given pipelines are skipped.
+    """
     property_ids = [p.id for p in properties]
 
-    all_loans = session.exec(select(Loan).where(Loan.property_id.in_(property_ids))).all()
-    all_valuations = session.exec(select(PropertyValuation).where(PropertyValuation.property_id.in_(property_ids))).all()
-    all_growth_rates = session.exec(select(GrowthRatePeriod).where(GrowthRatePeriod.property_id.in_(property_ids))).all()
-    all_rental_incomes = session.exec(select(RentalIncome).where(RentalIncome.property_id.in_(property_ids))).all()
-    all_expenses = session.exec(select(ExpenseLog).where(ExpenseLog.property_id.in_(property_ids))).all()
-    all_depreciation = session.exec(select(DepreciationSchedule).where(DepreciationSchedule.property_id.in_(property_ids))).all()
+    def _fetch(model, needed: bool) -> Dict[str, list]:
+        grouped = defaultdict(list)
+        if needed:
+            for row in session.exec(select(model).where(model.property_id.in_(property_ids))).all():
+                grouped[row.property_id].append(row)
+        return grouped
 
-    # Build lookup dicts keyed by property_id
-    def _build_property_data(property_id: str) -> dict:
-        loans = [l for l in all_loans if l.property_id == property_id]
-        valuations = [v for v in all_valuations if v.property_id == property_id]
-        growth_rates = [g for g in all_growth_rates if g.property_id == property_id]
-        rental_incomes = [r for r in all_rental_incomes if r.property_id == property_id]
-        expenses = [e for e in all_expenses if e.property_id == property_id]
-        depreciation = [d for d in all_depreciation if d.property_id == property_id]
+    all_loans = _fetch(Loan, bool(pipelines & {"debt", "repayments"}))
+    all_valuations = _fetch(PropertyValuation, "value" in pipelines)
+    all_growth_rates = _fetch(GrowthRatePeriod, "value" in pipelines)
+    all_rental_incomes = _fetch(RentalIncome, "rent" in pipelines)
+    all_expenses = _fetch(ExpenseLog, "expenses" in pipelines)
+    all_depreciation = _fetch(DepreciationSchedule, "depreciation" in pipelines)
 
+    # Build calculation-engine dicts per property
+    def _build_property_data(property_id: str) -> dict:
         return {
             "loans": [
                 {
@@ -375,15 +848,15 @@ async def get_portfolio_projections(
                     "repayment_frequency": loan.repayment_frequency.value if hasattr(loan.repayment_frequency, 'value') else loan.repayment_frequency,
                     "offset_balance": loan.offset_balance,
                 }
-                for loan in loans
+                for loan in all_loans[property_id]
             ],
             "valuations": [
                 {"valuation_date": val.valuation_date, "value": val.value}
-                for val in valuations
+                for val in all_valuations[property_id]
             ],
             "growth_rates": [
                 {"start_year": gr.start_year, "end_year": gr.end_year, "growth_rate": gr.growth_rate}
-                for gr in growth_rates
+                for gr in all_growth_rates[property_id]
             ],
             "rental_incomes": [
                 {
@@ -392,7 +865,7 @@ async def get_portfolio_projections(
                     "growth_rate": ri.growth_rate,
                     "vacancy_weeks_per_year": ri.vacancy_weeks_per_year,
                 }
-                for ri in rental_incomes
+                for ri in all_rental_incomes[property_id]
             ],
             "expenses": [
                 {
@@ -400,112 +873,1166 @@ async def get_portfolio_projections(
                     "frequency": exp.frequency.value if hasattr(exp.frequency, 'value') else exp.frequency,
                     "growth_rate": exp.growth_rate,
                 }
-                for exp in expenses
+                for exp in all_expenses[property_id]
             ],
-            "depreciation": depreciation,
+            "depreciation": all_depreciation[property_id],
         }
 
-    # Generate projections for each property using pre-fetched data
-    property_projections = []
+    return {property_id: _build_property_data(property_id) for property_id in property_ids}
+
+
+class _RunningTotals:
+    """
+    Per-year portfolio totals, accumulated one property at a time so property
+    projections need not be held in memory to aggregate them.
+    
+    LVR is recomputed from the summed value and debt, not summed.
+    """
+
+    def __init__(self, start_year: int, years: int, pipelines: FrozenSet[str]):
+        self.start_year = start_year
+        self.computed = [metric for metric, needs in METRIC_PIPELINES.items() if needs <= pipelines]
+        self.summed = [metric for metric in self.computed if metric != "lvr"]
+        self._sums = [{metric: Decimal("0") for metric in self.summed} for _ in range(years + 1)]
+
+    def add(self, projections: List[ProjectionYearData]) -> None:
+        for year_totals, year_data in zip(self._sums, projections):
+            for metric in self.summed:
+                year_totals[metric] += getattr(year_data, metric)
 
+    def rows(self) -> List[ProjectionYearData]:
+        totals = []
+        for year_idx, year_totals in enumerate(self._sums):
+            row = dict(year_totals)
+            if "lvr" in self.computed:
+                total_value = row["property_value"]
+                portfolio_lvr = (row["total_debt"] / total_value * 100) if total_value > 0 else Decimal("0")
+                row["lvr"] = portfolio_lvr.quantize(Decimal("0.01"))
+            totals.append(ProjectionYearData(year=self.start_year + year_idx, **row))
+        return totals
+
+
+def _iter_portfolio_projections(
+    properties: List[Property],
+    property_data: Dict[str, dict],
+    years: int,
+    expense_growth_override: Optional[float],
+    interest_rate_offset: Optional[float],
+    asset_growth_override: Optional[float],
+    pipelines: FrozenSet[str],
+    totals: _RunningTotals,
+    generate: Optional[Callable[..., List[ProjectionYearData]]] = None,
+    cancel: Optional[CancelToken] = None,
+) -> Iterator[PropertyProjectionResponse]:
+    """Project each property in turn, adding it to the running totals before yielding it"""
+    current_year = datetime.now().year
+    generate = generate or partial(_generate_property_projections, cancel=cancel)
     for property_obj in properties:
-        property_data = _build_property_data(property_obj.id)
-        projections = _generate_property_projections(
+        if cancel is not None:
+            cancel.check()
+        projections = generate(
             property_obj,
-            property_data,
+            property_data[property_obj.id],
             years,
             expense_growth_override,
             interest_rate_offset,
-            asset_growth_override
+            asset_growth_override,
+            pipelines,
         )
-
-        property_projections.append(PropertyProjectionResponse(
+        totals.add(projections)
+        yield PropertyProjectionResponse(
             property_id=property_obj.id,
             property_address=property_obj.address,
             start_year=current_year,
             end_year=current_year + years,
             projections=projections
-        ))
+        )
+
+
+def _compute_portfolio_projections(
+    portfolio: Portfolio,
+    properties: List[Property],
+    years: int,
+    expense_growth_override: Optional[float],
+    interest_rate_offset: Optional[float],
+    asset_growth_override: Optional[float],
+    session: Session,
+    fields: Optional[Tuple[str, ...]] = None,
+    cancel: Optional[CancelToken] = None,
+) -> PortfolioProjectionResponse:
+    """
+    Project every property in the portfolio and aggregate yearly totals
+    (synchronous; runs in the threadpool).
     
-    # Calculate portfolio totals by aggregating across properties
-    totals = []
-    for year_idx in range(years + 1):
-        year = current_year + year_idx
-        
-        total_value = Decimal("0")
-        total_debt = Decimal("0")
-        total_equity = Decimal("0")
-        total_rental = Decimal("0")
-        total_expenses = Decimal("0")
-        total_repayments = Decimal("0")
-        total_depreciation = Decimal("0")
-        total_cashflow = Decimal("0")
-        
-        for prop_proj in property_projections:
-            if year_idx < len(prop_proj.projections):
-                year_data = prop_proj.projections[year_idx]
-                total_value += year_data.property_value
-                total_debt += year_data.total_debt
-                total_equity += year_data.equity
-                total_rental += year_data.rental_income
-                total_expenses += year_data.expenses
-                total_repayments += year_data.loan_repayments
-                total_depreciation += year_data.depreciation
-                total_cashflow += year_data.net_cashflow
-        
-        portfolio_lvr = (total_debt / total_value * 100) if total_value > 0 else Decimal("0")
-        
-        totals.append(ProjectionYearData(
-            year=year,
-            property_value=total_value,
-            total_debt=total_debt,
-            equity=total_equity,
-            lvr=portfolio_lvr.quantize(Decimal("0.01")),
-            rental_income=total_rental,
-            expenses=total_expenses,
-            loan_repayments=total_repayments,
-            depreciation=total_depreciation,
-            net_cashflow=total_cashflow,
-        ))
+    With fields set, only the pipelines those metrics need are loaded and run,
+    and the balance sheet is left out.
+    Raises OperationCancelled once the cancel token is cancelled.
+    """
+    property_data = _load_portfolio_inputs(properties, session, _pipelines_for(fields))
+    balance_items = None if fields else _load_balance_sheet_items([portfolio.id], portfolio.user_id, session)[portfolio.id]
+    return _assemble_portfolio_projections(
+        portfolio,
+        properties,
+        property_data,
+        years,
+        expense_growth_override,
+        interest_rate_offset,
+        asset_growth_override,
+        fields,
+        cancel=cancel,
+        balance_items=balance_items,
+    )
+
+
+def _assemble_portfolio_projections(
+    portfolio: Portfolio,
+    properties: List[Property],
+    property_data: Dict[str, dict],
+    years: int,
+    expense_growth_override: Optional[float],
+    interest_rate_offset: Optional[float],
+    asset_growth_override: Optional[float],
+    fields: Optional[Tuple[str, ...]] = None,
+    generate: Optional[Callable[..., List[ProjectionYearData]]] = None,
+    cancel: Optional[CancelToken] = None,
+    balance_items: Optional[Tuple[List[Asset], List[Liability]]] = None,
+) -> PortfolioProjectionResponse:
+    """
+    Build a portfolio projection from already-loaded property data, with a
+    balance sheet when the portfolio's assets and liabilities are given.
+    """
+    current_year = datetime.now().year
+    pipelines = _pipelines_for(fields)
+
+    totals = _RunningTotals(current_year, years, pipelines)
+    property_projections = list(_iter_portfolio_projections(
+        properties,
+        property_data,
+        years,
+        expense_growth_override,
+        interest_rate_offset,
+        asset_growth_override,
+        pipelines,
+        totals,
+        generate,
+        cancel,
+    ))
+    
+    for prop_proj in property_projections:
+        prop_proj.projections = _select_fields(prop_proj.projections, fields)
+    
+    property_totals = totals.rows()
+    balance_sheet = None
+    if balance_items is not None:
+        other_assets, other_liabilities = _project_other_balances(*balance_items, years, interest_rate_offset)
+        balance_sheet = _balance_sheet(property_totals, other_assets, other_liabilities)
     
     return PortfolioProjectionResponse(
-        portfolio_id=portfolio_id,
+        portfolio_id=portfolio.id,
         portfolio_name=portfolio.name,
         start_year=current_year,
         end_year=current_year + years,
         properties=property_projections,
-        totals=totals
+        totals=_select_fields(property_totals, fields),
+        balance_sheet=balance_sheet,
     )
 
 
-@router.get("/property/{property_id}/summary")
-async def get_property_projection_summary(
-    property_id: str,
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
-):
+def _load_balance_sheet_items(
+    portfolio_ids: List[str],
+    user_id: str,
+    session: Session,
+) -> Dict[str, Tuple[List[Asset], List[Liability]]]:
+    """Active assets and liabilities of each portfolio, one query per table"""
+    items: Dict[str, Tuple[List[Asset], List[Liability]]] = {
+        portfolio_id: ([], []) for portfolio_id in portfolio_ids
+    }
+    for asset in session.exec(select(Asset).where(
+        Asset.portfolio_id.in_(portfolio_ids),
+        Asset.user_id == user_id,  # CRITICAL: Data isolation filter
+        Asset.is_active == True,
+    )).all():
+        items[asset.portfolio_id][0].append(asset)
+    for liability in session.exec(select(Liability).where(
+        Liability.portfolio_id.in_(portfolio_ids),
+        Liability.user_id == user_id,  # CRITICAL: Data isolation filter
+        Liability.is_active == True,
+    )).all():
+        items[liability.portfolio_id][1].append(liability)
+    return items
+
+
+def _project_other_balances(
+    assets: List[Asset],
+    liabilities: List[Liability],
+    years: int,
+    interest_rate_offset: Optional[float],
+) -> Tuple[List[Decimal], List[Decimal]]:
     """
-    Get a quick summary of current property financial status.
+    Yearly non-property asset and liability totals: assets compound at their
+    expected return with contributions, liabilities amortize at their rate
+    (shifted by interest_rate_offset, like the property loans).
+    """
+    projection = project_balance_sheet(assets, liabilities, years, interest_rate_offset)
+    return to_currency(projection.total_assets), to_currency(projection.total_liabilities)
+
+
+def _balance_sheet(
+    property_totals: List[ProjectionYearData],
+    other_assets: List[Decimal],
+    other_liabilities: List[Decimal],
+) -> List[HouseholdYearData]:
+    """Combine property totals with non-property balances, year by year"""
+    sheet = []
+    for row, assets, liabilities in zip(property_totals, other_assets, other_liabilities):
+        total_assets = row.property_value + assets
+        total_liabilities = row.total_debt + liabilities
+        sheet.append(HouseholdYearData(
+            year=row.year,
+            property_value=row.property_value,
+            property_debt=row.total_debt,
+            property_equity=row.equity,
+            other_assets=assets,
+            other_liabilities=liabilities,
+            total_assets=total_assets,
+            total_liabilities=total_liabilities,
+            net_worth=total_assets - total_liabilities,
+            net_cashflow=row.net_cashflow,
+        ))
+    return sheet
+
+
+def _compute_household_projections(
+    portfolios: List[Portfolio],
+    properties: List[Property],
+    years: int,
+    expense_growth_override: Optional[float],
+    interest_rate_offset: Optional[float],
+    asset_growth_override: Optional[float],
+    session: Session,
+    cancel: Optional[CancelToken] = None,
+) -> HouseholdProjectionResponse:
+    """
+    Project every portfolio of a household in one pass (synchronous; runs in
+    the threadpool).
     
-    Returns current value, equity, LVR, and annual cashflow.
+    Child data for all properties is loaded with one IN (...) query per table,
+    and active assets and liabilities with one query each. Each property is
+    projected once; its rows are added to its portfolio's running totals,
+    which are then added to the household's. Each portfolio's assets and
+    liabilities are projected in one array pass per category.
     """
-    # Get property with data isolation
-    statement = select(Property).where(
-        Property.id == property_id,
-        Property.user_id == current_user.id
-    )
-    property_obj = session.exec(statement).first()
+    current_year = datetime.now().year
+    property_data = _load_portfolio_inputs(properties, session)
+    balance_items = _load_balance_sheet_items([p.id for p in portfolios], portfolios[0].user_id, session)
     
-    if not property_obj:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Property not found or you don't have access"
-        )
+    portfolio_properties: Dict[str, List[Property]] = defaultdict(list)
+    for prop in properties:
+        portfolio_properties[prop.portfolio_id].append(prop)
     
-    # Fetch financial data
-    property_data = _get_property_data(property_id, session)
+    household_totals = _RunningTotals(current_year, years, ALL_PIPELINES)
+    household_assets = [Decimal("0")] * (years + 1)
+    household_liabilities = [Decimal("0")] * (years + 1)
+    results = []
+    for portfolio in portfolios:
+        members = portfolio_properties[portfolio.id]
+        assets, liabilities = balance_items[portfolio.id]
+        totals = _RunningTotals(current_year, years, ALL_PIPELINES)
+        for _ in _iter_portfolio_projections(
+            members,
+            property_data,
+            years,
+            expense_growth_override,
+            interest_rate_offset,
+            asset_growth_override,
+            ALL_PIPELINES,
+            totals,
+            cancel=cancel,
+        ):
+            pass
+        property_totals = totals.rows()
+        household_totals.add(property_totals)
+        
+        other_assets, other_liabilities = _project_other_balances(assets, liabilities, years, interest_rate_offset)
+        household_assets = [a + b for a, b in zip(household_assets, other_assets)]
+        household_liabilities = [a + b for a, b in zip(household_liabilities, other_liabilities)]
+        
+        results.append(HouseholdPortfolioProjection(
+            portfolio_id=portfolio.id,
+            portfolio_name=portfolio.name,
+            property_count=len(members),
+            asset_count=len(assets),
+            liability_count=len(liabilities),
+            property_totals=property_totals,
+            balance_sheet=_balance_sheet(property_totals, other_assets, other_liabilities),
+        ))
+    
+    consolidated = household_totals.rows()
+    return HouseholdProjectionResponse(
+        start_year=current_year,
+        end_year=current_year + years,
+        portfolios=results,
+        property_totals=consolidated,
+        balance_sheet=_balance_sheet(consolidated, household_assets, household_liabilities),
+    )
+
+
+def _ndjson_line(kind: str, data) -> str:
+    if isinstance(data, SQLModel):
+        return f'{{"type":"{kind}","data":{data.model_dump_json(exclude_none=True)}}}\n'
+    return json.dumps({"type": kind, "data": data}, separators=(",", ":")) + "\n"
+
+
+def _stream_projection_lines(
+    header: dict,
+    property_projections: Iterable[PropertyProjectionResponse],
+    totals: Callable[[], List[ProjectionYearData]],
+    fields: Optional[Tuple[str, ...]],
+) -> Iterator[str]:
+    """
+    NDJSON lines: a "portfolio" header, one "property" line per property as it
+    is computed, then a "totals" line. A failure mid-stream is reported as a
+    final "error" line (the 200 status has already been sent).
+    """
+    yield _ndjson_line("portfolio", header)
+    try:
+        for prop_proj in property_projections:
+            prop_proj = prop_proj.model_copy(update={"projections": _select_fields(prop_proj.projections, fields)})
+            yield _ndjson_line("property", prop_proj)
+        yield _ndjson_line("totals", [row.model_dump(mode="json", exclude_none=True) for row in _select_fields(totals(), fields)])
+    except OperationCancelled as e:
+        # Nobody is reading any more
+        logger.info(f"Projection stream for portfolio {header.get('portfolio_id')} abandoned: {e.reason}")
+    except Exception:
+        logger.exception(f"Projection stream failed for portfolio {header.get('portfolio_id')}")
+        yield _ndjson_line("error", {"detail": "Projection failed"})
+
+
+async def _stream_admitted(
+    request: Optional[Request],
+    user_id: str,
+    lines: Callable[[CancelToken], Iterator[str]],
+) -> AsyncIterator[str]:
+    """
+    Stream lines computed in the threadpool while holding the user's heavy
+    admission slot.
+    
+    The slot is taken when the body starts and released when it ends: FastAPI
+    0.110 exits yield dependencies before the body is sent, so
+    Depends(heavy_request) would not cover the computation. The token passed to
+    lines is cancelled once the client disconnects, which is also checked
+    between lines.
+    """
+    try:
+        async with heavy_controller.admit(user_id):
+            async with cancel_scope(request, timeout=0) as token:
+                async for line in iterate_in_threadpool(lines(token)):
+                    yield line
+                    if request is not None and await request.is_disconnected():
+                        token.cancel("disconnected")
+                        return
+    except HTTPException as e:
+        # Admission rejected; the 200 status has already been sent
+        yield _ndjson_line("error", {"detail": e.detail})
+
+
+@router.get("/portfolio/{portfolio_id}/stream")
+async def stream_portfolio_projections(
+    portfolio_id: str,
+    years: int = 10,
+    expense_growth_override: Optional[float] = None,
+    interest_rate_offset: Optional[float] = None,
+    asset_growth_override: Optional[float] = None,
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+    request: Request = None,
+):
+    """
+    Stream portfolio projections as NDJSON (application/x-ndjson).
+    
+    Same inputs and numbers as GET /projections/portfolio/{portfolio_id}, but
+    each property is sent as soon as it is computed, followed by the portfolio
+    totals, so large portfolios start rendering early and are never held in
+    memory whole.
+    
+    Lines (one JSON object each):
+        {"type": "portfolio", "data": {portfolio_id, portfolio_name, start_year, end_year, property_count}}
+        {"type": "property", "data": PropertyProjectionResponse}   (one per property)
+        {"type": "totals", "data": [ProjectionYearData, ...]}
+        {"type": "error", "data": {"detail": ...}}                 (only if computation fails mid-stream
+                                                                    or no admission slot frees up)
+    
+    ⚠️ All database reads happen before the response starts: the request's
+    session is closed once streaming begins. The heavy admission slot is held
+    by the body itself (see _stream_admitted), and computation stops between
+    properties once the client disconnects.
+    """
+    # Validate years
+    if years < 1 or years > 50:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Years must be between 1 and 50"
+        )
+    selected = _parse_fields(fields)
+    pipelines = _pipelines_for(selected)
+    
+    # Verify portfolio access
+    portfolio_stmt = select(Portfolio).where(
+        Portfolio.id == portfolio_id,
+        Portfolio.user_id == current_user.id
+    )
+    portfolio = session.exec(portfolio_stmt).first()
+    
+    if not portfolio:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Portfolio not found or you don't have access"
+        )
+    
+    # Get all properties in portfolio
+    properties_stmt = select(Property).where(
+        Property.portfolio_id == portfolio_id,
+        Property.user_id == current_user.id  # CRITICAL: Data isolation
+    )
+    properties = session.exec(properties_stmt).all()
+    
+    if not properties:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No properties found in this portfolio"
+        )
+    
+    current_year = datetime.now().year
+    header = {
+        "portfolio_id": portfolio.id,
+        "portfolio_name": portfolio.name,
+        "start_year": current_year,
+        "end_year": current_year + years,
+        "property_count": len(properties),
+    }
+    
+    # Replay a cached full result (shared with the non-streaming endpoint)
+    version = await get_portfolio_version(portfolio_id)
+    cache_key = projection_cache_key(
+        current_user.id, "portfolio", portfolio_id, version, current_year, years,
+        expense_growth_override, interest_rate_offset, asset_growth_override, selected,
+    )
+    cached = await projection_cache.get(cache_key)
+    if cached is not None:
+        lines = _stream_projection_lines(header, cached.properties, lambda: cached.totals, selected)
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+    
+    # Charge compute cost (properties × years) against the user's tier budget
+    await charge_cost(current_user, "projections.portfolio", projection_cost(len(properties), years))
+    
+    property_data = await run_in_threadpool(_load_portfolio_inputs, properties, session, pipelines)
+    totals = _RunningTotals(current_year, years, pipelines)
+    
+    def lines(cancel: CancelToken) -> Iterator[str]:
+        property_projections = _iter_portfolio_projections(
+            properties,
+            property_data,
+            years,
+            expense_growth_override,
+            interest_rate_offset,
+            asset_growth_override,
+            pipelines,
+            totals,
+            cancel=cancel,
+        )
+        return _stream_projection_lines(header, property_projections, totals.rows, selected)
+    
+    # Lines are computed in the threadpool, off the event loop
+    return StreamingResponse(_stream_admitted(request, current_user.id, lines), media_type="application/x-ndjson")
+
+
+@router.post(
+    "/batch",
+    response_model=ProjectionBatchResponse,
+    response_model_exclude_none=True,
+    dependencies=[Depends(heavy_request)],
+)
+async def get_batch_projections(
+    data: ProjectionBatchRequest,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+    request: Request = None,
+):
+    """
+    Project several properties and/or portfolios in one request.
+    
+    Each item takes the same parameters as the single-property or portfolio
+    endpoint. Ownership is checked and all child data loaded with a fixed
+    number of IN (...) queries for the whole batch, and each distinct
+    property/parameter combination is projected once even if several items
+    include it. Results share the single endpoints' cache entries.
+    
+    Items that are not found (or not owned) are reported in "errors" with a
+    404 while the rest of the batch succeeds; invalid parameters reject the
+    whole batch with 400.
+    
+    ⚠️ Data Isolation: Only properties and portfolios owned by current_user are loaded
+    """
+    if not data.items or len(data.items) > MAX_BATCH_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch must contain between 1 and {MAX_BATCH_ITEMS} items"
+        )
+    
+    # Validate every item and assign result keys
+    items: Dict[str, Tuple[ProjectionBatchItem, Optional[Tuple[str, ...]]]] = {}
+    for item in data.items:
+        if bool(item.property_id) == bool(item.portfolio_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Each batch item needs exactly one of property_id or portfolio_id"
+            )
+        if item.years < 1 or item.years > 50:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Years must be between 1 and 50"
+            )
+        key = item.key or (f"property:{item.property_id}" if item.property_id else f"portfolio:{item.portfolio_id}")
+        if key in items:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Duplicate batch item key: {key}"
+            )
+        items[key] = (item, _parse_fields(item.fields))
+    
+    # Ownership checks — one query per kind for the whole batch
+    property_ids = {item.property_id for item, _ in items.values() if item.property_id}
+    portfolio_ids = {item.portfolio_id for item, _ in items.values() if item.portfolio_id}
+    owned_properties: Dict[str, Property] = {}
+    owned_portfolios: Dict[str, Portfolio] = {}
+    portfolio_properties: Dict[str, List[Property]] = defaultdict(list)
+    if property_ids:
+        owned_properties = {p.id: p for p in session.exec(select(Property).where(
+            Property.id.in_(property_ids),
+            Property.user_id == current_user.id  # CRITICAL: Data isolation filter
+        )).all()}
+    if portfolio_ids:
+        owned_portfolios = {p.id: p for p in session.exec(select(Portfolio).where(
+            Portfolio.id.in_(portfolio_ids),
+            Portfolio.user_id == current_user.id  # CRITICAL: Data isolation filter
+        )).all()}
+    if owned_portfolios:
+        for prop in session.exec(select(Property).where(
+            Property.portfolio_id.in_(list(owned_portfolios)),
+            Property.user_id == current_user.id  # CRITICAL: Data isolation filter
+        )).all():
+            portfolio_properties[prop.portfolio_id].append(prop)
+    
+    # Resolve each item, serving cache hits
+    current_year = datetime.now().year
+    results = {}
+    errors: Dict[str, ProjectionBatchError] = {}
+    pending = []
+    versions: Dict[str, str] = {}
+    for key, (item, selected) in items.items():
+        if item.property_id:
+            target = owned_properties.get(item.property_id)
+            if target is None:
+                errors[key] = ProjectionBatchError(status_code=404, detail="Property not found or you don't have access")
+                continue
+            scope, object_id, portfolio_id, properties = "property", item.property_id, target.portfolio_id, [target]
+        else:
+            target = owned_portfolios.get(item.portfolio_id)
+            if target is None:
+                errors[key] = ProjectionBatchError(status_code=404, detail="Portfolio not found or you don't have access")
+                continue
+            properties = portfolio_properties[item.portfolio_id]
+            if not properties:
+                errors[key] = ProjectionBatchError(status_code=404, detail="No properties found in this portfolio")
+                continue
+            scope, object_id, portfolio_id = "portfolio", item.portfolio_id, item.portfolio_id
+        
+        if portfolio_id not in versions:
+            versions[portfolio_id] = await get_portfolio_version(portfolio_id)
+        cache_key = projection_cache_key(
+            current_user.id, scope, object_id, versions[portfolio_id], current_year, item.years,
+            item.expense_growth_override, item.interest_rate_offset, item.asset_growth_override, selected,
+        )
+        cached = await projection_cache.get(cache_key)
+        if cached is not None:
+            results[key] = cached
+        else:
+            pending.append((key, item, selected, target, properties, cache_key))
+    
+    if pending:
+        # Charge the summed compute cost of everything not served from cache
+        units = sum(projection_cost(len(properties), item.years) for _, item, _, _, properties, _ in pending)
+        await charge_cost(current_user, "projections.batch", units)
+        
+        async with cancel_scope(request) as token:
+            try:
+                computed = await run_in_threadpool(_compute_batch_projections, pending, session, token)
+            except OperationCancelled as e:
+                raise cancelled_error(e)
+        for (key, _, _, _, _, cache_key), result in zip(pending, computed):
+            await projection_cache.put(cache_key, result)
+            results[key] = result
+    
+    # Keep the request's item order
+    ordered = {key: results[key] for key in items if key in results}
+    return ProjectionBatchResponse(results=ordered, errors=errors)
+
+
+def _compute_batch_projections(pending: list, session: Session, cancel: Optional[CancelToken] = None) -> list:
+    """
+    Compute every uncached batch item (synchronous; runs in the threadpool).
+    
+    Child data for all involved properties is loaded once with one IN (...)
+    query per table, and each (property, parameters) combination is projected
+    once and shared between the items that include it.
+    """
+    current_year = datetime.now().year
+    all_properties = list({prop.id: prop for *_, properties, _ in pending for prop in properties}.values())
+    pipelines = frozenset().union(*(_pipelines_for(selected) for _, _, selected, *_ in pending))
+    property_data = _load_portfolio_inputs(all_properties, session, pipelines)
+    
+    # Balance sheets for full (unfielded) portfolio items, as GET /portfolio/{id} returns
+    balance_portfolios = {target.id: target.user_id for _, item, selected, target, *_ in pending if item.portfolio_id and not selected}
+    balance_items = (
+        _load_balance_sheet_items(list(balance_portfolios), next(iter(balance_portfolios.values())), session)
+        if balance_portfolios else {}
+    )
+    
+    memo: Dict[tuple, List[ProjectionYearData]] = {}
+    
+    def generate(property_obj, data, years, expense_growth_override, interest_rate_offset, asset_growth_override, item_pipelines):
+        memo_key = (property_obj.id, years, expense_growth_override, interest_rate_offset, asset_growth_override, item_pipelines)
+        if memo_key not in memo:
+            memo[memo_key] = _generate_property_projections(
+                property_obj, data, years, expense_growth_override, interest_rate_offset, asset_growth_override, item_pipelines, cancel,
+            )
+        return memo[memo_key]
+    
+    computed = []
+    for _, item, selected, target, properties, _ in pending:
+        if item.property_id:
+            rows = generate(
+                target,
+                property_data[target.id],
+                item.years,
+                item.expense_growth_override,
+                item.interest_rate_offset,
+                item.asset_growth_override,
+                _pipelines_for(selected),
+            )
+            computed.append(PropertyProjectionResponse(
+                property_id=target.id,
+                property_address=target.address,
+                start_year=current_year,
+                end_year=current_year + item.years,
+                projections=_select_fields(rows, selected)
+            ))
+        else:
+            computed.append(_assemble_portfolio_projections(
+                target,
+                properties,
+                property_data,
+                item.years,
+                item.expense_growth_override,
+                item.interest_rate_offset,
+                item.asset_growth_override,
+                selected,
+                generate,
+                cancel,
+                balance_items.get(target.id),
+            ))
+    return computed
+
+
+def _validate_sensitivity_axes(data: SensitivityGridRequest) -> None:
+    if data.years < 1 or data.years > 50:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Years must be between 1 and 50"
+        )
+    axes = {
+        "interest_rate_offsets": data.interest_rate_offsets,
+        "expense_growth_overrides": data.expense_growth_overrides,
+        "asset_growth_overrides": data.asset_growth_overrides,
+    }
+    for name, values in axes.items():
+        if not values or len(values) > MAX_SENSITIVITY_VALUES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{name} must have between 1 and {MAX_SENSITIVITY_VALUES} values"
+            )
+        if len(set(values)) != len(values):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{name} contains duplicate values"
+            )
+
+
+def _axis_totals(
+    properties: List[Property],
+    property_data: Dict[str, dict],
+    years: int,
+    pipelines: FrozenSet[str],
+    expense_growth_override: Optional[float] = None,
+    interest_rate_offset: Optional[float] = None,
+    asset_growth_override: Optional[float] = None,
+    cancel: Optional[CancelToken] = None,
+) -> List[ProjectionYearData]:
+    """Portfolio totals of one engine pass restricted to the given pipelines"""
+    totals = _RunningTotals(datetime.now().year, years, pipelines)
+    for property_obj in properties:
+        totals.add(_generate_property_projections(
+            property_obj,
+            property_data[property_obj.id],
+            years,
+            expense_growth_override,
+            interest_rate_offset,
+            asset_growth_override,
+            pipelines,
+            cancel,
+        ))
+    return totals.rows()
+
+
+def _cashflow_components(
+    properties: List[Property],
+    property_data: Dict[str, dict],
+    years: int,
+    pipeline: str,
+    expense_growth_override: Optional[float] = None,
+    interest_rate_offset: Optional[float] = None,
+    cancel: Optional[CancelToken] = None,
+) -> List[List[Decimal]]:
+    """
+    Unrounded yearly amounts of one cashflow pipeline (rent, repayments or
+    expenses), one series per property, as the engine computes them before
+    calculate_property_cashflow rounds.
+    """
+    current_year = datetime.now().year
+    exp_override = Decimal(str(expense_growth_override)) if expense_growth_override else None
+    rate_offset = Decimal(str(interest_rate_offset)) if interest_rate_offset else Decimal("0")
+    components = []
+    for property_obj in properties:
+        if cancel is not None:
+            cancel.check()
+        data = property_data[property_obj.id]
+        if pipeline == "repayments":
+            # Repayments depend on the current loans only, so are the same every year
+            components.append([calculate_annual_repayments(data.get("loans", []), rate_offset)] * (years + 1))
+            continue
+        series = []
+        for year in range(current_year, current_year + years + 1):
+            income, cost = _year_income_and_expenses(
+                property_obj, data, year, current_year, exp_override, frozenset({pipeline})
+            )
+            series.append(cost if pipeline == "expenses" else income)
+        components.append(series)
+    return components
+
+
+def _compute_sensitivity_grid(
+    portfolio: Portfolio,
+    properties: List[Property],
+    data: SensitivityGridRequest,
+    session: Session,
+    cancel: Optional[CancelToken] = None,
+) -> SensitivityGridResponse:
+    """
+    Evaluate a sensitivity grid (synchronous; runs in the threadpool).
+    
+    Loads the portfolio's data once, runs one restricted engine pass per axis
+    value (see utils/sensitivity.py) and combines them into the grid.
+    """
+    current_year = datetime.now().year
+    years = data.years
+    property_data = _load_portfolio_inputs(properties, session, ALL_PIPELINES - {"depreciation"})
+    
+    values = [
+        [row.property_value for row in _axis_totals(
+            properties, property_data, years, frozenset({"value"}), asset_growth_override=asset, cancel=cancel,
+        )]
+        for asset in data.asset_growth_overrides
+    ]
+    debts = [
+        [row.total_debt for row in _axis_totals(
+            properties, property_data, years, frozenset({"debt"}), interest_rate_offset=offset, cancel=cancel,
+        )]
+        for offset in data.interest_rate_offsets
+    ]
+    # Cashflow is combined per property before rounding, as the projection does
+    repayments = [
+        _cashflow_components(properties, property_data, years, "repayments", interest_rate_offset=offset, cancel=cancel)
+        for offset in data.interest_rate_offsets
+    ]
+    expenses = [
+        _cashflow_components(properties, property_data, years, "expenses", expense_growth_override=growth, cancel=cancel)
+        for growth in data.expense_growth_overrides
+    ]
+    rent = _cashflow_components(properties, property_data, years, "rent", cancel=cancel)
+    
+    cells = [
+        SensitivityCell(
+            interest_rate_offset=data.interest_rate_offsets[r],
+            expense_growth_override=data.expense_growth_overrides[e],
+            asset_growth_override=data.asset_growth_overrides[a],
+            **outcomes,
+        )
+        for r, e, a, outcomes in evaluate_grid(
+            list(range(current_year, current_year + years + 1)), values, debts, repayments, expenses, rent,
+        )
+    ]
+    return SensitivityGridResponse(
+        portfolio_id=portfolio.id,
+        portfolio_name=portfolio.name,
+        start_year=current_year,
+        end_year=current_year + years,
+        interest_rate_offsets=data.interest_rate_offsets,
+        expense_growth_overrides=data.expense_growth_overrides,
+        asset_growth_overrides=data.asset_growth_overrides,
+        cells=cells,
+    )
+
+
+@router.post(
+    "/portfolio/{portfolio_id}/sensitivity",
+    response_model=SensitivityGridResponse,
+    dependencies=[Depends(heavy_request)],
+)
+async def get_sensitivity_grid(
+    portfolio_id: str,
+    data: SensitivityGridRequest,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+    request: Request = None,
+):
+    """
+    Evaluate stress tests for every combination of override values in one request.
+    
+    Each cell holds the portfolio outcome GET /projections/portfolio/{id}
+    would give for that combination: final-year equity, the lowest yearly net
+    cashflow and the highest LVR (with the years they occur). Each axis value
+    runs only the engine pipeline it affects, so a 5 × 5 grid needs twelve
+    partial passes over data loaded once instead of 25 full projections.
+    
+    Args:
+        portfolio_id: Portfolio ID
+        data: Horizon and the values to try on each axis (up to 11 each)
+    
+    Returns:
+        SensitivityGridResponse; cells ordered interest rate → expense growth → asset growth
+    """
+    _validate_sensitivity_axes(data)
+    
+    # Verify portfolio access
+    portfolio_stmt = select(Portfolio).where(
+        Portfolio.id == portfolio_id,
+        Portfolio.user_id == current_user.id
+    )
+    portfolio = session.exec(portfolio_stmt).first()
+    
+    if not portfolio:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Portfolio not found or you don't have access"
+        )
+    
+    # Get all properties in portfolio
+    properties_stmt = select(Property).where(
+        Property.portfolio_id == portfolio_id,
+        Property.user_id == current_user.id  # CRITICAL: Data isolation
+    )
+    properties = session.exec(properties_stmt).all()
+    
+    if not properties:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No properties found in this portfolio"
+        )
+    
+    # Charge for the engine passes actually run (one per axis value, plus rent)
+    passes = (
+        len(data.interest_rate_offsets) + len(data.expense_growth_overrides)
+        + len(data.asset_growth_overrides) + 1
+    )
+    await charge_cost(current_user, "projections.sensitivity", sensitivity_cost(len(properties), data.years, passes))
+    
+    async with cancel_scope(request) as token:
+        try:
+            return await run_in_threadpool(_compute_sensitivity_grid, portfolio, properties, data, session, token)
+        except OperationCancelled as e:
+            raise cancelled_error(e)
+
+
+def _compute_tornado(
+    portfolio: Portfolio,
+    properties: List[Property],
+    years: int,
+    metric: str,
+    session: Session,
+    cancel: Optional[CancelToken] = None,
+) -> TornadoResponse:
+    """
+    Tornado analysis for every property and the portfolio (synchronous; runs in the threadpool).
+    
+    Properties are projected independently, so the portfolio outcome with an
+    input moved on every property is the sum of the property outcomes.
+    Raises OperationCancelled once the cancel token is cancelled.
+    """
+    current_year = datetime.now().year
+    property_data = _load_portfolio_inputs(properties, session, TORNADO_METRICS[metric])
+    generate = partial(_generate_property_projections, cancel=cancel)
+    
+    portfolio_baseline = Decimal("0")
+    portfolio_bars = {name: (Decimal("0"), Decimal("0")) for name in TORNADO_INPUTS}
+    property_results = []
+    for property_obj in properties:
+        if cancel is not None:
+            cancel.check()
+        baseline, bars = property_tornado(
+            property_obj, property_data[property_obj.id], years, metric, current_year, generate,
+        )
+        portfolio_baseline += baseline
+        for name, (low, high) in bars.items():
+            total_low, total_high = portfolio_bars[name]
+            portfolio_bars[name] = (total_low + low, total_high + high)
+        property_results.append(PropertyTornado(
+            property_id=property_obj.id,
+            property_address=property_obj.address,
+            baseline=baseline,
+            bars=[TornadoBar(**bar) for bar in rank_bars(baseline, bars)],
+        ))
+    
+    return TornadoResponse(
+        portfolio_id=portfolio.id,
+        portfolio_name=portfolio.name,
+        metric=metric,
+        start_year=current_year,
+        end_year=current_year + years,
+        portfolio=TornadoAnalysis(
+            baseline=portfolio_baseline,
+            bars=[TornadoBar(**bar) for bar in rank_bars(portfolio_baseline, portfolio_bars)],
+        ),
+        properties=property_results,
+    )
+
+
+@router.get(
+    "/portfolio/{portfolio_id}/tornado",
+    response_model=TornadoResponse,
+    dependencies=[Depends(heavy_request)],
+)
+async def get_tornado_analysis(
+    portfolio_id: str,
+    years: int = 10,
+    metric: str = "equity",
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+    request: Request = None,
+):
+    """
+    Rank which assumptions move a portfolio's outcome the most (tornado chart).
+    
+    Each input — capital growth, rent growth, vacancy weeks, interest rate,
+    expense growth and offset balance — is moved down and up by a fixed step
+    (see utils/sensitivity.py TORNADO_INPUTS) with everything else at
+    baseline. A perturbation re-runs only the engine pipelines that input
+    feeds, over data loaded once, instead of a full projection per bar.
+    
+    Args:
+        portfolio_id: Portfolio ID
+        years: Horizon (default 10, max 50)
+        metric: "equity" (final-year equity, default), "cumulative_cashflow"
+            (net cashflow summed over the horizon) or "net_position" (both);
+            inputs that cannot affect the metric get zero-width bars
+    
+    Returns:
+        TornadoResponse with ranked bars for the portfolio and each property
+    """
+    if years < 1 or years > 50:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Years must be between 1 and 50"
+        )
+    if metric not in TORNADO_METRICS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid metric. Must be one of: {', '.join(TORNADO_METRICS)}"
+        )
+    
+    # Verify portfolio access
+    portfolio_stmt = select(Portfolio).where(
+        Portfolio.id == portfolio_id,
+        Portfolio.user_id == current_user.id
+    )
+    portfolio = session.exec(portfolio_stmt).first()
+    
+    if not portfolio:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Portfolio not found or you don't have access"
+        )
+    
+    # Get all properties in portfolio
+    properties_stmt = select(Property).where(
+        Property.portfolio_id == portfolio_id,
+        Property.user_id == current_user.id  # CRITICAL: Data isolation
+    )
+    properties = session.exec(properties_stmt).all()
+    
+    if not properties:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No properties found in this portfolio"
+        )
+    
+    await charge_cost(current_user, "projections.tornado", sensitivity_cost(len(properties), years, tornado_passes(metric)))
+    
+    async with cancel_scope(request) as token:
+        try:
+            return await run_in_threadpool(_compute_tornado, portfolio, properties, years, metric, session, token)
+        except OperationCancelled as e:
+            raise cancelled_error(e)
+
+
+@router.post(
+    "/{property_id}/goal-seek",
+    response_model=GoalSeekResponse,
+    dependencies=[Depends(heavy_request)],
+)
+async def goal_seek_property(
+    property_id: str,
+    data: GoalSeekRequest,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+    request: Request = None,
+):
+    """
+    Solve for the input that makes a property's projection hit a target.
+    
+    Goals (see utils/goal_seek.py):
+        break_even_rent: weekly rent at which net cashflow is zero in its weakest year
+        max_interest_rate: rate offset (pp) at which net cashflow turns negative
+        target_equity: capital growth (% p.a.) reaching target_equity in the final year
+    
+    The solver re-runs only the engine pipeline the goal varies, so a solve
+    costs a dozen or so cheap passes instead of repeated projection requests.
+    
+    Returns:
+        GoalSeekResponse; 422 if the goal has no solution within its search limits
+    """
+    if data.goal not in GOALS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid goal. Must be one of: {', '.join(GOALS)}"
+        )
+    if data.years < 1 or data.years > 50:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Years must be between 1 and 50"
+        )
+    if data.goal == "target_equity" and data.target_equity is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="target_equity is required for the target_equity goal"
+        )
+    
+    # Get property with data isolation
+    statement = select(Property).where(
+        Property.id == property_id,
+        Property.user_id == current_user.id  # CRITICAL: Data isolation filter
+    )
+    property_obj = session.exec(statement).first()
+    
+    if not property_obj:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Property not found or you don't have access"
+        )
+    
+    await charge_cost(current_user, "projections.goal_seek", projection_cost(1, data.years))
+    
+    spec = GOALS[data.goal]
+    property_data = await run_in_threadpool(_get_property_data, property_id, session, spec.varied | spec.fixed)
+    try:
+        async with cancel_scope(request) as token:
+            # Every objective evaluation checks the token once per projected year
+            result = await run_in_threadpool(
+                goal_seek,
+                data.goal,
+                property_obj,
+                property_data,
+                data.years,
+                partial(_generate_property_projections, cancel=token),
+                data.target_equity,
+                data.lower,
+                data.upper,
+            )
+    except OperationCancelled as e:
+        raise cancelled_error(e)
+    except SolverError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "message": "Goal cannot be reached within the search limits",
+                "lower": e.lower,
+                "upper": e.upper,
+            }
+        )
+    except GoalSeekError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    
+    current_year = datetime.now().year
+    return GoalSeekResponse(
+        property_id=property_id,
+        property_address=property_obj.address,
+        goal=data.goal,
+        start_year=current_year,
+        end_year=current_year + data.years,
+        **result,
+    )
+
+
+@router.get("/property/{property_id}/summary")
+async def get_property_projection_summary(
+    property_id: str,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+    request: Request = None,
+    response: Response = None,
+):
+    """
+    Get a quick summary of current property financial status.
+    
+    Returns current value, equity, LVR, and annual cashflow. Returns 304 when
+    If-None-Match carries the current ETag.
+    """
+    # Get property with data isolation
+    statement = select(Property).where(
+        Property.id == property_id,
+        Property.user_id == current_user.id
+    )
+    property_obj = session.exec(statement).first()
+    
+    if not property_obj:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Property not found or you don't have access"
+        )
+    
+    current_year = datetime.now().year
+    version = await get_portfolio_version(property_obj.portfolio_id)
+    etag = make_etag(current_user.id, "projections.property_summary", property_id, version, current_year)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    # Fetch financial data
+    property_data = _get_property_data(property_id, session)
     
-    current_year = datetime.now().year
     base_value = to_decimal(property_obj.current_value or property_obj.purchase_price)
     
     # Calculate current equity
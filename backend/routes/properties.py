@@ -15,6 +15,7 @@ from models.portfolio import Portfolio
 from models.user import User
 from utils.database_sql import get_session
 from utils.auth import get_current_user
+from utils.data_version import bump_portfolio_version
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/properties", tags=["properties"])
@@ -112,6 +113,7 @@ async def create_property(
     session.add(property_obj)
     session.commit()
     session.refresh(property_obj)
+    await bump_portfolio_version(property_obj.portfolio_id, current_user.id)
     
     logger.info(f"Property created: {property_obj.id} for user: {current_user.id}")
     return property_obj
@@ -179,6 +181,7 @@ async def update_property(
     session.add(property_obj)
     session.commit()
     session.refresh(property_obj)
+    await bump_portfolio_version(property_obj.portfolio_id, current_user.id)
     
     logger.info(f"Property updated: {property_id} by user: {current_user.id}")
     return property_obj
@@ -209,8 +212,10 @@ async def delete_property(
         )
     
     # Delete property
+    portfolio_id = property_obj.portfolio_id
     session.delete(property_obj)
     session.commit()
+    await bump_portfolio_version(portfolio_id, current_user.id)
     
     logger.info(f"Property deleted: {property_id} by user: {current_user.id}")
     return Response(status_code=204)
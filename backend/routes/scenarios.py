@@ -26,6 +26,9 @@ from models.financials import (
 from models.user import User
 from utils.database_sql import get_session
 from utils.auth import get_current_user
+from utils.admission import heavy_request
+from utils.cost_limiter import charge_cost, scenario_copy_cost
+from utils.data_version import bump_portfolio_version
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/scenarios", tags=["scenarios"])
@@ -63,6 +66,34 @@ async def check_scenario_limit(user: User, session: Session) -> None:
         )
 
 
+def _count_copy_rows(source_portfolio_id: str, user_id: str, session: Session) -> int:
+    """
+    Count the rows a deep copy of the portfolio will write.
+    Used to size the request's compute cost before doing the copy.
+    """
+    property_ids = select(Property.id).where(
+        Property.portfolio_id == source_portfolio_id,
+        Property.user_id == user_id,
+    )
+    
+    total = 1  # the portfolio row itself
+    total += session.exec(
+        select(func.count()).select_from(Property).where(
+            Property.portfolio_id == source_portfolio_id,
+            Property.user_id == user_id,
+        )
+    ).one()
+    for model in (Loan, RentalIncome, ExpenseLog, PropertyValuation, GrowthRatePeriod):
+        total += session.exec(
+            select(func.count()).select_from(model).where(model.property_id.in_(property_ids))
+        ).one()
+    for model in (Asset, Liability, IncomeSource, Expense):
+        total += session.exec(
+            select(func.count()).select_from(model).where(model.portfolio_id == source_portfolio_id)
+        ).one()
+    return total
+
+
 async def deep_copy_portfolio(
     source_portfolio: Portfolio,
     scenario_name: str,
@@ -311,7 +342,11 @@ async def deep_copy_portfolio(
 # API ENDPOINTS
 # ============================================================================
 
-@router.post("/create/{portfolio_id}", response_model=PortfolioResponse)
+@router.post(
+    "/create/{portfolio_id}",
+    response_model=PortfolioResponse,
+    dependencies=[Depends(heavy_request)],
+)
 async def create_scenario(
     portfolio_id: str,
     scenario_name: str,
@@ -345,10 +380,15 @@ async def create_scenario(
             detail="Portfolio not found or you don't have access"
         )
     
+    # Charge compute cost (rows to copy) against the user's tier budget
+    copy_rows = _count_copy_rows(source.id, current_user.id, session)
+    await charge_cost(current_user, "scenarios.create", scenario_copy_cost(copy_rows))
+    
     # Create deep copy
     new_scenario = await deep_copy_portfolio(
         source, scenario_name, scenario_description, current_user, session
     )
+    await bump_portfolio_version(new_scenario.id, current_user.id)
     
     return new_scenario
 
@@ -449,6 +489,7 @@ async def update_scenario(
     session.add(scenario)
     session.commit()
     session.refresh(scenario)
+    await bump_portfolio_version(scenario.id, current_user.id)
     
     return scenario
 
@@ -506,6 +547,7 @@ async def delete_scenario(
     # Delete scenario
     session.delete(scenario)
     session.commit()
+    await bump_portfolio_version(scenario_id, current_user.id)
     
     logger.info(f"Deleted scenario {scenario_id}")
     return Response(status_code=204)
@@ -22,6 +22,7 @@ from models.financials import (
 from utils.database_sql import get_session
 from utils.auth import get_current_user
 from utils.property_access import verify_property_access
+from utils.data_version import bump_portfolio_version
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/valuations", tags=["valuations"])
@@ -67,6 +68,7 @@ async def create_valuation(
     
     session.commit()
     session.refresh(valuation)
+    await bump_portfolio_version(property_obj.portfolio_id, current_user.id)
     
     logger.info(f"Valuation created: {valuation.id} for property: {data.property_id}")
     return valuation
@@ -138,11 +140,13 @@ async def delete_valuation(
         )
     
     # Verify property access
-    verify_property_access(valuation.property_id, current_user.id, session)
+    property_obj = verify_property_access(valuation.property_id, current_user.id, session)
+    portfolio_id = property_obj.portfolio_id
     
     # Delete valuation
     session.delete(valuation)
     session.commit()
+    await bump_portfolio_version(portfolio_id, current_user.id)
 
     logger.info(f"Valuation deleted: {valuation_id}")
     return Response(status_code=204)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for large responses.
+
+Compares, per response:
+  stdlib   — FastAPI's default path (dump → validate → serialize) + json.dumps
+  orjson   — the same FastAPI path rendered by DecimalJSONResponse (app default)
+  trusted  — TrustedModelRoute: model rendered directly by DecimalJSONResponse
+
+Cases:
+  portfolio projection — 30 properties × 50 years (GET /projections/portfolio/{id})
+  property list        — 500 Property rows (GET /properties/portfolio/{id};
+                         table models, so no trusted path)
+
+Usage (from backend/):
+    python scripts/bench_serialization.py [--repeat 20]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+from datetime import date
+from decimal import Decimal
+from typing import List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from models.property import Property
+from models.financials import ProjectionYearData, PropertyProjectionResponse, PortfolioProjectionResponse
+from utils.json_response import DecimalJSONResponse, dumps
+
+
+def build_projection(properties: int = 30, years: int = 50) -> PortfolioProjectionResponse:
+    def row(year: int, scale: int) -> ProjectionYearData:
+        base = Decimal(750000 + scale * 1000) + Decimal(year) * Decimal("1234.5678")
+        return ProjectionYearData(
+            year=2026 + year,
+            property_value=base,
+            total_debt=base * Decimal("0.6"),
+            equity=base * Decimal("0.4"),
+            lvr=Decimal("60.00"),
+            rental_income=Decimal("31200.0000"),
+            expenses=Decimal("8123.4500"),
+            loan_repayments=Decimal("29876.1200"),
+            depreciation=Decimal("4500.0000"),
+            net_cashflow=Decimal("-6799.5700"),
+        )
+
+    return PortfolioProjectionResponse(
+        portfolio_id="pf_bench",
+        portfolio_name="Benchmark",
+        start_year=2026,
+        end_year=2026 + years,
+        properties=[
+            PropertyProjectionResponse(
+                property_id=f"prop_{i}",
+                property_address=f"{i} Bench St",
+                start_year=2026,
+                end_year=2026 + years,
+                projections=[row(y, i) for y in range(years + 1)],
+            )
+            for i in range(properties)
+        ],
+        totals=[row(y, 0) for y in range(years + 1)],
+    )
+
+
+def build_properties(count: int = 500) -> List[Property]:
+    return [
+        Property(
+            id=f"prop_{i}",
+            user_id="user_bench",
+            portfolio_id="pf_bench",
+            address=f"{i} Bench St",
+            suburb="Benchville",
+            state="NSW",
+            postcode="2000",
+            purchase_date=date(2018, 6, 1),
+            purchase_price=Decimal("600000.0000"),
+            current_value=Decimal("750000.0000"),
+        )
+        for i in range(count)
+    ]
+
+
+def fastapi_path(field, content, response_class) -> bytes:
+    serialized = asyncio.get_event_loop().run_until_complete(
+        serialize_response(field=field, response_content=content, is_coroutine=True)
+    )
+    return response_class(serialized).body
+
+
+def timed(label: str, fn, repeat: int) -> float:
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = fn()
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    print(f"  {label:<8} {elapsed:8.2f} ms   {len(body) / 1024:8.1f} KiB")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    projection = build_projection()
+    projection_field = create_response_field(name="projection", type_=PortfolioProjectionResponse)
+    print("Portfolio projection (30 properties × 50 years)")
+    baseline = timed("stdlib", lambda: fastapi_path(projection_field, projection, JSONResponse), args.repeat)
+    timed("orjson", lambda: fastapi_path(projection_field, projection, DecimalJSONResponse), args.repeat)
+    trusted = timed("trusted", lambda: dumps(projection), args.repeat)
+    print(f"  trusted speed-up: {baseline / trusted:.1f}×\n")
+
+    properties = build_properties()
+    list_field = create_response_field(name="properties", type_=List[Property])
+    print("Property list (500 rows)")
+    baseline = timed("stdlib", lambda: fastapi_path(list_field, properties, JSONResponse), args.repeat)
+    fast = timed("orjson", lambda: fastapi_path(list_field, properties, DecimalJSONResponse), args.repeat)
+    print(f"  orjson speed-up: {baseline / fast:.1f}×")
+
+
+if __name__ == "__main__":
+    main()
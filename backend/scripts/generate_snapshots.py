@@ -0,0 +1,76 @@
+"""
+Generate Net Worth Snapshots
+Writes one calculated net worth snapshot per actual portfolio for a day
+(utils/snapshots.py). The API server does this nightly; use this for cron
+deployments with SNAPSHOT_SCHEDULER_ENABLED=false, or to regenerate a day.
+
+With --rebuild-rollups it instead rebuilds the weekly/monthly/quarterly
+rollups (utils/snapshot_rollups.py) from the raw snapshots, e.g. for
+snapshots that existed before rollups did.
+
+Run with: python -m scripts.generate_snapshots [--date YYYY-MM-DD] [--chunk-size N]
+Or: python -m scripts.generate_snapshots --rebuild-rollups
+Or: python backend/scripts/generate_snapshots.py
+"""
+
+import sys
+import asyncio
+import argparse
+from datetime import date
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from sqlmodel import Session, select
+
+from models.net_worth import NetWorthSnapshot
+from utils.database_sql import engine
+from utils.snapshot_rollups import ROLLUP_COMPACTION_CHUNK_SIZE, rebuild_rollups
+from utils.snapshots import snapshot_scheduler
+
+
+def rebuild_all_rollups() -> int:
+    """Rebuild every portfolio's rollups, a chunk of portfolios per transaction"""
+    rewritten = 0
+    after = ""
+    while True:
+        with Session(engine) as session:
+            ids = list(session.exec(
+                select(NetWorthSnapshot.portfolio_id)
+                .where(NetWorthSnapshot.portfolio_id > after)
+                .group_by(NetWorthSnapshot.portfolio_id)
+                .order_by(NetWorthSnapshot.portfolio_id)
+                .limit(ROLLUP_COMPACTION_CHUNK_SIZE)
+            ).all())
+            if not ids:
+                return rewritten
+            rewritten += rebuild_rollups(session, ids)
+            session.commit()
+        after = ids[-1]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate net worth snapshots for every portfolio")
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="Snapshot date (default today, UTC)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Portfolios per transaction")
+    parser.add_argument("--rebuild-rollups", action="store_true", help="Rebuild rollups from raw snapshots instead")
+    args = parser.parse_args()
+
+    if args.rebuild_rollups:
+        print(f"✅ {rebuild_all_rollups()} rollups rebuilt")
+        return 0
+
+    # Re-generates completed days too; the claim still keeps two runs of one day apart
+    stats = asyncio.run(snapshot_scheduler.run(engine, args.date, force=True, chunk_size=args.chunk_size))
+    if stats is None:
+        print("❌ Snapshot run not started (another run is in progress) or failed; see the logs")
+        return 1
+    print(f"✅ {stats['snapshots']} snapshots written for {stats['portfolios']} portfolios "
+          f"on {stats['date']} in {stats['seconds']}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,6 +21,7 @@ import uuid
 from sqlmodel import Session, select
 from utils.database_sql import engine
 from utils.auth import hash_password
+from utils.snapshot_rollups import rebuild_rollups
 
 # Import all models
 from models.user import User
@@ -30,7 +31,7 @@ from models.income import IncomeSource
 from models.asset import Asset
 from models.liability import Liability
 from models.expense import Expense  # Portfolio-linked expense table
-from models.net_worth import NetWorthSnapshot  # Portfolio-linked net worth
+from models.net_worth import NetWorthSnapshot, NetWorthRollup  # Portfolio-linked net worth
 from models.plan import Plan  # Portfolio-linked financial plans
 from models.financials import (
     Loan, LoanType, LoanStructure, Frequency,
@@ -141,10 +142,12 @@ def clear_demo_data(session: Session):
             for exp in session.exec(select(Expense).where(Expense.portfolio_id == portfolio.id)).all():
                 session.delete(exp)
             
-            # Delete net worth snapshots (must be before portfolio due to FK)
-            from models.net_worth import NetWorthSnapshot
+            # Delete net worth snapshots and rollups (must be before portfolio due to FK)
+            from models.net_worth import NetWorthSnapshot, NetWorthRollup
             for snap in session.exec(select(NetWorthSnapshot).where(NetWorthSnapshot.portfolio_id == portfolio.id)).all():
                 session.delete(snap)
+            for rollup in session.exec(select(NetWorthRollup).where(NetWorthRollup.portfolio_id == portfolio.id)).all():
+                session.delete(rollup)
             
             session.delete(portfolio)
         
@@ -191,6 +194,8 @@ def clear_demo_data(session: Session):
                     session.delete(expense)
                 for networth in session.exec(select(NetWorthSnapshot).where(NetWorthSnapshot.portfolio_id == portfolio.id)).all():
                     session.delete(networth)
+                for rollup in session.exec(select(NetWorthRollup).where(NetWorthRollup.portfolio_id == portfolio.id)).all():
+                    session.delete(rollup)
                 for plan in session.exec(select(Plan).where(Plan.portfolio_id == portfolio.id)).all():
                     session.delete(plan)
                 session.delete(portfolio)
@@ -922,6 +927,8 @@ def create_net_worth_snapshots(session: Session, user: User, portfolio: Portfoli
         )
         session.add(snapshot)
     
+    session.flush()
+    rebuild_rollups(session, [portfolio.id])
     session.commit()
     print("✅ Created 6 historical snapshots")
 
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, APIRouter, Request, Response
+from fastapi import FastAPI, APIRouter, Depends, Request, Response
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.trustedhost import TrustedHostMiddleware
@@ -14,8 +14,17 @@ from pathlib import Path
 from contextlib import asynccontextmanager
 
 # Import New Utilities
-from utils.database_sql import create_db_and_tables, test_connection
+from utils.database_sql import create_db_and_tables, test_connection, engine
 from utils.sentry_config import init_sentry
+from utils.admission import get_admission_metrics
+from utils.single_flight import single_flight
+from utils.cache import get_cache_metrics
+from utils.redis_cache import start_invalidation_listener, stop_invalidation_listener
+from utils.jobs import job_runner
+from utils.lanes import get_lane_metrics, interactive_lane
+from utils.snapshots import SNAPSHOT_SCHEDULER_ENABLED, snapshot_scheduler
+from utils.json_response import DecimalJSONResponse
+from utils.auth import require_metrics_token
 
 # Import Routes (SQLModel versions)
 from routes.portfolios import router as portfolios_router
@@ -35,6 +44,9 @@ from routes.loans import router as loans_router
 from routes.valuations import router as valuations_router
 from routes.scenarios import router as scenarios_router
 
+# Background jobs (job kinds are registered by the route modules above)
+from routes.jobs import router as jobs_router
+
 # Clerk webhook ingestion
 from routes.clerk_webhooks import router as clerk_webhooks_router
 
@@ -69,15 +81,29 @@ async def lifespan(app: FastAPI):
     create_db_and_tables()
     logger.info("✅ Database tables verified/created")
 
+    # Listen for cache invalidations from other instances (no-op without Redis)
+    start_invalidation_listener()
+
+    # Background job workers; re-queues jobs left by a previous process
+    await job_runner.start(engine)
+
+    # Nightly net worth snapshots for every portfolio (one instance per day)
+    if SNAPSHOT_SCHEDULER_ENABLED:
+        await snapshot_scheduler.start(engine)
+
     yield
 
     logger.info("Shutting down...")
+    await snapshot_scheduler.stop()
+    await job_runner.stop()
+    await stop_invalidation_listener()
 
 app = FastAPI(
     title="PropEquityLab API",
     description="Property Investment Portfolio Management Platform",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=DecimalJSONResponse,
 )
 
 # Add rate limiter to app state
@@ -123,6 +149,26 @@ async def health_check():
         }
     }
 
+@api_router.get("/health/metrics", dependencies=[Depends(require_metrics_token)])
+async def health_metrics():
+    """
+    Runtime metrics for load-shedding components (internal: requires
+    `Authorization: Bearer <METRICS_TOKEN>`).
+    Reports admission control queue depth, wait times and rejection counts,
+    how many summary/projection requests were coalesced, local/shared cache
+    hit rates, background job queue depth and outcomes, per-lane
+    (interactive/batch) queue depth, latency and connection use, and the
+    nightly net worth snapshot schedule.
+    """
+    return {
+        "admission": get_admission_metrics(),
+        "lanes": get_lane_metrics(),
+        "single_flight": single_flight.snapshot(),
+        "caches": get_cache_metrics(),
+        "jobs": job_runner.snapshot(),
+        "snapshots": snapshot_scheduler.snapshot(),
+    }
+
 # Include all routers
 api_router.include_router(onboarding_router)
 api_router.include_router(dashboard_router)
@@ -141,6 +187,9 @@ api_router.include_router(loans_router)
 api_router.include_router(valuations_router)
 api_router.include_router(scenarios_router)
 
+# Background jobs
+api_router.include_router(jobs_router)
+
 # Clerk webhook ingestion
 api_router.include_router(clerk_webhooks_router)
 
@@ -156,6 +205,12 @@ app.add_middleware(
     allow_headers=["Authorization", "Content-Type"],
 )
 
+# Interactive lane metrics (in-flight requests and latency; batch work is measured by its lane)
+@app.middleware("http")
+async def track_interactive_lane(request: Request, call_next):
+    async with interactive_lane.track():
+        return await call_next(request)
+
 # Security Headers Middleware
 @app.middleware("http")
 async def add_security_headers(request: Request, call_next):
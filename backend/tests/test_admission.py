@@ -0,0 +1,229 @@
+"""
+Tests for admission control of CPU-heavy endpoints (utils/admission.py).
+
+Drives AdmissionController directly on an event loop; no HTTP layer involved.
+
+Covers:
+1. Per-user limit — extra concurrent requests from one user get 429
+2. Global limit — requests queue for a slot and are admitted when one frees
+3. Load shedding — full queue and queue timeout both give 503
+4. Metrics — admitted/rejected counters and slot bookkeeping, endpoint
+   access only with the internal metrics token
+"""
+
+import sys
+import os
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import utils.auth as auth
+from utils.admission import AdmissionController
+from utils.auth import require_metrics_token
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def make_controller(**overrides) -> AdmissionController:
+    options = dict(
+        name="test",
+        global_limit=2,
+        per_user_limit=1,
+        max_queue=1,
+        queue_timeout=0.2,
+    )
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+async def hold(controller: AdmissionController, user_id: str, release: asyncio.Event):
+    async with controller.admit(user_id):
+        await release.wait()
+
+
+# ---------------------------------------------------------------------------
+# 1. Per-user limit
+# ---------------------------------------------------------------------------
+
+class TestPerUserLimit:
+    def test_second_request_from_same_user_rejected_with_429(self):
+        async def scenario():
+            controller = make_controller()
+            release = asyncio.Event()
+            task = asyncio.ensure_future(hold(controller, "alice", release))
+            await asyncio.sleep(0)
+
+            with pytest.raises(HTTPException) as exc:
+                async with controller.admit("alice"):
+                    pass
+
+            release.set()
+            await task
+            return exc.value
+
+        error = run(scenario())
+        assert error.status_code == 429
+        assert "Retry-After" in error.headers
+
+    def test_other_user_still_admitted(self):
+        async def scenario():
+            controller = make_controller()
+            release = asyncio.Event()
+            task = asyncio.ensure_future(hold(controller, "alice", release))
+            await asyncio.sleep(0)
+
+            async with controller.admit("bob"):
+                admitted = True
+
+            release.set()
+            await task
+            return admitted
+
+        assert run(scenario()) is True
+
+    def test_user_slot_released_after_completion(self):
+        async def scenario():
+            controller = make_controller()
+            async with controller.admit("alice"):
+                pass
+            async with controller.admit("alice"):
+                pass
+            return controller.snapshot()
+
+        snapshot = run(scenario())
+        assert snapshot["admitted"] == 2
+        assert snapshot["rejected"]["per_user_limit"] == 0
+
+
+# ---------------------------------------------------------------------------
+# 2. Global limit
+# ---------------------------------------------------------------------------
+
+class TestGlobalLimit:
+    def test_queued_request_admitted_when_slot_frees(self):
+        async def scenario():
+            controller = make_controller(global_limit=1, queue_timeout=1.0)
+            release = asyncio.Event()
+            holder = asyncio.ensure_future(hold(controller, "alice", release))
+            await asyncio.sleep(0)
+
+            async def waiter():
+                async with controller.admit("bob"):
+                    return True
+
+            queued = asyncio.ensure_future(waiter())
+            await asyncio.sleep(0.05)
+            assert controller.snapshot()["waiting"] == 1
+
+            release.set()
+            await holder
+            return await queued
+
+        assert run(scenario()) is True
+
+
+# ---------------------------------------------------------------------------
+# 3. Load shedding
+# ---------------------------------------------------------------------------
+
+class TestLoadShedding:
+    def test_full_queue_rejected_with_503(self):
+        async def scenario():
+            controller = make_controller(global_limit=1, max_queue=1, queue_timeout=1.0)
+            release = asyncio.Event()
+            holder = asyncio.ensure_future(hold(controller, "alice", release))
+            await asyncio.sleep(0)
+            queued = asyncio.ensure_future(hold(controller, "bob", release))
+            await asyncio.sleep(0)
+
+            with pytest.raises(HTTPException) as exc:
+                async with controller.admit("carol"):
+                    pass
+
+            release.set()
+            await asyncio.gather(holder, queued)
+            return exc.value, controller.snapshot()
+
+        error, snapshot = run(scenario())
+        assert error.status_code == 503
+        assert snapshot["rejected"]["queue_full"] == 1
+
+    def test_queue_timeout_rejected_with_503(self):
+        async def scenario():
+            controller = make_controller(global_limit=1, queue_timeout=0.05)
+            release = asyncio.Event()
+            holder = asyncio.ensure_future(hold(controller, "alice", release))
+            await asyncio.sleep(0)
+
+            with pytest.raises(HTTPException) as exc:
+                async with controller.admit("bob"):
+                    pass
+
+            release.set()
+            await holder
+            return exc.value, controller.snapshot()
+
+        error, snapshot = run(scenario())
+        assert error.status_code == 503
+        assert snapshot["rejected"]["queue_timeout"] == 1
+        # Timed-out user does not keep a phantom slot
+        assert snapshot["waiting"] == 0
+
+
+# ---------------------------------------------------------------------------
+# 4. Metrics
+# ---------------------------------------------------------------------------
+
+class TestMetrics:
+    def test_snapshot_shape(self):
+        snapshot = make_controller().snapshot()
+        assert set(snapshot) == {"limits", "running", "waiting", "admitted", "rejected", "wait_seconds"}
+        assert set(snapshot["wait_seconds"]) == {"avg", "max", "p50", "p99"}
+
+    def test_exception_inside_block_releases_slots(self):
+        async def scenario():
+            controller = make_controller(global_limit=1)
+            with pytest.raises(ValueError):
+                async with controller.admit("alice"):
+                    raise ValueError("boom")
+            async with controller.admit("alice"):
+                pass
+            return controller.snapshot()
+
+        snapshot = run(scenario())
+        assert snapshot["running"] == 0
+        assert snapshot["admitted"] == 2
+
+
+def bearer(token: str) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+class TestMetricsAccess:
+    def test_matching_token_accepted(self):
+        with patch.object(auth, "METRICS_TOKEN", "s3cret"):
+            assert run(require_metrics_token(bearer("s3cret"))) is None
+
+    @pytest.mark.parametrize("credentials", [None, bearer("wrong"), bearer("")])
+    def test_missing_or_wrong_token_rejected(self, credentials):
+        with patch.object(auth, "METRICS_TOKEN", "s3cret"):
+            with pytest.raises(HTTPException) as exc:
+                run(require_metrics_token(credentials))
+        assert exc.value.status_code == 401
+
+    def test_unconfigured_token_disables_endpoint(self):
+        with patch.object(auth, "METRICS_TOKEN", None):
+            with pytest.raises(HTTPException) as exc:
+                run(require_metrics_token(bearer("anything")))
+        assert exc.value.status_code == 503
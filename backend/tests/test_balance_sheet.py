@@ -0,0 +1,251 @@
+"""
+Tests for the balance sheet projection engine (utils/balance_sheet.py) and its
+use in portfolio and household projections.
+
+Covers:
+1. Assets — compounding with growing contributions matches a year-by-year loop
+2. Liabilities — amortization, payoff month, minimum vs extra payments, rate offsets
+3. Portfolio projections — balance sheet included, omitted with ?fields=
+4. Household projections — non-property balances move over the horizon
+"""
+
+import sys
+import os
+import uuid
+import asyncio
+from decimal import Decimal
+from datetime import date
+
+import numpy as np
+import pytest
+from sqlmodel import SQLModel, Session, create_engine
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.user import User
+from models.portfolio import Portfolio
+from models.property import Property
+from models.asset import Asset
+from models.liability import Liability
+from routes.projections import get_household_projections, get_portfolio_projections
+from utils.balance_sheet import project_assets, project_liabilities, project_balance_sheet, to_currency
+from utils.cache import projection_cache
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def make_engine():
+    return create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+
+def make_user(tag: str = "") -> User:
+    uid = tag or uuid.uuid4().hex[:8]
+    return User(
+        id=f"user_{uid}",
+        email=f"{uid}@example.com",
+        first_name="Test",
+        last_name="User",
+    )
+
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture()
+def engine():
+    eng = make_engine()
+    SQLModel.metadata.create_all(eng)
+    yield eng
+    SQLModel.metadata.drop_all(eng)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    projection_cache.clear()
+    yield
+    projection_cache.clear()
+
+
+def asset(value: str, expected_return: str = "7.0", contributions: dict = None) -> Asset:
+    return Asset(user_id="u", portfolio_id="p", name="Asset", type="etf", current_value=Decimal(value),
+                 expected_return=Decimal(expected_return), contributions=contributions)
+
+
+def liability(balance: str, rate: str, payment: str, **kwargs) -> Liability:
+    return Liability(user_id="u", portfolio_id="p", name="Debt", type="personal_loan",
+                     original_amount=Decimal(balance), current_balance=Decimal(balance),
+                     interest_rate=Decimal(rate), minimum_payment=Decimal(payment), **kwargs)
+
+
+def stepped_asset(value: float, rate: float, contribution: float, growth: float, years: int) -> list:
+    values = [value]
+    for t in range(1, years + 1):
+        values.append(values[-1] * (1 + rate) + contribution * (1 + growth) ** (t - 1))
+    return values
+
+
+def stepped_liability(balance: float, annual_rate: float, payment: float, months: int) -> tuple:
+    """(year-end balances, total interest, payoff month or -1)"""
+    rate = annual_rate / 12
+    balances, total_interest, payoff = [balance], 0.0, -1
+    for month in range(1, months + 1):
+        interest = balance * rate
+        balance = max(balance + interest - payment, 0)
+        total_interest += interest
+        if balance <= 0.005 and payoff < 0:
+            payoff = month
+        if month % 12 == 0:
+            balances.append(balance)
+    return balances, total_interest, payoff
+
+
+def _seed_portfolio(engine, user: User) -> str:
+    portfolio_id = str(uuid.uuid4())
+    with Session(engine) as s:
+        s.add(Portfolio(id=portfolio_id, user_id=user.id, name="Balance Sheet", type="actual"))
+        s.add(Property(
+            id=str(uuid.uuid4()),
+            user_id=user.id,
+            portfolio_id=portfolio_id,
+            address="1 Ledger Lane",
+            suburb="Testville",
+            state="NSW",
+            postcode="2000",
+            purchase_date=date(2018, 6, 1),
+            current_value=Decimal("750000"),
+            purchase_price=Decimal("600000"),
+        ))
+        s.add(Asset(user_id=user.id, portfolio_id=portfolio_id, name="Super", type="super",
+                    current_value=Decimal("100000"), expected_return=Decimal("8.0"),
+                    contributions={"amount": "1000", "frequency": "monthly", "growth_rate": "3"}))
+        s.add(Liability(user_id=user.id, portfolio_id=portfolio_id, name="Car", type="car_loan",
+                        original_amount=Decimal("20000"), current_balance=Decimal("20000"),
+                        interest_rate=Decimal("8.00"), minimum_payment=Decimal("500")))
+        s.commit()
+    return portfolio_id
+
+
+# ---------------------------------------------------------------------------
+# 1. Assets
+# ---------------------------------------------------------------------------
+
+class TestAssets:
+    def test_matches_year_by_year_compounding(self):
+        projection = project_assets([
+            asset("100000", "7.0", {"amount": "1000", "frequency": "monthly", "employer_contribution": "500", "growth_rate": "3"}),
+            asset("5000", "3.0", {"amount": "100", "frequency": "weekly", "growth_rate": "3"}),
+            asset("20000", "0"),
+        ], 10)
+        expected = [
+            stepped_asset(100000, 0.07, 18000, 0.03, 10),
+            stepped_asset(5000, 0.03, 5200, 0.03, 10),
+            [20000] * 11,
+        ]
+        assert np.allclose(projection.values, expected)
+
+    def test_returns_and_contributions_add_up(self):
+        projection = project_assets([asset("50000", "6.0", {"amount": "2000", "frequency": "annual", "growth_rate": "2"})], 5)
+        values, returns, contributions = projection
+        assert returns[0, 0] == 0 and contributions[0, 0] == 0
+        assert np.allclose(values[:, 1:], values[:, :-1] + returns[:, 1:] + contributions[:, 1:])
+
+    def test_no_assets(self):
+        assert project_assets([], 5).values.shape == (0, 6)
+
+
+# ---------------------------------------------------------------------------
+# 2. Liabilities
+# ---------------------------------------------------------------------------
+
+class TestLiabilities:
+    def test_matches_month_by_month_amortization(self):
+        projection = project_liabilities([liability("20000", "8.00", "500")], 5)
+        balances, total_interest, payoff = stepped_liability(20000, 0.08, 500, 60)
+        assert np.allclose(projection.balances[0], balances)
+        assert projection.interest[0].sum() == pytest.approx(total_interest)
+        assert projection.payments[0].sum() == pytest.approx(20000 + total_interest)
+        assert projection.payoff_months[0] == payoff
+
+    def test_extra_payment_only_outside_minimum_strategy(self):
+        minimum, aggressive = project_liabilities([
+            liability("20000", "8.00", "500", extra_payment=Decimal("500"), payoff_strategy="minimum"),
+            liability("20000", "8.00", "500", extra_payment=Decimal("500"), payoff_strategy="aggressive"),
+        ], 5).payoff_months
+        assert aggressive < minimum
+
+    def test_payment_frequency_converted_to_monthly(self):
+        weekly, monthly = project_liabilities([
+            liability("30000", "0", "100", payment_frequency="weekly"),
+            liability("30000", "0", str(Decimal("100") * 52 / 12)),
+        ], 5).balances
+        assert np.allclose(weekly, monthly)
+
+    def test_payment_below_interest_grows_balance(self):
+        projection = project_liabilities([liability("10000", "20.00", "50")], 3)
+        assert np.all(np.diff(projection.balances[0]) > 0)
+        assert projection.payoff_months[0] == -1
+
+    def test_rate_offset_applied_and_floored(self):
+        base, stressed = (project_liabilities([liability("20000", "1.00", "0")], 1, offset).balances[0, 1]
+                          for offset in (None, 2.0))
+        floored = project_liabilities([liability("20000", "1.00", "0")], 1, -5.0).balances[0, 1]
+        assert stressed > base
+        assert floored == 20000
+
+    def test_balance_sheet_totals(self):
+        projection = project_balance_sheet([asset("50000", "0")], [liability("10000", "0", "1000")], 1)
+        assert to_currency(projection.net_worth) == [Decimal("40000.00"), Decimal("50000.00")]
+
+
+# ---------------------------------------------------------------------------
+# 3. Portfolio projections
+# ---------------------------------------------------------------------------
+
+class TestPortfolioProjections:
+    def test_balance_sheet_included(self, engine):
+        user = make_user()
+        portfolio_id = _seed_portfolio(engine, user)
+        with Session(engine) as session:
+            result = run(get_portfolio_projections(portfolio_id=portfolio_id, years=5, current_user=user, session=session))
+
+        sheet = result.balance_sheet
+        assert len(sheet) == 6
+        assert sheet[0].other_assets == Decimal("100000.00")
+        assert sheet[0].other_liabilities == Decimal("20000.00")
+        assert sheet[1].other_assets == Decimal("120000.00")  # 8% growth + 12,000 contributions
+        assert sheet[5].other_liabilities == 0  # Car loan paid off within four years
+        for row, totals in zip(sheet, result.totals):
+            assert row.property_value == totals.property_value
+            assert row.net_worth == row.total_assets - row.total_liabilities
+
+    def test_omitted_with_fields(self, engine):
+        user = make_user()
+        portfolio_id = _seed_portfolio(engine, user)
+        with Session(engine) as session:
+            result = run(get_portfolio_projections(portfolio_id=portfolio_id, years=5, fields="equity",
+                                                   current_user=user, session=session))
+        assert result.balance_sheet is None
+
+
+# ---------------------------------------------------------------------------
+# 4. Household projections
+# ---------------------------------------------------------------------------
+
+class TestHouseholdProjections:
+    def test_matches_portfolio_balance_sheet(self, engine):
+        user = make_user()
+        portfolio_id = _seed_portfolio(engine, user)
+        with Session(engine) as session:
+            household = run(get_household_projections(years=5, current_user=user, session=session))
+            portfolio = run(get_portfolio_projections(portfolio_id=portfolio_id, years=5, current_user=user, session=session))
+
+        assert household.portfolios[0].balance_sheet == portfolio.balance_sheet
+        assert household.balance_sheet == portfolio.balance_sheet
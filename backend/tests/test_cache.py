@@ -0,0 +1,213 @@
+"""
+Tests for the projection result cache (utils/cache.py) and write-path invalidation.
+
+Covers:
+1. LRUCache — hits/misses, LRU eviction by weight, oversize entries skipped
+2. Projection caching — repeat requests are served from cache; a new engine
+   revision stops older results being addressed
+3. Invalidation — a write through a route bumps the data version and the next
+   request recomputes
+4. Isolation — cache entries are never shared across users
+"""
+
+import sys
+import os
+import uuid
+import asyncio
+from unittest.mock import patch
+from decimal import Decimal
+from datetime import date
+
+import pytest
+from sqlmodel import SQLModel, Session, create_engine
+from sqlalchemy.pool import StaticPool
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.user import User
+from models.portfolio import Portfolio
+from models.property import Property
+from models.financials import ValuationCreate
+from routes.projections import get_property_projections, get_portfolio_projections
+from routes.valuations import create_valuation
+from utils.cache import LRUCache, projection_cache
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def make_engine():
+    return create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+
+def make_user(tag: str = "") -> User:
+    uid = tag or uuid.uuid4().hex[:8]
+    return User(
+        id=f"user_{uid}",
+        email=f"{uid}@example.com",
+        first_name="Test",
+        last_name="User",
+    )
+
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture()
+def engine():
+    eng = make_engine()
+    SQLModel.metadata.create_all(eng)
+    yield eng
+    SQLModel.metadata.drop_all(eng)
+
+
+@pytest.fixture(autouse=True)
+def clear_projection_cache():
+    projection_cache.clear()
+    yield
+    projection_cache.clear()
+
+
+def _seed(engine, user: User) -> tuple:
+    portfolio_id = str(uuid.uuid4())
+    property_id = str(uuid.uuid4())
+    with Session(engine) as s:
+        s.add(Portfolio(id=portfolio_id, user_id=user.id, name="Cache Portfolio", type="actual"))
+        s.add(Property(
+            id=property_id,
+            user_id=user.id,
+            portfolio_id=portfolio_id,
+            address="1 Cache St",
+            suburb="Testville",
+            state="NSW",
+            postcode="2000",
+            purchase_date=date(2018, 6, 1),
+            current_value=Decimal("750000"),
+            purchase_price=Decimal("600000"),
+        ))
+        s.commit()
+    return portfolio_id, property_id
+
+
+# ---------------------------------------------------------------------------
+# 1. LRUCache
+# ---------------------------------------------------------------------------
+
+class TestLRUCache:
+    def test_hit_and_miss_counted(self):
+        cache = LRUCache("t", max_weight=10)
+        assert cache.get("a") is None
+        cache.put("a", 1)
+        assert cache.get("a") == 1
+        snapshot = cache.snapshot()
+        assert snapshot["hits"] == 1
+        assert snapshot["misses"] == 1
+        assert snapshot["hit_rate"] == 0.5
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache("t", max_weight=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.snapshot()["evictions"] == 1
+
+    def test_weight_bound_respected(self):
+        cache = LRUCache("t", max_weight=10, weigh=lambda v: len(v))
+        cache.put("a", "x" * 6)
+        cache.put("b", "x" * 6)
+        assert len(cache) == 1
+        assert cache.snapshot()["weight"] <= 10
+
+    def test_oversize_entry_not_cached(self):
+        cache = LRUCache("t", max_weight=3, weigh=lambda v: len(v))
+        cache.put("a", "x" * 4)
+        assert cache.get("a") is None
+
+
+# ---------------------------------------------------------------------------
+# 2. Projection caching
+# ---------------------------------------------------------------------------
+
+class TestProjectionCaching:
+    def test_repeat_property_request_served_from_cache(self, engine):
+        user = make_user()
+        _, property_id = _seed(engine, user)
+        with Session(engine) as session:
+            first = run(get_property_projections(property_id=property_id, years=5, current_user=user, session=session))
+            second = run(get_property_projections(property_id=property_id, years=5, current_user=user, session=session))
+        assert second is first
+
+    def test_different_params_not_shared(self, engine):
+        user = make_user()
+        _, property_id = _seed(engine, user)
+        with Session(engine) as session:
+            five = run(get_property_projections(property_id=property_id, years=5, current_user=user, session=session))
+            ten = run(get_property_projections(property_id=property_id, years=10, current_user=user, session=session))
+        assert len(five.projections) == 6
+        assert len(ten.projections) == 11
+
+    def test_repeat_portfolio_request_served_from_cache(self, engine):
+        user = make_user()
+        portfolio_id, _ = _seed(engine, user)
+        with Session(engine) as session:
+            first = run(get_portfolio_projections(portfolio_id=portfolio_id, years=5, current_user=user, session=session))
+            second = run(get_portfolio_projections(portfolio_id=portfolio_id, years=5, current_user=user, session=session))
+        assert second is first
+
+    def test_engine_revision_change_not_served_from_cache(self, engine):
+        user = make_user()
+        portfolio_id, _ = _seed(engine, user)
+        with Session(engine) as session:
+            first = run(get_portfolio_projections(portfolio_id=portfolio_id, years=5, current_user=user, session=session))
+            with patch("utils.cache.PROJECTION_ENGINE_REVISION", "next"):
+                second = run(get_portfolio_projections(portfolio_id=portfolio_id, years=5, current_user=user, session=session))
+        assert second is not first
+        assert second == first
+
+
+# ---------------------------------------------------------------------------
+# 3. Invalidation
+# ---------------------------------------------------------------------------
+
+class TestInvalidation:
+    def test_valuation_write_invalidates_projections(self, engine):
+        user = make_user()
+        portfolio_id, property_id = _seed(engine, user)
+        with Session(engine) as session:
+            before = run(get_portfolio_projections(portfolio_id=portfolio_id, years=5, current_user=user, session=session))
+            run(create_valuation(
+                data=ValuationCreate(property_id=property_id, valuation_date=date.today(), value=Decimal("900000")),
+                current_user=user,
+                session=session,
+            ))
+            after = run(get_portfolio_projections(portfolio_id=portfolio_id, years=5, current_user=user, session=session))
+
+        assert after is not before
+        assert after.totals[0].property_value == Decimal("900000")
+
+
+# ---------------------------------------------------------------------------
+# 4. Isolation
+# ---------------------------------------------------------------------------
+
+class TestIsolation:
+    def test_other_user_does_not_hit_cached_entry(self, engine):
+        owner = make_user()
+        intruder = make_user()
+        _, property_id = _seed(engine, owner)
+        with Session(engine) as session:
+            run(get_property_projections(property_id=property_id, years=5, current_user=owner, session=session))
+            with pytest.raises(HTTPException) as exc:
+                run(get_property_projections(property_id=property_id, years=5, current_user=intruder, session=session))
+        assert exc.value.status_code == 404
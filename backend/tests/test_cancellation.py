@@ -0,0 +1,429 @@
+"""
+Tests for cooperative cancellation (utils/cancellation.py).
+
+Covers:
+1. Tokens — explicit cancellation, deadlines, shared tokens
+2. cancel_scope — client disconnects and handler cancellation cancel the token
+3. Calculation loops — stop at the next check instead of running to completion
+4. Single-flight — a shared computation stops only when every caller gives up
+5. Endpoints — abandoned requests raise 499, expired deadlines 503 (portfolio,
+   property, tornado and goal-seek projections, plan batches)
+"""
+
+import sys
+import os
+import time
+import uuid
+import asyncio
+import threading
+from decimal import Decimal
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from sqlmodel import SQLModel, Session, create_engine, select
+from sqlmodel.pool import StaticPool
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.user import User
+from models.portfolio import Portfolio
+from models.property import Property
+from models.plan import Plan
+from models.asset import Asset
+from models.financials import Loan, LoanType, LoanStructure, Frequency, RentalIncome
+import routes.projections as projections
+import utils.cancellation as cancellation
+from routes.plans import PlanBatchRequest, get_portfolio_plan_projections
+from routes.projections import (
+    _generate_property_projections,
+    get_portfolio_projections,
+    get_property_projections,
+    get_tornado_analysis,
+    goal_seek_property,
+)
+from models.financials import GoalSeekRequest
+from utils.cache import projection_cache
+from utils.calculations import generate_portfolio_projections
+from utils.cancellation import CancelToken, OperationCancelled, SharedCancelToken, cancel_scope
+from utils.single_flight import SingleFlight
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def make_user(tag: str = "") -> User:
+    uid = tag or uuid.uuid4().hex[:8]
+    return User(
+        id=f"user_{uid}",
+        email=f"{uid}@example.com",
+        first_name="Test",
+        last_name="User",
+    )
+
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture()
+def engine():
+    eng = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(eng)
+    yield eng
+    SQLModel.metadata.drop_all(eng)
+
+
+@pytest.fixture(autouse=True)
+def clear_projection_cache():
+    projection_cache.clear()
+    yield
+    projection_cache.clear()
+
+
+class FakeRequest:
+    """Just enough of a Request for cancel_scope and the ETag helpers"""
+
+    def __init__(self, disconnected: bool = False):
+        self.headers = {}
+        self.disconnected = disconnected
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnected
+
+
+class CountdownToken(CancelToken):
+    """Token that cancels itself after a number of checks"""
+
+    def __init__(self, checks: int):
+        super().__init__()
+        self.allowed = checks
+        self.checks = 0
+
+    def check(self) -> None:
+        self.checks += 1
+        if self.checks > self.allowed:
+            self.cancel("disconnected")
+        super().check()
+
+
+def _seed(engine, user: User) -> str:
+    """Portfolio with one tenanted, mortgaged property and a plan; returns the portfolio ID"""
+    portfolio_id = str(uuid.uuid4())
+    property_id = str(uuid.uuid4())
+    with Session(engine) as s:
+        s.add(Portfolio(id=portfolio_id, user_id=user.id, name="Cancel Portfolio", type="actual"))
+        s.add(Property(
+            id=property_id,
+            user_id=user.id,
+            portfolio_id=portfolio_id,
+            address="1 Abandon St",
+            suburb="Testville",
+            state="NSW",
+            postcode="2000",
+            purchase_date=date(2018, 6, 1),
+            current_value=Decimal("750000"),
+            purchase_price=Decimal("600000"),
+        ))
+        s.add(Loan(
+            property_id=property_id,
+            lender_name="Test Bank",
+            loan_type=LoanType.PRINCIPAL_LOAN,
+            loan_structure=LoanStructure.INTEREST_ONLY,
+            original_amount=Decimal("500000"),
+            current_amount=Decimal("480000"),
+            interest_rate=Decimal("5.50"),
+            remaining_term_years=27,
+            repayment_frequency=Frequency.MONTHLY,
+        ))
+        s.add(RentalIncome(
+            property_id=property_id,
+            amount=Decimal("650"),
+            frequency=Frequency.WEEKLY,
+            start_date=date(2020, 1, 1),
+        ))
+        s.add(Asset(user_id=user.id, portfolio_id=portfolio_id, name="ETFs", type="etf", current_value=Decimal("250000")))
+        s.add(Plan(user_id=user.id, portfolio_id=portfolio_id, name="FIRE", type="fire", retirement_age=55))
+        s.commit()
+    return portfolio_id
+
+
+def _wait_for_cancel(cancel: CancelToken, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not cancel.cancelled and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+# ---------------------------------------------------------------------------
+# 1. Tokens
+# ---------------------------------------------------------------------------
+
+class TestCancelToken:
+    def test_cancel_sets_reason(self):
+        token = CancelToken()
+        assert not token.cancelled and token.reason is None
+        token.cancel("disconnected")
+        token.cancel("cancelled")  # First reason wins
+        assert token.cancelled
+        with pytest.raises(OperationCancelled) as exc:
+            token.check()
+        assert exc.value.reason == "disconnected"
+
+    def test_deadline_expires(self):
+        token = CancelToken(timeout=0.01)
+        token.check()
+        time.sleep(0.02)
+        assert token.cancelled
+        assert token.reason == "deadline"
+
+    def test_zero_timeout_has_no_deadline(self):
+        token = CancelToken(timeout=0)
+        time.sleep(0.01)
+        assert not token.cancelled
+
+    def test_shared_token_needs_every_caller(self):
+        first, second = CancelToken(), CancelToken()
+        shared = SharedCancelToken()
+        shared.join(first)
+        shared.join(second)
+
+        first.cancel("disconnected")
+        assert not shared.cancelled
+        second.cancel("disconnected")
+        assert shared.cancelled
+        assert shared.reason == "disconnected"
+
+    def test_shared_token_caller_without_token_never_gives_up(self):
+        first = CancelToken()
+        shared = SharedCancelToken()
+        shared.join(first)
+        shared.join(None)
+        first.cancel("disconnected")
+        assert not shared.cancelled
+
+    def test_shared_token_reports_deadline(self):
+        disconnected, expired = CancelToken(), CancelToken(timeout=0.001)
+        disconnected.cancel("disconnected")
+        shared = SharedCancelToken()
+        shared.join(disconnected)
+        shared.join(expired)
+        time.sleep(0.01)
+        assert shared.reason == "deadline"
+
+
+# ---------------------------------------------------------------------------
+# 2. cancel_scope
+# ---------------------------------------------------------------------------
+
+class TestCancelScope:
+    def test_disconnect_cancels_token(self):
+        request = FakeRequest()
+
+        async def scenario():
+            async with cancel_scope(request) as token:
+                await asyncio.sleep(0.01)
+                assert not token.cancelled
+                request.disconnected = True
+                await asyncio.sleep(0.05)
+                return token
+
+        with patch.object(cancellation, "DISCONNECT_POLL_SECONDS", 0.001):
+            token = run(scenario())
+        assert token.reason == "disconnected"
+
+    def test_without_request_only_deadline_applies(self):
+        async def scenario():
+            async with cancel_scope(None, timeout=0.01) as token:
+                await asyncio.sleep(0.02)
+                return token
+
+        assert run(scenario()).reason == "deadline"
+
+    def test_default_deadline_from_settings(self):
+        async def scenario():
+            async with cancel_scope(None) as token:
+                return token
+
+        with patch.object(cancellation, "REQUEST_DEADLINE_SECONDS", 0):
+            token = run(scenario())
+        time.sleep(0.001)
+        assert not token.cancelled
+
+    def test_handler_cancellation_cancels_token(self):
+        tokens = []
+
+        async def handler():
+            async with cancel_scope(None) as token:
+                tokens.append(token)
+                await asyncio.sleep(10)
+
+        async def scenario():
+            task = asyncio.ensure_future(handler())
+            await asyncio.sleep(0.01)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        run(scenario())
+        assert tokens[0].reason == "disconnected"
+
+
+# ---------------------------------------------------------------------------
+# 3. Calculation loops
+# ---------------------------------------------------------------------------
+
+class TestCalculationLoops:
+    PROPERTIES = [
+        {"property": {"current_value": Decimal("500000")}, "loans": [], "rental_incomes": [], "expenses": []},
+        {"property": {"current_value": Decimal("800000")}, "loans": [], "rental_incomes": [], "expenses": []},
+    ]
+
+    def test_portfolio_projection_stops_at_next_check(self):
+        token = CountdownToken(3)
+        with pytest.raises(OperationCancelled):
+            generate_portfolio_projections(self.PROPERTIES, 2025, 2034, cancel=token)
+        assert token.checks == 4  # Stopped in year two instead of after 20 property-years
+
+    def test_portfolio_projection_unaffected_without_cancellation(self):
+        plain = generate_portfolio_projections(self.PROPERTIES, 2025, 2034)
+        assert generate_portfolio_projections(self.PROPERTIES, 2025, 2034, cancel=CancelToken()) == plain
+
+    def test_property_projection_stops_at_next_check(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user)
+        with Session(engine) as session:
+            prop = session.exec(select(Property).where(Property.portfolio_id == portfolio_id)).one()
+            data = projections._get_property_data(prop.id, session)
+        token = CountdownToken(5)
+        with pytest.raises(OperationCancelled):
+            _generate_property_projections(prop, data, 50, cancel=token)
+        assert token.checks == 6
+
+
+# ---------------------------------------------------------------------------
+# 4. Single-flight
+# ---------------------------------------------------------------------------
+
+class TestSingleFlightCancellation:
+    @staticmethod
+    def _compute(release: threading.Event, cancel: CancelToken):
+        while not release.is_set():
+            cancel.check()
+            time.sleep(0.001)
+        return "done"
+
+    def test_one_caller_leaving_does_not_cancel_others(self):
+        flight = SingleFlight("test")
+        release = threading.Event()
+        leaving, staying = CancelToken(), CancelToken()
+
+        async def scenario():
+            first = asyncio.ensure_future(flight.do("k", self._compute, release, cancel=leaving))
+            await asyncio.sleep(0.01)
+            second = asyncio.ensure_future(flight.do("k", self._compute, release, cancel=staying))
+            await asyncio.sleep(0.01)
+            leaving.cancel("disconnected")
+            await asyncio.sleep(0.02)
+            release.set()
+            return await asyncio.gather(first, second)
+
+        assert run(scenario()) == ["done", "done"]
+        assert flight.snapshot()["abandoned"] == 0
+
+    def test_computation_stops_when_every_caller_leaves(self):
+        flight = SingleFlight("test")
+        release = threading.Event()
+        first_token, second_token = CancelToken(), CancelToken()
+
+        async def scenario():
+            calls = [
+                asyncio.ensure_future(flight.do("k", self._compute, release, cancel=token))
+                for token in (first_token, second_token)
+            ]
+            await asyncio.sleep(0.01)
+            first_token.cancel("disconnected")
+            second_token.cancel("disconnected")
+            return await asyncio.wait_for(asyncio.gather(*calls, return_exceptions=True), timeout=2)
+
+        results = run(scenario())
+        assert all(isinstance(r, OperationCancelled) for r in results)
+        snapshot = flight.snapshot()
+        assert snapshot["abandoned"] == 1
+        assert snapshot["inflight"] == 0
+
+
+# ---------------------------------------------------------------------------
+# 5. Endpoints
+# ---------------------------------------------------------------------------
+
+class TestEndpoints:
+    def test_portfolio_projection_abandoned_on_disconnect(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user)
+        original = projections._generate_property_projections
+
+        def slow_generate(*args, cancel=None):
+            _wait_for_cancel(cancel)
+            return original(*args, cancel=cancel)
+
+        with patch.object(projections, "_generate_property_projections", slow_generate), \
+                patch.object(cancellation, "DISCONNECT_POLL_SECONDS", 0.001):
+            with Session(engine) as session:
+                with pytest.raises(HTTPException) as exc:
+                    run(get_portfolio_projections(
+                        portfolio_id=portfolio_id, years=50, current_user=user, session=session,
+                        request=FakeRequest(disconnected=True),
+                    ))
+        assert exc.value.status_code == 499
+
+    def test_connected_request_gets_full_result(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user)
+        with Session(engine) as session:
+            watched = run(get_portfolio_projections(
+                portfolio_id=portfolio_id, years=50, current_user=user, session=session, request=FakeRequest(),
+            ))
+        projection_cache.clear()
+        with Session(engine) as session:
+            direct = run(get_portfolio_projections(portfolio_id=portfolio_id, years=50, current_user=user, session=session))
+        assert watched.model_dump() == direct.model_dump()
+
+    def test_plan_batch_deadline(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user)
+        with patch.object(cancellation, "REQUEST_DEADLINE_SECONDS", 1e-9):
+            with Session(engine) as session:
+                with pytest.raises(HTTPException) as exc:
+                    run(get_portfolio_plan_projections(
+                        portfolio_id=portfolio_id, data=PlanBatchRequest(), current_user=user, session=session,
+                    ))
+        assert exc.value.status_code == 503
+        assert exc.value.detail["error"] == "Calculation timed out"
+
+    @pytest.mark.parametrize("endpoint", ["property", "tornado", "goal_seek"])
+    def test_projection_deadline(self, engine, endpoint):
+        user = make_user()
+        portfolio_id = _seed(engine, user)
+        with Session(engine) as session:
+            property_id = session.exec(select(Property.id).where(Property.portfolio_id == portfolio_id)).first()
+            calls = {
+                "property": lambda: get_property_projections(
+                    property_id=property_id, years=50, current_user=user, session=session,
+                ),
+                "tornado": lambda: get_tornado_analysis(
+                    portfolio_id=portfolio_id, years=50, current_user=user, session=session,
+                ),
+                "goal_seek": lambda: goal_seek_property(
+                    property_id=property_id, data=GoalSeekRequest(goal="break_even_rent", years=50),
+                    current_user=user, session=session,
+                ),
+            }
+            with patch.object(cancellation, "REQUEST_DEADLINE_SECONDS", 1e-9):
+                with pytest.raises(HTTPException) as exc:
+                    run(calls[endpoint]())
+        assert exc.value.status_code == 503
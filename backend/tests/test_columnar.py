@@ -0,0 +1,177 @@
+"""
+Tests for the columnar projection format (?format=columnar, utils/columnar.py).
+
+Covers:
+1. Encoding — fixed-point integers, ROUND_HALF_UP
+2. Property and portfolio projections — one array per metric, values match
+   the default JSON format
+3. Negotiation — invalid formats rejected, format is part of the ETag
+"""
+
+import sys
+import os
+import json
+import uuid
+import asyncio
+from decimal import Decimal
+from datetime import date
+
+import pytest
+from sqlmodel import SQLModel, Session, create_engine
+from sqlalchemy.pool import StaticPool
+from fastapi import HTTPException, Response
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.user import User
+from models.portfolio import Portfolio
+from models.property import Property
+from routes.projections import get_property_projections, get_portfolio_projections
+from utils.cache import projection_cache
+from utils.columnar import PROJECTION_METRICS, to_fixed_point
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def make_engine():
+    return create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+
+def make_user(tag: str = "") -> User:
+    uid = tag or uuid.uuid4().hex[:8]
+    return User(
+        id=f"user_{uid}",
+        email=f"{uid}@example.com",
+        first_name="Test",
+        last_name="User",
+    )
+
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture()
+def engine():
+    eng = make_engine()
+    SQLModel.metadata.create_all(eng)
+    yield eng
+    SQLModel.metadata.drop_all(eng)
+
+
+@pytest.fixture(autouse=True)
+def clear_projection_cache():
+    projection_cache.clear()
+    yield
+    projection_cache.clear()
+
+
+def _seed(engine, user: User, count: int = 2) -> tuple:
+    portfolio_id = str(uuid.uuid4())
+    property_ids = [str(uuid.uuid4()) for _ in range(count)]
+    with Session(engine) as s:
+        s.add(Portfolio(id=portfolio_id, user_id=user.id, name="Columnar Portfolio", type="actual"))
+        for i, property_id in enumerate(property_ids):
+            s.add(Property(
+                id=property_id,
+                user_id=user.id,
+                portfolio_id=portfolio_id,
+                address=f"{i + 1} Column St",
+                suburb="Testville",
+                state="NSW",
+                postcode="2000",
+                purchase_date=date(2018, 6, 1),
+                current_value=Decimal("750000.125"),
+                purchase_price=Decimal("600000"),
+            ))
+        s.commit()
+    return portfolio_id, property_ids
+
+
+# ---------------------------------------------------------------------------
+# 1. Encoding
+# ---------------------------------------------------------------------------
+
+class TestFixedPoint:
+    def test_encodes_cents(self):
+        assert to_fixed_point([Decimal("1.23"), Decimal("-4"), Decimal("0")]) == [123, -400, 0]
+
+    def test_rounds_half_up(self):
+        assert to_fixed_point([Decimal("0.005"), Decimal("-0.005"), Decimal("0.0049")]) == [1, -1, 0]
+
+
+# ---------------------------------------------------------------------------
+# 2. Projections
+# ---------------------------------------------------------------------------
+
+class TestColumnarProjections:
+    def test_property_columns_match_json(self, engine):
+        user = make_user()
+        _, property_ids = _seed(engine, user, count=1)
+        with Session(engine) as session:
+            rows = run(get_property_projections(property_id=property_ids[0], years=5, current_user=user, session=session))
+            columnar = run(get_property_projections(property_id=property_ids[0], years=5, format="columnar",
+                                                    current_user=user, session=session))
+
+        payload = json.loads(columnar.body)
+        assert payload["scale"] == 2
+        assert payload["years"] == [row.year for row in rows.projections]
+        assert set(payload["columns"]) == set(PROJECTION_METRICS)
+        for metric in PROJECTION_METRICS:
+            assert payload["columns"][metric] == to_fixed_point([getattr(r, metric) for r in rows.projections])
+        assert payload["columns"]["property_value"][0] == 75000013
+
+    def test_portfolio_columns_and_totals(self, engine):
+        user = make_user()
+        portfolio_id, property_ids = _seed(engine, user, count=3)
+        with Session(engine) as session:
+            columnar = run(get_portfolio_projections(portfolio_id=portfolio_id, years=10, format="columnar",
+                                                     current_user=user, session=session))
+
+        payload = json.loads(columnar.body)
+        assert len(payload["years"]) == 11
+        assert {p["property_id"] for p in payload["properties"]} == set(property_ids)
+        assert all(len(p["columns"]["equity"]) == 11 for p in payload["properties"])
+        assert len(payload["totals"]["equity"]) == 11
+
+    def test_columnar_is_smaller_than_json(self, engine):
+        user = make_user()
+        portfolio_id, _ = _seed(engine, user, count=5)
+        with Session(engine) as session:
+            rows = run(get_portfolio_projections(portfolio_id=portfolio_id, years=50, current_user=user, session=session))
+            columnar = run(get_portfolio_projections(portfolio_id=portfolio_id, years=50, format="columnar",
+                                                     current_user=user, session=session))
+
+        assert len(columnar.body) * 2 < len(rows.model_dump_json())
+
+
+# ---------------------------------------------------------------------------
+# 3. Negotiation
+# ---------------------------------------------------------------------------
+
+class TestFormatNegotiation:
+    def test_unknown_format_rejected(self, engine):
+        user = make_user()
+        _, property_ids = _seed(engine, user, count=1)
+        with Session(engine) as session:
+            with pytest.raises(HTTPException) as exc:
+                run(get_property_projections(property_id=property_ids[0], format="xml", current_user=user, session=session))
+        assert exc.value.status_code == 400
+
+    def test_format_changes_etag(self, engine):
+        user = make_user()
+        _, property_ids = _seed(engine, user, count=1)
+        with Session(engine) as session:
+            json_response = Response()
+            run(get_property_projections(property_id=property_ids[0], years=5, current_user=user, session=session,
+                                         response=json_response))
+            columnar = run(get_property_projections(property_id=property_ids[0], years=5, format="columnar",
+                                                    current_user=user, session=session))
+
+        assert columnar.headers["ETag"] != json_response.headers["ETag"]
@@ -0,0 +1,167 @@
+"""
+Tests for the cost-weighted per-user rate limiter (utils/cost_limiter.py).
+
+Exercises the in-memory fallback path (no REDIS_URL configured in tests).
+
+Covers:
+1. Cost helpers — projection_cost / sensitivity_cost / scenario_copy_cost scale with work done
+2. Tier budgets — unknown tiers fall back to free, paid tiers get more
+3. Charging — budget is consumed per user and exhausting it raises 429
+4. Isolation — one user's spend does not affect another user's budget
+"""
+
+import sys
+import os
+import uuid
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.user import User
+from utils import cost_limiter
+from utils.cost_limiter import (
+    charge_cost,
+    get_tier_budget,
+    projection_cost,
+    scenario_copy_cost,
+    sensitivity_cost,
+    TIER_COST_BUDGETS,
+)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def make_user(tier: str = "free") -> User:
+    tag = uuid.uuid4().hex[:8]
+    return User(
+        id=f"user_{tag}",
+        email=f"{tag}@example.com",
+        first_name="Test",
+        last_name="User",
+        subscription_tier=tier,
+    )
+
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture(autouse=True)
+def memory_only(monkeypatch):
+    """Force the in-memory path and start each test with an empty store"""
+    monkeypatch.setattr(cost_limiter, "redis_client", None)
+    monkeypatch.setattr(cost_limiter, "ENABLE_RATE_LIMITING", True)
+    cost_limiter._memory_windows.clear()
+    yield
+    cost_limiter._memory_windows.clear()
+
+
+# ---------------------------------------------------------------------------
+# 1. Cost helpers
+# ---------------------------------------------------------------------------
+
+class TestCostHelpers:
+    def test_projection_cost_scales_with_properties_and_years(self):
+        assert projection_cost(1, 10) == 11
+        assert projection_cost(5, 30) == 155
+
+    def test_projection_cost_minimum_one_property(self):
+        assert projection_cost(0, 10) == 11
+
+    def test_sensitivity_cost_charges_four_passes_per_projection(self):
+        # 5 × 5 grid: 5 rate + 5 expense + 1 value + 1 rent passes
+        assert sensitivity_cost(2, 10, 12) == 3 * projection_cost(2, 10)
+        assert sensitivity_cost(2, 10, 5) == 2 * projection_cost(2, 10)
+        assert sensitivity_cost(2, 10, 1) == projection_cost(2, 10)
+
+    def test_scenario_copy_cost_minimum_one(self):
+        assert scenario_copy_cost(0) == 1
+        assert scenario_copy_cost(42) == 42
+
+
+# ---------------------------------------------------------------------------
+# 2. Tier budgets
+# ---------------------------------------------------------------------------
+
+class TestTierBudgets:
+    def test_unknown_tier_gets_free_budget(self):
+        assert get_tier_budget("unknown") == TIER_COST_BUDGETS["free"]
+        assert get_tier_budget(None) == TIER_COST_BUDGETS["free"]
+
+    def test_paid_tiers_get_larger_budgets(self):
+        assert get_tier_budget("pro") > get_tier_budget("free")
+        assert get_tier_budget("enterprise") > get_tier_budget("pro")
+
+
+# ---------------------------------------------------------------------------
+# 3. Charging
+# ---------------------------------------------------------------------------
+
+class TestChargeCost:
+    def test_charge_reduces_remaining(self):
+        user = make_user()
+        result = run(charge_cost(user, "projections.property", 11))
+        assert result["cost"] == 11
+        assert result["remaining"] == TIER_COST_BUDGETS["free"] - 11
+
+    def test_route_weight_applied(self):
+        user = make_user("pro")
+        result = run(charge_cost(user, "scenarios.create", 10))
+        assert result["cost"] == 50
+
+    def test_exhausted_budget_raises_429(self):
+        user = make_user()
+        budget = TIER_COST_BUDGETS["free"]
+        run(charge_cost(user, "projections.portfolio", budget))
+
+        with pytest.raises(HTTPException) as exc:
+            run(charge_cost(user, "projections.property", 1))
+
+        assert exc.value.status_code == 429
+        assert exc.value.detail["limit"] == budget
+        assert "Retry-After" in exc.value.headers
+
+    def test_rejected_request_does_not_consume_budget(self):
+        user = make_user()
+        budget = TIER_COST_BUDGETS["free"]
+        run(charge_cost(user, "projections.portfolio", budget - 5))
+
+        with pytest.raises(HTTPException):
+            run(charge_cost(user, "projections.property", 10))
+
+        # The smaller request still fits in what is left
+        result = run(charge_cost(user, "projections.property", 5))
+        assert result["remaining"] == 0
+
+    def test_single_request_larger_than_budget_is_capped(self):
+        user = make_user()
+        result = run(charge_cost(user, "projections.portfolio", 10 ** 9))
+        assert result["cost"] == TIER_COST_BUDGETS["free"]
+
+    def test_disabled_rate_limiting_never_raises(self, monkeypatch):
+        monkeypatch.setattr(cost_limiter, "ENABLE_RATE_LIMITING", False)
+        user = make_user()
+        for _ in range(5):
+            run(charge_cost(user, "projections.portfolio", TIER_COST_BUDGETS["free"]))
+
+
+# ---------------------------------------------------------------------------
+# 4. Isolation
+# ---------------------------------------------------------------------------
+
+class TestIsolation:
+    def test_budgets_are_per_user(self):
+        alice = make_user()
+        bob = make_user()
+        run(charge_cost(alice, "projections.portfolio", TIER_COST_BUDGETS["free"]))
+
+        with pytest.raises(HTTPException):
+            run(charge_cost(alice, "projections.property", 1))
+
+        result = run(charge_cost(bob, "projections.property", 1))
+        assert result["remaining"] == TIER_COST_BUDGETS["free"] - 1
@@ -0,0 +1,314 @@
+"""
+Tests for the debt payoff simulator (utils/debt_payoff.py) and
+POST /liabilities/payoff.
+
+Covers:
+1. Orders — avalanche by rate, snowball by balance, custom with avalanche fallback
+2. Simulation — matches a debt-by-debt monthly loop, rollover, offsets, baseline
+3. Endpoint — liabilities and property loans compared in one call, payoff dates,
+   validation, data isolation
+"""
+
+import sys
+import os
+import uuid
+import asyncio
+from decimal import Decimal
+from datetime import date
+
+import numpy as np
+import pytest
+from sqlmodel import SQLModel, Session, create_engine
+from sqlalchemy.pool import StaticPool
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.user import User
+from models.portfolio import Portfolio
+from models.property import Property
+from models.liability import Liability, DebtPayoffRequest
+from models.financials import Loan, LoanType, LoanStructure, Frequency
+from routes.liabilities import compare_payoff_strategies
+from utils.debt_payoff import Debt, DebtPayoffError, compare_strategies, payoff_order
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def make_engine():
+    return create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+
+def make_user(tag: str = "") -> User:
+    uid = tag or uuid.uuid4().hex[:8]
+    return User(
+        id=f"user_{uid}",
+        email=f"{uid}@example.com",
+        first_name="Test",
+        last_name="User",
+    )
+
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture()
+def engine():
+    eng = make_engine()
+    SQLModel.metadata.create_all(eng)
+    yield eng
+    SQLModel.metadata.drop_all(eng)
+
+
+DEBTS = [
+    Debt("card", 5000, 20.0, 150),
+    Debt("car", 15000, 8.0, 400),
+    Debt("personal", 3000, 12.0, 100),
+]
+
+
+def stepped_payoff(debts, order, surplus, rollover=True, months=600):
+    """Reference simulation: one debt at a time, one month at a time"""
+    balances = [d.balance for d in debts]
+    budget = sum(d.payment for d in debts) + surplus
+    interest_total, payoff = [0.0] * len(debts), [-1] * len(debts)
+    for month in range(1, months + 1):
+        if all(b <= 0.005 for b in balances):
+            break
+        due, paid = [], []
+        for i, debt in enumerate(debts):
+            interest = max(balances[i] - debt.offset_balance, 0) * debt.interest_rate / 1200
+            interest_total[i] += interest
+            due.append(balances[i] + interest)
+            paid.append(min(debt.payment, due[-1]))
+        extra = budget - sum(paid) if rollover else 0
+        for i in order:
+            amount = min(extra, due[i] - paid[i])
+            paid[i] += amount
+            extra -= amount
+        balances = [d - p for d, p in zip(due, paid)]
+        for i, balance in enumerate(balances):
+            if payoff[i] < 0 and balance <= 0.005:
+                payoff[i] = month
+    return payoff, interest_total
+
+
+def _seed(engine, user: User, type: str = "actual") -> str:
+    portfolio_id = str(uuid.uuid4())
+    with Session(engine) as s:
+        s.add(Portfolio(id=portfolio_id, user_id=user.id, name="Debts", type=type))
+        s.commit()
+    return portfolio_id
+
+
+def _add_liability(engine, user: User, portfolio_id: str, name: str, balance: str, rate: str, payment: str, **kwargs) -> str:
+    liability = Liability(user_id=user.id, portfolio_id=portfolio_id, name=name, type="personal_loan",
+                          original_amount=Decimal(balance), current_balance=Decimal(balance),
+                          interest_rate=Decimal(rate), minimum_payment=Decimal(payment), **kwargs)
+    with Session(engine) as s:
+        s.add(liability)
+        s.commit()
+        return f"liability:{liability.id}"
+
+
+def _add_loan(engine, user: User, portfolio_id: str, amount: str) -> str:
+    property_id = str(uuid.uuid4())
+    with Session(engine) as s:
+        s.add(Property(
+            id=property_id,
+            user_id=user.id,
+            portfolio_id=portfolio_id,
+            address="9 Mortgage Rd",
+            suburb="Testville",
+            state="NSW",
+            postcode="2000",
+            purchase_date=date(2018, 6, 1),
+            current_value=Decimal("750000"),
+            purchase_price=Decimal("600000"),
+        ))
+        loan = Loan(
+            property_id=property_id,
+            lender_name="Test Bank",
+            loan_type=LoanType.PRINCIPAL_LOAN,
+            loan_structure=LoanStructure.PRINCIPAL_AND_INTEREST,
+            original_amount=Decimal(amount),
+            current_amount=Decimal(amount),
+            interest_rate=Decimal("6.00"),
+            remaining_term_years=25,
+            repayment_frequency=Frequency.MONTHLY,
+        )
+        s.add(loan)
+        s.commit()
+        return f"loan:{loan.id}"
+
+
+def _payoff(engine, user: User, **kwargs):
+    with Session(engine) as session:
+        return run(compare_payoff_strategies(data=DebtPayoffRequest(**kwargs), current_user=user, session=session))
+
+
+# ---------------------------------------------------------------------------
+# 1. Orders
+# ---------------------------------------------------------------------------
+
+class TestOrders:
+    def test_avalanche_highest_rate_first(self):
+        assert [DEBTS[i].key for i in payoff_order(DEBTS, "avalanche")] == ["card", "personal", "car"]
+
+    def test_snowball_smallest_balance_first(self):
+        assert [DEBTS[i].key for i in payoff_order(DEBTS, "snowball")] == ["personal", "card", "car"]
+
+    def test_custom_unlisted_debts_follow_in_avalanche_order(self):
+        assert [DEBTS[i].key for i in payoff_order(DEBTS, "custom", ["car"])] == ["car", "card", "personal"]
+
+    def test_custom_errors(self):
+        with pytest.raises(DebtPayoffError):
+            payoff_order(DEBTS, "custom")
+        with pytest.raises(DebtPayoffError, match="nope"):
+            payoff_order(DEBTS, "custom", ["nope"])
+        with pytest.raises(DebtPayoffError):
+            payoff_order(DEBTS, "fastest")
+
+
+# ---------------------------------------------------------------------------
+# 2. Simulation
+# ---------------------------------------------------------------------------
+
+class TestSimulation:
+    def test_matches_monthly_loop_for_every_strategy(self):
+        outcomes = compare_strategies(DEBTS, 500, ["avalanche", "snowball", "custom"], ["car"])
+        for name, outcome in outcomes.items():
+            order = payoff_order(DEBTS, name, ["car"])
+            payoff, interest = stepped_payoff(DEBTS, order, 500, rollover=name != "minimum")
+            assert outcome.payoff_months.tolist() == payoff, name
+            assert np.allclose(outcome.interest, interest), name
+
+    def test_avalanche_never_pays_more_interest_than_snowball(self):
+        outcomes = compare_strategies(DEBTS, 500, ["avalanche", "snowball"])
+        assert list(outcomes) == ["minimum", "avalanche", "snowball"]
+        assert outcomes["avalanche"].interest.sum() <= outcomes["snowball"].interest.sum()
+        assert outcomes["minimum"].interest.sum() > outcomes["avalanche"].interest.sum()
+
+    def test_payoffs_roll_over_without_surplus(self):
+        outcomes = compare_strategies(DEBTS, 0, ["avalanche"])
+        assert outcomes["avalanche"].months_to_debt_free < outcomes["minimum"].months_to_debt_free
+
+    def test_payments_cover_balance_plus_interest(self):
+        outcome = compare_strategies(DEBTS, 250, ["snowball"])["snowball"]
+        assert np.allclose(outcome.paid, [d.balance for d in DEBTS] + outcome.interest)
+
+    def test_offset_balance_reduces_interest(self):
+        plain, offset = (
+            compare_strategies([Debt("loan", 100000, 6.0, 1000, offset)], 0, [])["minimum"].interest.sum()
+            for offset in (0.0, 50000.0)
+        )
+        assert offset < plain
+
+    def test_unpayable_debt_reported_as_not_paid_off(self):
+        outcome = compare_strategies([Debt("card", 10000, 20.0, 50)], 0, [], max_months=24)["minimum"]
+        assert outcome.payoff_months.tolist() == [-1]
+        assert outcome.months_to_debt_free is None
+
+
+# ---------------------------------------------------------------------------
+# 3. Endpoint
+# ---------------------------------------------------------------------------
+
+class TestEndpoint:
+    def test_liabilities_and_loans_compared(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user)
+        card = _add_liability(engine, user, portfolio_id, "Card", "5000", "20.00", "150")
+        car = _add_liability(engine, user, portfolio_id, "Car", "15000", "8.00", "400")
+        loan = _add_loan(engine, user, portfolio_id, "400000")
+
+        result = _payoff(engine, user, monthly_surplus=Decimal("1000"), strategies=["avalanche", "snowball"])
+
+        assert {d.key for d in result.debts} == {card, car, loan}
+        mortgage = next(d for d in result.debts if d.key == loan)
+        assert mortgage.name == "9 Mortgage Rd (Test Bank)"
+        assert mortgage.monthly_payment > 0
+        assert result.monthly_budget == sum(d.monthly_payment for d in result.debts) + 1000
+        assert list(result.strategies) == ["minimum", "avalanche", "snowball"]
+        avalanche = result.strategies["avalanche"]
+        assert avalanche.order == [card, car, loan]
+        assert avalanche.interest_saved > 0
+        assert result.strategies["minimum"].interest_saved == 0
+        assert avalanche.total_interest == sum(d.total_interest for d in avalanche.debts)
+
+    def test_payoff_dates_count_from_this_month(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user)
+        key = _add_liability(engine, user, portfolio_id, "Interest free", "1200", "0", "100",
+                             target_payoff_date=date(2000, 1, 1))
+
+        result = _payoff(engine, user)
+        payoff = result.strategies["minimum"].debts[0]
+        start = date.today().replace(day=1)
+        assert payoff.key == key
+        assert payoff.payoff_month == 12
+        assert payoff.payoff_date == date(start.year + 1, start.month, 1)
+        assert payoff.meets_target is False
+        assert result.strategies["minimum"].debt_free_date == payoff.payoff_date
+
+    def test_extra_payment_counts_as_regular_payment(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user)
+        _add_liability(engine, user, portfolio_id, "Car", "15000", "8.00", "400",
+                       extra_payment=Decimal("100"), payoff_strategy="aggressive")
+        assert _payoff(engine, user).debts[0].monthly_payment == Decimal("500.00")
+
+    def test_scenario_portfolios_and_loans_optional(self, engine):
+        user = make_user()
+        actual = _seed(engine, user)
+        scenario = _seed(engine, user, type="scenario")
+        card = _add_liability(engine, user, actual, "Card", "5000", "20.00", "150")
+        _add_liability(engine, user, scenario, "What if", "9000", "10.00", "200")
+        _add_loan(engine, user, actual, "400000")
+
+        result = _payoff(engine, user, include_property_loans=False)
+        assert [d.key for d in result.debts] == [card]
+
+    def test_single_portfolio(self, engine):
+        user = make_user()
+        first, second = _seed(engine, user), _seed(engine, user)
+        _add_liability(engine, user, first, "Card", "5000", "20.00", "150")
+        car = _add_liability(engine, user, second, "Car", "15000", "8.00", "400")
+        assert [d.key for d in _payoff(engine, user, portfolio_id=second).debts] == [car]
+
+    def test_validation_errors(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user)
+        _add_liability(engine, user, portfolio_id, "Card", "5000", "20.00", "150")
+        for kwargs in ({"strategies": ["custom"]}, {"strategies": ["custom"], "custom_order": ["liability:nope"]},
+                       {"strategies": ["fastest"]}, {"max_years": 0}):
+            with pytest.raises(HTTPException) as exc:
+                _payoff(engine, user, **kwargs)
+            assert exc.value.status_code == 400, kwargs
+
+    def test_no_debts_raises_404(self, engine):
+        user = make_user()
+        _seed(engine, user)
+        with pytest.raises(HTTPException) as exc:
+            _payoff(engine, user)
+        assert exc.value.status_code == 404
+
+    def test_other_users_debts_excluded(self, engine):
+        user_a, user_b = make_user("a"), make_user("b")
+        own = _seed(engine, user_a)
+        other = _seed(engine, user_b)
+        card = _add_liability(engine, user_a, own, "Card", "5000", "20.00", "150")
+        _add_liability(engine, user_b, other, "Theirs", "9000", "10.00", "200")
+        _add_loan(engine, user_b, other, "400000")
+
+        assert [d.key for d in _payoff(engine, user_a).debts] == [card]
+        with pytest.raises(HTTPException) as exc:
+            _payoff(engine, user_a, portfolio_id=other)
+        assert exc.value.status_code == 404
@@ -0,0 +1,273 @@
+"""
+Tests for ETag / If-None-Match conditional responses (utils/etag.py).
+
+Covers:
+1. Helpers — tag stability, If-None-Match parsing (lists, weak tags, *)
+2. Summaries — matching tag returns 304, a write changes the tag
+3. Projections — 304 is answered before cost is charged
+4. Net worth history — a new snapshot changes the tag
+5. Isolation — tags differ between users; ownership is checked before any tag
+"""
+
+import sys
+import os
+import uuid
+import asyncio
+from decimal import Decimal
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from sqlmodel import SQLModel, Session, create_engine
+from sqlalchemy.pool import StaticPool
+from starlette.requests import Request
+from fastapi import HTTPException, Response
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.user import User
+from models.portfolio import Portfolio
+from models.property import Property
+from models.net_worth import NetWorthSnapshot
+from models.financials import ValuationCreate
+from routes.portfolios import get_portfolio_summary
+from routes.projections import get_property_projections
+from routes.dashboard import get_dashboard_summary, get_net_worth_history
+from routes.valuations import create_valuation
+from utils.cache import projection_cache, summary_cache
+from utils.etag import make_etag, is_not_modified
+from utils.data_version import get_portfolio_version
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def make_engine():
+    return create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+
+def make_user(tag: str = "") -> User:
+    uid = tag or uuid.uuid4().hex[:8]
+    return User(
+        id=f"user_{uid}",
+        email=f"{uid}@example.com",
+        first_name="Test",
+        last_name="User",
+    )
+
+
+def make_request(if_none_match: str = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture()
+def engine():
+    eng = make_engine()
+    SQLModel.metadata.create_all(eng)
+    yield eng
+    SQLModel.metadata.drop_all(eng)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    projection_cache.clear()
+    summary_cache.clear()
+    yield
+    projection_cache.clear()
+    summary_cache.clear()
+
+
+def _seed(engine, user: User) -> tuple:
+    portfolio_id = str(uuid.uuid4())
+    property_id = str(uuid.uuid4())
+    with Session(engine) as s:
+        s.add(Portfolio(id=portfolio_id, user_id=user.id, name="ETag Portfolio", type="actual"))
+        s.add(Property(
+            id=property_id,
+            user_id=user.id,
+            portfolio_id=portfolio_id,
+            address="1 ETag St",
+            suburb="Testville",
+            state="NSW",
+            postcode="2000",
+            purchase_date=date(2018, 6, 1),
+            current_value=Decimal("750000"),
+            purchase_price=Decimal("600000"),
+        ))
+        s.commit()
+    return portfolio_id, property_id
+
+
+# ---------------------------------------------------------------------------
+# 1. Helpers
+# ---------------------------------------------------------------------------
+
+class TestHelpers:
+    def test_tag_is_stable_and_quoted(self):
+        assert make_etag("u", 1) == make_etag("u", 1)
+        assert make_etag("u", 1) != make_etag("u", 2)
+        assert make_etag("u", 1).startswith('"') and make_etag("u", 1).endswith('"')
+
+    def test_matches_tag_in_list_and_weak_form(self):
+        etag = make_etag("u", 1)
+        assert is_not_modified(make_request(f'"other", W/{etag}'), etag)
+        assert is_not_modified(make_request("*"), etag)
+
+    def test_no_header_or_no_request_never_matches(self):
+        etag = make_etag("u", 1)
+        assert not is_not_modified(make_request(), etag)
+        assert not is_not_modified(None, etag)
+
+
+# ---------------------------------------------------------------------------
+# 2. Summaries
+# ---------------------------------------------------------------------------
+
+class TestSummaryETag:
+    def test_matching_tag_returns_304(self, engine):
+        user = make_user()
+        portfolio_id, _ = _seed(engine, user)
+        with Session(engine) as session:
+            response = Response()
+            run(get_portfolio_summary(portfolio_id=portfolio_id, current_user=user, session=session,
+                                      request=make_request(), response=response))
+            etag = response.headers["ETag"]
+
+            result = run(get_portfolio_summary(portfolio_id=portfolio_id, current_user=user, session=session,
+                                               request=make_request(etag), response=Response()))
+
+        assert result.status_code == 304
+        assert result.headers["ETag"] == etag
+        assert result.body == b""
+
+    def test_write_changes_tag(self, engine):
+        user = make_user()
+        portfolio_id, property_id = _seed(engine, user)
+        with Session(engine) as session:
+            response = Response()
+            run(get_portfolio_summary(portfolio_id=portfolio_id, current_user=user, session=session,
+                                      request=make_request(), response=response))
+            etag = response.headers["ETag"]
+
+            run(create_valuation(
+                data=ValuationCreate(property_id=property_id, valuation_date=date.today(), value=Decimal("900000")),
+                current_user=user,
+                session=session,
+            ))
+
+            fresh = Response()
+            summary = run(get_portfolio_summary(portfolio_id=portfolio_id, current_user=user, session=session,
+                                                request=make_request(etag), response=fresh))
+
+        assert summary.total_value == Decimal("900000")
+        assert fresh.headers["ETag"] != etag
+
+
+# ---------------------------------------------------------------------------
+# 3. Projections
+# ---------------------------------------------------------------------------
+
+class TestProjectionETag:
+    def test_304_skips_cost_charge(self, engine):
+        user = make_user()
+        _, property_id = _seed(engine, user)
+        with Session(engine) as session:
+            response = Response()
+            run(get_property_projections(property_id=property_id, years=5, current_user=user, session=session,
+                                         request=make_request(), response=response))
+            etag = response.headers["ETag"]
+
+            with patch("routes.projections.charge_cost") as charge:
+                result = run(get_property_projections(property_id=property_id, years=5, current_user=user,
+                                                      session=session, request=make_request(etag)))
+
+        assert result.status_code == 304
+        charge.assert_not_called()
+
+    def test_params_change_tag(self, engine):
+        user = make_user()
+        _, property_id = _seed(engine, user)
+        with Session(engine) as session:
+            five, ten = Response(), Response()
+            run(get_property_projections(property_id=property_id, years=5, current_user=user, session=session,
+                                         response=five))
+            run(get_property_projections(property_id=property_id, years=10, current_user=user, session=session,
+                                         response=ten))
+        assert five.headers["ETag"] != ten.headers["ETag"]
+
+
+# ---------------------------------------------------------------------------
+# 4. Net worth history
+# ---------------------------------------------------------------------------
+
+class TestHistoryETag:
+    def test_new_snapshot_changes_tag(self, engine):
+        user = make_user()
+        portfolio_id, _ = _seed(engine, user)
+        with Session(engine) as session:
+            before = Response()
+            run(get_net_worth_history(portfolio_id=portfolio_id, limit=12, current_user=user, session=session,
+                                      response=before))
+
+            session.add(NetWorthSnapshot(
+                id=str(uuid.uuid4()), user_id=user.id, portfolio_id=portfolio_id, date=date.today(),
+            ))
+            session.commit()
+
+            after = Response()
+            history = run(get_net_worth_history(portfolio_id=portfolio_id, limit=12, current_user=user,
+                                                session=session, request=make_request(before.headers["ETag"]),
+                                                response=after))
+
+        assert len(history) == 1
+        assert after.headers["ETag"] != before.headers["ETag"]
+
+
+# ---------------------------------------------------------------------------
+# 5. Isolation
+# ---------------------------------------------------------------------------
+
+class TestIsolation:
+    def test_tags_differ_between_users(self, engine):
+        owner = make_user()
+        other = make_user()
+        with Session(engine) as session:
+            mine, theirs = Response(), Response()
+            run(get_net_worth_history(portfolio_id=None, limit=12, current_user=owner, session=session, response=mine))
+            run(get_net_worth_history(portfolio_id=None, limit=12, current_user=other, session=session, response=theirs))
+        assert mine.headers["ETag"] != theirs.headers["ETag"]
+
+    def test_summary_checks_ownership_before_tag(self, engine):
+        owner, other = make_user(), make_user()
+        portfolio_id, _ = _seed(engine, owner)
+        version = run(get_portfolio_version(portfolio_id))
+        forged = make_etag(other.id, "portfolios.summary", portfolio_id, version)
+        with Session(engine) as session:
+            response = Response()
+            with pytest.raises(HTTPException) as exc:
+                run(get_portfolio_summary(portfolio_id=portfolio_id, current_user=other, session=session,
+                                          request=make_request(forged), response=response))
+        assert exc.value.status_code == 404
+        assert "ETag" not in response.headers
+
+    def test_dashboard_checks_ownership_before_tag(self, engine):
+        owner, other = make_user(), make_user()
+        portfolio_id, _ = _seed(engine, owner)
+        version = run(get_portfolio_version(portfolio_id))
+        forged = make_etag(other.id, "dashboard.summary", portfolio_id, version)
+        with Session(engine) as session:
+            response = Response()
+            result = run(get_dashboard_summary(portfolio_id=portfolio_id, current_user=other, session=session,
+                                               request=make_request(forged), response=response))
+        assert result.properties_count == 0
+        assert "ETag" not in response.headers
@@ -0,0 +1,174 @@
+"""
+Tests for the FIRE solver (utils/fire_solver.py, POST /plans/solve).
+
+Covers:
+1. Forward model — closed-form years to FIRE and success probability match
+   the year-by-year simulation behind /plans/project
+2. Inverse questions — required savings, coast-FIRE number and maximum
+   withdrawal rate verified by projecting either side of the answer
+3. Endpoint — response fields, default target age, validation
+"""
+
+import sys
+import os
+import uuid
+import asyncio
+import itertools
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.user import User
+from routes.plans import FireSolveInput, ProjectionInput, _run_projection, calculate_projection, solve_fire
+from utils import fire_solver
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def make_user(tag: str = "") -> User:
+    uid = tag or uuid.uuid4().hex[:8]
+    return User(
+        id=f"user_{uid}",
+        email=f"{uid}@example.com",
+        first_name="Test",
+        last_name="User",
+    )
+
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def _inputs(**kwargs) -> fire_solver.FireInputs:
+    return fire_solver.FireInputs(**ProjectionInput(**kwargs).model_dump())
+
+
+def _simulate(**kwargs):
+    return _run_projection(ProjectionInput(**kwargs))
+
+
+# Mix of ordinary and awkward cases: zero/negative returns, negative net
+# worth, retiring before today, withdrawals above returns, fixed targets
+CASES = [
+    dict(zip(("current_net_worth", "annual_savings", "expected_return", "withdrawal_rate", "retirement_age", "target_net_worth"), values))
+    for values in itertools.product(
+        (-50000.0, 0.0, 250000.0, 2000000.0),
+        (0.0, 48000.0),
+        (-100.0, -3.0, 0.0, 7.0, 25.0),
+        (0.0, 4.0, 50.0),
+        (30, 55),
+        (None, 1500000.0),
+    )
+]
+
+
+# ---------------------------------------------------------------------------
+# 1. Forward model
+# ---------------------------------------------------------------------------
+
+class TestForwardModel:
+    @pytest.mark.parametrize("case", CASES)
+    def test_matches_simulation(self, case):
+        simulated = _simulate(**case)
+        inputs = _inputs(**case)
+
+        assert fire_solver.years_to_fire(inputs) == simulated.years_to_fire
+        assert round(Decimal(repr(fire_solver.fire_number(inputs))), 2) == simulated.fire_number
+        assert round(fire_solver.success_probability(inputs), 1) == pytest.approx(simulated.success_probability, abs=0.1)
+
+    def test_net_worth_matches_each_projected_year(self):
+        case = dict(current_net_worth=250000.0, annual_savings=48000.0, current_age=35, retirement_age=50)
+        simulated = _simulate(**case)
+        inputs = _inputs(**case)
+        for year, point in enumerate(simulated.projections):
+            assert fire_solver.net_worth_at(inputs, year) == pytest.approx(float(point.net_worth), abs=0.01)
+
+    def test_tie_with_fire_number_counts_as_reached(self):
+        # FIRE number equals one year's savings, reached exactly after a year
+        case = dict(current_net_worth=0.0, annual_savings=101796.42, expected_return=12.37, withdrawal_rate=50.0)
+        assert fire_solver.years_to_fire(_inputs(**case)) == _simulate(**case).years_to_fire == 1
+
+
+# ---------------------------------------------------------------------------
+# 2. Inverse questions
+# ---------------------------------------------------------------------------
+
+class TestInverseQuestions:
+    def test_required_savings(self):
+        inputs = _inputs(current_net_worth=250000.0, annual_savings=48000.0)
+        target = fire_solver.fire_number(inputs)
+        savings = fire_solver.required_savings(inputs, target_age=45)
+
+        enough = _simulate(current_net_worth=250000.0, annual_savings=savings + 0.01, target_net_worth=target)
+        short = _simulate(current_net_worth=250000.0, annual_savings=savings - 1, target_net_worth=target)
+        assert enough.fire_age == 45
+        assert short.fire_age > 45
+
+    def test_required_savings_zero_when_already_on_track(self):
+        inputs = _inputs(current_net_worth=2000000.0, annual_savings=48000.0)
+        assert fire_solver.required_savings(inputs, target_age=40) == 0.0
+
+    def test_required_savings_none_without_saving_years(self):
+        inputs = _inputs(current_net_worth=1000.0, annual_savings=48000.0, expected_return=0.0, withdrawal_rate=10.0, retirement_age=35)
+        assert fire_solver.required_savings(inputs, target_age=60) is None
+
+    def test_coast_fire_number(self):
+        inputs = _inputs(current_net_worth=100000.0, annual_savings=48000.0)
+        target = fire_solver.fire_number(inputs)
+        coast = fire_solver.coast_fire_number(inputs, target_age=55)
+
+        assert _simulate(current_net_worth=coast + 1, annual_savings=0, target_net_worth=target).fire_age == 55
+        assert _simulate(current_net_worth=coast - 1, annual_savings=0, target_net_worth=target).fire_age > 55
+
+    @pytest.mark.parametrize("target_net_worth", [None, 1500000.0])
+    def test_max_withdrawal_rate(self, target_net_worth):
+        case = dict(current_net_worth=250000.0, annual_savings=48000.0, target_net_worth=target_net_worth)
+        rate = fire_solver.max_withdrawal_rate(_inputs(**case), success_threshold=95.0)
+
+        assert _simulate(**case, withdrawal_rate=rate).success_probability >= 95.0
+        assert _simulate(**case, withdrawal_rate=rate + 0.01).success_probability < 95.0
+
+    def test_max_withdrawal_rate_none_when_unreachable(self):
+        inputs = _inputs(current_net_worth=0.0, annual_savings=0.0, expected_return=-20.0)
+        assert fire_solver.max_withdrawal_rate(inputs, success_threshold=95.0) is None
+
+
+# ---------------------------------------------------------------------------
+# 3. Endpoint
+# ---------------------------------------------------------------------------
+
+class TestSolveEndpoint:
+    def test_matches_projection(self):
+        user = make_user()
+        data = FireSolveInput(current_net_worth=250000.0, annual_savings=48000.0, target_fire_age=38)
+        result = run(solve_fire(data=data, current_user=user))
+        projection = run(calculate_projection(ProjectionInput(**data.model_dump(exclude={"target_fire_age", "success_threshold"})), current_user=user))
+
+        assert result.years_to_fire == projection.years_to_fire
+        assert result.fire_age == projection.fire_age
+        assert result.fire_year == projection.fire_year
+        assert result.fire_number == projection.fire_number
+        assert result.success_probability == projection.success_probability
+        assert result.target_fire_age == 38
+        assert result.required_annual_savings > 0
+        assert result.coast_fire_number > 0
+        assert result.max_withdrawal_rate is not None
+
+    def test_target_age_defaults_to_retirement_age(self):
+        result = run(solve_fire(data=FireSolveInput(retirement_age=60), current_user=make_user()))
+        assert result.target_fire_age == 60
+
+    def test_target_age_outside_horizon(self):
+        with pytest.raises(HTTPException) as exc:
+            run(solve_fire(data=FireSolveInput(current_age=40, target_fire_age=30), current_user=make_user()))
+        assert exc.value.status_code == 400
+
+    def test_age_range_too_large(self):
+        with pytest.raises(HTTPException) as exc:
+            run(solve_fire(data=FireSolveInput(current_age=5, life_expectancy=120), current_user=make_user()))
+        assert exc.value.status_code == 400
@@ -0,0 +1,280 @@
+"""
+Tests for goal seek (POST /projections/{property_id}/goal-seek,
+utils/goal_seek.py, utils/solver.py).
+
+Covers:
+1. Solver — Brent converges, bracket expansion, no sign change raises
+2. Goals — solutions verified against full projections either side of the
+   rounded value (break-even rent, max interest rate, target equity)
+3. Cost — fixed pipelines projected once, few restricted evaluations
+4. Errors — unknown goal, missing target, no loans, unreachable, isolation
+"""
+
+import sys
+import os
+import uuid
+import asyncio
+from decimal import Decimal
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from sqlmodel import SQLModel, Session, create_engine
+from sqlalchemy.pool import StaticPool
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.user import User
+from models.portfolio import Portfolio
+from models.property import Property
+from models.financials import (
+    Loan,
+    LoanType,
+    LoanStructure,
+    Frequency,
+    RentalIncome,
+    ExpenseLog,
+    GoalSeekRequest,
+)
+import routes.projections as projections
+from routes.projections import get_property_projections, goal_seek_property, _get_property_data
+from utils.cache import projection_cache
+from utils.goal_seek import current_weekly_rent, with_weekly_rent
+from utils.solver import SolverError, brent, expand_bracket
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def make_engine():
+    return create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+
+def make_user(tag: str = "") -> User:
+    uid = tag or uuid.uuid4().hex[:8]
+    return User(
+        id=f"user_{uid}",
+        email=f"{uid}@example.com",
+        first_name="Test",
+        last_name="User",
+    )
+
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture()
+def engine():
+    eng = make_engine()
+    SQLModel.metadata.create_all(eng)
+    yield eng
+    SQLModel.metadata.drop_all(eng)
+
+
+@pytest.fixture(autouse=True)
+def clear_projection_cache():
+    projection_cache.clear()
+    yield
+    projection_cache.clear()
+
+
+def _seed(engine, user: User, with_loan: bool = True) -> str:
+    """Leveraged, tenanted property; returns its ID"""
+    portfolio_id, property_id = str(uuid.uuid4()), str(uuid.uuid4())
+    with Session(engine) as s:
+        s.add(Portfolio(id=portfolio_id, user_id=user.id, name="Goal Portfolio", type="actual"))
+        s.add(Property(
+            id=property_id,
+            user_id=user.id,
+            portfolio_id=portfolio_id,
+            address="1 Target St",
+            suburb="Testville",
+            state="NSW",
+            postcode="2000",
+            purchase_date=date(2018, 6, 1),
+            current_value=Decimal("750000"),
+            purchase_price=Decimal("600000"),
+        ))
+        if with_loan:
+            s.add(Loan(
+                property_id=property_id,
+                lender_name="Test Bank",
+                loan_type=LoanType.PRINCIPAL_LOAN,
+                loan_structure=LoanStructure.INTEREST_ONLY,
+                original_amount=Decimal("500000"),
+                current_amount=Decimal("480000"),
+                interest_rate=Decimal("5.50"),
+                remaining_term_years=27,
+                repayment_frequency=Frequency.MONTHLY,
+            ))
+        s.add(RentalIncome(
+            property_id=property_id,
+            amount=Decimal("650"),
+            frequency=Frequency.WEEKLY,
+            start_date=date(2020, 1, 1),
+        ))
+        s.add(ExpenseLog(
+            property_id=property_id,
+            category="council_rates",
+            amount=Decimal("400"),
+            frequency=Frequency.MONTHLY,
+            start_date=date(2020, 1, 1),
+        ))
+        s.commit()
+    return property_id
+
+
+def _solve(engine, user, property_id, **kwargs):
+    with Session(engine) as session:
+        return run(goal_seek_property(
+            property_id=property_id, data=GoalSeekRequest(**kwargs), current_user=user, session=session,
+        ))
+
+
+def _projection(engine, user, property_id, **overrides):
+    with Session(engine) as session:
+        return run(get_property_projections(
+            property_id=property_id, years=10, current_user=user, session=session, **overrides,
+        )).projections
+
+
+def _min_cashflow_at_rent(engine, property_id, weekly_rent: Decimal) -> Decimal:
+    with Session(engine) as session:
+        property_obj = session.get(Property, property_id)
+        data = _get_property_data(property_id, session)
+        rent_obj, rent_data = with_weekly_rent(property_obj, data, weekly_rent, current_weekly_rent(property_obj, data))
+        rows = projections._generate_property_projections(rent_obj, rent_data, 10)
+    return min(row.net_cashflow for row in rows)
+
+
+# ---------------------------------------------------------------------------
+# 1. Solver
+# ---------------------------------------------------------------------------
+
+class TestSolver:
+    def test_brent_finds_root(self):
+        root = brent(lambda x: x ** 3 - 2 * x - 5, 2.0, 3.0, xtol=1e-10)
+        assert abs(root - 2.0945514815) < 1e-8
+
+    def test_brent_few_evaluations_on_smooth_function(self):
+        calls = []
+
+        def f(x):
+            calls.append(x)
+            return x * x - 2
+
+        brent(f, 0.0, 2.0, xtol=1e-9)
+        assert len(calls) < 12
+
+    def test_expand_bracket_widens_until_sign_change(self):
+        lower, upper, f_lower, f_upper = expand_bracket(lambda x: x - 25, 0.0, 1.0, (-100.0, 100.0))
+        assert lower <= 25 <= upper
+        assert f_lower * f_upper <= 0
+
+    def test_expand_bracket_raises_at_limits(self):
+        with pytest.raises(SolverError):
+            expand_bracket(lambda x: x * x + 1, -1.0, 1.0, (-10.0, 10.0))
+
+
+# ---------------------------------------------------------------------------
+# 2. Goals
+# ---------------------------------------------------------------------------
+
+class TestGoals:
+    def test_break_even_rent(self, engine):
+        user = make_user()
+        property_id = _seed(engine, user)
+        result = _solve(engine, user, property_id, goal="break_even_rent")
+
+        assert result.unit == "$/week"
+        assert result.outcome >= 0
+        assert result.outcome == _min_cashflow_at_rent(engine, property_id, result.value)
+        assert _min_cashflow_at_rent(engine, property_id, result.value - Decimal("0.01")) < 0
+
+    def test_max_interest_rate(self, engine):
+        user = make_user()
+        property_id = _seed(engine, user)
+        result = _solve(engine, user, property_id, goal="max_interest_rate")
+
+        at = _projection(engine, user, property_id, interest_rate_offset=float(result.value))
+        above = _projection(engine, user, property_id, interest_rate_offset=float(result.value + Decimal("0.01")))
+        assert min(row.net_cashflow for row in at) == result.outcome >= 0
+        assert min(row.net_cashflow for row in above) < 0
+
+    def test_target_equity(self, engine):
+        user = make_user()
+        property_id = _seed(engine, user)
+        target = Decimal("900000")
+        result = _solve(engine, user, property_id, goal="target_equity", target_equity=target)
+
+        at = _projection(engine, user, property_id, asset_growth_override=float(result.value))
+        below = _projection(engine, user, property_id, asset_growth_override=float(result.value - Decimal("0.0001")))
+        assert at[-1].equity == result.outcome >= target
+        assert below[-1].equity < target
+
+
+# ---------------------------------------------------------------------------
+# 3. Cost
+# ---------------------------------------------------------------------------
+
+class TestGoalSeekCost:
+    def test_only_varied_pipeline_rerun(self, engine):
+        user = make_user()
+        property_id = _seed(engine, user)
+        generate = projections._generate_property_projections
+        with patch.object(projections, "_generate_property_projections", side_effect=generate) as spy:
+            result = _solve(engine, user, property_id, goal="max_interest_rate")
+
+        pipelines = [call.kwargs["pipelines"] for call in spy.call_args_list]
+        assert pipelines[0] == {"rent", "expenses"}
+        assert all(p == {"repayments"} for p in pipelines[1:])
+        assert len(pipelines) == result.evaluations + 1
+        assert result.evaluations <= 20
+
+
+# ---------------------------------------------------------------------------
+# 4. Errors
+# ---------------------------------------------------------------------------
+
+class TestGoalSeekErrors:
+    def test_unknown_goal(self, engine):
+        user = make_user()
+        property_id = _seed(engine, user)
+        with pytest.raises(HTTPException) as exc:
+            _solve(engine, user, property_id, goal="max_yield")
+        assert exc.value.status_code == 400
+
+    def test_target_required(self, engine):
+        user = make_user()
+        property_id = _seed(engine, user)
+        with pytest.raises(HTTPException) as exc:
+            _solve(engine, user, property_id, goal="target_equity")
+        assert exc.value.status_code == 400
+
+    def test_no_loans(self, engine):
+        user = make_user()
+        property_id = _seed(engine, user, with_loan=False)
+        with pytest.raises(HTTPException) as exc:
+            _solve(engine, user, property_id, goal="max_interest_rate")
+        assert exc.value.status_code == 422
+
+    def test_unreachable_target(self, engine):
+        user = make_user()
+        property_id = _seed(engine, user)
+        with pytest.raises(HTTPException) as exc:
+            _solve(engine, user, property_id, goal="target_equity", target_equity=Decimal("1000000000000"))
+        assert exc.value.status_code == 422
+
+    def test_other_users_property_not_found(self, engine):
+        owner, intruder = make_user(), make_user()
+        property_id = _seed(engine, owner)
+        with pytest.raises(HTTPException) as exc:
+            _solve(engine, intruder, property_id, goal="break_even_rent")
+        assert exc.value.status_code == 404
@@ -0,0 +1,327 @@
+"""
+Tests for household projections (GET /projections/household).
+
+Calls the handler directly with a real SQLite in-memory session and stub user,
+matching the pattern in test_projections.py.
+
+Covers:
+1. Consolidation — household totals equal the sum of each portfolio's projection
+2. Scope — scenario portfolios are excluded; a user without portfolios gets 404
+3. Balance sheet — non-property assets and liabilities are included
+4. Data isolation — another user's portfolios never appear
+5. Caching — repeat requests are served from cache and revalidate with 304,
+   and a newly created portfolio invalidates them
+"""
+
+import sys
+import os
+import uuid
+import asyncio
+from decimal import Decimal
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from sqlmodel import SQLModel, Session, create_engine
+from sqlalchemy.pool import StaticPool
+from starlette.requests import Request
+from fastapi import HTTPException, Response
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.user import User
+from models.portfolio import Portfolio, PortfolioCreate
+from models.property import Property
+from models.asset import Asset
+from models.liability import Liability
+from models.financials import Loan, LoanType, LoanStructure, Frequency
+from routes.portfolios import create_portfolio
+from routes.projections import get_household_projections, get_portfolio_projections
+from utils.cache import projection_cache
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def make_engine():
+    return create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+
+def make_user(tag: str = "") -> User:
+    uid = tag or uuid.uuid4().hex[:8]
+    return User(
+        id=f"user_{uid}",
+        email=f"{uid}@example.com",
+        first_name="Test",
+        last_name="User",
+    )
+
+
+def make_request(if_none_match: str = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture()
+def engine():
+    eng = make_engine()
+    SQLModel.metadata.create_all(eng)
+    yield eng
+    SQLModel.metadata.drop_all(eng)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    projection_cache.clear()
+    yield
+    projection_cache.clear()
+
+
+def _make_portfolio(engine, user: User, name: str, type: str = "actual") -> str:
+    portfolio_id = str(uuid.uuid4())
+    with Session(engine) as s:
+        s.add(Portfolio(id=portfolio_id, user_id=user.id, name=name, type=type))
+        s.commit()
+    return portfolio_id
+
+
+def _make_property(engine, user: User, portfolio_id: str, value: str = "750000", loan: str = None) -> str:
+    property_id = str(uuid.uuid4())
+    with Session(engine) as s:
+        s.add(Property(
+            id=property_id,
+            user_id=user.id,
+            portfolio_id=portfolio_id,
+            address="42 Household Ave",
+            suburb="Testville",
+            state="NSW",
+            postcode="2000",
+            purchase_date=date(2018, 6, 1),
+            current_value=Decimal(value),
+            purchase_price=Decimal("600000"),
+        ))
+        if loan:
+            s.add(Loan(
+                property_id=property_id,
+                lender_name="Test Bank",
+                loan_type=LoanType.PRINCIPAL_LOAN,
+                loan_structure=LoanStructure.PRINCIPAL_AND_INTEREST,
+                original_amount=Decimal(loan),
+                current_amount=Decimal(loan),
+                interest_rate=Decimal("6.00"),
+                remaining_term_years=25,
+                repayment_frequency=Frequency.MONTHLY,
+            ))
+        s.commit()
+    return property_id
+
+
+def _make_asset(engine, user: User, portfolio_id: str, value: str, is_active: bool = True) -> None:
+    with Session(engine) as s:
+        s.add(Asset(
+            user_id=user.id,
+            portfolio_id=portfolio_id,
+            name="Super",
+            type="super",
+            current_value=Decimal(value),
+            is_active=is_active,
+        ))
+        s.commit()
+
+
+def _make_liability(engine, user: User, portfolio_id: str, balance: str) -> None:
+    with Session(engine) as s:
+        s.add(Liability(
+            user_id=user.id,
+            portfolio_id=portfolio_id,
+            name="Car loan",
+            type="car_loan",
+            original_amount=Decimal(balance),
+            current_balance=Decimal(balance),
+        ))
+        s.commit()
+
+
+def _household(engine, user: User, years: int = 5, **kwargs):
+    with Session(engine) as session:
+        return run(get_household_projections(years=years, current_user=user, session=session, **kwargs))
+
+
+# ---------------------------------------------------------------------------
+# 1. Consolidation
+# ---------------------------------------------------------------------------
+
+class TestConsolidation:
+
+    def test_totals_equal_sum_of_portfolio_projections(self, engine):
+        user = make_user()
+        personal = _make_portfolio(engine, user, "Personal")
+        smsf = _make_portfolio(engine, user, "SMSF")
+        _make_property(engine, user, personal, "750000", loan="500000")
+        _make_property(engine, user, personal, "520000")
+        _make_property(engine, user, smsf, "900000", loan="300000")
+
+        result = _household(engine, user, years=5)
+        with Session(engine) as session:
+            singles = [
+                run(get_portfolio_projections(portfolio_id=pid, years=5, current_user=user, session=session))
+                for pid in (personal, smsf)
+            ]
+
+        assert [p.portfolio_name for p in result.portfolios] == ["Personal", "SMSF"]
+        assert [p.property_count for p in result.portfolios] == [2, 1]
+        for household_row, *portfolio_rows in zip(result.property_totals, *(s.totals for s in singles)):
+            assert household_row.property_value == sum(r.property_value for r in portfolio_rows)
+            assert household_row.total_debt == sum(r.total_debt for r in portfolio_rows)
+            assert household_row.net_cashflow == sum(r.net_cashflow for r in portfolio_rows)
+        for entry, single in zip(result.portfolios, singles):
+            assert entry.property_totals == single.totals
+
+    def test_consolidated_lvr_recomputed_from_totals(self, engine):
+        user = make_user()
+        first = _make_portfolio(engine, user, "First")
+        second = _make_portfolio(engine, user, "Second")
+        _make_property(engine, user, first, "500000", loan="400000")
+        _make_property(engine, user, second, "1500000")
+
+        row = _household(engine, user, years=1).property_totals[0]
+        expected = (row.total_debt / row.property_value * 100).quantize(Decimal("0.01"))
+        assert row.lvr == expected
+
+    def test_years_out_of_range_raises_400(self, engine):
+        user = make_user()
+        _make_portfolio(engine, user, "Personal")
+        with pytest.raises(HTTPException) as exc:
+            _household(engine, user, years=51)
+        assert exc.value.status_code == 400
+
+
+# ---------------------------------------------------------------------------
+# 2. Scope
+# ---------------------------------------------------------------------------
+
+class TestScope:
+
+    def test_scenario_portfolios_excluded(self, engine):
+        user = make_user()
+        actual = _make_portfolio(engine, user, "Actual")
+        scenario = _make_portfolio(engine, user, "What if", type="scenario")
+        _make_property(engine, user, actual, "750000")
+        _make_property(engine, user, scenario, "2000000")
+
+        result = _household(engine, user)
+        assert [p.portfolio_id for p in result.portfolios] == [actual]
+        assert result.property_totals[0].property_value == result.portfolios[0].property_totals[0].property_value
+
+    def test_portfolio_without_properties_still_listed(self, engine):
+        user = make_user()
+        _make_portfolio(engine, user, "Empty")
+        result = _household(engine, user, years=3)
+        assert result.portfolios[0].property_count == 0
+        assert len(result.property_totals) == 4
+        assert all(row.property_value == 0 for row in result.property_totals)
+
+    def test_no_portfolios_raises_404(self, engine):
+        user = make_user()
+        with pytest.raises(HTTPException) as exc:
+            _household(engine, user)
+        assert exc.value.status_code == 404
+
+
+# ---------------------------------------------------------------------------
+# 3. Balance sheet
+# ---------------------------------------------------------------------------
+
+class TestBalanceSheet:
+
+    def test_assets_and_liabilities_included(self, engine):
+        user = make_user()
+        personal = _make_portfolio(engine, user, "Personal")
+        smsf = _make_portfolio(engine, user, "SMSF")
+        _make_property(engine, user, personal, "750000", loan="500000")
+        _make_asset(engine, user, personal, "40000")
+        _make_asset(engine, user, smsf, "250000")
+        _make_asset(engine, user, smsf, "99999", is_active=False)
+        _make_liability(engine, user, personal, "15000")
+
+        result = _household(engine, user, years=2)
+        start = result.balance_sheet[0]
+        assert start.other_assets == Decimal("290000")
+        assert start.other_liabilities == Decimal("15000")
+        assert start.total_assets == start.property_value + start.other_assets
+        assert start.total_liabilities == start.property_debt + start.other_liabilities
+        assert start.net_worth == start.total_assets - start.total_liabilities
+
+        personal_sheet, smsf_sheet = (p.balance_sheet[0] for p in result.portfolios)
+        assert result.portfolios[1].asset_count == 1
+        assert personal_sheet.net_worth + smsf_sheet.net_worth == start.net_worth
+
+
+# ---------------------------------------------------------------------------
+# 4. Data isolation
+# ---------------------------------------------------------------------------
+
+class TestIsolation:
+
+    def test_other_users_portfolios_excluded(self, engine):
+        user_a, user_b = make_user("a"), make_user("b")
+        own = _make_portfolio(engine, user_a, "Mine")
+        other = _make_portfolio(engine, user_b, "Theirs")
+        _make_property(engine, user_a, own, "750000")
+        _make_property(engine, user_b, other, "900000")
+        _make_asset(engine, user_b, other, "100000")
+
+        result = _household(engine, user_a)
+        assert [p.portfolio_id for p in result.portfolios] == [own]
+        assert result.balance_sheet[0].other_assets == 0
+
+
+# ---------------------------------------------------------------------------
+# 5. Caching
+# ---------------------------------------------------------------------------
+
+class TestCaching:
+
+    def test_repeat_request_served_from_cache(self, engine):
+        user = make_user()
+        pid = _make_portfolio(engine, user, "Personal")
+        _make_property(engine, user, pid)
+
+        first = _household(engine, user)
+        with patch("routes.projections._compute_household_projections") as compute:
+            second = _household(engine, user)
+        compute.assert_not_called()
+        assert second == first
+
+    def test_matching_etag_returns_304(self, engine):
+        user = make_user()
+        pid = _make_portfolio(engine, user, "Personal")
+        _make_property(engine, user, pid)
+
+        response = Response()
+        _household(engine, user, request=make_request(), response=response)
+        etag = response.headers["ETag"]
+
+        with patch("routes.projections.charge_cost") as charge:
+            result = _household(engine, user, request=make_request(etag))
+        assert result.status_code == 304
+        charge.assert_not_called()
+
+    def test_new_portfolio_invalidates_cache(self, engine):
+        user = make_user()
+        pid = _make_portfolio(engine, user, "Personal")
+        _make_property(engine, user, pid)
+        assert len(_household(engine, user).portfolios) == 1
+
+        with Session(engine) as session:
+            run(create_portfolio(data=PortfolioCreate(name="SMSF"), current_user=user, session=session))
+        assert [p.portfolio_name for p in _household(engine, user).portfolios] == ["Personal", "SMSF"]
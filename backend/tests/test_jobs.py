@@ -0,0 +1,486 @@
+"""
+Tests for background jobs (utils/jobs.py, routes/jobs.py).
+
+Covers:
+1. Lifecycle — submit returns a queued job, workers run it, result matches
+   the synchronous endpoint (portfolio projections, plan batches)
+2. Submission — unknown kind, invalid params, ownership, per-user limit
+   (checked in the inserting transaction, before the submission is charged)
+3. Cancellation — queued jobs at once, running jobs at their next check
+4. Failures and recovery — handler errors, restart re-queues, single claim,
+   periodic sweep (stale running jobs failed, orphaned queued jobs taken
+   over, expired jobs deleted)
+5. Data isolation
+"""
+
+import sys
+import os
+import time
+import uuid
+import asyncio
+from decimal import Decimal
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from pydantic import BaseModel
+from sqlmodel import SQLModel, Session, create_engine, select
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.user import User
+from models.portfolio import Portfolio
+from models.property import Property
+from models.plan import Plan
+from models.job import Job, JobCreate
+from models.financials import Loan, LoanType, LoanStructure, Frequency, RentalIncome, PortfolioProjectionResponse
+import utils.jobs as jobs
+from utils.jobs import JobContext, job_runner, register_job
+from routes.jobs import cancel_job, get_job, get_job_result, get_jobs, submit_job
+from routes.projections import get_portfolio_projections
+from routes.plans import PlanBatchRequest, PlanVariant, get_portfolio_plan_projections
+from utils.cache import projection_cache
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def make_user(tag: str = "") -> User:
+    uid = tag or uuid.uuid4().hex[:8]
+    return User(
+        id=f"user_{uid}",
+        email=f"{uid}@example.com",
+        first_name="Test",
+        last_name="User",
+    )
+
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    # File database: job handlers query from threadpool threads while tests poll
+    eng = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(eng)
+    yield eng
+    run(job_runner.stop())
+    SQLModel.metadata.drop_all(eng)
+    eng.dispose()
+
+
+@pytest.fixture(autouse=True)
+def clear_projection_cache():
+    projection_cache.clear()
+    yield
+    projection_cache.clear()
+
+
+class SleepParams(BaseModel):
+    seconds: float = 5.0
+
+
+@register_job("test.sleep", SleepParams)
+def _sleep_job(ctx: JobContext, params: SleepParams):
+    deadline = time.monotonic() + params.seconds
+    while time.monotonic() < deadline:
+        ctx.progress(0.5)
+        time.sleep(0.01)
+    return None
+
+
+@register_job("test.fail", SleepParams)
+def _failing_job(ctx: JobContext, params: SleepParams):
+    raise RuntimeError("boom")
+
+
+@register_job("test.quiet", SleepParams)
+def _quiet_job(ctx: JobContext, params: SleepParams):
+    # Never reports progress, so only the runner refreshes its heartbeat
+    deadline = time.monotonic() + params.seconds
+    while time.monotonic() < deadline and not ctx.cancelled:
+        time.sleep(0.01)
+    ctx.check_cancelled()
+
+
+def _seed(engine, user: User) -> str:
+    """Portfolio with two tenanted properties and a plan; returns the portfolio ID"""
+    portfolio_id = str(uuid.uuid4())
+    with Session(engine) as s:
+        s.add(Portfolio(id=portfolio_id, user_id=user.id, name="Job Portfolio", type="actual"))
+        for i in range(2):
+            property_id = str(uuid.uuid4())
+            s.add(Property(
+                id=property_id,
+                user_id=user.id,
+                portfolio_id=portfolio_id,
+                address=f"{i + 1} Queue St",
+                suburb="Testville",
+                state="NSW",
+                postcode="2000",
+                purchase_date=date(2018, 6, 1),
+                current_value=Decimal("750000"),
+                purchase_price=Decimal("600000"),
+            ))
+            s.add(Loan(
+                property_id=property_id,
+                lender_name="Test Bank",
+                loan_type=LoanType.PRINCIPAL_LOAN,
+                loan_structure=LoanStructure.INTEREST_ONLY,
+                original_amount=Decimal("500000"),
+                current_amount=Decimal("480000"),
+                interest_rate=Decimal("5.50"),
+                remaining_term_years=27,
+                repayment_frequency=Frequency.MONTHLY,
+            ))
+            s.add(RentalIncome(
+                property_id=property_id,
+                amount=Decimal("650"),
+                frequency=Frequency.WEEKLY,
+                start_date=date(2020, 1, 1),
+            ))
+        s.add(Plan(user_id=user.id, portfolio_id=portfolio_id, name="FIRE", type="fire", retirement_age=55))
+        s.commit()
+    return portfolio_id
+
+
+def _submit(engine, user, kind, **params):
+    with Session(engine) as session:
+        return run(submit_job(data=JobCreate(kind=kind, params=params), current_user=user, session=session))
+
+
+def _status(engine, user, job_id):
+    with Session(engine) as session:
+        return run(get_job(job_id=job_id, current_user=user, session=session))
+
+
+def _result(engine, user, job_id):
+    with Session(engine) as session:
+        return run(get_job_result(job_id=job_id, current_user=user, session=session))
+
+
+def _cancel(engine, user, job_id):
+    with Session(engine) as session:
+        return run(cancel_job(job_id=job_id, current_user=user, session=session))
+
+
+async def _wait_for_status(engine, job_id, wanted, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with Session(engine) as session:
+            if session.get(Job, job_id).status == wanted:
+                return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Job {job_id} never reached {wanted}")
+
+
+# ---------------------------------------------------------------------------
+# 1. Lifecycle
+# ---------------------------------------------------------------------------
+
+class TestJobLifecycle:
+    def test_portfolio_projection_job_matches_endpoint(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user)
+        job = _submit(engine, user, "projections.portfolio", portfolio_id=portfolio_id, years=50)
+        assert job.status == "queued"
+        assert job.result_url is None
+
+        run(job_runner.join())
+        finished = _status(engine, user, job.id)
+        assert finished.status == "done"
+        assert finished.progress == 1.0
+        assert finished.result_url == f"/api/jobs/{job.id}/result"
+
+        result = _result(engine, user, job.id)
+        with Session(engine) as session:
+            direct = run(get_portfolio_projections(portfolio_id=portfolio_id, years=50, current_user=user, session=session))
+        assert isinstance(result, PortfolioProjectionResponse)
+        assert result.model_dump() == direct.model_dump()
+
+    def test_plan_batch_job_matches_endpoint(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user)
+        variants = [{"key": f"return_{r}", "expected_return": r} for r in (4.0, 6.0, 8.0)]
+        job = _submit(engine, user, "plans.batch", portfolio_id=portfolio_id, variants=variants)
+        run(job_runner.join())
+
+        result = _result(engine, user, job.id)
+        with Session(engine) as session:
+            direct = run(get_portfolio_plan_projections(
+                portfolio_id=portfolio_id,
+                data=PlanBatchRequest(variants=[PlanVariant(**v) for v in variants]),
+                current_user=user,
+                session=session,
+            ))
+        assert result == direct
+
+    def test_result_before_done_conflicts(self, engine):
+        user = make_user()
+        job = Job(user_id=user.id, kind="test.sleep")
+        with Session(engine) as s:
+            s.add(job)
+            s.commit()
+            s.refresh(job)
+        with pytest.raises(HTTPException) as exc:
+            _result(engine, user, job.id)
+        assert exc.value.status_code == 409
+        assert exc.value.detail["status"] == "queued"
+
+
+# ---------------------------------------------------------------------------
+# 2. Submission
+# ---------------------------------------------------------------------------
+
+class TestJobSubmission:
+    def test_unknown_kind(self, engine):
+        with pytest.raises(HTTPException) as exc:
+            _submit(engine, make_user(), "monte_carlo")
+        assert exc.value.status_code == 400
+        assert "projections.portfolio" in exc.value.detail["kinds"]
+
+    def test_invalid_params(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user)
+        with pytest.raises(HTTPException) as exc:
+            _submit(engine, user, "projections.portfolio", portfolio_id=portfolio_id, years=80)
+        assert exc.value.status_code == 422
+
+    def test_other_users_portfolio_refused_at_submit(self, engine):
+        owner, intruder = make_user(), make_user()
+        portfolio_id = _seed(engine, owner)
+        with pytest.raises(HTTPException) as exc:
+            _submit(engine, intruder, "projections.portfolio", portfolio_id=portfolio_id)
+        assert exc.value.status_code == 404
+        with Session(engine) as s:
+            assert s.exec(select(Job)).all() == []
+
+    def test_per_user_active_limit(self, engine):
+        user = make_user()
+        with patch.object(jobs, "JOB_MAX_ACTIVE_PER_USER", 1):
+            first = _submit(engine, user, "test.sleep", seconds=5.0)
+            with pytest.raises(HTTPException) as exc:
+                _submit(engine, user, "test.sleep", seconds=5.0)
+            assert exc.value.status_code == 429
+            _cancel(engine, user, first.id)
+            run(job_runner.join())
+
+    def test_refused_submission_not_charged(self, engine):
+        user = make_user()
+        admitted = []
+
+        async def _charge(params, user, session):
+            admitted.append(params)
+
+        register_job("test.charged", SleepParams, admit=_charge)(_sleep_job)
+        with Session(engine) as s:
+            # Another submission already holds the user's only slot
+            s.add(Job(user_id=user.id, kind="test.sleep"))
+            s.commit()
+        with patch.object(jobs, "JOB_MAX_ACTIVE_PER_USER", 1):
+            with pytest.raises(HTTPException) as exc:
+                _submit(engine, user, "test.charged")
+        assert exc.value.status_code == 429
+        assert admitted == []
+        with Session(engine) as s:
+            assert [job.kind for job in s.exec(select(Job)).all()] == ["test.sleep"]
+
+
+# ---------------------------------------------------------------------------
+# 3. Cancellation
+# ---------------------------------------------------------------------------
+
+class TestJobCancellation:
+    def test_cancel_queued_job(self, engine):
+        user = make_user()
+        job = Job(user_id=user.id, kind="test.sleep")
+        with Session(engine) as s:
+            s.add(job)
+            s.commit()
+            s.refresh(job)
+
+        cancelled = _cancel(engine, user, job.id)
+        assert cancelled.status == "cancelled"
+        assert cancelled.finished_at is not None
+
+    def test_cancel_running_job_stops_handler(self, engine):
+        user = make_user()
+        job = _submit(engine, user, "test.sleep", seconds=30.0)
+        run(_wait_for_status(engine, job.id, "running"))
+
+        started = time.monotonic()
+        assert _cancel(engine, user, job.id).status == "running"
+        run(job_runner.join())
+        assert time.monotonic() - started < 5
+        assert _status(engine, user, job.id).status == "cancelled"
+
+    def test_cancel_finished_job_conflicts(self, engine):
+        user = make_user()
+        job = _submit(engine, user, "test.sleep", seconds=0.0)
+        run(job_runner.join())
+        with pytest.raises(HTTPException) as exc:
+            _cancel(engine, user, job.id)
+        assert exc.value.status_code == 409
+
+
+# ---------------------------------------------------------------------------
+# 4. Failures and recovery
+# ---------------------------------------------------------------------------
+
+class TestJobFailures:
+    def test_handler_exception_marks_failed(self, engine):
+        user = make_user()
+        job = _submit(engine, user, "test.fail")
+        run(job_runner.join())
+
+        failed = _status(engine, user, job.id)
+        assert failed.status == "failed"
+        assert failed.error == "Job failed"
+
+    def test_http_exception_detail_recorded(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user)
+        job = _submit(engine, user, "projections.portfolio", portfolio_id=portfolio_id)
+        with Session(engine) as s:
+            for prop in s.exec(select(Property).where(Property.portfolio_id == portfolio_id)).all():
+                prop.portfolio_id = _seed(engine, make_user())
+                s.add(prop)
+            s.commit()
+        run(job_runner.join())
+
+        failed = _status(engine, user, job.id)
+        assert failed.status == "failed"
+        assert failed.error == "No properties found in this portfolio"
+
+    def test_start_requeues_queued_and_fails_stale_running(self, engine):
+        user = make_user()
+        stale = datetime.now(timezone.utc) - timedelta(hours=2)
+        queued = Job(user_id=user.id, kind="test.sleep", params={"seconds": 0.0})
+        lost = Job(user_id=user.id, kind="test.sleep", status="running", started_at=stale, updated_at=stale)
+        with Session(engine) as s:
+            s.add(queued)
+            s.add(lost)
+            s.commit()
+            queued_id, lost_id = queued.id, lost.id
+
+        run(job_runner.start(engine))
+        run(job_runner.join())
+        assert _status(engine, user, queued_id).status == "done"
+        lost_status = _status(engine, user, lost_id)
+        assert lost_status.status == "failed"
+        assert "restart" in lost_status.error
+
+    def test_sweep_fails_stale_running_jobs_periodically(self, engine):
+        user = make_user()
+        with patch.object(jobs, "JOB_SWEEP_SECONDS", 0.01):
+            run(job_runner.start(engine))
+            stale = datetime.now(timezone.utc) - timedelta(hours=2)
+            lost = Job(user_id=user.id, kind="test.sleep", status="running", started_at=stale, updated_at=stale)
+            with Session(engine) as s:
+                s.add(lost)
+                s.commit()
+                lost_id = lost.id
+            run(_wait_for_status(engine, lost_id, "failed"))
+
+    def test_sweep_keeps_own_running_jobs_alive(self, engine):
+        user = make_user()
+        job = _submit(engine, user, "test.quiet", seconds=30.0)
+        run(_wait_for_status(engine, job.id, "running"))
+        with Session(engine) as s:
+            running = s.get(Job, job.id)
+            running.updated_at = datetime.now(timezone.utc) - timedelta(hours=2)
+            s.add(running)
+            s.commit()
+
+        assert job_runner._sweep(engine) == []
+        assert _status(engine, user, job.id).status == "running"
+        _cancel(engine, user, job.id)
+        run(job_runner.join())
+        assert _status(engine, user, job.id).status == "cancelled"
+
+    def test_sweep_takes_over_orphaned_queued_jobs(self, engine):
+        user = make_user()
+        with patch.object(jobs, "JOB_SWEEP_SECONDS", 0.01):
+            run(job_runner.start(engine))
+            stale = datetime.now(timezone.utc) - timedelta(hours=2)
+            orphan = Job(user_id=user.id, kind="test.sleep", params={"seconds": 0.0}, updated_at=stale)
+            with Session(engine) as s:
+                s.add(orphan)
+                s.commit()
+                orphan_id = orphan.id
+            run(_wait_for_status(engine, orphan_id, "done"))
+
+    def test_sweep_keeps_own_queued_jobs(self, engine):
+        user = make_user()
+        stale = datetime.now(timezone.utc) - timedelta(hours=2)
+        job = Job(user_id=user.id, kind="test.sleep", updated_at=stale)
+        with Session(engine) as s:
+            s.add(job)
+            s.commit()
+            job_id = job.id
+        job_runner._queued.add(job_id)
+        try:
+            assert job_runner._sweep(engine) == []
+        finally:
+            job_runner._queued.discard(job_id)
+        with Session(engine) as s:
+            assert s.get(Job, job_id).updated_at.replace(tzinfo=timezone.utc) > stale
+
+    def test_sweep_deletes_expired_jobs_periodically(self, engine):
+        user = make_user()
+        with patch.object(jobs, "JOB_SWEEP_SECONDS", 0.01):
+            run(job_runner.start(engine))
+            old = datetime.now(timezone.utc) - timedelta(hours=jobs.JOB_RETENTION_HOURS + 1)
+            expired = Job(user_id=user.id, kind="test.sleep", status="done", finished_at=old)
+            recent = Job(user_id=user.id, kind="test.sleep", status="done", finished_at=datetime.now(timezone.utc))
+            with Session(engine) as s:
+                s.add(expired)
+                s.add(recent)
+                s.commit()
+                expired_id, recent_id = expired.id, recent.id
+
+            async def _wait_deleted():
+                for _ in range(500):
+                    with Session(engine) as s:
+                        if s.get(Job, expired_id) is None:
+                            return
+                    await asyncio.sleep(0.01)
+                raise AssertionError("Expired job never deleted")
+            run(_wait_deleted())
+        with Session(engine) as s:
+            assert s.get(Job, recent_id) is not None
+
+    def test_job_claimed_once(self, engine):
+        user = make_user()
+        calls = []
+
+        @register_job("test.count", SleepParams)
+        def _count(ctx, params):
+            calls.append(ctx.job_id)
+
+        job = _submit(engine, user, "test.count")
+        run(job_runner.start(engine))  # Queues the same job id a second time
+        run(job_runner.join())
+        assert calls == [job.id]
+
+
+# ---------------------------------------------------------------------------
+# 5. Data isolation
+# ---------------------------------------------------------------------------
+
+class TestJobIsolation:
+    def test_other_users_job_not_visible(self, engine):
+        owner, intruder = make_user(), make_user()
+        job = _submit(engine, owner, "test.sleep", seconds=0.0)
+        run(job_runner.join())
+
+        for call in (_status, _result, _cancel):
+            with pytest.raises(HTTPException) as exc:
+                call(engine, intruder, job.id)
+            assert exc.value.status_code == 404
+        with Session(engine) as session:
+            assert run(get_jobs(current_user=intruder, session=session)) == []
+            assert [j.id for j in run(get_jobs(current_user=owner, session=session))] == [job.id]
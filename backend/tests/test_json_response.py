@@ -0,0 +1,172 @@
+"""
+Tests for the orjson response layer (utils/json_response.py).
+
+Covers:
+1. Encoding — Decimals as exact strings, dates, models, exclude_none
+2. Wire compatibility — trusted output equals FastAPI's default serialization
+3. TrustedModelRoute — handler-built models rendered directly with headers and
+   status kept; other return values and table models use the default path
+"""
+
+import sys
+import os
+import json
+import asyncio
+from decimal import Decimal
+from datetime import date, datetime, timezone
+from typing import List
+
+import pytest
+from fastapi import APIRouter, Response, status
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.portfolio import Portfolio
+from models.financials import ProjectionYearData, PropertyProjectionResponse
+from utils.json_response import DecimalJSONResponse, TrustedModelRoute, dumps
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def make_projection(**overrides) -> PropertyProjectionResponse:
+    row = dict(
+        year=2026,
+        property_value=Decimal("750000.0000"),
+        total_debt=Decimal("500000.1234"),
+        equity=Decimal("249999.8766"),
+        lvr=Decimal("66.67"),
+        rental_income=Decimal("31200"),
+        expenses=Decimal("8000"),
+        loan_repayments=Decimal("30000"),
+        depreciation=Decimal("0"),
+        net_cashflow=Decimal("-6800"),
+    )
+    row.update(overrides)
+    return PropertyProjectionResponse(
+        property_id="prop_1",
+        property_address="1 Fast St",
+        start_year=2026,
+        end_year=2026,
+        projections=[ProjectionYearData(**row)],
+    )
+
+
+def make_route(endpoint, **kwargs) -> TrustedModelRoute:
+    router = APIRouter(route_class=TrustedModelRoute)
+    router.add_api_route("/x", endpoint, **kwargs)
+    return router.routes[0]
+
+
+def call(route: TrustedModelRoute):
+    """Invoke the route's endpoint as FastAPI would, with a fresh sub-response"""
+    values = {}
+    if route.dependant.response_param_name:
+        sub_response = Response()
+        sub_response.status_code = None  # as FastAPI creates it
+        values[route.dependant.response_param_name] = sub_response
+    return run(route.dependant.call(**values))
+
+
+# ---------------------------------------------------------------------------
+# 1. Encoding
+# ---------------------------------------------------------------------------
+
+class TestEncoding:
+    def test_decimals_are_exact_strings(self):
+        assert json.loads(dumps({"a": Decimal("0.10"), "b": Decimal("-1234567.8901")})) == {
+            "a": "0.10",
+            "b": "-1234567.8901",
+        }
+
+    def test_dates_and_utc_datetimes(self):
+        body = json.loads(dumps({"d": date(2026, 1, 31), "t": datetime(2026, 1, 31, tzinfo=timezone.utc)}))
+        assert body == {"d": "2026-01-31", "t": "2026-01-31T00:00:00Z"}
+
+    def test_exclude_none_drops_missing_metrics(self):
+        row = ProjectionYearData(year=2026, equity=Decimal("1.50"))
+        assert json.loads(dumps(row, exclude_none=True)) == {"year": 2026, "equity": "1.50"}
+
+    def test_table_model_excludes_sqlalchemy_state(self):
+        portfolio = Portfolio(id="pf_1", user_id="user_1", name="Fast", type="actual")
+        body = json.loads(dumps(portfolio))
+        assert body["id"] == "pf_1"
+        assert "_sa_instance_state" not in body
+
+
+# ---------------------------------------------------------------------------
+# 2. Wire compatibility
+# ---------------------------------------------------------------------------
+
+class TestWireCompatibility:
+    def test_trusted_output_matches_fastapi_default(self):
+        projection = make_projection()
+
+        async def endpoint():
+            return projection
+
+        route = make_route(endpoint, response_model=PropertyProjectionResponse)
+        default = run(serialize_response(field=route.response_field, response_content=projection, is_coroutine=True))
+
+        assert json.loads(call(route).body) == json.loads(JSONResponse(default).body)
+
+
+# ---------------------------------------------------------------------------
+# 3. TrustedModelRoute
+# ---------------------------------------------------------------------------
+
+class TestTrustedModelRoute:
+    def test_model_rendered_directly_with_headers(self):
+        async def endpoint(response: Response):
+            response.headers["ETag"] = '"abc"'
+            return make_projection()
+
+        route = make_route(endpoint, response_model=PropertyProjectionResponse)
+        rendered = call(route)
+
+        assert isinstance(rendered, DecimalJSONResponse)
+        assert rendered.headers["etag"] == '"abc"'
+        assert rendered.status_code == 200
+
+    def test_route_status_code_and_exclude_none_honoured(self):
+        async def endpoint():
+            return make_projection(property_value=None)
+
+        route = make_route(
+            endpoint,
+            response_model=PropertyProjectionResponse,
+            response_model_exclude_none=True,
+            status_code=status.HTTP_201_CREATED,
+        )
+        rendered = call(route)
+
+        assert rendered.status_code == 201
+        assert "property_value" not in json.loads(rendered.body)["projections"][0]
+
+    def test_list_of_models_trusted(self):
+        async def endpoint():
+            return [make_projection(), make_projection()]
+
+        route = make_route(endpoint, response_model=List[PropertyProjectionResponse])
+        assert len(json.loads(call(route).body)) == 2
+
+    def test_other_return_values_use_default_path(self):
+        async def endpoint():
+            return {"property_id": "prop_1"}
+
+        route = make_route(endpoint, response_model=PropertyProjectionResponse)
+        assert call(route) == {"property_id": "prop_1"}
+
+    def test_table_models_not_trusted(self):
+        async def endpoint():
+            return Portfolio(id="pf_1", user_id="user_1", name="Fast", type="actual")
+
+        route = make_route(endpoint, response_model=Portfolio)
+        assert isinstance(call(route), Portfolio)
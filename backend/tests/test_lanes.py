@@ -0,0 +1,244 @@
+"""
+Tests for priority lanes (utils/lanes.py).
+
+Drives Lane directly on an event loop, plus the batch work moved onto it.
+
+Covers:
+1. Worker quota — batch work never runs on more than its threads
+2. Interactive headroom — a saturated batch lane leaves the default threadpool free
+3. Connection quota — sessions are capped per lane and re-entrant per thread
+4. Metrics — queue depth, latency percentiles, completed/failed counts
+5. Batch work — demo data seeding runs in the batch lane
+"""
+
+import sys
+import os
+import time
+import uuid
+import asyncio
+import threading
+
+import pytest
+from sqlmodel import SQLModel, Session, create_engine, select
+from sqlmodel.pool import StaticPool
+from starlette.concurrency import run_in_threadpool
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.user import User
+from models.asset import Asset
+from models.plan import Plan
+from routes.onboarding import load_demo_data
+from utils.lanes import Lane, batch_lane, get_lane_metrics
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def make_user(tag: str = "") -> User:
+    uid = tag or uuid.uuid4().hex[:8]
+    return User(
+        id=f"user_{uid}",
+        email=f"{uid}@example.com",
+        first_name="Test",
+        last_name="User",
+    )
+
+
+class ConcurrencyProbe:
+    """Records the most calls inside it at once"""
+
+    def __init__(self, hold: float = 0.02):
+        self.hold = hold
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, value=None):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.hold)
+        with self._lock:
+            self.active -= 1
+        return value
+
+
+# ---------------------------------------------------------------------------
+# 1. Worker quota
+# ---------------------------------------------------------------------------
+
+class TestWorkerQuota:
+    def test_runs_at_most_workers_at_once(self):
+        lane = Lane("test", workers=2)
+        probe = ConcurrencyProbe()
+
+        async def scenario():
+            return await asyncio.gather(*(lane.run(probe, i) for i in range(6)))
+
+        assert run(scenario()) == list(range(6))
+        assert probe.peak == 2
+
+    def test_queue_depth_reported_while_waiting(self):
+        lane = Lane("test", workers=1)
+        release = threading.Event()
+
+        async def scenario():
+            calls = [asyncio.ensure_future(lane.run(release.wait, 2)) for _ in range(3)]
+            await asyncio.sleep(0.05)
+            snapshot = lane.snapshot()
+            release.set()
+            await asyncio.gather(*calls)
+            return snapshot
+
+        snapshot = run(scenario())
+        assert snapshot["threads"] == {"limit": 1, "running": 1, "waiting": 2}
+        assert snapshot["queue_depth"] == 2
+        assert lane.snapshot()["queue_depth"] == 0
+
+    def test_exception_propagates_and_counts_as_failed(self):
+        lane = Lane("test", workers=1)
+
+        def boom():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            run(lane.run(boom))
+        snapshot = lane.snapshot()
+        assert snapshot["failed"] == 1
+        assert snapshot["threads"]["running"] == 0
+
+
+# ---------------------------------------------------------------------------
+# 2. Interactive headroom
+# ---------------------------------------------------------------------------
+
+class TestInteractiveHeadroom:
+    def test_saturated_batch_lane_leaves_default_threadpool_free(self):
+        lane = Lane("test", workers=1)
+        release = threading.Event()
+
+        async def scenario():
+            blocked = [asyncio.ensure_future(lane.run(release.wait, 2)) for _ in range(3)]
+            await asyncio.sleep(0.02)
+            started = time.monotonic()
+            interactive = await asyncio.wait_for(run_in_threadpool(lambda: "ok"), timeout=1)
+            waited = time.monotonic() - started
+            release.set()
+            await asyncio.gather(*blocked)
+            return interactive, waited
+
+        interactive, waited = run(scenario())
+        assert interactive == "ok"
+        assert waited < 0.5
+
+
+# ---------------------------------------------------------------------------
+# 3. Connection quota
+# ---------------------------------------------------------------------------
+
+class TestConnectionQuota:
+    def test_sessions_capped_per_lane(self):
+        lane = Lane("test", workers=4, connections=1)
+        probe = ConcurrencyProbe()
+
+        def with_connection(value):
+            with lane.connection():
+                return probe(value)
+
+        async def scenario():
+            return await asyncio.gather(*(lane.run(with_connection, i) for i in range(4)))
+
+        assert run(scenario()) == [0, 1, 2, 3]
+        assert probe.peak == 1
+        snapshot = lane.snapshot()["connections"]
+        assert snapshot["limit"] == 1
+        assert snapshot["in_use"] == 0
+
+    def test_nested_sessions_share_the_threads_slot(self):
+        lane = Lane("test", workers=1, connections=1)
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+        def nested():
+            with lane.session(engine):
+                with lane.session(engine):
+                    return lane.snapshot()["connections"]["in_use"]
+
+        assert run(asyncio.wait_for(lane.run(nested), timeout=2)) == 1
+        assert lane.snapshot()["connections"]["in_use"] == 0
+
+
+# ---------------------------------------------------------------------------
+# 4. Metrics
+# ---------------------------------------------------------------------------
+
+class TestMetrics:
+    def test_wait_and_run_latency(self):
+        lane = Lane("test", workers=1)
+        probe = ConcurrencyProbe(hold=0.02)
+
+        async def scenario():
+            await asyncio.gather(*(lane.run(probe) for _ in range(3)))
+
+        run(scenario())
+        snapshot = lane.snapshot()
+        assert snapshot["completed"] == 3
+        assert snapshot["run_seconds"]["p50"] >= 0.02
+        # The last call queued behind two others
+        assert snapshot["wait_seconds"]["max"] >= 0.04
+
+    def test_track_counts_in_flight(self):
+        lane = Lane("test")
+
+        # Lanes without their own workers report the default threadpool (needs a running loop)
+        async def scenario():
+            async with lane.track():
+                inside = lane.snapshot()["in_flight"]
+            return inside, lane.snapshot()
+
+        inside, snapshot = run(scenario())
+        assert inside == 1
+        assert snapshot["in_flight"] == 0
+        assert snapshot["completed"] == 1
+        assert snapshot["connections"]["limit"] is None
+
+    def test_published_lanes(self):
+        async def scenario():
+            return get_lane_metrics()
+
+        metrics = run(scenario())
+        assert set(metrics) == {"interactive", "batch"}
+        assert metrics["batch"]["threads"]["limit"] == batch_lane.workers
+        assert metrics["batch"]["connections"]["limit"] == batch_lane.connections
+
+
+# ---------------------------------------------------------------------------
+# 5. Batch work
+# ---------------------------------------------------------------------------
+
+class TestBatchWork:
+    def test_demo_data_seeded_in_batch_lane(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        SQLModel.metadata.create_all(engine)
+        user = make_user()
+        user.name = "Demo User"
+        with Session(engine) as s:
+            s.add(user)
+            s.commit()
+            s.refresh(user)
+
+        completed = batch_lane.snapshot()["completed"]
+        with Session(engine) as session:
+            result = run(load_demo_data(current_user=user, session=session))
+
+        assert result["summary"]["assets"] == 3
+        assert batch_lane.snapshot()["completed"] == completed + 1
+        with Session(engine) as s:
+            assert len(s.exec(select(Asset).where(Asset.user_id == user.id)).all()) == 3
+            assert len(s.exec(select(Plan).where(Plan.user_id == user.id)).all()) == 1
+        SQLModel.metadata.drop_all(engine)
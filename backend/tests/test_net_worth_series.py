@@ -0,0 +1,402 @@
+"""
+Tests for net worth rollups and the time-series endpoint
+(utils/snapshot_rollups.py, GET /api/dashboard/net-worth-series).
+
+Covers:
+1. Periods — week, month and quarter bounds
+2. Incremental rollups — merged as snapshots are written, same-day rewrites
+   replaced, backfilled days counted, written with an upsert
+3. Rebuild and compaction — exact rebuild, raw rows past the horizon deleted
+4. Series endpoint — resolutions, ranges, validation, ETag, data isolation
+5. Deletion — a portfolio with rollups can be deleted
+"""
+
+import sys
+import os
+import uuid
+import asyncio
+from decimal import Decimal
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import event, inspect
+from sqlmodel import SQLModel, Session, create_engine, select
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.user import User
+from models.portfolio import Portfolio
+from models.asset import Asset
+from models.net_worth import NetWorthRollup, NetWorthSnapshot
+from routes.dashboard import get_net_worth_series
+from routes.portfolios import delete_portfolio
+import utils.snapshot_rollups as rollups
+from utils.snapshot_rollups import (
+    compact_snapshots, compaction_cutoff, merge_into_rollups, period_bounds, rebuild_rollups,
+)
+from utils.snapshots import generate_daily_snapshots
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    # File database: compaction runs in batch-lane threads
+    eng = create_engine(f"sqlite:///{tmp_path / 'series.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(eng)
+    yield eng
+    SQLModel.metadata.drop_all(eng)
+    eng.dispose()
+
+
+def _enforce_foreign_keys(engine):
+    # SQLite ignores foreign keys unless asked; Postgres always enforces them
+    event.listen(engine, "connect", lambda conn, record: conn.execute("PRAGMA foreign_keys=ON"))
+    engine.dispose()
+
+
+def _add_user(engine) -> User:
+    uid = uuid.uuid4().hex[:8]
+    user = User(id=f"user_{uid}", email=f"{uid}@example.com", name="Test User")
+    with Session(engine) as s:
+        s.add(user)
+        s.commit()
+        s.refresh(user)
+    return user
+
+
+def _add_portfolio(engine, user: User) -> str:
+    portfolio_id = str(uuid.uuid4())
+    with Session(engine) as s:
+        s.add(Portfolio(id=portfolio_id, user_id=user.id, name="Series Portfolio", type="actual"))
+        s.commit()
+    return portfolio_id
+
+
+def _write(engine, user: User, portfolio_id: str, day: date, net_worth, merge: bool = True):
+    """Write a snapshot the way every writer does: insert, merge into rollups, commit"""
+    snapshot = NetWorthSnapshot(
+        id=str(uuid.uuid4()), user_id=user.id, portfolio_id=portfolio_id, date=day,
+        net_worth=Decimal(str(net_worth)), total_assets=Decimal(str(net_worth)) + 100,
+        total_liabilities=Decimal("100"),
+    )
+    with Session(engine) as s:
+        s.add(snapshot)
+        if merge:
+            merge_into_rollups(s, [snapshot.model_dump()])
+        s.commit()
+
+
+def _rollups(engine, portfolio_id: str, resolution: str):
+    with Session(engine) as s:
+        return s.exec(select(NetWorthRollup).where(
+            NetWorthRollup.portfolio_id == portfolio_id,
+            NetWorthRollup.resolution == resolution,
+        ).order_by(NetWorthRollup.period_start)).all()
+
+
+def _figures(rows):
+    return [
+        (r.period_start, r.first_date, r.last_date, r.samples, r.net_worth,
+         r.open_net_worth, r.min_net_worth, r.max_net_worth)
+        for r in rows
+    ]
+
+
+def _series(engine, user, portfolio_id, resolution="monthly", date_from=None, date_to=None, request=None, response=None):
+    with Session(engine) as s:
+        return run(get_net_worth_series(
+            portfolio_id=portfolio_id, resolution=resolution, date_from=date_from, date_to=date_to,
+            current_user=user, session=s, request=request, response=response,
+        ))
+
+
+# ---------------------------------------------------------------------------
+# 1. Periods
+# ---------------------------------------------------------------------------
+
+class TestPeriods:
+    def test_week_starts_monday(self):
+        assert period_bounds("weekly", date(2026, 10, 22)) == (date(2026, 10, 19), date(2026, 10, 25))
+
+    def test_month(self):
+        assert period_bounds("monthly", date(2024, 2, 10)) == (date(2024, 2, 1), date(2024, 2, 29))
+
+    def test_quarter_wraps_year(self):
+        assert period_bounds("quarterly", date(2026, 11, 5)) == (date(2026, 10, 1), date(2026, 12, 31))
+        assert period_bounds("quarterly", date(2026, 1, 1)) == (date(2026, 1, 1), date(2026, 3, 31))
+
+    def test_unknown_resolution(self):
+        with pytest.raises(ValueError):
+            period_bounds("hourly", date(2026, 1, 1))
+
+    def test_compaction_cutoff_is_a_month_start(self):
+        with patch.object(rollups, "SNAPSHOT_RAW_RETENTION_DAYS", 30):
+            assert compaction_cutoff(date(2026, 10, 19)) == date(2026, 9, 1)
+
+
+# ---------------------------------------------------------------------------
+# 2. Incremental rollups
+# ---------------------------------------------------------------------------
+
+class TestIncrementalRollups:
+    def test_month_tracks_open_close_min_max(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        for day, value in ((3, 100), (10, 50), (17, 300), (24, 200)):
+            _write(engine, user, portfolio_id, date(2026, 8, day), value)
+
+        [month] = _rollups(engine, portfolio_id, "monthly")
+        assert _figures([month]) == [(
+            date(2026, 8, 1), date(2026, 8, 3), date(2026, 8, 24), 4,
+            Decimal("200"), Decimal("100"), Decimal("50"), Decimal("300"),
+        )]
+        assert month.period_end == date(2026, 8, 31)
+        assert month.total_assets == Decimal("300")
+        assert len(_rollups(engine, portfolio_id, "weekly")) == 4
+        assert len(_rollups(engine, portfolio_id, "quarterly")) == 1
+
+    def test_same_day_rewrite_replaces_close(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        _write(engine, user, portfolio_id, date(2026, 8, 3), 100)
+        _write(engine, user, portfolio_id, date(2026, 8, 3), 150)
+
+        [month] = _rollups(engine, portfolio_id, "monthly")
+        assert (month.samples, month.net_worth, month.min_net_worth, month.max_net_worth) == (
+            1, Decimal("150"), Decimal("150"), Decimal("150"),
+        )
+
+    def test_backfilled_day_inside_range_counted_once(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        for day, value in ((3, 100), (24, 200), (10, 50), (10, 75)):
+            _write(engine, user, portfolio_id, date(2026, 8, day), value)
+
+        [month] = _rollups(engine, portfolio_id, "monthly")
+        assert (month.samples, month.net_worth, month.min_net_worth) == (3, Decimal("200"), Decimal("50"))
+        with Session(engine) as s:
+            rebuild_rollups(s, [portfolio_id])
+            s.commit()
+        assert _rollups(engine, portfolio_id, "monthly")[0].samples == 3
+
+    def test_rollups_upserted_not_deleted(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        _write(engine, user, portfolio_id, date(2026, 8, 3), 100)
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            _write(engine, user, portfolio_id, date(2026, 8, 4), 120)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        rollup_writes = [sql for sql in statements if "net_worth_rollups" in sql and not sql.lstrip().startswith("SELECT")]
+        assert rollup_writes and all("ON CONFLICT" in sql for sql in rollup_writes)
+        assert _rollups(engine, portfolio_id, "monthly")[0].samples == 2
+
+    def test_nightly_generation_merges_and_reruns_idempotently(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        with Session(engine) as s:
+            s.add(Asset(
+                id=str(uuid.uuid4()), user_id=user.id, portfolio_id=portfolio_id,
+                name="Cash", type="cash", current_value=Decimal("1000"), is_active=True,
+            ))
+            s.commit()
+
+        for day in (date(2026, 10, 19), date(2026, 10, 20), date(2026, 10, 20)):
+            generate_daily_snapshots(engine, day)
+
+        [week] = _rollups(engine, portfolio_id, "weekly")
+        assert (week.samples, week.net_worth, week.last_date) == (2, Decimal("1000"), date(2026, 10, 20))
+
+
+# ---------------------------------------------------------------------------
+# 3. Rebuild and compaction
+# ---------------------------------------------------------------------------
+
+def _history(engine, user, portfolio_id, start: date, days: int, merge: bool = True):
+    for i in range(days):
+        _write(engine, user, portfolio_id, start + timedelta(days=i), 1000 + (i * 37) % 101, merge=merge)
+
+
+class TestRebuildAndCompaction:
+    def test_rebuild_matches_incremental(self, engine):
+        user = _add_user(engine)
+        merged, rebuilt = _add_portfolio(engine, user), _add_portfolio(engine, user)
+        _history(engine, user, merged, date(2026, 1, 1), 120)
+        _history(engine, user, rebuilt, date(2026, 1, 1), 120, merge=False)
+
+        with Session(engine) as s:
+            rebuild_rollups(s, [rebuilt])
+            s.commit()
+
+        for resolution in ("weekly", "monthly", "quarterly"):
+            assert _figures(_rollups(engine, rebuilt, resolution)) == _figures(_rollups(engine, merged, resolution))
+
+    def test_compaction_deletes_old_raw_and_keeps_rollups(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        _history(engine, user, portfolio_id, date(2026, 1, 1), 120)
+        before = {r: _figures(_rollups(engine, portfolio_id, r)) for r in ("weekly", "monthly", "quarterly")}
+
+        with patch.object(rollups, "SNAPSHOT_RAW_RETENTION_DAYS", 30):
+            stats = compact_snapshots(engine, date(2026, 4, 15))
+
+        # Cutoff is 2026-03-01: January and February are compacted
+        assert stats["cutoff"] == "2026-03-01"
+        assert stats["deleted"] == 31 + 28
+        with Session(engine) as s:
+            oldest = s.exec(select(NetWorthSnapshot.date).order_by(NetWorthSnapshot.date)).first()
+        assert oldest == date(2026, 3, 1)
+        for resolution, figures in before.items():
+            assert _figures(_rollups(engine, portfolio_id, resolution)) == figures
+
+    def test_partly_compacted_period_not_rebuilt_from_remaining_rows(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        _history(engine, user, portfolio_id, date(2026, 1, 1), 120)
+        before = _figures(_rollups(engine, portfolio_id, "quarterly"))
+
+        with patch.object(rollups, "SNAPSHOT_RAW_RETENTION_DAYS", 30):
+            compact_snapshots(engine, date(2026, 4, 15))
+        with Session(engine) as s:
+            rebuild_rollups(s, [portfolio_id])
+            s.commit()
+
+        # Q1 keeps January and February although only March is still raw
+        assert _figures(_rollups(engine, portfolio_id, "quarterly")) == before
+
+    def test_compaction_is_a_no_op_inside_the_horizon(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        _history(engine, user, portfolio_id, date(2026, 10, 1), 10)
+
+        stats = compact_snapshots(engine, date(2026, 10, 19))
+
+        assert stats["deleted"] == 0
+        assert stats["portfolios"] == 0
+
+    def test_portfolio_date_index(self, engine):
+        indexes = {i["name"]: i["column_names"] for i in inspect(engine).get_indexes("net_worth_snapshots")}
+        assert indexes["ix_net_worth_snapshots_portfolio_id_date"] == ["portfolio_id", "date"]
+
+
+# ---------------------------------------------------------------------------
+# 4. Series endpoint
+# ---------------------------------------------------------------------------
+
+class FakeRequest:
+    def __init__(self, etag: str = None):
+        self.headers = {"if-none-match": etag} if etag else {}
+
+
+class TestSeriesEndpoint:
+    def test_monthly_points_in_range(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        _history(engine, user, portfolio_id, date(2026, 1, 1), 120)
+
+        result = _series(engine, user, portfolio_id, "monthly", date(2026, 2, 15), date(2026, 3, 10))
+
+        assert [p.period_start for p in result.points] == [date(2026, 2, 1), date(2026, 3, 1)]
+        assert result.points[0].date == date(2026, 2, 28)
+        assert result.points[0].samples == 28
+        assert result.resolution == "monthly"
+
+    def test_daily_points_latest_snapshot_per_day(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        _write(engine, user, portfolio_id, date(2026, 5, 1), 100)
+        _write(engine, user, portfolio_id, date(2026, 5, 2), 200)
+        _write(engine, user, portfolio_id, date(2026, 5, 2), 250)
+        _write(engine, user, portfolio_id, date(2026, 5, 3), 300)
+
+        result = _series(engine, user, portfolio_id, "daily", date(2026, 5, 2))
+
+        assert [(p.date, p.net_worth) for p in result.points] == [
+            (date(2026, 5, 2), Decimal("250")), (date(2026, 5, 3), Decimal("300")),
+        ]
+
+    def test_open_ended_range_returns_everything(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        _history(engine, user, portfolio_id, date(2026, 1, 1), 120)
+
+        result = _series(engine, user, portfolio_id, "quarterly")
+
+        assert [p.period_start for p in result.points] == [date(2026, 1, 1), date(2026, 4, 1)]
+
+    def test_invalid_resolution(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        with pytest.raises(HTTPException) as exc:
+            _series(engine, user, portfolio_id, "hourly")
+        assert exc.value.status_code == 400
+
+    def test_from_after_to(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        with pytest.raises(HTTPException) as exc:
+            _series(engine, user, portfolio_id, "monthly", date(2026, 2, 1), date(2026, 1, 1))
+        assert exc.value.status_code == 400
+
+    def test_other_users_portfolio_not_found(self, engine):
+        owner, other = _add_user(engine), _add_user(engine)
+        portfolio_id = _add_portfolio(engine, owner)
+        _write(engine, owner, portfolio_id, date(2026, 5, 1), 100)
+        with pytest.raises(HTTPException) as exc:
+            _series(engine, other, portfolio_id)
+        assert exc.value.status_code == 404
+
+    def test_etag_until_new_snapshot(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        _write(engine, user, portfolio_id, date(2026, 5, 1), 100)
+
+        response = Response()
+        _series(engine, user, portfolio_id, response=response)
+        etag = response.headers["ETag"]
+
+        cached = _series(engine, user, portfolio_id, request=FakeRequest(etag))
+        assert cached.status_code == 304
+
+        _write(engine, user, portfolio_id, date(2026, 5, 2), 200)
+        fresh = _series(engine, user, portfolio_id, request=FakeRequest(etag), response=Response())
+        assert fresh.points[-1].net_worth == Decimal("200")
+
+
+# ---------------------------------------------------------------------------
+# 5. Deletion
+# ---------------------------------------------------------------------------
+
+class TestDeletion:
+    def test_portfolio_with_rollups_deleted(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        with Session(engine) as s:
+            merge_into_rollups(s, [NetWorthSnapshot(
+                id=str(uuid.uuid4()), user_id=user.id, portfolio_id=portfolio_id,
+                date=date(2026, 8, 3), net_worth=Decimal("1000"),
+            ).model_dump()])
+            s.commit()
+        assert _rollups(engine, portfolio_id, "monthly")
+
+        _enforce_foreign_keys(engine)
+        with Session(engine) as s:
+            run(delete_portfolio(portfolio_id=portfolio_id, current_user=user, session=s))
+
+        with Session(engine) as s:
+            assert s.get(Portfolio, portfolio_id) is None
+        assert _rollups(engine, portfolio_id, "monthly") == []
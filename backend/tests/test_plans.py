@@ -0,0 +1,392 @@
+"""
+Tests for batch plan projections (POST /plans/portfolio/{portfolio_id}/projections).
+
+Covers:
+1. Plans — every active plan projected, identical to GET /plans/{id}/projections
+2. Variants — overrides on a base plan or on the portfolio's current position
+3. Loading — portfolio data queried once however many plans are projected
+4. Errors — unknown plans, duplicate keys, invalid ages, data isolation
+5. Result store — GET /plans/{id}/projections persisted and served until the
+   plan or portfolio data changes; stale plans refreshed in the background
+6. Balance sheet — assets earn their own returns and liabilities charge their own interest
+"""
+
+import sys
+import os
+import uuid
+import asyncio
+from decimal import Decimal
+
+import pytest
+from sqlmodel import SQLModel, Session, create_engine
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from fastapi import BackgroundTasks, HTTPException
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.user import User
+from models.portfolio import Portfolio
+from models.plan import Plan, PlanResult, PlanUpdate
+from models.asset import Asset
+from models.liability import Liability
+from models.income import IncomeSource
+from models.expense import Expense
+import routes.plans as plans_routes
+from routes.plans import (
+    PlanBatchRequest,
+    PlanVariant,
+    delete_plan,
+    get_plan_projections,
+    get_portfolio_plan_projections,
+    get_portfolio_plans,
+    update_plan,
+)
+from utils.data_version import bump_portfolio_version
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def make_engine():
+    return create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+
+def make_user(tag: str = "") -> User:
+    uid = tag or uuid.uuid4().hex[:8]
+    return User(
+        id=f"user_{uid}",
+        email=f"{uid}@example.com",
+        first_name="Test",
+        last_name="User",
+    )
+
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture()
+def engine():
+    eng = make_engine()
+    SQLModel.metadata.create_all(eng)
+    yield eng
+    SQLModel.metadata.drop_all(eng)
+
+
+def _seed(engine, user: User, plan_types=("lean_fire", "fire", "fat_fire")) -> tuple:
+    """Portfolio with savings, net worth and one plan per type; returns (portfolio_id, plan_ids)"""
+    portfolio_id = str(uuid.uuid4())
+    plan_ids = []
+    with Session(engine) as s:
+        s.add(Portfolio(id=portfolio_id, user_id=user.id, name="FIRE Portfolio", type="actual"))
+        s.add(Asset(user_id=user.id, portfolio_id=portfolio_id, name="ETFs", type="etf", current_value=Decimal("250000")))
+        s.add(IncomeSource(user_id=user.id, portfolio_id=portfolio_id, name="Salary", type="salary",
+                           amount=Decimal("9000"), frequency="monthly"))
+        s.add(Expense(user_id=user.id, portfolio_id=portfolio_id, name="Living", category="housing",
+                      amount=Decimal("5000"), frequency="monthly"))
+        for i, plan_type in enumerate(plan_types):
+            plan = Plan(
+                user_id=user.id,
+                portfolio_id=portfolio_id,
+                name=plan_type,
+                type=plan_type,
+                retirement_age=50 + 5 * i,
+                target_equity=Decimal("1000000") * (i + 1),
+            )
+            s.add(plan)
+            plan_ids.append(plan.id)
+        s.commit()
+    return portfolio_id, plan_ids
+
+
+def _batch(engine, user, portfolio_id, **kwargs):
+    with Session(engine) as session:
+        return run(get_portfolio_plan_projections(
+            portfolio_id=portfolio_id, data=PlanBatchRequest(**kwargs), current_user=user, session=session,
+        ))
+
+
+# ---------------------------------------------------------------------------
+# 1. Plans
+# ---------------------------------------------------------------------------
+
+class TestBatchPlans:
+    def test_all_active_plans_match_single_plan_endpoint(self, engine):
+        user = make_user()
+        portfolio_id, plan_ids = _seed(engine, user)
+        batch = _batch(engine, user, portfolio_id)
+
+        assert set(batch.results) == set(plan_ids)
+        assert batch.current_net_worth == Decimal("250000.00")
+        assert batch.annual_savings == Decimal("48000.00")
+        with Session(engine) as session:
+            for plan_id in plan_ids:
+                single = run(get_plan_projections(
+                    plan_id=plan_id, portfolio_id=portfolio_id, current_user=user, session=session,
+                ))
+                assert batch.results[plan_id] == single
+
+    def test_inactive_plans_skipped_unless_requested(self, engine):
+        user = make_user()
+        portfolio_id, plan_ids = _seed(engine, user)
+        with Session(engine) as s:
+            plan = s.get(Plan, plan_ids[0])
+            plan.is_active = False
+            s.add(plan)
+            s.commit()
+
+        assert set(_batch(engine, user, portfolio_id).results) == set(plan_ids[1:])
+        assert list(_batch(engine, user, portfolio_id, plan_ids=[plan_ids[0]]).results) == [plan_ids[0]]
+
+
+# ---------------------------------------------------------------------------
+# 2. Variants
+# ---------------------------------------------------------------------------
+
+class TestBatchVariants:
+    def test_variant_overrides_base_plan(self, engine):
+        user = make_user()
+        portfolio_id, plan_ids = _seed(engine, user)
+        batch = _batch(engine, user, portfolio_id, plan_ids=[plan_ids[1]], variants=[
+            PlanVariant(key="fire_retire_later", base_plan_id=plan_ids[1], retirement_age=65),
+        ])
+
+        base, later = batch.results[plan_ids[1]], batch.results["fire_retire_later"]
+        assert base.fire_number == later.fire_number
+        first_retired_age = next(p.age for p in later.projections if p.phase == "retirement")
+        assert first_retired_age == 65
+
+    def test_variant_without_base_uses_portfolio_position(self, engine):
+        user = make_user()
+        portfolio_id, _ = _seed(engine, user)
+        batch = _batch(engine, user, portfolio_id, plan_ids=[], variants=[
+            PlanVariant(key="coast", annual_savings=0, expected_return=6.0),
+        ])
+
+        coast = batch.results["coast"]
+        assert list(batch.results) == ["coast"]
+        assert coast.projections[0].net_worth == Decimal("250000.00")
+        # The ETFs keep their own 7% return; the variant's 6% applies to the rest of net worth
+        accumulation = [p for p in coast.projections if p.phase == "accumulation"]
+        for year, point in enumerate(accumulation):
+            assert float(point.net_worth) == pytest.approx(250000 * 1.07 ** year, abs=0.01)
+
+    def test_identical_inputs_computed_once(self, engine):
+        user = make_user()
+        portfolio_id, plan_ids = _seed(engine, user)
+        batch = _batch(engine, user, portfolio_id, plan_ids=[plan_ids[0]], variants=[
+            PlanVariant(key="same", base_plan_id=plan_ids[0]),
+        ])
+        assert batch.results["same"] is batch.results[plan_ids[0]]
+
+
+# ---------------------------------------------------------------------------
+# 3. Loading
+# ---------------------------------------------------------------------------
+
+class TestBatchLoading:
+    def test_query_count_independent_of_plan_count(self, engine):
+        user = make_user()
+        small_portfolio, _ = _seed(engine, user, plan_types=("fire",))
+        large_portfolio, _ = _seed(engine, user, plan_types=("lean_fire", "fire", "fat_fire", "coast_fire", "barista_fire"))
+
+        def queries(portfolio_id):
+            statements = []
+            listener = lambda *args: statements.append(args[2])
+            event.listen(engine, "before_cursor_execute", listener)
+            try:
+                batch = _batch(engine, user, portfolio_id)
+            finally:
+                event.remove(engine, "before_cursor_execute", listener)
+            return len(statements), len(batch.results)
+
+        small_queries, small_results = queries(small_portfolio)
+        large_queries, large_results = queries(large_portfolio)
+        assert (small_results, large_results) == (1, 5)
+        assert large_queries == small_queries
+
+
+# ---------------------------------------------------------------------------
+# 4. Errors
+# ---------------------------------------------------------------------------
+
+class TestBatchErrors:
+    def test_unknown_plan_id(self, engine):
+        user = make_user()
+        portfolio_id, _ = _seed(engine, user)
+        with pytest.raises(HTTPException) as exc:
+            _batch(engine, user, portfolio_id, plan_ids=["missing"])
+        assert exc.value.status_code == 404
+        assert exc.value.detail["plan_ids"] == ["missing"]
+
+    def test_unknown_base_plan(self, engine):
+        user = make_user()
+        portfolio_id, _ = _seed(engine, user)
+        with pytest.raises(HTTPException) as exc:
+            _batch(engine, user, portfolio_id, variants=[PlanVariant(key="v", base_plan_id="missing")])
+        assert exc.value.status_code == 404
+
+    def test_duplicate_keys(self, engine):
+        user = make_user()
+        portfolio_id, plan_ids = _seed(engine, user)
+        with pytest.raises(HTTPException) as exc:
+            _batch(engine, user, portfolio_id, variants=[PlanVariant(key=plan_ids[0])])
+        assert exc.value.status_code == 400
+
+    def test_age_range_too_large(self, engine):
+        user = make_user()
+        portfolio_id, _ = _seed(engine, user)
+        with pytest.raises(HTTPException) as exc:
+            _batch(engine, user, portfolio_id, variants=[PlanVariant(key="v", current_age=5, life_expectancy=120)])
+        assert exc.value.status_code == 400
+
+    def test_other_users_plans_not_visible(self, engine):
+        owner, intruder = make_user(), make_user()
+        portfolio_id, plan_ids = _seed(engine, owner)
+        intruder_portfolio, _ = _seed(engine, intruder, plan_types=())
+
+        with pytest.raises(HTTPException) as exc:
+            _batch(engine, intruder, portfolio_id)
+        assert exc.value.status_code == 404
+        with pytest.raises(HTTPException) as exc:
+            _batch(engine, intruder, intruder_portfolio, plan_ids=plan_ids)
+        assert exc.value.status_code == 404
+
+
+# ---------------------------------------------------------------------------
+# 5. Result store
+# ---------------------------------------------------------------------------
+
+def _view(engine, user, plan_id, portfolio_id):
+    with Session(engine) as session:
+        return run(get_plan_projections(plan_id=plan_id, portfolio_id=portfolio_id, current_user=user, session=session))
+
+
+def _list(engine, user, portfolio_id) -> BackgroundTasks:
+    tasks = BackgroundTasks()
+    with Session(engine) as session:
+        run(get_portfolio_plans(portfolio_id=portfolio_id, background_tasks=tasks, current_user=user, session=session))
+    return tasks
+
+
+class TestResultStore:
+    def test_first_view_persists_result_and_summary(self, engine):
+        user = make_user()
+        portfolio_id, plan_ids = _seed(engine, user, plan_types=("fire",))
+        result = _view(engine, user, plan_ids[0], portfolio_id)
+
+        with Session(engine) as s:
+            plan = s.get(Plan, plan_ids[0])
+            assert s.get(PlanResult, plan_ids[0]) is not None
+            assert plan.last_calculated is not None
+            assert plan.success_probability == Decimal(str(result.success_probability))
+            assert plan.projected_fire_age == result.fire_age
+            assert plan.projected_fire_year == (str(result.fire_year) if result.fire_year else None)
+
+    def test_repeat_view_served_from_store(self, engine):
+        user = make_user()
+        portfolio_id, plan_ids = _seed(engine, user, plan_types=("fire",))
+        first = _view(engine, user, plan_ids[0], portfolio_id)
+
+        with patch.object(plans_routes, "_run_projection") as spy:
+            second = _view(engine, user, plan_ids[0], portfolio_id)
+        spy.assert_not_called()
+        assert second == first
+
+    def test_portfolio_change_invalidates(self, engine):
+        user = make_user()
+        portfolio_id, plan_ids = _seed(engine, user, plan_types=("fire",))
+        _view(engine, user, plan_ids[0], portfolio_id)
+        with Session(engine) as s:
+            s.add(Asset(user_id=user.id, portfolio_id=portfolio_id, name="Cash", type="cash", current_value=Decimal("100000")))
+            s.commit()
+        run(bump_portfolio_version(portfolio_id, user.id))
+
+        result = _view(engine, user, plan_ids[0], portfolio_id)
+        assert result.projections[0].net_worth == Decimal("350000.00")
+
+    def test_plan_edit_invalidates(self, engine):
+        user = make_user()
+        portfolio_id, plan_ids = _seed(engine, user, plan_types=("fire",))
+        _view(engine, user, plan_ids[0], portfolio_id)
+        with Session(engine) as session:
+            run(update_plan(plan_id=plan_ids[0], data=PlanUpdate(retirement_age=65), current_user=user, session=session))
+
+        result = _view(engine, user, plan_ids[0], portfolio_id)
+        assert next(p.age for p in result.projections if p.phase == "retirement") == 65
+
+    def test_other_portfolio_not_persisted(self, engine):
+        user = make_user()
+        portfolio_id, plan_ids = _seed(engine, user, plan_types=("fire",))
+        other_portfolio, _ = _seed(engine, user, plan_types=())
+        _view(engine, user, plan_ids[0], other_portfolio)
+
+        with Session(engine) as s:
+            assert s.get(PlanResult, plan_ids[0]) is None
+            assert s.get(Plan, plan_ids[0]).last_calculated is None
+
+    def test_listing_refreshes_stale_plans_in_background(self, engine):
+        user = make_user()
+        portfolio_id, plan_ids = _seed(engine, user)
+        tasks = _list(engine, user, portfolio_id)
+        assert len(tasks.tasks) == 1
+        run(tasks())
+
+        with Session(engine) as s:
+            assert all(s.get(Plan, plan_id).last_calculated is not None for plan_id in plan_ids)
+        assert _list(engine, user, portfolio_id).tasks == []
+        with patch.object(plans_routes, "_run_projection") as spy:
+            _view(engine, user, plan_ids[0], portfolio_id)
+        spy.assert_not_called()
+
+    def test_delete_removes_stored_result(self, engine):
+        user = make_user()
+        portfolio_id, plan_ids = _seed(engine, user, plan_types=("fire",))
+        _view(engine, user, plan_ids[0], portfolio_id)
+        with Session(engine) as session:
+            run(delete_plan(plan_id=plan_ids[0], current_user=user, session=session))
+        with Session(engine) as s:
+            assert s.get(PlanResult, plan_ids[0]) is None
+
+
+# ---------------------------------------------------------------------------
+# 6. Balance sheet
+# ---------------------------------------------------------------------------
+
+class TestBalanceSheet:
+    def test_liability_interest_replaces_expected_return(self, engine):
+        user = make_user()
+        portfolio_id, plan_ids = _seed(engine, user, plan_types=("fire",))
+        with Session(engine) as s:
+            s.add(Liability(user_id=user.id, portfolio_id=portfolio_id, name="Car", type="car_loan",
+                            original_amount=Decimal("20000"), current_balance=Decimal("20000"),
+                            interest_rate=Decimal("12.00"), minimum_payment=Decimal("0")))
+            s.commit()
+
+        first = _view(engine, user, plan_ids[0], portfolio_id).projections[0]
+        # 7% on the ETFs, less a year of 1%-a-month interest on the unpaid loan (not 7% of 230,000)
+        interest = 20000 * (1.01 ** 12 - 1)
+        assert first.net_worth == Decimal("230000.00")
+        assert float(first.investment_returns) == pytest.approx(17500 - interest, abs=0.01)
+
+    def test_asset_return_and_contributions_used(self, engine):
+        user = make_user()
+        portfolio_id, plan_ids = _seed(engine, user, plan_types=("fire",))
+        with Session(engine) as s:
+            s.add(Asset(user_id=user.id, portfolio_id=portfolio_id, name="Super", type="super",
+                        current_value=Decimal("100000"), expected_return=Decimal("10.0"),
+                        contributions={"amount": "1000", "frequency": "monthly"}))
+            s.commit()
+
+        second = _view(engine, user, plan_ids[0], portfolio_id).projections[1]
+        # Contributions come out of savings, so only the super's own 10% is extra return
+        assert float(second.investment_returns) == pytest.approx(
+            250000 * 1.07 * 0.07 + (110000 + 12000) * 0.10 + (48000 - 12000) * 0.07, abs=0.01
+        )
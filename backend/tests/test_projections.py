@@ -10,14 +10,20 @@ Covers:
 3. POST /plans/project — pure calculation, no DB, returns ProjectionResult
 4. Data isolation — other user cannot fetch projections for properties they don't own
 5. Validation — years out of range raises 400
+6. Sparse fields — ?fields= returns (and computes) only the requested metrics
+7. Streaming — NDJSON portfolio projections match the non-streaming response;
+   the admission slot is held by the body, which stops on disconnect
+8. Batch — mixed property/portfolio items, per-item overrides, constant query count
 """
 
 import sys
 import os
 import uuid
 import asyncio
+import json
 from decimal import Decimal
 from datetime import date
+from unittest.mock import patch
 
 import pytest
 from sqlmodel import SQLModel, Session, create_engine
@@ -29,7 +35,16 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 from models.user import User
 from models.portfolio import Portfolio
 from models.property import Property
-from routes.projections import get_property_projections, get_portfolio_projections
+from routes.projections import (
+    get_property_projections,
+    get_portfolio_projections,
+    stream_portfolio_projections,
+    get_batch_projections,
+)
+from models.financials import ProjectionBatchItem, ProjectionBatchRequest
+from sqlalchemy import event
+from starlette.requests import Request
+from utils.admission import heavy_controller
 from routes.plans import calculate_projection, ProjectionInput
 
 
@@ -58,6 +73,13 @@ def run(coro):
     return asyncio.get_event_loop().run_until_complete(coro)
 
 
+def read_ndjson(response) -> list:
+    async def _collect():
+        return [chunk async for chunk in response.body_iterator]
+    body = "".join(run(_collect()))
+    return [json.loads(line) for line in body.splitlines()]
+
+
 @pytest.fixture()
 def engine():
     eng = make_engine()
@@ -313,6 +335,271 @@ class TestPortfolioProjections:
         assert result.totals[0].property_value == prop_sum
 
 
+# ---------------------------------------------------------------------------
+# Tests: sparse ?fields= selection
+# ---------------------------------------------------------------------------
+
+class TestSparseFields:
+
+    def test_equity_only_matches_full_projection(self, engine, user_a):
+        p = _make_portfolio(engine, user_a)
+        prop = _make_property(engine, user_a, p.id)
+        with Session(engine) as session:
+            full = run(get_property_projections(property_id=prop.id, years=5, current_user=user_a, session=session))
+            sparse = run(get_property_projections(
+                property_id=prop.id, years=5, fields="equity", current_user=user_a, session=session,
+            ))
+        assert [yr.equity for yr in sparse.projections] == [yr.equity for yr in full.projections]
+        assert sparse.projections[0].property_value is None
+        assert sparse.projections[0].net_cashflow is None
+
+    def test_equity_only_skips_cashflow_pipelines(self, engine, user_a):
+        p = _make_portfolio(engine, user_a)
+        prop = _make_property(engine, user_a, p.id)
+        with Session(engine) as session:
+            with patch("routes.projections.calculate_rental_income_for_year") as rent, \
+                    patch("routes.projections.calculate_expenses_for_year") as expenses:
+                run(get_property_projections(
+                    property_id=prop.id, years=5, fields="equity", current_user=user_a, session=session,
+                ))
+        rent.assert_not_called()
+        expenses.assert_not_called()
+
+    def test_portfolio_lvr_totals_match_full_projection(self, engine, user_a):
+        p = _make_portfolio(engine, user_a)
+        _make_property(engine, user_a, p.id)
+        _make_property(engine, user_a, p.id)
+        with Session(engine) as session:
+            full = run(get_portfolio_projections(portfolio_id=p.id, years=3, current_user=user_a, session=session))
+            sparse = run(get_portfolio_projections(
+                portfolio_id=p.id, years=3, fields="lvr,net_cashflow", current_user=user_a, session=session,
+            ))
+        assert [yr.lvr for yr in sparse.totals] == [yr.lvr for yr in full.totals]
+        assert [yr.net_cashflow for yr in sparse.totals] == [yr.net_cashflow for yr in full.totals]
+        assert sparse.totals[0].property_value is None
+        assert sparse.properties[0].projections[0].total_debt is None
+
+    def test_unknown_field_raises_400(self, engine, user_a):
+        p = _make_portfolio(engine, user_a)
+        prop = _make_property(engine, user_a, p.id)
+        with Session(engine) as session:
+            with pytest.raises(HTTPException) as exc_info:
+                run(get_property_projections(
+                    property_id=prop.id, fields="equity,bogus", current_user=user_a, session=session,
+                ))
+        assert exc_info.value.status_code == 400
+        assert exc_info.value.detail["unknown"] == ["bogus"]
+
+
+# ---------------------------------------------------------------------------
+# Tests: stream_portfolio_projections (NDJSON)
+# ---------------------------------------------------------------------------
+
+class TestStreamingProjections:
+
+    def test_stream_lines_in_order(self, engine, user_a):
+        p = _make_portfolio(engine, user_a)
+        _make_property(engine, user_a, p.id)
+        _make_property(engine, user_a, p.id)
+        with Session(engine) as session:
+            response = run(stream_portfolio_projections(
+                portfolio_id=p.id, years=3, current_user=user_a, session=session,
+            ))
+        lines = read_ndjson(response)
+        assert response.media_type == "application/x-ndjson"
+        assert [line["type"] for line in lines] == ["portfolio", "property", "property", "totals"]
+        assert lines[0]["data"]["property_count"] == 2
+        assert len(lines[1]["data"]["projections"]) == 4
+
+    def test_stream_totals_match_full_response(self, engine, user_a):
+        p = _make_portfolio(engine, user_a)
+        _make_property(engine, user_a, p.id)
+        _make_property(engine, user_a, p.id)
+        with Session(engine) as session:
+            streamed = read_ndjson(run(stream_portfolio_projections(
+                portfolio_id=p.id, years=3, expense_growth_override=4.0, current_user=user_a, session=session,
+            )))
+            full = run(get_portfolio_projections(
+                portfolio_id=p.id, years=3, expense_growth_override=4.0, current_user=user_a, session=session,
+            ))
+        totals = streamed[-1]["data"]
+        assert [Decimal(row["equity"]) for row in totals] == [row.equity for row in full.totals]
+        assert [Decimal(row["lvr"]) for row in totals] == [row.lvr for row in full.totals]
+
+    def test_stream_respects_fields(self, engine, user_a):
+        p = _make_portfolio(engine, user_a)
+        _make_property(engine, user_a, p.id)
+        with Session(engine) as session:
+            lines = read_ndjson(run(stream_portfolio_projections(
+                portfolio_id=p.id, years=2, fields="equity", current_user=user_a, session=session,
+            )))
+        assert set(lines[1]["data"]["projections"][0]) == {"year", "equity"}
+        assert set(lines[-1]["data"][0]) == {"year", "equity"}
+
+    def test_failure_mid_stream_reported_as_error_line(self, engine, user_a):
+        p = _make_portfolio(engine, user_a)
+        _make_property(engine, user_a, p.id)
+        with Session(engine) as session:
+            response = run(stream_portfolio_projections(
+                portfolio_id=p.id, years=2, current_user=user_a, session=session,
+            ))
+            with patch("routes.projections._generate_property_projections", side_effect=RuntimeError("boom")):
+                lines = read_ndjson(response)
+        assert [line["type"] for line in lines] == ["portfolio", "error"]
+
+    def test_admission_slot_held_while_streaming(self, engine, user_a):
+        p = _make_portfolio(engine, user_a)
+        _make_property(engine, user_a, p.id)
+        with Session(engine) as session:
+            response = run(stream_portfolio_projections(portfolio_id=p.id, years=2, current_user=user_a, session=session))
+
+        async def _consume():
+            body = response.body_iterator
+            await body.__anext__()
+            during = heavy_controller.snapshot()["running"]
+            rest = [chunk async for chunk in body]
+            return during, rest
+
+        during, rest = run(_consume())
+        assert during == 1
+        assert heavy_controller.snapshot()["running"] == 0
+        assert json.loads(rest[-1])["type"] == "totals"
+
+    def test_disconnect_stops_stream_between_properties(self, engine, user_a):
+        p = _make_portfolio(engine, user_a)
+        _make_property(engine, user_a, p.id)
+        _make_property(engine, user_a, p.id)
+
+        async def receive():
+            return {"type": "http.disconnect"}
+
+        request = Request({"type": "http", "method": "GET", "path": "/", "headers": []}, receive)
+        with Session(engine) as session:
+            lines = read_ndjson(run(stream_portfolio_projections(
+                portfolio_id=p.id, years=2, current_user=user_a, session=session, request=request,
+            )))
+        assert [line["type"] for line in lines] == ["portfolio"]
+        assert heavy_controller.snapshot()["running"] == 0
+
+    def test_stream_other_users_portfolio_raises_404(self, engine, user_a, user_b):
+        p = _make_portfolio(engine, user_a)
+        _make_property(engine, user_a, p.id)
+        with Session(engine) as session:
+            with pytest.raises(HTTPException) as exc_info:
+                run(stream_portfolio_projections(portfolio_id=p.id, current_user=user_b, session=session))
+        assert exc_info.value.status_code == 404
+
+
+# ---------------------------------------------------------------------------
+# Tests: get_batch_projections (POST /projections/batch)
+# ---------------------------------------------------------------------------
+
+def _count_queries(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+class TestBatchProjections:
+
+    def test_mixed_batch_matches_single_endpoints(self, engine, user_a):
+        p = _make_portfolio(engine, user_a)
+        prop1 = _make_property(engine, user_a, p.id)
+        _make_property(engine, user_a, p.id)
+        with Session(engine) as session:
+            batch = run(get_batch_projections(
+                data=ProjectionBatchRequest(items=[
+                    ProjectionBatchItem(property_id=prop1.id, years=3),
+                    ProjectionBatchItem(portfolio_id=p.id, years=3),
+                ]),
+                current_user=user_a,
+                session=session,
+            ))
+            single = run(get_portfolio_projections(portfolio_id=p.id, years=3, current_user=user_a, session=session))
+
+        assert list(batch.results) == [f"property:{prop1.id}", f"portfolio:{p.id}"]
+        assert batch.results[f"portfolio:{p.id}"].totals == single.totals
+        assert len(batch.results[f"property:{prop1.id}"].projections) == 4
+        assert batch.errors == {}
+
+    def test_per_item_overrides_with_custom_keys(self, engine, user_a):
+        p = _make_portfolio(engine, user_a)
+        prop = _make_property(engine, user_a, p.id)
+        with Session(engine) as session:
+            batch = run(get_batch_projections(
+                data=ProjectionBatchRequest(items=[
+                    ProjectionBatchItem(key="base", property_id=prop.id, years=5),
+                    ProjectionBatchItem(key="fast", property_id=prop.id, years=5, asset_growth_override=10.0),
+                ]),
+                current_user=user_a,
+                session=session,
+            ))
+        base = batch.results["base"].projections[-1].property_value
+        fast = batch.results["fast"].projections[-1].property_value
+        assert fast > base
+
+    def test_query_count_independent_of_item_count(self, engine, user_a):
+        p = _make_portfolio(engine, user_a)
+        props = [_make_property(engine, user_a, p.id) for _ in range(4)]
+
+        def queries_for(items):
+            statements = _count_queries(engine)
+            with Session(engine) as session:
+                run(get_batch_projections(
+                    data=ProjectionBatchRequest(items=items), current_user=user_a, session=session,
+                ))
+            return len(statements)
+
+        small = queries_for([ProjectionBatchItem(property_id=props[0].id, years=2)])
+        large = queries_for(
+            [ProjectionBatchItem(property_id=prop.id, years=2, interest_rate_offset=1.0) for prop in props]
+            + [ProjectionBatchItem(portfolio_id=p.id, years=2, interest_rate_offset=1.0)]
+        )
+        assert large <= small + 4  # portfolio lookup + its properties, assets and liabilities
+
+    def test_unowned_items_reported_without_failing_batch(self, engine, user_a, user_b):
+        p = _make_portfolio(engine, user_a)
+        prop = _make_property(engine, user_a, p.id)
+        other = _make_portfolio(engine, user_b)
+        other_prop = _make_property(engine, user_b, other.id)
+        with Session(engine) as session:
+            batch = run(get_batch_projections(
+                data=ProjectionBatchRequest(items=[
+                    ProjectionBatchItem(property_id=prop.id, years=2),
+                    ProjectionBatchItem(property_id=other_prop.id, years=2),
+                    ProjectionBatchItem(portfolio_id=other.id, years=2),
+                ]),
+                current_user=user_a,
+                session=session,
+            ))
+        assert list(batch.results) == [f"property:{prop.id}"]
+        assert batch.errors[f"property:{other_prop.id}"].status_code == 404
+        assert batch.errors[f"portfolio:{other.id}"].status_code == 404
+
+    def test_item_with_both_ids_raises_400(self, engine, user_a):
+        with Session(engine) as session:
+            with pytest.raises(HTTPException) as exc_info:
+                run(get_batch_projections(
+                    data=ProjectionBatchRequest(items=[ProjectionBatchItem(property_id="a", portfolio_id="b")]),
+                    current_user=user_a,
+                    session=session,
+                ))
+        assert exc_info.value.status_code == 400
+
+    def test_duplicate_keys_raise_400(self, engine, user_a):
+        with Session(engine) as session:
+            with pytest.raises(HTTPException) as exc_info:
+                run(get_batch_projections(
+                    data=ProjectionBatchRequest(items=[
+                        ProjectionBatchItem(property_id="a"),
+                        ProjectionBatchItem(property_id="a", years=5),
+                    ]),
+                    current_user=user_a,
+                    session=session,
+                ))
+        assert exc_info.value.status_code == 400
+
+
 # ---------------------------------------------------------------------------
 # Tests: calculate_projection (POST /plans/project — pure calculation)
 # ---------------------------------------------------------------------------
@@ -0,0 +1,449 @@
+"""
+Tests for sensitivity analysis (utils/sensitivity.py):
+POST /projections/portfolio/{id}/sensitivity and GET /projections/portfolio/{id}/tornado.
+
+Covers:
+1. Engine — cell combination, first year of extremes, LVR with no value,
+   cashflow rounded once per property
+2. Grid — every cell matches the portfolio projection with the same overrides,
+   including unrounded (JSON) rent and expense figures
+3. Cost — one restricted engine pass per axis value, not per cell
+4. Validation and data isolation
+5. Tornado — bars match projections with the input moved, ranking, portfolio
+   sums, restricted passes, input clamping
+"""
+
+import sys
+import os
+import uuid
+import asyncio
+from decimal import Decimal
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from sqlmodel import SQLModel, Session, create_engine, select
+from sqlalchemy.pool import StaticPool
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.user import User
+from models.portfolio import Portfolio
+from models.property import Property
+from models.financials import (
+    Loan,
+    LoanType,
+    LoanStructure,
+    Frequency,
+    RentalIncome,
+    ExpenseLog,
+    SensitivityGridRequest,
+)
+import routes.projections as projections
+from routes.projections import get_portfolio_projections, get_sensitivity_grid, get_tornado_analysis
+from utils.cache import projection_cache
+from utils.sensitivity import evaluate_grid, perturb, portfolio_cashflow, portfolio_lvr
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def make_engine():
+    return create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+
+def make_user(tag: str = "") -> User:
+    uid = tag or uuid.uuid4().hex[:8]
+    return User(
+        id=f"user_{uid}",
+        email=f"{uid}@example.com",
+        first_name="Test",
+        last_name="User",
+    )
+
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture()
+def engine():
+    eng = make_engine()
+    SQLModel.metadata.create_all(eng)
+    yield eng
+    SQLModel.metadata.drop_all(eng)
+
+
+@pytest.fixture(autouse=True)
+def clear_projection_cache():
+    projection_cache.clear()
+    yield
+    projection_cache.clear()
+
+
+def _seed(engine, user: User, count: int = 2) -> str:
+    """Portfolio of leveraged, tenanted properties"""
+    portfolio_id = str(uuid.uuid4())
+    with Session(engine) as s:
+        s.add(Portfolio(id=portfolio_id, user_id=user.id, name="Stress Portfolio", type="actual"))
+        for i in range(count):
+            property_id = str(uuid.uuid4())
+            s.add(Property(
+                id=property_id,
+                user_id=user.id,
+                portfolio_id=portfolio_id,
+                address=f"{i + 1} Stress St",
+                suburb="Testville",
+                state="NSW",
+                postcode="2000",
+                purchase_date=date(2018, 6, 1),
+                current_value=Decimal("750000") + i * Decimal("50000"),
+                purchase_price=Decimal("600000"),
+            ))
+            s.add(Loan(
+                property_id=property_id,
+                lender_name="Test Bank",
+                loan_type=LoanType.PRINCIPAL_LOAN,
+                loan_structure=LoanStructure.PRINCIPAL_AND_INTEREST if i % 2 == 0 else LoanStructure.INTEREST_ONLY,
+                original_amount=Decimal("500000"),
+                current_amount=Decimal("480000") - i * Decimal("20000"),
+                interest_rate=Decimal("6.25"),
+                remaining_term_years=27,
+                repayment_frequency=Frequency.MONTHLY,
+            ))
+            s.add(RentalIncome(
+                property_id=property_id,
+                amount=Decimal("620"),
+                frequency=Frequency.WEEKLY,
+                start_date=date(2020, 1, 1),
+            ))
+            s.add(ExpenseLog(
+                property_id=property_id,
+                category="council_rates",
+                amount=Decimal("650"),
+                frequency=Frequency.MONTHLY,
+                start_date=date(2020, 1, 1),
+            ))
+        s.commit()
+    return portfolio_id
+
+
+# ---------------------------------------------------------------------------
+# 1. Engine
+# ---------------------------------------------------------------------------
+
+class TestEvaluateGrid:
+    def test_cells_combine_axes(self):
+        years = [2026, 2027]
+        values = [[Decimal("100"), Decimal("110")], [Decimal("100"), Decimal("90")]]
+        debts = [[Decimal("80"), Decimal("80")]]
+        repayments = [[[Decimal("10"), Decimal("10")]]]
+        expenses = [[[Decimal("5"), Decimal("15")]]]
+        rent = [[Decimal("12"), Decimal("12")]]
+
+        cells = list(evaluate_grid(years, values, debts, repayments, expenses, rent))
+
+        assert [(r, e, a) for r, e, a, _ in cells] == [(0, 0, 0), (0, 0, 1)]
+        rising, falling = cells[0][3], cells[1][3]
+        assert rising["final_equity"] == Decimal("30")
+        assert falling["final_equity"] == Decimal("10")
+        assert rising["min_net_cashflow"] == Decimal("-13")
+        assert rising["min_net_cashflow_year"] == 2027
+        assert rising["peak_lvr"] == Decimal("80.00")
+        assert rising["peak_lvr_year"] == 2026
+        assert falling["peak_lvr"] == Decimal("88.89")
+        assert falling["peak_lvr_year"] == 2027
+
+    def test_cashflow_rounded_once_per_property(self):
+        rent = [[Decimal("100.005")], [Decimal("50.004")]]
+        repayments = [[Decimal("0")], [Decimal("0.003")]]
+        expenses = [[Decimal("0.004")], [Decimal("0")]]
+        # 100.001 → 100.00 and 50.001 → 50.00, not 100.01 − 0.00 and 50.00 − 0.00
+        assert portfolio_cashflow(rent, repayments, expenses) == [Decimal("150.00")]
+
+    def test_lvr_zero_without_value(self):
+        assert portfolio_lvr(Decimal("0"), Decimal("100")) == Decimal("0.00")
+
+
+# ---------------------------------------------------------------------------
+# 2. Grid
+# ---------------------------------------------------------------------------
+
+class TestSensitivityGrid:
+    def test_cells_match_portfolio_projections(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user, count=3)
+        request = SensitivityGridRequest(
+            years=8,
+            interest_rate_offsets=[0.0, 2.0],
+            expense_growth_overrides=[None, 6.0],
+            asset_growth_overrides=[None, -2.0, 7.5],
+        )
+        with Session(engine) as session:
+            grid = run(get_sensitivity_grid(portfolio_id=portfolio_id, data=request, current_user=user, session=session))
+
+            assert len(grid.cells) == 12
+            for cell in grid.cells:
+                projection = run(get_portfolio_projections(
+                    portfolio_id=portfolio_id,
+                    years=8,
+                    expense_growth_override=cell.expense_growth_override,
+                    interest_rate_offset=cell.interest_rate_offset,
+                    asset_growth_override=cell.asset_growth_override,
+                    current_user=user,
+                    session=session,
+                ))
+                totals = projection.totals
+                assert cell.final_equity == totals[-1].equity
+                assert cell.min_net_cashflow == min(row.net_cashflow for row in totals)
+                assert cell.peak_lvr == max(row.lvr for row in totals)
+
+    def test_sub_cent_figures_match_portfolio_projections(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user, count=3)
+        with Session(engine) as s:
+            # JSON rent (grown) and expenses are not rounded before the cashflow is
+            for row in s.exec(select(RentalIncome)).all() + s.exec(select(ExpenseLog)).all():
+                s.delete(row)
+            properties = s.exec(select(Property).order_by(Property.address)).all()
+            for prop, rent, cost in zip(properties, ("587.53", "611.11", "623.37"), ("2345.678", "1999.995", "3210.125")):
+                prop.rental_details = {"income": rent}
+                prop.growth_assumptions = {"rental_growth_rate": 3.37}
+                prop.expenses = {"council_rates": cost}
+                s.add(prop)
+            s.commit()
+        request = SensitivityGridRequest(years=10, interest_rate_offsets=[0.0, 0.37])
+        with Session(engine) as session:
+            grid = run(get_sensitivity_grid(portfolio_id=portfolio_id, data=request, current_user=user, session=session))
+
+            for cell in grid.cells:
+                totals = run(get_portfolio_projections(
+                    portfolio_id=portfolio_id,
+                    years=10,
+                    interest_rate_offset=cell.interest_rate_offset,
+                    current_user=user,
+                    session=session,
+                )).totals
+                assert cell.min_net_cashflow == min(row.net_cashflow for row in totals)
+
+    def test_cells_ordered_rate_expense_asset(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user, count=1)
+        request = SensitivityGridRequest(
+            years=3,
+            interest_rate_offsets=[0.0, 1.0],
+            expense_growth_overrides=[None, 5.0],
+            asset_growth_overrides=[2.0, 4.0],
+        )
+        with Session(engine) as session:
+            grid = run(get_sensitivity_grid(portfolio_id=portfolio_id, data=request, current_user=user, session=session))
+
+        assert [
+            (c.interest_rate_offset, c.expense_growth_override, c.asset_growth_override) for c in grid.cells
+        ] == [(r, e, a) for r in (0.0, 1.0) for e in (None, 5.0) for a in (2.0, 4.0)]
+
+    def test_stress_moves_outcomes_in_expected_direction(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user)
+        request = SensitivityGridRequest(years=5, interest_rate_offsets=[0.0, 3.0])
+        with Session(engine) as session:
+            base, stressed = run(get_sensitivity_grid(
+                portfolio_id=portfolio_id, data=request, current_user=user, session=session,
+            )).cells
+
+        assert stressed.min_net_cashflow < base.min_net_cashflow
+        assert stressed.final_equity <= base.final_equity
+
+
+# ---------------------------------------------------------------------------
+# 3. Cost
+# ---------------------------------------------------------------------------
+
+class TestSensitivityCost:
+    def test_one_engine_pass_per_axis_value(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user, count=2)
+        request = SensitivityGridRequest(
+            years=5,
+            interest_rate_offsets=[0.0, 1.0, 2.0, 3.0, 4.0],
+            expense_growth_overrides=[None, 3.0, 5.0, 7.0, 9.0],
+        )
+        generate = projections._generate_property_projections
+        components = projections._cashflow_components
+        with patch.object(projections, "_generate_property_projections", side_effect=generate) as spy, \
+                patch.object(projections, "_cashflow_components", side_effect=components) as cashflow_spy:
+            with Session(engine) as session:
+                grid = run(get_sensitivity_grid(portfolio_id=portfolio_id, data=request, current_user=user, session=session))
+
+        assert len(grid.cells) == 25
+        # 2 properties × (5 debt + 1 value) engine passes
+        assert spy.call_count == 2 * 6
+        # 5 repayment + 5 expense + 1 rent cashflow passes over both properties
+        assert cashflow_spy.call_count == 11
+
+
+# ---------------------------------------------------------------------------
+# 4. Validation and data isolation
+# ---------------------------------------------------------------------------
+
+class TestSensitivityValidation:
+    @pytest.mark.parametrize("request_kwargs", [
+        {"years": 0},
+        {"interest_rate_offsets": []},
+        {"interest_rate_offsets": [1.0, 1.0]},
+        {"asset_growth_overrides": [float(v) for v in range(12)]},
+    ])
+    def test_invalid_requests_rejected(self, engine, request_kwargs):
+        user = make_user()
+        portfolio_id = _seed(engine, user, count=1)
+        with Session(engine) as session:
+            with pytest.raises(HTTPException) as exc:
+                run(get_sensitivity_grid(
+                    portfolio_id=portfolio_id,
+                    data=SensitivityGridRequest(**request_kwargs),
+                    current_user=user,
+                    session=session,
+                ))
+        assert exc.value.status_code == 400
+
+    def test_other_users_portfolio_not_found(self, engine):
+        owner, intruder = make_user(), make_user()
+        portfolio_id = _seed(engine, owner, count=1)
+        with Session(engine) as session:
+            with pytest.raises(HTTPException) as exc:
+                run(get_sensitivity_grid(
+                    portfolio_id=portfolio_id,
+                    data=SensitivityGridRequest(),
+                    current_user=intruder,
+                    session=session,
+                ))
+        assert exc.value.status_code == 404
+
+
+# ---------------------------------------------------------------------------
+# 5. Tornado
+# ---------------------------------------------------------------------------
+
+def _bar(analysis, name):
+    return next(bar for bar in analysis.bars if bar.input == name)
+
+
+class TestTornado:
+    def test_bars_match_projections_with_input_moved(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user, count=2)
+        with Session(engine) as session:
+            tornado = run(get_tornado_analysis(portfolio_id=portfolio_id, years=10, current_user=user, session=session))
+
+            def final_equity(**overrides):
+                projection = run(get_portfolio_projections(
+                    portfolio_id=portfolio_id, years=10, current_user=user, session=session, **overrides,
+                ))
+                return projection.totals[-1].equity
+
+            # No growth periods seeded: the engine's 5% default is moved to 4% / 6%
+            assert tornado.portfolio.baseline == final_equity()
+            capital = _bar(tornado.portfolio, "capital_growth")
+            assert (capital.low, capital.high) == (final_equity(asset_growth_override=4.0), final_equity(asset_growth_override=6.0))
+            rate = _bar(tornado.portfolio, "interest_rate")
+            assert (rate.low, rate.high) == (final_equity(interest_rate_offset=-1.0), final_equity(interest_rate_offset=1.0))
+
+    def test_bars_ranked_and_irrelevant_inputs_zero_for_equity(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user, count=1)
+        with Session(engine) as session:
+            tornado = run(get_tornado_analysis(portfolio_id=portfolio_id, current_user=user, session=session))
+
+        swings = [bar.swing for bar in tornado.portfolio.bars]
+        assert swings == sorted(swings, reverse=True)
+        assert tornado.portfolio.bars[0].input == "capital_growth"
+        for name in ("rent_growth", "vacancy_weeks", "expense_growth"):
+            assert _bar(tornado.portfolio, name).swing == 0
+
+    def test_cumulative_cashflow_metric(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user, count=2)
+        with Session(engine) as session:
+            tornado = run(get_tornado_analysis(
+                portfolio_id=portfolio_id, years=5, metric="cumulative_cashflow", current_user=user, session=session,
+            ))
+            projection = run(get_portfolio_projections(portfolio_id=portfolio_id, years=5, current_user=user, session=session))
+
+        assert tornado.portfolio.baseline == sum(row.net_cashflow for row in projection.totals)
+        assert _bar(tornado.portfolio, "capital_growth").swing == 0
+        assert _bar(tornado.portfolio, "rent_growth").high_impact > 0
+        assert _bar(tornado.portfolio, "vacancy_weeks").high_impact < 0
+        assert _bar(tornado.portfolio, "expense_growth").high_impact < 0
+        assert _bar(tornado.portfolio, "offset_balance").high_impact > 0
+
+    def test_portfolio_bars_sum_property_bars(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user, count=3)
+        with Session(engine) as session:
+            tornado = run(get_tornado_analysis(
+                portfolio_id=portfolio_id, metric="net_position", current_user=user, session=session,
+            ))
+
+        assert len(tornado.properties) == 3
+        assert tornado.portfolio.baseline == sum(p.baseline for p in tornado.properties)
+        for bar in tornado.portfolio.bars:
+            assert bar.high == sum(_bar(p, bar.input).high for p in tornado.properties)
+
+    def test_only_pipelines_the_metric_reads_are_rerun(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user, count=2)
+        generate = projections._generate_property_projections
+        with patch.object(projections, "_generate_property_projections", side_effect=generate) as spy:
+            with Session(engine) as session:
+                run(get_tornado_analysis(portfolio_id=portfolio_id, current_user=user, session=session))
+
+        # Per property: baseline + 2 × (capital growth, interest rate, offset balance)
+        assert spy.call_count == 2 * 7
+        assert all(call.kwargs["pipelines"] <= {"value", "debt"} for call in spy.call_args_list)
+
+    def test_invalid_metric_rejected(self, engine):
+        user = make_user()
+        portfolio_id = _seed(engine, user, count=1)
+        with Session(engine) as session:
+            with pytest.raises(HTTPException) as exc:
+                run(get_tornado_analysis(portfolio_id=portfolio_id, metric="irr", current_user=user, session=session))
+        assert exc.value.status_code == 400
+
+    def test_perturbation_clamps_inputs(self):
+        prop = Property(
+            id="prop_1", user_id="user_1", portfolio_id="pf_1", address="1 Clamp St", suburb="Testville",
+            state="NSW", postcode="2000", purchase_date=date(2018, 6, 1), purchase_price=Decimal("600000"),
+        )
+        data = {
+            "loans": [{"current_amount": Decimal("5000"), "offset_balance": Decimal("0"), "interest_rate": Decimal("0.5")}],
+            "rental_incomes": [{"vacancy_weeks_per_year": 1}],
+        }
+        _, lower = perturb("offset_balance", Decimal("-10000"), prop, data, 2026)
+        _, higher = perturb("offset_balance", Decimal("10000"), prop, data, 2026)
+        _, cheaper = perturb("interest_rate", Decimal("-1"), prop, data, 2026)
+        _, vacant = perturb("vacancy_weeks", Decimal("-2"), prop, data, 2026)
+
+        assert lower["loans"][0]["offset_balance"] == 0
+        assert higher["loans"][0]["offset_balance"] == Decimal("5000")
+        assert cheaper["loans"][0]["interest_rate"] == 0
+        assert vacant["rental_incomes"][0]["vacancy_weeks_per_year"] == 0
+        assert data["loans"][0]["offset_balance"] == 0  # input data untouched
+
+    def test_rent_growth_moves_json_assumptions_on_a_copy(self):
+        prop = Property(
+            id="prop_1", user_id="user_1", portfolio_id="pf_1", address="1 Copy St", suburb="Testville",
+            state="NSW", postcode="2000", purchase_date=date(2018, 6, 1), purchase_price=Decimal("600000"),
+            rental_details={"income": 600}, growth_assumptions={"rental_growth_rate": 3},
+        )
+        moved, _ = perturb("rent_growth", Decimal("1"), prop, {}, 2026)
+
+        assert moved is not prop
+        assert moved.growth_assumptions["rental_growth_rate"] == Decimal("4")
+        assert prop.growth_assumptions["rental_growth_rate"] == 3
+
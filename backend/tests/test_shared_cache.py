@@ -0,0 +1,233 @@
+"""
+Tests for the shared (Redis) cache tier.
+
+Uses utils.local_redis.InMemoryRedis as the Redis stand-in.
+
+Covers:
+1. Codec — Decimal, date and registered models round-trip exactly
+2. Two-tier cache — remote hits fill the local tier, entries shared across
+   "instances" (separate local tiers on one Redis)
+3. Invalidation — broadcast messages from other instances drop local copies
+4. Degradation — a Redis outage falls back to local-only without raising
+5. Data versions — Redis-backed counters, bumps made during an outage
+   are replayed once Redis is back, and a new epoch after Redis loses its data
+"""
+
+import sys
+import os
+import asyncio
+import json
+from decimal import Decimal
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.financials import ProjectionYearData, PropertyProjectionResponse
+from utils import redis_cache, data_version
+from utils.cache import LRUCache, TwoTierCache
+from utils.cache_codec import encode, decode, register_model, CodecError
+from utils.local_redis import InMemoryRedis
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture()
+def fake_redis():
+    server = InMemoryRedis()
+    redis_cache.set_redis_client(server)
+    data_version._mirror.clear()
+    data_version._pending_bumps.clear()
+    yield server
+    redis_cache.set_redis_client(None)
+    data_version._mirror.clear()
+    data_version._pending_bumps.clear()
+
+
+def make_cache(name: str = "test") -> TwoTierCache:
+    return TwoTierCache(name, LRUCache(name, max_weight=100), ttl_seconds=60)
+
+
+def make_projection() -> PropertyProjectionResponse:
+    return PropertyProjectionResponse(
+        property_id="prop_1",
+        property_address="1 Codec St",
+        start_year=2026,
+        end_year=2027,
+        projections=[
+            ProjectionYearData(
+                year=2026,
+                property_value=Decimal("750000.0000"),
+                total_debt=Decimal("500000.1234"),
+                equity=Decimal("249999.8766"),
+                lvr=Decimal("66.67"),
+                rental_income=Decimal("31200"),
+                expenses=Decimal("8000"),
+                loan_repayments=Decimal("30000"),
+                depreciation=Decimal("0"),
+                net_cashflow=Decimal("-6800"),
+            )
+        ],
+    )
+
+
+register_model(PropertyProjectionResponse)
+
+
+# ---------------------------------------------------------------------------
+# 1. Codec
+# ---------------------------------------------------------------------------
+
+class TestCodec:
+    def test_decimal_round_trips_exactly(self):
+        value = {"amount": Decimal("1234567.8901"), "items": [Decimal("0.10"), Decimal("-3")]}
+        decoded = decode(encode(value))
+        assert decoded == value
+        assert str(decoded["items"][0]) == "0.10"
+
+    def test_dates_round_trip(self):
+        value = {"on": date(2026, 1, 31)}
+        assert decode(encode(value)) == value
+
+    def test_registered_model_round_trips(self):
+        original = make_projection()
+        decoded = decode(encode(original))
+        assert isinstance(decoded, PropertyProjectionResponse)
+        assert decoded.projections[0].total_debt == Decimal("500000.1234")
+        assert decoded == original
+
+    def test_payload_is_compressed(self):
+        rows = [{"value": Decimal("123456.7890"), "year": 2026 + i} for i in range(50)]
+        assert len(encode(rows)) < len(json.dumps(rows, default=str))
+
+    def test_unknown_format_rejected(self):
+        with pytest.raises(CodecError):
+            decode(b"\x99garbage")
+
+
+# ---------------------------------------------------------------------------
+# 2. Two-tier cache
+# ---------------------------------------------------------------------------
+
+class TestTwoTierCache:
+    def test_value_shared_between_instances(self, fake_redis):
+        instance_a = make_cache("shared")
+        instance_b = make_cache("shared")
+        run(instance_a.put(("k", 1), make_projection()))
+
+        value = run(instance_b.get(("k", 1)))
+
+        assert isinstance(value, PropertyProjectionResponse)
+        assert instance_b.snapshot()["remote"]["hits"] == 1
+
+    def test_remote_hit_fills_local_tier(self, fake_redis):
+        cache = make_cache()
+        run(cache.put("k", {"n": Decimal("1")}))
+        cache.clear()
+
+        run(cache.get("k"))
+        run(cache.get("k"))
+
+        snapshot = cache.snapshot()
+        assert snapshot["remote"]["hits"] == 1
+        assert snapshot["local"]["hits"] == 1
+
+    def test_local_only_without_redis(self):
+        cache = make_cache()
+        run(cache.put("k", {"n": 1}))
+        assert run(cache.get("k")) == {"n": 1}
+        assert cache.snapshot()["remote"]["status"] == "disabled"
+
+
+# ---------------------------------------------------------------------------
+# 3. Invalidation
+# ---------------------------------------------------------------------------
+
+class TestInvalidation:
+    def test_invalidate_removes_from_both_tiers(self, fake_redis):
+        cache = make_cache()
+        run(cache.put("k", {"n": 1}))
+        run(cache.invalidate("k"))
+        assert run(cache.get("k")) is None
+
+    def test_message_from_other_instance_drops_local_copy(self, fake_redis):
+        cache = make_cache("broadcast")
+        run(cache.put("k", {"n": 1}))
+        redis_key = cache._redis_key("k")
+
+        message = json.dumps({"origin": "other-instance", "kind": "cache", "cache": "broadcast", "key": redis_key})
+        run(redis_cache._dispatch(message))
+
+        assert cache.local.get(redis_key) is None
+
+    def test_own_messages_ignored(self, fake_redis):
+        cache = make_cache("own")
+        run(cache.put("k", {"n": 1}))
+        redis_key = cache._redis_key("k")
+
+        message = json.dumps({"origin": redis_cache.INSTANCE_ID, "kind": "cache", "cache": "own", "key": redis_key})
+        run(redis_cache._dispatch(message))
+
+        assert cache.local.get(redis_key) == {"n": 1}
+
+
+# ---------------------------------------------------------------------------
+# 4. Degradation
+# ---------------------------------------------------------------------------
+
+class TestDegradation:
+    def test_outage_falls_back_to_local(self, fake_redis):
+        cache = make_cache()
+        fake_redis.fail = True
+
+        run(cache.put("k", {"n": 1}))
+        assert run(cache.get("k")) == {"n": 1}
+        assert run(cache.get("missing")) is None
+        assert cache.snapshot()["remote"]["status"] == "unavailable"
+
+
+# ---------------------------------------------------------------------------
+# 5. Data versions
+# ---------------------------------------------------------------------------
+
+class TestRedisDataVersions:
+    def test_bump_increments_shared_counter(self, fake_redis):
+        before = run(data_version.get_portfolio_version("pf_shared"))
+        run(data_version.bump_portfolio_version("pf_shared", "user_shared"))
+        after = run(data_version.get_portfolio_version("pf_shared"))
+
+        epoch = run(fake_redis.get("dv:epoch"))
+        assert before == f"{epoch}.0"
+        assert after == f"{epoch}.1"
+        assert run(fake_redis.get("dv:portfolio:pf_shared")) == 1
+
+    def test_bump_during_outage_replayed_on_recovery(self, fake_redis):
+        run(data_version.get_portfolio_version("pf_outage"))
+        fake_redis.fail = True
+        run(data_version.bump_portfolio_version("pf_outage"))
+
+        fake_redis.fail = False
+        redis_cache.set_redis_client(fake_redis)  # end the retry back-off
+        version = run(data_version.get_portfolio_version("pf_outage"))
+
+        assert version == f"{run(fake_redis.get('dv:epoch'))}.1"
+
+    def test_lost_redis_data_never_reissues_a_version(self, fake_redis):
+        run(data_version.bump_portfolio_version("pf_flushed"))
+        before = run(data_version.get_portfolio_version("pf_flushed"))
+
+        # Redis restarts empty; the counter starts again from zero
+        fake_redis._data.clear()
+        data_version._mirror.clear()
+        run(data_version.bump_portfolio_version("pf_flushed"))
+        after = run(data_version.get_portfolio_version("pf_flushed"))
+
+        assert after.endswith(".1")
+        assert after != before
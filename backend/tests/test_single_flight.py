@@ -0,0 +1,180 @@
+"""
+Tests for request coalescing (utils/single_flight.py) and data versions
+(utils/data_version.py).
+
+Covers:
+1. Key normalization — parameter order and None values do not split keys
+2. Coalescing — concurrent identical calls run the computation once, on a
+   session of its own rather than the leader's
+3. Isolation — different keys compute independently
+4. Errors — an exception reaches every caller and the key is released
+5. Data versions — bumps change portfolio and user versions
+"""
+
+import sys
+import os
+import time
+import asyncio
+import threading
+
+import pytest
+from sqlmodel import Session, create_engine, text
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.single_flight import SingleFlight, make_key
+from utils.data_version import get_portfolio_version, get_user_version, bump_portfolio_version
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+class SlowCounter:
+    """Blocking computation that records how often it ran"""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, value):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return {"value": value}
+
+
+# ---------------------------------------------------------------------------
+# 1. Key normalization
+# ---------------------------------------------------------------------------
+
+class TestMakeKey:
+    def test_param_order_ignored(self):
+        a = make_key("u1", "ep", {"years": 10, "portfolio_id": "p1"}, "v1")
+        b = make_key("u1", "ep", {"portfolio_id": "p1", "years": 10}, "v1")
+        assert a == b
+
+    def test_none_params_dropped(self):
+        a = make_key("u1", "ep", {"portfolio_id": "p1", "asset_growth_override": None}, "v1")
+        b = make_key("u1", "ep", {"portfolio_id": "p1"}, "v1")
+        assert a == b
+
+    def test_user_and_version_in_key(self):
+        base = make_key("u1", "ep", {"portfolio_id": "p1"}, "v1")
+        assert base != make_key("u2", "ep", {"portfolio_id": "p1"}, "v1")
+        assert base != make_key("u1", "ep", {"portfolio_id": "p1"}, "v2")
+
+
+# ---------------------------------------------------------------------------
+# 2. Coalescing
+# ---------------------------------------------------------------------------
+
+class TestCoalescing:
+    def test_concurrent_identical_calls_share_one_computation(self):
+        flight = SingleFlight("test")
+        compute = SlowCounter()
+
+        async def scenario():
+            return await asyncio.gather(*[flight.do("k", compute, 1) for _ in range(5)])
+
+        results = run(scenario())
+        assert compute.calls == 1
+        assert all(r == {"value": 1} for r in results)
+        snapshot = flight.snapshot()
+        assert snapshot["computations"] == 1
+        assert snapshot["coalesced"] == 4
+        assert snapshot["inflight"] == 0
+
+    def test_bind_gives_computation_its_own_session(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'flight.db'}", connect_args={"check_same_thread": False})
+        flight = SingleFlight("test")
+        seen = []
+
+        def compute(value, session):
+            time.sleep(0.05)
+            seen.append(session)
+            return session.exec(text("SELECT :v").bindparams(v=value)).one()[0]
+
+        async def scenario(leader: Session):
+            leading = asyncio.ensure_future(flight.do("k", compute, 7, bind=leader.get_bind()))
+            await asyncio.sleep(0)
+            following = flight.do("k", compute, 7, bind=engine)
+            # The leader's request ends (and its session closes) mid-computation
+            leader.close()
+            return await asyncio.gather(leading, following)
+
+        with Session(engine) as leader:
+            assert run(scenario(leader)) == [7, 7]
+        assert len(seen) == 1 and seen[0] is not leader
+        assert not seen[0].in_transaction()
+
+    def test_sequential_calls_recompute(self):
+        flight = SingleFlight("test")
+        compute = SlowCounter(delay=0)
+        run(flight.do("k", compute, 1))
+        run(flight.do("k", compute, 1))
+        assert compute.calls == 2
+
+
+# ---------------------------------------------------------------------------
+# 3. Isolation
+# ---------------------------------------------------------------------------
+
+class TestIsolation:
+    def test_different_keys_compute_independently(self):
+        flight = SingleFlight("test")
+        compute = SlowCounter()
+
+        async def scenario():
+            return await asyncio.gather(flight.do("a", compute, 1), flight.do("b", compute, 2))
+
+        results = run(scenario())
+        assert compute.calls == 2
+        assert results == [{"value": 1}, {"value": 2}]
+
+
+# ---------------------------------------------------------------------------
+# 4. Errors
+# ---------------------------------------------------------------------------
+
+class TestErrors:
+    def test_exception_propagates_to_all_callers(self):
+        flight = SingleFlight("test")
+
+        def boom():
+            time.sleep(0.05)
+            raise ValueError("boom")
+
+        async def scenario():
+            return await asyncio.gather(
+                flight.do("k", boom), flight.do("k", boom), return_exceptions=True
+            )
+
+        results = run(scenario())
+        assert all(isinstance(r, ValueError) for r in results)
+        assert flight.snapshot()["inflight"] == 0
+
+
+# ---------------------------------------------------------------------------
+# 5. Data versions
+# ---------------------------------------------------------------------------
+
+class TestDataVersion:
+    def test_bump_changes_portfolio_and_user_versions(self):
+        before_portfolio = run(get_portfolio_version("pf_version_test"))
+        before_user = run(get_user_version("user_version_test"))
+
+        run(bump_portfolio_version("pf_version_test", "user_version_test"))
+
+        assert run(get_portfolio_version("pf_version_test")) != before_portfolio
+        assert run(get_user_version("user_version_test")) != before_user
+
+    def test_bump_does_not_touch_other_portfolios(self):
+        before = run(get_portfolio_version("pf_other"))
+        run(bump_portfolio_version("pf_version_test"))
+        assert run(get_portfolio_version("pf_other")) == before
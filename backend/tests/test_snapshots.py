@@ -0,0 +1,401 @@
+"""
+Tests for nightly net worth snapshots (utils/snapshots.py).
+
+Covers:
+1. Totals — each snapshot matches the dashboard summary for its portfolio
+2. Selection — actual portfolios of active users only, across chunks
+3. Idempotency — re-running a day replaces its calculated snapshots, manual ones are kept
+4. Change from previous — latest earlier snapshot, percentages clamped
+5. Runs — one claim per day, failed and forced re-claims, cancellation
+6. Deletion — portfolios and accounts with nightly snapshots can be deleted
+"""
+
+import sys
+import os
+import uuid
+import asyncio
+from decimal import Decimal
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import SQLModel, Session, create_engine, select
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models.user import User
+from models.portfolio import Portfolio
+from models.property import Property
+from models.asset import Asset
+from models.liability import Liability
+from models.income import IncomeSource
+from models.expense import Expense
+from models.net_worth import NetWorthRollup, NetWorthSnapshot, SnapshotRun
+from routes.dashboard import _compute_dashboard_summary
+from routes.gdpr import DeleteAccountRequest, delete_account
+from routes.portfolios import delete_portfolio
+from utils.cancellation import CancelToken, OperationCancelled
+from utils.snapshots import SnapshotScheduler, claim_run, generate_daily_snapshots
+
+
+DAY = date(2026, 10, 19)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    # File database: snapshot chunks run in batch-lane threads
+    eng = create_engine(f"sqlite:///{tmp_path / 'snapshots.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(eng)
+    yield eng
+    SQLModel.metadata.drop_all(eng)
+    eng.dispose()
+
+
+def _add_user(engine, **fields) -> User:
+    uid = uuid.uuid4().hex[:8]
+    user = User(id=f"user_{uid}", email=f"{uid}@example.com", name="Test User", **fields)
+    with Session(engine) as s:
+        s.add(user)
+        s.commit()
+        s.refresh(user)
+    return user
+
+
+def _add_portfolio(engine, user: User, type_: str = "actual") -> str:
+    portfolio_id = str(uuid.uuid4())
+    with Session(engine) as s:
+        s.add(Portfolio(id=portfolio_id, user_id=user.id, name="Snapshot Portfolio", type=type_))
+        s.commit()
+    return portfolio_id
+
+
+def _seed(engine, user: User, portfolio_id: str, cash: str = "20000"):
+    """Every kind of row the summary reads, including ones it must ignore"""
+    with Session(engine) as s:
+        for value, loan in (("500000", {"amount": 300000}), ("400000", None)):
+            s.add(Property(
+                id=str(uuid.uuid4()), user_id=user.id, portfolio_id=portfolio_id,
+                address="1 Test St", suburb="Suburb", state="VIC", postcode="3000",
+                purchase_date=date(2020, 1, 1), current_value=Decimal(value), loan_details=loan,
+            ))
+        for type_, value, active in (("cash", cash, True), ("shares", "15000", True),
+                                     ("managed_fund", "7000", True), ("crypto", "9999", False)):
+            s.add(Asset(
+                id=str(uuid.uuid4()), user_id=user.id, portfolio_id=portfolio_id,
+                name=type_, type=type_, current_value=Decimal(value), is_active=active,
+            ))
+        for type_, balance in (("credit_card", "5000"), ("mortgage", "12000")):
+            s.add(Liability(
+                id=str(uuid.uuid4()), user_id=user.id, portfolio_id=portfolio_id,
+                name=type_, type=type_, current_balance=Decimal(balance), is_active=True,
+            ))
+        for amount, frequency in (("5000", "monthly"), ("1000", "weekly"), ("3000", "one_time")):
+            s.add(IncomeSource(
+                id=str(uuid.uuid4()), user_id=user.id, portfolio_id=portfolio_id,
+                name="Income", type="salary", amount=Decimal(amount), frequency=frequency, is_active=True,
+            ))
+        for amount, frequency in (("500", "monthly"), ("1200", "annual")):
+            s.add(Expense(
+                id=str(uuid.uuid4()), user_id=user.id, portfolio_id=portfolio_id,
+                name="Expense", category="rates", amount=Decimal(amount), frequency=frequency, is_active=True,
+            ))
+        s.commit()
+
+
+def _snapshots(engine, portfolio_id: str = None):
+    with Session(engine) as s:
+        stmt = select(NetWorthSnapshot).order_by(NetWorthSnapshot.date, NetWorthSnapshot.created_at)
+        if portfolio_id is not None:
+            stmt = stmt.where(NetWorthSnapshot.portfolio_id == portfolio_id)
+        return s.exec(stmt).all()
+
+
+def _add_snapshot(engine, user: User, portfolio_id: str, day: date, net_worth: str, is_manual: bool = False):
+    with Session(engine) as s:
+        s.add(NetWorthSnapshot(
+            id=str(uuid.uuid4()), user_id=user.id, portfolio_id=portfolio_id, date=day,
+            net_worth=Decimal(net_worth), is_manual=is_manual,
+        ))
+        s.commit()
+
+
+# ---------------------------------------------------------------------------
+# 1. Totals
+# ---------------------------------------------------------------------------
+
+class TestTotals:
+    def test_matches_dashboard_summary(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        _seed(engine, user, portfolio_id)
+
+        generate_daily_snapshots(engine, DAY)
+
+        [snapshot] = _snapshots(engine, portfolio_id)
+        with Session(engine) as s:
+            summary = _compute_dashboard_summary(portfolio_id, user, s)
+        assert snapshot.date == DAY
+        assert snapshot.is_manual is False
+        assert snapshot.user_id == user.id
+        assert float(snapshot.total_assets) == pytest.approx(float(summary.total_assets))
+        assert float(snapshot.total_liabilities) == pytest.approx(float(summary.total_liabilities))
+        assert float(snapshot.net_worth) == pytest.approx(float(summary.net_worth))
+        assert float(snapshot.monthly_income) == pytest.approx(float(summary.monthly_income), abs=1e-3)
+        assert float(snapshot.monthly_expenses) == pytest.approx(float(summary.monthly_expenses), abs=1e-3)
+        assert float(snapshot.savings_rate) == pytest.approx(float(summary.savings_rate), abs=0.01)
+        for field, value in summary.asset_breakdown.model_dump().items():
+            assert snapshot.asset_breakdown[field] == pytest.approx(float(value))
+        for field, value in summary.liability_breakdown.model_dump().items():
+            assert snapshot.liability_breakdown[field] == pytest.approx(float(value))
+
+    def test_property_equity_and_ltv(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        _seed(engine, user, portfolio_id)
+
+        generate_daily_snapshots(engine, DAY)
+
+        [snapshot] = _snapshots(engine, portfolio_id)
+        assert snapshot.property_equity == Decimal("600000")
+        assert snapshot.property_ltv == Decimal("33.33")
+
+    def test_empty_portfolio_gets_zero_snapshot(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+
+        generate_daily_snapshots(engine, DAY)
+
+        [snapshot] = _snapshots(engine, portfolio_id)
+        assert snapshot.net_worth == 0
+        assert snapshot.savings_rate == 0
+        assert snapshot.property_ltv == 0
+
+
+# ---------------------------------------------------------------------------
+# 2. Selection
+# ---------------------------------------------------------------------------
+
+class TestSelection:
+    def test_only_actual_portfolios_of_active_users(self, engine):
+        user = _add_user(engine)
+        actual = _add_portfolio(engine, user)
+        _add_portfolio(engine, user, type_="scenario")
+        _add_portfolio(engine, _add_user(engine, is_active=False))
+        _add_portfolio(engine, _add_user(engine, deleted_at=datetime.now(timezone.utc)))
+
+        stats = generate_daily_snapshots(engine, DAY)
+
+        assert stats["portfolios"] == 1
+        assert [s.portfolio_id for s in _snapshots(engine)] == [actual]
+
+    def test_every_portfolio_written_across_chunks(self, engine):
+        users = [_add_user(engine) for _ in range(3)]
+        portfolio_ids = {_add_portfolio(engine, users[i % 3]) for i in range(7)}
+        progress = []
+
+        stats = generate_daily_snapshots(engine, DAY, chunk_size=3, progress=lambda *p: progress.append(p))
+
+        assert stats["portfolios"] == 7
+        assert stats["snapshots"] == 7
+        assert progress == [(3, 3), (6, 6), (7, 7)]
+        assert {s.portfolio_id for s in _snapshots(engine)} == portfolio_ids
+
+
+# ---------------------------------------------------------------------------
+# 3. Idempotency
+# ---------------------------------------------------------------------------
+
+class TestIdempotency:
+    def test_rerun_replaces_the_days_snapshot(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        _seed(engine, user, portfolio_id)
+        generate_daily_snapshots(engine, DAY)
+        first = _snapshots(engine, portfolio_id)[0].net_worth
+
+        _seed(engine, user, portfolio_id, cash="1000")
+        generate_daily_snapshots(engine, DAY)
+
+        snapshots = _snapshots(engine, portfolio_id)
+        assert len(snapshots) == 1
+        assert snapshots[0].net_worth > first
+
+    def test_manual_snapshot_kept_and_portfolio_skipped(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        _add_snapshot(engine, user, portfolio_id, DAY, "123", is_manual=True)
+
+        stats = generate_daily_snapshots(engine, DAY)
+
+        assert stats["snapshots"] == 0
+        snapshots = _snapshots(engine, portfolio_id)
+        assert [(s.is_manual, s.net_worth) for s in snapshots] == [(True, Decimal("123"))]
+
+    def test_other_days_untouched(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        _add_snapshot(engine, user, portfolio_id, DAY - timedelta(days=1), "100")
+
+        generate_daily_snapshots(engine, DAY)
+
+        assert [s.date for s in _snapshots(engine, portfolio_id)] == [DAY - timedelta(days=1), DAY]
+
+
+# ---------------------------------------------------------------------------
+# 4. Change from previous
+# ---------------------------------------------------------------------------
+
+class TestChangeFromPrevious:
+    def test_change_from_latest_earlier_snapshot(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        with Session(engine) as s:
+            s.add(Asset(
+                id=str(uuid.uuid4()), user_id=user.id, portfolio_id=portfolio_id,
+                name="Cash", type="cash", current_value=Decimal("1100"), is_active=True,
+            ))
+            s.commit()
+        _add_snapshot(engine, user, portfolio_id, DAY - timedelta(days=30), "500")
+        _add_snapshot(engine, user, portfolio_id, DAY - timedelta(days=1), "1000")
+        # Later days never count as "previous"
+        _add_snapshot(engine, user, portfolio_id, DAY + timedelta(days=1), "9000")
+
+        generate_daily_snapshots(engine, DAY)
+
+        [snapshot] = [s for s in _snapshots(engine, portfolio_id) if s.date == DAY]
+        assert snapshot.change_from_previous == Decimal("100")
+        assert snapshot.change_percentage == Decimal("10.00")
+
+    def test_first_snapshot_has_no_change(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+
+        generate_daily_snapshots(engine, DAY)
+
+        [snapshot] = _snapshots(engine, portfolio_id)
+        assert snapshot.change_from_previous == 0
+        assert snapshot.change_percentage == 0
+
+    def test_change_percentage_clamped_to_column(self, engine):
+        user = _add_user(engine)
+        portfolio_id = _add_portfolio(engine, user)
+        _seed(engine, user, portfolio_id)
+        _add_snapshot(engine, user, portfolio_id, DAY - timedelta(days=1), "-1")
+
+        generate_daily_snapshots(engine, DAY)
+
+        [snapshot] = [s for s in _snapshots(engine, portfolio_id) if s.date == DAY]
+        assert snapshot.change_percentage == Decimal("999.99")
+
+
+# ---------------------------------------------------------------------------
+# 5. Runs
+# ---------------------------------------------------------------------------
+
+class TestRuns:
+    def test_day_claimed_once(self, engine):
+        assert claim_run(engine, DAY) is True
+        assert claim_run(engine, DAY) is False
+        assert claim_run(engine, DAY + timedelta(days=1)) is True
+
+    def test_failed_and_stale_runs_reclaimed(self, engine):
+        claim_run(engine, DAY)
+        with Session(engine) as s:
+            run_ = s.get(SnapshotRun, DAY)
+            run_.status = "failed"
+            s.add(run_)
+            s.commit()
+        assert claim_run(engine, DAY) is True
+
+        with Session(engine) as s:
+            run_ = s.get(SnapshotRun, DAY)
+            run_.updated_at = datetime.now(timezone.utc) - timedelta(days=1)
+            s.add(run_)
+            s.commit()
+        assert claim_run(engine, DAY) is True
+
+    def test_scheduler_run_records_completion(self, engine):
+        user = _add_user(engine)
+        _add_portfolio(engine, user)
+        scheduler = SnapshotScheduler("test", 2)
+
+        stats = run(scheduler.run(engine, DAY))
+
+        assert stats["snapshots"] == 1
+        with Session(engine) as s:
+            run_ = s.get(SnapshotRun, DAY)
+        assert (run_.status, run_.portfolios, run_.snapshots) == ("completed", 1, 1)
+        assert run_.finished_at is not None
+        # Completed days are skipped unless forced
+        assert run(scheduler.run(engine, DAY)) is None
+        assert run(scheduler.run(engine, DAY, force=True))["snapshots"] == 1
+        assert len(_snapshots(engine)) == 1
+        assert scheduler.snapshot()["runs"] == 2
+
+    def test_cancelled_between_chunks(self, engine):
+        user = _add_user(engine)
+        for _ in range(4):
+            _add_portfolio(engine, user)
+        token = CancelToken()
+
+        with pytest.raises(OperationCancelled):
+            generate_daily_snapshots(engine, DAY, chunk_size=2, progress=lambda *_: token.cancel(), cancel=token)
+
+        # The committed chunk is kept; a re-run completes the day
+        assert len(_snapshots(engine)) == 2
+        assert generate_daily_snapshots(engine, DAY, chunk_size=2)["snapshots"] == 4
+        assert len(_snapshots(engine)) == 4
+
+
+# ---------------------------------------------------------------------------
+# 6. Deletion
+# ---------------------------------------------------------------------------
+
+def _enforce_foreign_keys(engine):
+    # SQLite ignores foreign keys unless asked; Postgres always enforces them
+    event.listen(engine, "connect", lambda conn, record: conn.execute("PRAGMA foreign_keys=ON"))
+    engine.dispose()
+
+
+def _rollups(engine, user: User):
+    with Session(engine) as s:
+        return s.exec(select(NetWorthRollup).where(NetWorthRollup.user_id == user.id)).all()
+
+
+class TestDeletion:
+    def test_portfolio_deleted_after_nightly_run(self, engine):
+        user = _add_user(engine)
+        portfolio_id, kept = _add_portfolio(engine, user), _add_portfolio(engine, user)
+        _seed(engine, user, portfolio_id)
+        generate_daily_snapshots(engine, DAY)
+
+        _enforce_foreign_keys(engine)
+        with Session(engine) as s:
+            run(delete_portfolio(portfolio_id=portfolio_id, current_user=user, session=s))
+
+        assert _snapshots(engine, portfolio_id) == []
+        assert len(_snapshots(engine, kept)) == 1
+        assert {r.portfolio_id for r in _rollups(engine, user)} == {kept}
+
+    def test_account_deleted_after_nightly_run(self, engine):
+        user, other = _add_user(engine), _add_user(engine)
+        _seed(engine, user, _add_portfolio(engine, user))
+        other_portfolio = _add_portfolio(engine, other)
+        generate_daily_snapshots(engine, DAY)
+
+        _enforce_foreign_keys(engine)
+        with Session(engine) as s:
+            run(delete_account(request=DeleteAccountRequest(confirmation="DELETE"),
+                               current_user=s.get(User, user.id), session=s))
+
+        assert [snapshot.portfolio_id for snapshot in _snapshots(engine)] == [other_portfolio]
+        assert _rollups(engine, user) == []
+        assert _rollups(engine, other)
@@ -0,0 +1,227 @@
+"""
+Admission Control for CPU-Heavy Endpoints
+Bounds how many heavy requests (full-portfolio projections, scenario deep copies)
+run at once, per user and per instance.
+
+A request first takes a per-user slot (rejected immediately with 429 when the user
+already has their limit in flight), then waits briefly in a bounded queue for a
+global slot (rejected with 503 when the queue is full or the wait times out).
+
+⚠️ CRITICAL: Limits are per process. Each worker instance admits up to
+HEAVY_GLOBAL_LIMIT requests; size it to the worker's CPU budget, not the fleet.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict
+
+from fastapi import Depends, HTTPException, status
+
+from models.user import User
+from utils.auth import get_current_user
+
+logger = logging.getLogger(__name__)
+
+
+# Heavy requests allowed to run concurrently on this instance
+HEAVY_GLOBAL_LIMIT = int(os.getenv("HEAVY_GLOBAL_LIMIT", "4"))
+
+# Heavy requests a single user may have running or queued at once
+HEAVY_PER_USER_LIMIT = int(os.getenv("HEAVY_PER_USER_LIMIT", "2"))
+
+# Requests allowed to wait for a global slot before new arrivals are shed
+HEAVY_MAX_QUEUE = int(os.getenv("HEAVY_MAX_QUEUE", "8"))
+
+# Longest a queued request waits for a global slot (seconds)
+HEAVY_QUEUE_TIMEOUT = float(os.getenv("HEAVY_QUEUE_TIMEOUT_SECONDS", "2.0"))
+
+# Number of recent wait times kept for percentile reporting
+_WAIT_SAMPLE_SIZE = 1000
+
+
+def _percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of floats (0.0 when empty)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class AdmissionController:
+    """
+    Per-user and global concurrency limiter with a short bounded queue.
+
+    Usage:
+        async with controller.admit(user.id):
+            ... heavy work ...
+    """
+
+    def __init__(
+        self,
+        name: str,
+        global_limit: int,
+        per_user_limit: int,
+        max_queue: int,
+        queue_timeout: float,
+    ):
+        self.name = name
+        self.global_limit = global_limit
+        self.per_user_limit = per_user_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._slots = asyncio.Semaphore(global_limit)
+        self._user_inflight: Dict[str, int] = {}
+        self._running = 0
+        self._waiting = 0
+
+        # Metrics
+        self._admitted = 0
+        self._rejected_user = 0
+        self._rejected_queue_full = 0
+        self._rejected_timeout = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._recent_waits: Deque[float] = deque(maxlen=_WAIT_SAMPLE_SIZE)
+
+    def _release_user(self, user_id: str) -> None:
+        remaining = self._user_inflight.get(user_id, 1) - 1
+        if remaining > 0:
+            self._user_inflight[user_id] = remaining
+        else:
+            self._user_inflight.pop(user_id, None)
+
+    def _reject(self, status_code: int, message: str, retry_after: int) -> HTTPException:
+        return HTTPException(
+            status_code=status_code,
+            detail={
+                "error": "Too many concurrent requests" if status_code == 429 else "Server busy",
+                "message": message,
+                "retry_after": retry_after,
+            },
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    @asynccontextmanager
+    async def admit(self, user_id: str) -> AsyncIterator[None]:
+        """
+        Hold a per-user and a global slot for the duration of the block.
+
+        Raises:
+            HTTPException 429 if the user already has per_user_limit requests in flight
+            HTTPException 503 if the queue is full or the wait for a slot times out
+        """
+        # Fast per-user rejection — counts both running and queued requests
+        if self._user_inflight.get(user_id, 0) >= self.per_user_limit:
+            self._rejected_user += 1
+            raise self._reject(
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                f"You already have {self.per_user_limit} heavy requests in progress. "
+                "Please wait for them to finish.",
+                retry_after=1,
+            )
+
+        # Shed load when every slot is busy and the queue is already full
+        if self._slots.locked() and self._waiting >= self.max_queue:
+            self._rejected_queue_full += 1
+            raise self._reject(
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                "The server is busy. Please try again shortly.",
+                retry_after=max(1, int(self.queue_timeout)),
+            )
+
+        self._user_inflight[user_id] = self._user_inflight.get(user_id, 0) + 1
+        self._waiting += 1
+        start = time.monotonic()
+        try:
+            if self._slots.locked():
+                await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+            else:
+                # Free slot: acquire without the wait_for task overhead
+                await self._slots.acquire()
+        except asyncio.TimeoutError:
+            self._rejected_timeout += 1
+            self._release_user(user_id)
+            raise self._reject(
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                "The server is busy. Please try again shortly.",
+                retry_after=max(1, int(self.queue_timeout)),
+            )
+        except BaseException:
+            self._release_user(user_id)
+            raise
+        finally:
+            self._waiting -= 1
+
+        waited = time.monotonic() - start
+        self._admitted += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        self._recent_waits.append(waited)
+        if waited > self.queue_timeout / 2:
+            logger.info(f"Admission '{self.name}': user {user_id} waited {waited:.3f}s for a slot")
+
+        self._running += 1
+        try:
+            yield
+        finally:
+            self._running -= 1
+            self._slots.release()
+            self._release_user(user_id)
+
+    def snapshot(self) -> dict:
+        """Point-in-time metrics for the health/metrics endpoint"""
+        recent = list(self._recent_waits)
+        return {
+            "limits": {
+                "global": self.global_limit,
+                "per_user": self.per_user_limit,
+                "max_queue": self.max_queue,
+                "queue_timeout_seconds": self.queue_timeout,
+            },
+            "running": self._running,
+            "waiting": self._waiting,
+            "admitted": self._admitted,
+            "rejected": {
+                "per_user_limit": self._rejected_user,
+                "queue_full": self._rejected_queue_full,
+                "queue_timeout": self._rejected_timeout,
+            },
+            "wait_seconds": {
+                "avg": round(self._wait_total / self._admitted, 6) if self._admitted else 0.0,
+                "max": round(self._wait_max, 6),
+                "p50": round(_percentile(recent, 50), 6),
+                "p99": round(_percentile(recent, 99), 6),
+            },
+        }
+
+
+# Shared controller for all endpoints marked as heavy
+heavy_controller = AdmissionController(
+    name="heavy",
+    global_limit=HEAVY_GLOBAL_LIMIT,
+    per_user_limit=HEAVY_PER_USER_LIMIT,
+    max_queue=HEAVY_MAX_QUEUE,
+    queue_timeout=HEAVY_QUEUE_TIMEOUT,
+)
+
+
+async def heavy_request(current_user: User = Depends(get_current_user)) -> AsyncIterator[None]:
+    """
+    FastAPI dependency marking an endpoint as CPU-heavy.
+
+    Usage:
+        @router.get("/...", dependencies=[Depends(heavy_request)])
+    """
+    async with heavy_controller.admit(current_user.id):
+        yield
+
+
+def get_admission_metrics() -> dict:
+    """Metrics for every admission controller, keyed by name"""
+    return {heavy_controller.name: heavy_controller.snapshot()}
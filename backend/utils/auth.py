@@ -30,11 +30,15 @@ JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
 
+# Shared secret for internal monitoring endpoints (/api/health/metrics); unset disables them
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
+internal_security = HTTPBearer(auto_error=False)
 
 
 # ============================================================================
@@ -329,6 +333,29 @@ async def get_current_active_user(
     return current_user
 
 
+async def require_metrics_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(internal_security)
+) -> None:
+    """
+    FastAPI dependency for internal monitoring endpoints: requires
+    `Authorization: Bearer <METRICS_TOKEN>`
+    
+    Raises:
+        HTTPException 503 if METRICS_TOKEN is not configured, 401 if the token is missing or wrong
+    """
+    if not METRICS_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Metrics unavailable: METRICS_TOKEN not configured"
+        )
+    if credentials is None or not secrets.compare_digest(credentials.credentials.encode(), METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
 # ============================================================================
 # TOKEN RESPONSE HELPER
 # ============================================================================
@@ -0,0 +1,207 @@
+"""
+Balance Sheet Projection Engine
+Projects non-property assets (super, shares, ETFs, cash, ...) and liabilities
+(car loans, credit cards, HECS, ...) over a horizon, all items of a category
+at once.
+
+Each category is one array expression over items × periods, evaluated in
+closed form rather than stepped item by item:
+
+    assets (yearly):        v(t) = v0·q^t + c0·(q^t − h^t)/(q − h),  q = 1 + r, h = 1 + g
+                            (c0·t·q^(t−1) when q = h)
+    liabilities (monthly):  b(k) = max((b0 − p/m)·(1 + m)^k + p/m, 0)
+                            (max(b0 − p·k, 0) when m = 0)
+
+r is the asset's expected return, c0 its first year's contributions (growing
+at g a year, paid at year end), m a liability's monthly interest rate and p
+its monthly payment. A balance that reaches zero stays there; one whose
+payment does not cover its interest keeps growing.
+
+⚠️ CRITICAL: Projections are computed in float64 arrays and rounded to cents
+with ROUND_HALF_UP on the way out (to_currency). They are forecasts — stored
+balances and ledger arithmetic still use Decimal (see utils/calculations.py).
+"""
+
+from decimal import Decimal
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from models.asset import Asset
+from models.liability import Liability
+from utils.calculations import round_currency
+
+
+# Payments per year by frequency (Asset.contributions and Liability.payment_frequency)
+PERIODS_PER_YEAR = {
+    "weekly": 52,
+    "fortnightly": 26,
+    "monthly": 12,
+    "quarterly": 4,
+    "annual": 1,
+    "annually": 1,
+}
+
+# Liabilities with this payoff strategy pay only their minimum; others add extra_payment
+MINIMUM_ONLY = "minimum"
+
+
+class AssetProjection(NamedTuple):
+    """Per-asset yearly series, shape (assets, years + 1); column 0 is today"""
+    values: np.ndarray
+    returns: np.ndarray  # Growth earned during each year
+    contributions: np.ndarray  # Paid in at the end of each year
+
+
+class LiabilityProjection(NamedTuple):
+    """Per-liability yearly series, shape (liabilities, years + 1); column 0 is today"""
+    balances: np.ndarray
+    interest: np.ndarray  # Interest charged during each year
+    payments: np.ndarray  # Paid during each year
+    payoff_months: np.ndarray  # Months until paid off, -1 if not within the horizon
+
+
+class BalanceSheetProjection(NamedTuple):
+    """Assets and liabilities projected over the same horizon"""
+    assets: AssetProjection
+    liabilities: LiabilityProjection
+
+    @property
+    def total_assets(self) -> np.ndarray:
+        return self.assets.values.sum(axis=0)
+
+    @property
+    def total_liabilities(self) -> np.ndarray:
+        return self.liabilities.balances.sum(axis=0)
+
+    @property
+    def net_worth(self) -> np.ndarray:
+        return self.total_assets - self.total_liabilities
+
+    @property
+    def net_returns(self) -> np.ndarray:
+        """Asset growth less liability interest, per year"""
+        return self.assets.returns.sum(axis=0) - self.liabilities.interest.sum(axis=0)
+
+
+def _column(values: Sequence, default: float = 0.0) -> np.ndarray:
+    """Items as a float column vector; None becomes default"""
+    return np.array([default if v is None else float(v) for v in values], dtype=float).reshape(-1, 1)
+
+
+def _annual_contributions(asset: Asset) -> tuple:
+    """(first year's contributions, yearly contribution growth %) from Asset.contributions"""
+    schedule = asset.contributions or {}
+    per_period = float(schedule.get("amount") or 0) + float(schedule.get("employer_contribution") or 0)
+    periods = PERIODS_PER_YEAR.get(schedule.get("frequency") or "monthly", 12)
+    return per_period * periods, float(schedule.get("growth_rate") or 0)
+
+
+def project_assets(assets: Sequence[Asset], years: int) -> AssetProjection:
+    """
+    Compound every asset at its expected return, adding its contributions.
+
+    Args:
+        assets: Assets to project (usually the active ones)
+        years: Number of years to project
+
+    Returns:
+        AssetProjection with one row per asset, in input order
+    """
+    t = np.arange(years + 1, dtype=float)
+    if not assets:
+        empty = np.zeros((0, years + 1))
+        return AssetProjection(empty, empty, empty)
+
+    contributions = [_annual_contributions(asset) for asset in assets]
+    v0 = _column([asset.current_value for asset in assets])
+    q = 1 + _column([asset.expected_return for asset in assets]) / 100
+    c0 = _column([c for c, _ in contributions])
+    h = 1 + _column([g for _, g in contributions]) / 100
+
+    q_t = q ** t
+    h_t = h ** t
+    same = np.isclose(q, h)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        paid_in = np.where(same, c0 * t * q ** np.maximum(t - 1, 0), c0 * (q_t - h_t) / np.where(same, 1, q - h))
+    values = v0 * q_t + paid_in
+
+    # Year t's contributions are c0·h^(t−1); year 0 has none
+    yearly = np.zeros_like(values)
+    yearly[:, 1:] = c0 * h_t[:, :-1]
+    returns = np.zeros_like(values)
+    returns[:, 1:] = values[:, :-1] * (q - 1)
+    return AssetProjection(values, returns, yearly)
+
+
+def monthly_payment(liability: Liability) -> float:
+    """Regular payment per month, including extra_payment unless paying the minimum only"""
+    payment = float(liability.minimum_payment or 0)
+    if liability.payoff_strategy != MINIMUM_ONLY:
+        payment += float(liability.extra_payment or 0)
+    return payment * PERIODS_PER_YEAR.get(liability.payment_frequency, 12) / 12
+
+
+def project_liabilities(
+    liabilities: Sequence[Liability],
+    years: int,
+    interest_rate_offset: Optional[float] = None,
+) -> LiabilityProjection:
+    """
+    Amortize every liability month by month at its interest rate and payment.
+
+    Args:
+        liabilities: Liabilities to project (usually the active ones)
+        years: Number of years to project
+        interest_rate_offset: Percentage points added to every rate (stress
+            testing); rates are floored at zero
+
+    Returns:
+        LiabilityProjection with one row per liability, in input order
+    """
+    if not liabilities:
+        empty = np.zeros((0, years + 1))
+        return LiabilityProjection(empty, empty, empty, np.zeros(0, dtype=int))
+
+    k = np.arange(years * 12 + 1, dtype=float)
+    b0 = _column([liability.current_balance for liability in liabilities])
+    rates = _column([liability.interest_rate for liability in liabilities]) + (interest_rate_offset or 0)
+    m = np.maximum(rates, 0) / 100 / 12
+    p = _column([monthly_payment(liability) for liability in liabilities])
+
+    growth = (1 + m) ** k
+    with np.errstate(divide="ignore", invalid="ignore"):
+        steady = np.where(m > 0, p / np.where(m > 0, m, 1), 0)
+    balances = np.where(m > 0, (b0 - steady) * growth + steady, b0 - p * k)
+    balances = np.maximum(balances, 0)
+
+    # Month k's interest accrues on month k − 1's balance; the payment is whatever cleared it
+    interest = balances[:, :-1] * m
+    paid = balances[:, :-1] + interest - balances[:, 1:]
+
+    cleared = balances <= 0.005
+    payoff_months = np.where(cleared.any(axis=1), cleared.argmax(axis=1), -1)
+
+    yearly_interest = np.zeros((len(liabilities), years + 1))
+    yearly_paid = np.zeros((len(liabilities), years + 1))
+    yearly_interest[:, 1:] = interest.reshape(len(liabilities), years, 12).sum(axis=2)
+    yearly_paid[:, 1:] = paid.reshape(len(liabilities), years, 12).sum(axis=2)
+    return LiabilityProjection(balances[:, ::12], yearly_interest, yearly_paid, payoff_months)
+
+
+def project_balance_sheet(
+    assets: Sequence[Asset],
+    liabilities: Sequence[Liability],
+    years: int,
+    interest_rate_offset: Optional[float] = None,
+) -> BalanceSheetProjection:
+    """Project assets and liabilities over the same horizon"""
+    return BalanceSheetProjection(
+        project_assets(assets, years),
+        project_liabilities(liabilities, years, interest_rate_offset),
+    )
+
+
+def to_currency(values: np.ndarray) -> List[Decimal]:
+    """A projected series as Decimals rounded to cents"""
+    return [round_currency(Decimal(repr(float(v)))) for v in values]
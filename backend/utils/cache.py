@@ -0,0 +1,315 @@
+"""
+Result Caches
+Two-tier caches for computed results (projections, summaries): a bounded
+in-process LRU in front of a shared Redis tier, with hit-rate metrics.
+
+Keys are content-addressed: they include the owning portfolio's data version
+(utils/data_version.py), so a write never needs to find and delete entries —
+it bumps the version and old entries stop being addressed, ageing out of the
+local LRU and expiring from Redis by TTL.
+
+⚠️ CRITICAL: Keys must include the user id. Cached values are shared objects —
+callers must treat them as read-only. Values stored in a TwoTierCache must be
+encodable by utils/cache_codec.py (register response models there).
+"""
+
+import os
+import time
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from utils.cache_codec import encode, decode, CodecError
+from utils.redis_cache import get_redis, mark_redis_failure, publish_invalidation, on_invalidation, redis_status
+
+logger = logging.getLogger(__name__)
+
+
+# Total weight the local projection cache may hold (one unit per projected property-year)
+PROJECTION_CACHE_MAX_WEIGHT = int(os.getenv("PROJECTION_CACHE_MAX_WEIGHT", "200000"))
+
+# Summaries held locally (one unit per summary)
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "5000"))
+
+# Lifetime of shared-tier entries; stale versions expire from Redis after this
+PROJECTION_CACHE_TTL_SECONDS = int(os.getenv("PROJECTION_CACHE_TTL_SECONDS", "3600"))
+SUMMARY_CACHE_TTL_SECONDS = int(os.getenv("SUMMARY_CACHE_TTL_SECONDS", "900"))
+
+# Bump whenever projection maths or response shape changes, so results (and
+# ETags) computed by an older deploy stop being addressed
+PROJECTION_ENGINE_REVISION = "2"  # 2: balance sheet projected with the array engine
+
+
+class LRUCache:
+    """
+    Weight-bounded LRU cache.
+
+    Each entry has a weight (default 1); least recently used entries are evicted
+    until the total weight fits max_weight. Entries heavier than max_weight are
+    not cached. With ttl_seconds set, entries also expire after that long.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_weight: int,
+        weigh: Optional[Callable[[Any], int]] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        self.name = name
+        self.max_weight = max_weight
+        self.ttl_seconds = ttl_seconds
+        self._weigh = weigh or (lambda value: 1)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, Optional[float]]]" = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value (marking it most recently used) or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None and time.monotonic() >= entry[2]:
+                self._entries.pop(key)
+                self._weight -= entry[1]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Insert or replace an entry, evicting LRU entries to stay within max_weight"""
+        weight = max(1, int(self._weigh(value)))
+        if weight > self.max_weight:
+            return
+
+        with self._lock:
+            existing = self._entries.pop(key, None)
+            if existing is not None:
+                self._weight -= existing[1]
+
+            expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+            self._entries[key] = (value, weight, expires_at)
+            self._weight += weight
+
+            while self._weight > self.max_weight:
+                _, (_, evicted_weight, _) = self._entries.popitem(last=False)
+                self._weight -= evicted_weight
+                self._evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._weight -= entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def snapshot(self) -> dict:
+        """Point-in-time metrics for the health/metrics endpoint"""
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "weight": self._weight,
+            "max_weight": self.max_weight,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def _projection_weight(response: Any) -> int:
+    """Weight a projection response by the number of year rows it holds"""
+    if hasattr(response, "properties"):
+        rows = sum(len(p.projections) for p in response.properties)
+        return rows + len(response.totals)
+    return len(getattr(response, "projections", [])) or 1
+
+
+def projection_cache_key(
+    user_id: str,
+    scope: str,
+    object_id: str,
+    version: str,
+    start_year: int,
+    years: int,
+    expense_growth_override: Optional[float] = None,
+    interest_rate_offset: Optional[float] = None,
+    asset_growth_override: Optional[float] = None,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> Tuple:
+    """
+    Key for a projection result.
+
+    Args:
+        scope: "property" or "portfolio"
+        object_id: Property or portfolio ID
+        version: Data version of the owning portfolio
+        start_year: First projected year (results roll over at New Year)
+        fields: Selected metrics in canonical order (None = all)
+    """
+    return (
+        PROJECTION_ENGINE_REVISION,
+        user_id,
+        scope,
+        object_id,
+        version,
+        start_year,
+        years,
+        expense_growth_override,
+        interest_rate_offset,
+        asset_growth_override,
+        fields,
+    )
+
+
+# Registry used to route invalidation messages: {name: TwoTierCache}
+_two_tier_caches: Dict[str, "TwoTierCache"] = {}
+
+
+class TwoTierCache:
+    """
+    Local LRU in front of a shared Redis tier.
+
+    Reads check the local LRU, then Redis (filling the LRU on a remote hit).
+    Writes go to both. Explicit invalidations are broadcast so other instances
+    drop their local copy. Without Redis — unconfigured or failing — it behaves
+    as the local LRU alone.
+    """
+
+    def __init__(self, name: str, local: LRUCache, ttl_seconds: int):
+        self.name = name
+        self.local = local
+        self.ttl_seconds = ttl_seconds
+        self._remote_hits = 0
+        self._remote_misses = 0
+        self._remote_errors = 0
+        _two_tier_caches[name] = self
+
+    def _redis_key(self, key: Hashable) -> str:
+        digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()[:40]
+        return f"cache:{self.name}:{digest}"
+
+    async def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value or None"""
+        redis_key = self._redis_key(key)
+        value = self.local.get(redis_key)
+        if value is not None:
+            return value
+
+        client = get_redis()
+        if client is None:
+            return None
+        try:
+            blob = await client.get(redis_key)
+        except Exception as e:
+            self._remote_errors += 1
+            mark_redis_failure(e)
+            return None
+
+        if blob is None:
+            self._remote_misses += 1
+            return None
+        try:
+            value = decode(blob)
+        except CodecError as e:
+            logger.warning(f"Dropping undecodable {self.name} cache entry: {e}")
+            self._remote_misses += 1
+            return None
+
+        self._remote_hits += 1
+        self.local.put(redis_key, value)
+        return value
+
+    async def put(self, key: Hashable, value: Any) -> None:
+        """Store a value in both tiers"""
+        redis_key = self._redis_key(key)
+        self.local.put(redis_key, value)
+
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            await client.set(redis_key, encode(value), ex=self.ttl_seconds)
+        except Exception as e:
+            self._remote_errors += 1
+            mark_redis_failure(e)
+
+    async def invalidate(self, key: Hashable) -> None:
+        """Remove a value from both tiers and from every other instance's local tier"""
+        redis_key = self._redis_key(key)
+        self.local.delete(redis_key)
+
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            await client.delete(redis_key)
+        except Exception as e:
+            self._remote_errors += 1
+            mark_redis_failure(e)
+            return
+        await publish_invalidation("cache", {"cache": self.name, "key": redis_key})
+
+    def clear(self) -> None:
+        """Clear the local tier (shared entries expire by TTL)"""
+        self.local.clear()
+
+    def snapshot(self) -> dict:
+        """Point-in-time metrics for the health/metrics endpoint"""
+        remote_lookups = self._remote_hits + self._remote_misses
+        return {
+            "local": self.local.snapshot(),
+            "remote": {
+                "status": redis_status(),
+                "hits": self._remote_hits,
+                "misses": self._remote_misses,
+                "errors": self._remote_errors,
+                "hit_rate": round(self._remote_hits / remote_lookups, 4) if remote_lookups else 0.0,
+            },
+        }
+
+
+async def _on_cache_invalidation(message: dict) -> None:
+    cache = _two_tier_caches.get(message.get("cache"))
+    if cache is not None and message.get("key"):
+        cache.local.delete(message["key"])
+
+
+on_invalidation("cache", _on_cache_invalidation)
+
+
+def get_cache_metrics() -> dict:
+    """Metrics for every two-tier cache, keyed by name"""
+    return {name: cache.snapshot() for name, cache in _two_tier_caches.items()}
+
+
+# Shared projection result cache
+projection_cache = TwoTierCache(
+    "projections",
+    LRUCache("projections", PROJECTION_CACHE_MAX_WEIGHT, weigh=_projection_weight),
+    ttl_seconds=PROJECTION_CACHE_TTL_SECONDS,
+)
+
+# Shared dashboard / portfolio summary cache
+summary_cache = TwoTierCache(
+    "summaries",
+    LRUCache("summaries", SUMMARY_CACHE_MAX_ENTRIES),
+    ttl_seconds=SUMMARY_CACHE_TTL_SECONDS,
+)
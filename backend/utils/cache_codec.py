@@ -0,0 +1,90 @@
+"""
+Cache Payload Codec
+Compact binary serialization for cached results shared through Redis.
+
+Payloads are JSON with short type tags for the values JSON cannot carry
+(Decimal, date, datetime, registered pydantic models), zlib-compressed. Decimal
+values round-trip exactly — money never passes through float.
+
+⚠️ CRITICAL: Only models registered with register_model() can be decoded. Register
+each response model next to the cache that stores it.
+"""
+
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Type
+
+from pydantic import BaseModel
+
+
+# Leading byte identifies the format so it can evolve without misreading old entries
+FORMAT_VERSION = b"\x01"
+
+_models: Dict[str, Type[BaseModel]] = {}
+
+
+class CodecError(ValueError):
+    """Raised when a cached payload cannot be decoded"""
+
+
+def register_model(model_cls: Type[BaseModel]) -> Type[BaseModel]:
+    """Allow instances of a pydantic model to be encoded and decoded"""
+    _models[model_cls.__name__] = model_cls
+    return model_cls
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return {"$d": str(value)}
+    if isinstance(value, datetime):
+        return {"$t": value.isoformat()}
+    if isinstance(value, date):
+        return {"$a": value.isoformat()}
+    if isinstance(value, BaseModel):
+        name = type(value).__name__
+        if name not in _models:
+            raise TypeError(f"Model {name} is not registered with the cache codec")
+        return {"$m": name, "v": value.model_dump()}
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def _object_hook(obj: dict) -> Any:
+    if len(obj) == 1:
+        if "$d" in obj:
+            return Decimal(obj["$d"])
+        if "$t" in obj:
+            return datetime.fromisoformat(obj["$t"])
+        if "$a" in obj:
+            return date.fromisoformat(obj["$a"])
+    elif len(obj) == 2 and "$m" in obj:
+        model_cls = _models.get(obj["$m"])
+        if model_cls is None:
+            raise CodecError(f"Unknown model {obj['$m']}")
+        return model_cls.model_validate(obj["v"])
+    return obj
+
+
+def encode(value: Any) -> bytes:
+    """Serialize a value to compressed bytes"""
+    text = json.dumps(value, default=_default, separators=(",", ":"))
+    return FORMAT_VERSION + zlib.compress(text.encode("utf-8"), 6)
+
+
+def decode(blob: bytes) -> Any:
+    """
+    Deserialize bytes produced by encode().
+
+    Raises:
+        CodecError if the payload is from an unknown format or is corrupt
+    """
+    if not blob or blob[:1] != FORMAT_VERSION:
+        raise CodecError("Unknown cache payload format")
+    try:
+        text = zlib.decompress(blob[1:]).decode("utf-8")
+        return json.loads(text, object_hook=_object_hook)
+    except CodecError:
+        raise
+    except Exception as e:
+        raise CodecError(f"Corrupt cache payload: {e}") from e
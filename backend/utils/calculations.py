@@ -13,6 +13,8 @@ from datetime import date
 from typing import List, Dict, Optional, Any
 from enum import Enum
 
+from utils.cancellation import CancelToken
+
 
 # ============================================================================
 # CONSTANTS
@@ -534,28 +536,21 @@ def calculate_property_equity(
 # CASHFLOW CALCULATIONS
 # ============================================================================
 
-def calculate_property_cashflow(
+def calculate_annual_repayments(
     loans: List[Dict[str, Any]],
-    rental_income: Decimal,
-    expenses: Decimal,
-    depreciation: Decimal = Decimal("0"),
     interest_rate_offset: Decimal = Decimal("0")
-) -> Dict[str, Decimal]:
+) -> Decimal:
     """
-    Calculate property cashflow for a given year.
+    Total annual repayments across loans, unrounded.
     
-    Net Cashflow = Rental Income - Loan Repayments - Expenses
-    (Depreciation is a non-cash deduction for tax purposes)
+    Each loan is repaid on its balance net of any offset account.
     
     Args:
         loans: List of loan records
-        rental_income: Annual rental income
-        expenses: Annual expenses
-        depreciation: Annual depreciation (for reporting)
         interest_rate_offset: Rate adjustment for scenario modeling
     
     Returns:
-        Dict with rental_income, loan_repayments, expenses, depreciation, net_cashflow
+        Annual repayments (not rounded to cents)
     """
     total_repayments = Decimal("0")
     
@@ -581,6 +576,35 @@ def calculate_property_cashflow(
         
         total_repayments += repayment["annual_payment"]
     
+    return total_repayments
+
+
+def calculate_property_cashflow(
+    loans: List[Dict[str, Any]],
+    rental_income: Decimal,
+    expenses: Decimal,
+    depreciation: Decimal = Decimal("0"),
+    interest_rate_offset: Decimal = Decimal("0")
+) -> Dict[str, Decimal]:
+    """
+    Calculate property cashflow for a given year.
+    
+    Net Cashflow = Rental Income - Loan Repayments - Expenses
+    (Depreciation is a non-cash deduction for tax purposes)
+    
+    Args:
+        loans: List of loan records
+        rental_income: Annual rental income
+        expenses: Annual expenses
+        depreciation: Annual depreciation (for reporting)
+        interest_rate_offset: Rate adjustment for scenario modeling
+    
+    Returns:
+        Dict with rental_income, loan_repayments, expenses, depreciation, net_cashflow
+        (each rounded once; net_cashflow from the unrounded components)
+    """
+    total_repayments = calculate_annual_repayments(loans, interest_rate_offset)
+    
     net_cashflow = rental_income - total_repayments - expenses
     
     return {
@@ -601,7 +625,8 @@ def calculate_portfolio_summary(
     target_year: int,
     base_year: Optional[int] = None,
     expense_growth_override: Optional[Decimal] = None,
-    interest_rate_offset: Decimal = Decimal("0")
+    interest_rate_offset: Decimal = Decimal("0"),
+    cancel: Optional[CancelToken] = None
 ) -> Dict[str, Decimal]:
     """
     Calculate aggregated portfolio metrics for a single year.
@@ -612,6 +637,7 @@ def calculate_portfolio_summary(
         base_year: Base year for calculations
         expense_growth_override: Optional expense growth rate override
         interest_rate_offset: Interest rate adjustment for scenarios
+        cancel: Checked before each property; raises OperationCancelled once cancelled
     
     Returns:
         Aggregated portfolio metrics
@@ -631,6 +657,8 @@ def calculate_portfolio_summary(
     }
     
     for prop_data in properties_data:
+        if cancel is not None:
+            cancel.check()
         prop = prop_data.get("property", {})
         loans = prop_data.get("loans", [])
         rental_incomes = prop_data.get("rental_incomes", [])
@@ -685,7 +713,8 @@ def generate_portfolio_projections(
     start_year: int,
     end_year: int,
     expense_growth_override: Optional[Decimal] = None,
-    interest_rate_offset: Decimal = Decimal("0")
+    interest_rate_offset: Decimal = Decimal("0"),
+    cancel: Optional[CancelToken] = None
 ) -> List[Dict[str, Any]]:
     """
     Generate multi-year projections for entire portfolio.
@@ -696,6 +725,7 @@ def generate_portfolio_projections(
         end_year: Last year of projection (inclusive)
         expense_growth_override: Optional expense growth rate override
         interest_rate_offset: Interest rate adjustment for scenarios
+        cancel: Checked before each property of each year; raises OperationCancelled once cancelled
     
     Returns:
         List of yearly projection dicts
@@ -708,7 +738,8 @@ def generate_portfolio_projections(
             year,
             start_year,
             expense_growth_override,
-            interest_rate_offset
+            interest_rate_offset,
+            cancel
         )
         
         projections.append({
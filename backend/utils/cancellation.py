@@ -0,0 +1,162 @@
+"""
+Cooperative Cancellation
+Lets long calculations stop early when nobody is waiting for the answer.
+
+A CancelToken is cancelled when the client disconnects, when the request's
+deadline passes, or explicitly (background jobs). Calculation loops call
+token.check() once per property or year and unwind with OperationCancelled;
+the route turns that into an HTTP error and the session dependency returns
+the pooled connection.
+
+    async with cancel_scope(request) as token:
+        try:
+            result = await run_in_threadpool(_compute, ..., cancel=token)
+        except OperationCancelled as e:
+            raise cancelled_error(e)
+
+⚠️ CRITICAL: Checks are cooperative — code that never calls check() runs to
+completion. Tokens are read from threadpool threads, so state lives in a
+threading.Event and a monotonic deadline, never in the event loop.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+from fastapi import HTTPException, Request, status
+
+logger = logging.getLogger(__name__)
+
+
+# Longest a single request may compute before it is abandoned (0 disables)
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "30"))
+
+# How often a computing request checks whether its client is still connected
+DISCONNECT_POLL_SECONDS = float(os.getenv("DISCONNECT_POLL_SECONDS", "0.25"))
+
+# Non-standard "client closed request" status (nginx); never seen by the client
+HTTP_499_CLIENT_CLOSED_REQUEST = 499
+
+
+class OperationCancelled(Exception):
+    """Raised by CancelToken.check() inside a cancelled calculation"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason  # "disconnected", "deadline" or "cancelled"
+
+
+class CancelToken:
+    """Thread-safe cancellation flag with an optional deadline"""
+
+    def __init__(self, timeout: Optional[float] = None):
+        self._event = threading.Event()
+        self._reason: Optional[str] = None
+        self._deadline = time.monotonic() + timeout if timeout else None
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        if not self._event.is_set():
+            self._reason = reason
+            self._event.set()
+
+    @property
+    def expired(self) -> bool:
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set() or self.expired
+
+    @property
+    def reason(self) -> Optional[str]:
+        if self._event.is_set():
+            return self._reason
+        return "deadline" if self.expired else None
+
+    def check(self) -> None:
+        """
+        Raises:
+            OperationCancelled if the token has been cancelled or its deadline has passed
+        """
+        if self.cancelled:
+            raise OperationCancelled(self.reason)
+
+
+class SharedCancelToken(CancelToken):
+    """
+    Token for a computation shared by several callers (utils/single_flight.py):
+    cancelled only once every caller that joined it is cancelled.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._callers: List[CancelToken] = []
+
+    def join(self, token: Optional[CancelToken]) -> None:
+        # A caller without a token never gives up, so neither does the computation
+        self._callers.append(token if token is not None else CancelToken())
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set() or bool(self._callers) and all(t.cancelled for t in list(self._callers))
+
+    @property
+    def reason(self) -> Optional[str]:
+        if self._event.is_set():
+            return self._reason
+        if not self.cancelled:
+            return None
+        reasons = {t.reason for t in list(self._callers)}
+        return "deadline" if "deadline" in reasons else reasons.pop()
+
+
+async def _watch_disconnect(request: Request, token: CancelToken) -> None:
+    while not token.cancelled:
+        if await request.is_disconnected():
+            token.cancel("disconnected")
+            return
+        await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+
+
+@asynccontextmanager
+async def cancel_scope(request: Optional[Request], timeout: Optional[float] = None) -> AsyncIterator[CancelToken]:
+    """
+    Token for the block's computation, cancelled when the request's client
+    disconnects, when timeout seconds pass, or when the handler itself is cancelled.
+
+    Args:
+        request: The incoming request (None when a handler is called directly;
+            only the deadline applies)
+        timeout: Seconds before the token expires (default REQUEST_DEADLINE_SECONDS; 0 for no deadline)
+    """
+    token = CancelToken(REQUEST_DEADLINE_SECONDS if timeout is None else timeout)
+    watcher = asyncio.ensure_future(_watch_disconnect(request, token)) if request is not None else None
+    try:
+        yield token
+    except asyncio.CancelledError:
+        # Work shielded from the handler (threadpool, single-flight) keeps running otherwise
+        token.cancel("disconnected")
+        raise
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+
+
+def cancelled_error(e: OperationCancelled) -> HTTPException:
+    """HTTP error for a calculation abandoned by a cancel_scope"""
+    if e.reason == "deadline":
+        logger.warning("Calculation abandoned after exceeding its deadline")
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "error": "Calculation timed out",
+                "message": "This calculation took too long to run in a request. "
+                           "Submit it as a background job (POST /api/jobs) instead.",
+            },
+        )
+    logger.info(f"Calculation abandoned: {e.reason}")
+    return HTTPException(status_code=HTTP_499_CLIENT_CLOSED_REQUEST, detail="Client closed request")
@@ -23,9 +23,11 @@ from jwt.algorithms import RSAAlgorithm
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
 
 from models.user import User
 from utils.database_sql import get_session
+from utils.cache import LRUCache, TwoTierCache
 
 logger = logging.getLogger(__name__)
 
@@ -39,15 +41,39 @@ _CLERK_JWKS_URL = f"{CLERK_ISSUER}/.well-known/jwks.json" if CLERK_ISSUER else N
 
 security = HTTPBearer()
 
-# In-memory JWKS key cache: {kid: public_key}, expires after 1 hour
+# JWKS document cache: local tier per process, shared through Redis across instances
+_JWKS_TTL_SECONDS = 3600
+_jwks_cache = TwoTierCache(
+    "jwks",
+    LRUCache("jwks", max_weight=4, ttl_seconds=_JWKS_TTL_SECONDS),
+    ttl_seconds=_JWKS_TTL_SECONDS,
+)
+
+# Parsed public keys for the current JWKS document: {kid: public_key}, expires after 1 hour
 _key_cache: dict[str, Any] = {}
 _key_cache_expiry: float = 0
 
 
-def _get_signing_key(kid: str) -> Any:
+def _fetch_jwks() -> dict:
+    """Fetch the JWKS document from Clerk (blocking; run in the threadpool)."""
+    if not _CLERK_JWKS_URL:
+        raise RuntimeError("CLERK_ISSUER environment variable is not set")
+
+    # Cloudflare blocks default Python user agents. We must spoof a browser.
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    }
+    response = http_requests.get(_CLERK_JWKS_URL, headers=headers, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+async def _get_signing_key(kid: str) -> Any:
     """Fetch the RSA public key for the given kid from Clerk's public JWKS endpoint.
 
-    Uses a 1-hour in-memory cache to avoid repeated JWKS fetches.
+    Parsed keys are cached in memory for 1 hour; the JWKS document itself is
+    cached in the shared tier so a fresh instance does not refetch it from Clerk.
+    An unknown kid (key rotation) forces a refetch.
     Uses the instance JWKS URL (not api.clerk.com/v1/jwks) because that is the
     endpoint that includes the instance signing key used for JWT template tokens.
     """
@@ -56,22 +82,16 @@ def _get_signing_key(kid: str) -> Any:
     if time.time() < _key_cache_expiry and kid in _key_cache:
         return _key_cache[kid]
 
-    if not _CLERK_JWKS_URL:
-        raise RuntimeError("CLERK_ISSUER environment variable is not set")
-
-    # Cloudflare blocks default Python user agents. We must spoof a browser.
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    }
-    response = http_requests.get(_CLERK_JWKS_URL, headers=headers, timeout=10)
-    response.raise_for_status()
+    jwks = await _jwks_cache.get(_CLERK_JWKS_URL)
+    if not jwks or kid not in {k.get("kid") for k in jwks.get("keys", [])}:
+        jwks = await run_in_threadpool(_fetch_jwks)
+        await _jwks_cache.put(_CLERK_JWKS_URL, jwks)
 
-    jwks = response.json()
     _key_cache = {
         k["kid"]: RSAAlgorithm.from_jwk(k)
         for k in jwks.get("keys", [])
     }
-    _key_cache_expiry = time.time() + 3600
+    _key_cache_expiry = time.time() + _JWKS_TTL_SECONDS
 
     if kid not in _key_cache:
         logger.error("kid %s not found in Clerk JWKS (available: %s)", kid, list(_key_cache))
@@ -83,7 +103,7 @@ def _get_signing_key(kid: str) -> Any:
     return _key_cache[kid]
 
 
-def _verify_clerk_token(token: str) -> dict:
+async def _verify_clerk_token(token: str) -> dict:
     """
     Verify a Clerk-issued JWT and return the decoded payload.
 
@@ -99,7 +119,7 @@ def _verify_clerk_token(token: str) -> dict:
     try:
         header = jwt.get_unverified_header(token)
         kid = header.get("kid")
-        public_key = _get_signing_key(kid)
+        public_key = await _get_signing_key(kid)
         decode_kwargs: dict = {
             "algorithms": ["RS256"],
             "issuer": CLERK_ISSUER,
@@ -212,7 +232,7 @@ async def get_current_user(
     Returns:
         Authenticated local User object.
     """
-    payload = _verify_clerk_token(credentials.credentials)
+    payload = await _verify_clerk_token(credentials.credentials)
 
     clerk_user_id: Optional[str] = payload.get("sub")
     if not clerk_user_id:
@@ -0,0 +1,109 @@
+"""
+Columnar Projection Encoding
+Compact alternative to the row-per-year projection responses for chart
+rendering (?format=columnar): one array per metric instead of one object per
+year, with Decimals encoded as fixed-point integers.
+
+A value v is sent as round(v × 10**scale); clients divide by 10**scale. The
+scale is included in every payload.
+
+⚠️ CRITICAL: Rounding is ROUND_HALF_UP to match utils/calculations.py. Columnar
+output is for display — anything that needs full DECIMAL(19, 4) precision must
+use the default JSON format.
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, List, Sequence
+
+from models.financials import ProjectionYearData, PropertyProjectionResponse, PortfolioProjectionResponse
+
+
+# Supported values for the ?format= query parameter
+RESPONSE_FORMATS = ("json", "columnar")
+
+# Fixed-point scale: 2 → integer cents (and hundredths of a percent for LVR)
+COLUMNAR_SCALE = 2
+
+# ProjectionYearData fields emitted as columns, in response order
+PROJECTION_METRICS = (
+    "property_value",
+    "total_debt",
+    "equity",
+    "lvr",
+    "rental_income",
+    "expenses",
+    "loan_repayments",
+    "depreciation",
+    "net_cashflow",
+)
+
+# HouseholdYearData fields emitted as balance sheet columns, in response order
+BALANCE_SHEET_METRICS = (
+    "other_assets",
+    "other_liabilities",
+    "total_assets",
+    "total_liabilities",
+    "net_worth",
+)
+
+
+def to_fixed_point(values: Sequence[Decimal], scale: int = COLUMNAR_SCALE) -> List[int]:
+    """Encode Decimals as integers in units of 10**-scale"""
+    multiplier = Decimal(10) ** scale
+    return [int((value * multiplier).to_integral_value(ROUND_HALF_UP)) for value in values]
+
+
+def _columns(rows: Sequence[ProjectionYearData], scale: int) -> Dict[str, List[int]]:
+    # Metrics excluded by ?fields= are None in every row and are omitted
+    present = [metric for metric in PROJECTION_METRICS if rows and getattr(rows[0], metric) is not None]
+    return {
+        metric: to_fixed_point([getattr(row, metric) for row in rows], scale)
+        for metric in present
+    }
+
+
+def property_projection_columns(response: PropertyProjectionResponse, scale: int = COLUMNAR_SCALE) -> dict:
+    """Columnar form of a property projection"""
+    return {
+        "format": "columnar",
+        "scale": scale,
+        "property_id": response.property_id,
+        "property_address": response.property_address,
+        "start_year": response.start_year,
+        "end_year": response.end_year,
+        "years": [row.year for row in response.projections],
+        "columns": _columns(response.projections, scale),
+    }
+
+
+def portfolio_projection_columns(response: PortfolioProjectionResponse, scale: int = COLUMNAR_SCALE) -> dict:
+    """
+    Columnar form of a portfolio projection.
+
+    Every property shares the top-level "years" axis; per-property metadata is
+    kept, but the per-property "years" arrays are not repeated. The balance
+    sheet, when present, adds the non-property and net worth columns.
+    """
+    return {
+        "format": "columnar",
+        "scale": scale,
+        "portfolio_id": response.portfolio_id,
+        "portfolio_name": response.portfolio_name,
+        "start_year": response.start_year,
+        "end_year": response.end_year,
+        "years": [row.year for row in response.totals],
+        "properties": [
+            {
+                "property_id": prop.property_id,
+                "property_address": prop.property_address,
+                "columns": _columns(prop.projections, scale),
+            }
+            for prop in response.properties
+        ],
+        "totals": _columns(response.totals, scale),
+        # Property metrics are already in "totals"
+        "balance_sheet": {
+            metric: to_fixed_point([getattr(row, metric) for row in response.balance_sheet], scale)
+            for metric in BALANCE_SHEET_METRICS
+        } if response.balance_sheet else None,
+    }
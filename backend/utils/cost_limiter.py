@@ -0,0 +1,168 @@
+"""
+Cost-Weighted Per-User Rate Limiter
+Charges each expensive request a cost proportional to the work it triggers
+(properties × years for projections, copied rows for scenario creation) against
+a per-user budget sized by subscription tier.
+
+⚠️ Keyed on the authenticated user id, not the client IP, so users behind a shared
+NAT do not share a bucket. Uses the Redis client from utils.rate_limiter when
+configured so budgets are shared across server instances.
+"""
+
+import os
+import time
+import logging
+from typing import Dict
+
+from fastapi import HTTPException, status
+
+from models.user import User
+from utils.rate_limiter import redis_client, ENABLE_RATE_LIMITING
+
+logger = logging.getLogger(__name__)
+
+
+# Length of a budget window in seconds
+COST_WINDOW_SECONDS = int(os.getenv("COST_LIMIT_WINDOW_SECONDS", "60"))
+
+# Cost units available per window, by subscription tier
+TIER_COST_BUDGETS: Dict[str, int] = {
+    "free": int(os.getenv("COST_BUDGET_FREE", "2000")),
+    "pro": int(os.getenv("COST_BUDGET_PRO", "10000")),
+    "premium": int(os.getenv("COST_BUDGET_PRO", "10000")),  # legacy alias for pro
+    "enterprise": int(os.getenv("COST_BUDGET_ENTERPRISE", "50000")),
+}
+
+# Multiplier applied to the raw work units of each route
+ROUTE_COST_WEIGHTS: Dict[str, int] = {
+    "projections.property": 1,
+    "projections.portfolio": 1,
+    "projections.batch": 1,
+    "projections.sensitivity": 1,
+    "projections.tornado": 1,
+    "projections.goal_seek": 3,  # A solve is a dozen or so restricted passes
+    "scenarios.create": 5,
+}
+
+# In-memory fallback: {key: (window_index, units_spent)}
+_memory_windows: Dict[str, tuple[int, int]] = {}
+
+
+def projection_cost(property_count: int, years: int) -> int:
+    """Work units for a projection: one unit per property per projected year"""
+    return max(1, property_count) * (years + 1)
+
+
+def sensitivity_cost(property_count: int, years: int, passes: int) -> int:
+    """
+    Work units for a sensitivity grid.
+
+    Each pass runs only one of the engine's four pipeline groups (value,
+    debt/repayments, expenses, rent), so four passes cost one projection.
+    """
+    return projection_cost(property_count, years) * max(1, -(-passes // 4))
+
+
+def scenario_copy_cost(row_count: int) -> int:
+    """Work units for a scenario deep copy: one unit per copied row"""
+    return max(1, row_count)
+
+
+def get_tier_budget(tier: str) -> int:
+    """Get the per-window cost budget for a subscription tier (unknown tiers get free)"""
+    return TIER_COST_BUDGETS.get((tier or "free").lower(), TIER_COST_BUDGETS["free"])
+
+
+async def _spend(key: str, cost: int, budget: int, window: int) -> tuple[bool, int]:
+    """
+    Atomically add cost to the user's window total.
+
+    Returns:
+        Tuple of (is_allowed, units_spent_in_window)
+    """
+    if redis_client:
+        try:
+            pipe = redis_client.pipeline()
+            pipe.incrby(key, cost)
+            pipe.expire(key, COST_WINDOW_SECONDS * 2)
+            results = await pipe.execute()
+            spent = int(results[0])
+
+            if spent > budget:
+                # Refund so a rejected request does not consume budget
+                await redis_client.decrby(key, cost)
+                return False, spent - cost
+            return True, spent
+
+        except Exception as e:
+            logger.warning(f"Redis error in cost limiter: {e}")
+            # Fall through to in-memory fallback
+
+    window_index, spent = _memory_windows.get(key, (window, 0))
+    if window_index != window:
+        spent = 0
+
+    if spent + cost > budget:
+        _memory_windows[key] = (window, spent)
+        return False, spent
+
+    _memory_windows[key] = (window, spent + cost)
+
+    # Drop stale windows so the fallback store does not grow unbounded
+    if len(_memory_windows) > 10000:
+        for stale_key in [k for k, (w, _) in _memory_windows.items() if w != window]:
+            _memory_windows.pop(stale_key, None)
+
+    return True, spent + cost
+
+
+async def charge_cost(user: User, route: str, units: int) -> dict:
+    """
+    Charge a request's cost against the user's tier budget.
+
+    Args:
+        user: Authenticated user (budget keyed on user.id)
+        route: Route name in ROUTE_COST_WEIGHTS
+        units: Raw work units (see projection_cost / scenario_copy_cost)
+
+    Returns:
+        Dict with limit, remaining, reset, cost
+
+    Raises:
+        HTTPException 429 if the user's budget for the current window is exhausted
+    """
+    budget = get_tier_budget(user.subscription_tier)
+    # A single request is always admissible against an empty bucket
+    cost = min(units * ROUTE_COST_WEIGHTS.get(route, 1), budget)
+
+    if not ENABLE_RATE_LIMITING:
+        return {"limit": budget, "remaining": budget, "reset": 0, "cost": cost}
+
+    now = time.time()
+    window = int(now // COST_WINDOW_SECONDS)
+    reset_time = (window + 1) * COST_WINDOW_SECONDS
+    key = f"cost:{user.id}:{window}"
+
+    is_allowed, spent = await _spend(key, cost, budget, window)
+
+    if not is_allowed:
+        retry_after = max(1, int(reset_time - now))
+        logger.info(f"Cost budget exhausted for user {user.id} on {route} (cost={cost}, spent={spent}, budget={budget})")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={
+                "error": "Rate limit exceeded",
+                "message": f"Compute budget for your plan is exhausted. Please try again in {retry_after} seconds.",
+                "limit": budget,
+                "cost": cost,
+                "reset": int(reset_time),
+            },
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    return {
+        "limit": budget,
+        "remaining": max(0, budget - spent),
+        "reset": int(reset_time),
+        "cost": cost,
+    }
@@ -0,0 +1,161 @@
+"""
+Portfolio Data Versions
+Monotonic per-portfolio and per-user version counters used to key caches,
+request coalescing and ETags. Any write that changes data feeding a summary or
+projection bumps the owning portfolio's version (and its user's version).
+
+With Redis configured, counters live in Redis (INCR) so every instance agrees on
+the current version, namespaced by an epoch also stored in Redis (created with
+SETNX), so counters that restart after Redis loses its data never re-issue an
+old version string. Each instance mirrors recently read versions locally for
+VERSION_MIRROR_SECONDS; bumps are broadcast over pub/sub so other instances drop
+their mirror immediately, and the short mirror lifetime bounds staleness if a
+broadcast is missed.
+
+⚠️ CRITICAL: Local-only versions are namespaced by a per-process boot epoch so a
+restarted process never re-issues a version string that a client or cache
+already holds.
+"""
+
+import os
+import time
+import uuid
+import logging
+from typing import Dict, Optional, Set, Tuple
+
+from utils.redis_cache import get_redis, mark_redis_failure, publish_invalidation, on_invalidation, redis_status
+
+logger = logging.getLogger(__name__)
+
+
+# Changes on every process start
+BOOT_EPOCH = uuid.uuid4().hex[:8]
+
+# How long a version read from Redis is trusted locally
+VERSION_MIRROR_SECONDS = float(os.getenv("VERSION_MIRROR_SECONDS", "5"))
+
+# Local counters (used when Redis is unavailable): {key: n}
+_local_versions: Dict[str, int] = {}
+
+# Redis key holding the epoch shared by every Redis counter
+_EPOCH_KEY = "dv:epoch"
+
+# Mirror of Redis versions: {key: ("epoch.n", expires_at)}
+_mirror: Dict[str, Tuple[str, float]] = {}
+
+# Bumps that could not reach Redis; replayed before the key is next read from it
+_pending_bumps: Set[str] = set()
+
+
+def _portfolio_key(portfolio_id: str) -> str:
+    return f"dv:portfolio:{portfolio_id}"
+
+
+def _user_key(user_id: str) -> str:
+    return f"dv:user:{user_id}"
+
+
+def _local_version(key: str) -> str:
+    return f"{BOOT_EPOCH}.{_local_versions.get(key, 0)}"
+
+
+async def _redis_version(client, key: str, bump: bool = False) -> str:
+    """Read (or INCR) a Redis counter together with the epoch, in one round trip"""
+    pipe = client.pipeline()
+    pipe.get(_EPOCH_KEY)
+    if bump:
+        pipe.incr(key)
+    else:
+        pipe.get(key)
+    epoch, raw = await pipe.execute()
+    if epoch is None:
+        # First use, or Redis lost its data and the counters restarted
+        await client.setnx(_EPOCH_KEY, uuid.uuid4().hex[:8])
+        epoch = await client.get(_EPOCH_KEY)
+    if isinstance(epoch, bytes):
+        epoch = epoch.decode()
+    return f"{epoch}.{int(raw or 0)}"
+
+
+async def _get_version(key: str) -> str:
+    client = get_redis()
+    if client is None:
+        return _local_version(key)
+
+    mirrored = _mirror.get(key)
+    if mirrored is not None and time.monotonic() < mirrored[1] and key not in _pending_bumps:
+        return mirrored[0]
+
+    try:
+        if key in _pending_bumps:
+            # A write happened while Redis was unreachable — make it visible fleet-wide
+            version = await _redis_version(client, key, bump=True)
+            _pending_bumps.discard(key)
+            await publish_invalidation("version", {"key": key})
+        else:
+            version = await _redis_version(client, key)
+    except Exception as e:
+        mark_redis_failure(e)
+        return _local_version(key)
+
+    _remember(key, version)
+    return version
+
+
+def _remember(key: str, version: str) -> None:
+    now = time.monotonic()
+    if len(_mirror) > 10000:
+        for stale in [k for k, (_, expires_at) in _mirror.items() if expires_at <= now]:
+            _mirror.pop(stale, None)
+    _mirror[key] = (version, now + VERSION_MIRROR_SECONDS)
+
+
+async def _bump(key: str) -> None:
+    # Always bump locally so a Redis outage still invalidates this instance
+    _local_versions[key] = _local_versions.get(key, 0) + 1
+
+    client = get_redis()
+    if client is None:
+        if redis_status() == "unavailable":
+            _pending_bumps.add(key)
+        return
+    try:
+        version = await _redis_version(client, key, bump=True)
+    except Exception as e:
+        mark_redis_failure(e)
+        _pending_bumps.add(key)
+        return
+    _remember(key, version)
+    await publish_invalidation("version", {"key": key})
+
+
+async def _on_version_invalidation(message: dict) -> None:
+    if message.get("key"):
+        _mirror.pop(message["key"], None)
+
+
+on_invalidation("version", _on_version_invalidation)
+
+
+async def get_portfolio_version(portfolio_id: str) -> str:
+    """Current data version of a portfolio"""
+    return await _get_version(_portfolio_key(portfolio_id))
+
+
+async def get_user_version(user_id: str) -> str:
+    """Current data version across all of a user's portfolios"""
+    return await _get_version(_user_key(user_id))
+
+
+async def bump_portfolio_version(portfolio_id: Optional[str], user_id: Optional[str] = None) -> None:
+    """
+    Invalidate everything derived from a portfolio's data.
+
+    Args:
+        portfolio_id: Portfolio whose data changed (ignored if None)
+        user_id: Owner of the portfolio; bumps the user-wide version too
+    """
+    if portfolio_id:
+        await _bump(_portfolio_key(portfolio_id))
+    if user_id:
+        await _bump(_user_key(user_id))
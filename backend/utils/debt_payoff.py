@@ -0,0 +1,175 @@
+"""
+Debt Payoff Simulator
+Month-by-month payoff of several debts under competing strategies:
+
+    minimum    every debt gets its regular payment only (the baseline)
+    avalanche  surplus goes to the highest interest rate first
+    snowball   surplus goes to the smallest balance first
+    custom     surplus follows a caller-given order (unlisted debts follow
+               in avalanche order)
+
+Apart from the baseline, the monthly budget stays fixed at every regular
+payment plus the surplus. A paid-off debt's payment rolls over to the next
+debt in the order, as does the unused part of a final payment.
+
+All strategies are simulated together. Each month is one set of array
+operations over strategies × debts, and the surplus is allocated along each
+strategy's order with a cumulative-sum waterfall. Only the months are
+stepped, because each month's allocation depends on which debts the previous
+months paid off.
+
+⚠️ CRITICAL: Simulated in float64 (like utils/balance_sheet.py) and rounded
+to cents on the way out; results are forecasts, not ledger values.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+
+STRATEGIES = ("minimum", "avalanche", "snowball", "custom")
+
+# Balances at or below this are treated as paid off
+PAID_OFF = 0.005
+
+
+class DebtPayoffError(ValueError):
+    """Raised when the strategies cannot be set up for the given debts"""
+
+
+class Debt(NamedTuple):
+    """One debt to pay off; rates in percent a year, amounts per month"""
+    key: str
+    balance: float
+    interest_rate: float
+    payment: float
+    offset_balance: float = 0.0  # Offset account: interest accrues only on the balance above it
+
+
+class PayoffOutcome(NamedTuple):
+    """One strategy's result; per-debt arrays are in input order"""
+    strategy: str
+    order: List[str]  # Debt keys, highest priority first
+    payoff_months: np.ndarray  # Month of the final payment (1 = next month), -1 if not within the horizon
+    interest: np.ndarray  # Total interest charged
+    paid: np.ndarray  # Total paid
+
+    @property
+    def months_to_debt_free(self) -> Optional[int]:
+        if (self.payoff_months < 0).any():
+            return None
+        return int(self.payoff_months.max(initial=0))
+
+
+def payoff_order(debts: Sequence[Debt], strategy: str, custom_order: Optional[Sequence[str]] = None) -> List[int]:
+    """
+    Indices of the debts in the order a strategy pays down.
+
+    Raises:
+        DebtPayoffError: Unknown strategy, or custom_order missing or naming unknown debts
+    """
+    indices = range(len(debts))
+    avalanche = sorted(indices, key=lambda i: (-debts[i].interest_rate, debts[i].balance, i))
+    if strategy in ("minimum", "avalanche"):
+        return avalanche
+    if strategy == "snowball":
+        return sorted(indices, key=lambda i: (debts[i].balance, -debts[i].interest_rate, i))
+    if strategy == "custom":
+        if not custom_order:
+            raise DebtPayoffError("The custom strategy needs custom_order")
+        positions = {debt.key: i for i, debt in enumerate(debts)}
+        unknown = [key for key in custom_order if key not in positions]
+        if unknown:
+            raise DebtPayoffError(f"Unknown debts in custom_order: {', '.join(unknown)}")
+        listed = [positions[key] for key in dict.fromkeys(custom_order)]
+        return listed + [i for i in avalanche if i not in listed]
+    raise DebtPayoffError(f"Strategy must be one of: {', '.join(STRATEGIES)}")
+
+
+def simulate_payoff(
+    debts: Sequence[Debt],
+    orders: np.ndarray,
+    surplus: np.ndarray,
+    max_months: int,
+) -> tuple:
+    """
+    Pay off the debts under several allocation orders at once.
+
+    Args:
+        debts: Debts to pay off
+        orders: (strategies, debts) debt indices per strategy, highest priority first
+        surplus: (strategies,) monthly amount on top of the regular payments;
+            NaN for a strategy that pays regular payments only, without rollover
+        max_months: Longest horizon to simulate
+
+    Returns:
+        (payoff_months, interest, paid), each (strategies, debts)
+    """
+    strategies, count = orders.shape
+    balances = np.tile(np.array([debt.balance for debt in debts], dtype=float), (strategies, 1))
+    rates = np.array([max(debt.interest_rate, 0.0) for debt in debts]) / 100 / 12
+    payments = np.array([debt.payment for debt in debts], dtype=float)
+    offsets = np.array([debt.offset_balance for debt in debts], dtype=float)
+
+    rollover = ~np.isnan(surplus)
+    budget = np.where(rollover, payments.sum() + np.nan_to_num(surplus), 0.0)
+
+    payoff_months = np.where(balances <= PAID_OFF, 0, -1)
+    interest_total = np.zeros_like(balances)
+    paid_total = np.zeros_like(balances)
+    for month in range(1, max_months + 1):
+        if (balances <= PAID_OFF).all():
+            break
+        interest = np.maximum(balances - offsets, 0) * rates
+        due = balances + interest
+        regular = np.minimum(payments, due)
+
+        # Whatever the budget has left after regular payments, poured down each order
+        extra = np.where(rollover, budget - regular.sum(axis=1), 0.0)
+        need = np.take_along_axis(due - regular, orders, axis=1)
+        ahead = np.cumsum(need, axis=1) - need
+        allocated = np.empty_like(need)
+        np.put_along_axis(allocated, orders, np.clip(extra[:, None] - ahead, 0, need), axis=1)
+
+        paid = regular + allocated
+        balances = due - paid
+        interest_total += interest
+        paid_total += paid
+        payoff_months = np.where((payoff_months < 0) & (balances <= PAID_OFF), month, payoff_months)
+
+    return payoff_months, interest_total, paid_total
+
+
+def compare_strategies(
+    debts: Sequence[Debt],
+    monthly_surplus: float,
+    strategies: Sequence[str],
+    custom_order: Optional[Sequence[str]] = None,
+    max_months: int = 600,
+) -> Dict[str, PayoffOutcome]:
+    """
+    Simulate the minimum-payment baseline and each requested strategy in one pass.
+
+    Args:
+        debts: Debts to pay off
+        monthly_surplus: Paid each month on top of the regular payments
+        strategies: Strategies to compare with the baseline (see STRATEGIES)
+        custom_order: Debt keys for the custom strategy, highest priority first
+        max_months: Longest horizon to simulate
+
+    Returns:
+        PayoffOutcome per strategy, the baseline ("minimum") first
+
+    Raises:
+        DebtPayoffError: Unknown strategy or invalid custom_order
+    """
+    names = list(dict.fromkeys(["minimum", *strategies]))
+    orders = [payoff_order(debts, name, custom_order) for name in names]
+    surplus = np.array([np.nan if name == "minimum" else monthly_surplus for name in names], dtype=float)
+    payoff_months, interest, paid = simulate_payoff(
+        debts, np.array(orders, dtype=int).reshape(len(names), len(debts)), surplus, max_months,
+    )
+    return {
+        name: PayoffOutcome(name, [debts[i].key for i in order], payoff_months[s], interest[s], paid[s])
+        for s, (name, order) in enumerate(zip(names, orders))
+    }
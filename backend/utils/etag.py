@@ -0,0 +1,66 @@
+"""
+ETag / Conditional Response Helpers
+Strong ETags for read-heavy endpoints, derived from the data version of the
+portfolio a response is computed from (or a hash of its inputs), so a client
+that already holds the current representation gets 304 Not Modified before any
+heavy query or calculation runs.
+
+Usage:
+    etag = make_etag(current_user.id, "dashboard.summary", portfolio_id, version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    ...
+    set_etag(response, etag)
+
+⚠️ CRITICAL: ETag inputs must include the user id and every parameter that
+changes the response body, otherwise two different bodies can share a tag.
+"""
+
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+
+# Clients must revalidate on every use; private because bodies are per-user
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a strong ETag from the values that determine a response body"""
+    digest = hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def is_not_modified(request: Optional[Request], etag: str) -> bool:
+    """
+    True if the request's If-None-Match matches the ETag.
+
+    Uses the weak comparison RFC 9110 specifies for If-None-Match, so a W/ prefix
+    added by a proxy still matches.
+    """
+    if request is None:
+        return False
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current ETag"""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def set_etag(response: Optional[Response], etag: str) -> None:
+    """Attach the ETag to the outgoing response (no-op when called outside a request)"""
+    if response is None:
+        return
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -0,0 +1,231 @@
+"""
+FIRE Solver
+Closed-form answers for the FIRE projection in routes/plans.py, without
+simulating year by year.
+
+The projection model has two constant-rate phases. With return r, savings s,
+withdrawal rate w and inflation i, net worth at the start of year t is
+
+    accumulation (age < retirement):  nw(t) = nw0·q^t + s·(q^t − 1)/r,  q = 1 + r
+    retirement:                       nw(t) = nw(T)·g^(t − T),  g = (1 + r − w)(1 − i/2)
+
+where T is the number of accumulation years. Time to a target is solved with
+logarithms where the phase is a plain geometric series, and by bisection over
+years otherwise; required savings is solved exactly since net worth is affine
+in s. The maximum withdrawal rate for a success threshold has no closed form
+(the FIRE number itself depends on w), so it is found by a grid scan of
+closed-form evaluations refined with Brent's method.
+
+⚠️ CRITICAL: These formulas must stay in step with _run_projection in
+routes/plans.py (same float model, same FIRE number and success
+probability); tests cross-check them against the simulation.
+"""
+
+import math
+from typing import Callable, NamedTuple, Optional
+
+from utils.solver import brent
+
+
+class FireInputs(NamedTuple):
+    """Projection inputs as used by the model (rates in percent, as in ProjectionInput)"""
+    current_net_worth: float
+    annual_savings: float
+    expected_return: float
+    inflation_rate: float
+    withdrawal_rate: float
+    current_age: int
+    retirement_age: int
+    life_expectancy: int
+    target_net_worth: Optional[float] = None
+
+
+def fire_number(inputs: FireInputs) -> float:
+    """Net worth at which FIRE is reached"""
+    if inputs.target_net_worth:
+        return inputs.target_net_worth
+    # Default: 25x annual expenses (4% rule equivalent)
+    annual_expenses = inputs.annual_savings * 0.5 if inputs.annual_savings > 0 else 50000
+    withdrawal_rate = inputs.withdrawal_rate / 100
+    return annual_expenses * (1 / withdrawal_rate) if withdrawal_rate > 0 else annual_expenses * 25
+
+
+def horizon(inputs: FireInputs) -> int:
+    """Last projected year index (the projection has horizon + 1 rows)"""
+    return inputs.life_expectancy - inputs.current_age
+
+
+def accumulation_years(inputs: FireInputs) -> int:
+    """Number of yearly updates made before retirement"""
+    return min(max(inputs.retirement_age - inputs.current_age, 0), horizon(inputs) + 1)
+
+
+def _accumulate(inputs: FireInputs, years: int) -> float:
+    r = inputs.expected_return / 100
+    if r == 0:
+        return inputs.current_net_worth + inputs.annual_savings * years
+    if r > -1:
+        # expm1/log1p keep (q^t - 1)/r exact enough to match the simulation at ties
+        gain = math.expm1(years * math.log1p(r))
+    else:
+        gain = (1 + r) ** years - 1
+    return inputs.current_net_worth * (1 + gain) + inputs.annual_savings * gain / r
+
+
+def retirement_growth(inputs: FireInputs) -> float:
+    """Yearly net worth multiplier once retired"""
+    r = inputs.expected_return / 100
+    return (1 + r - inputs.withdrawal_rate / 100) * (1 - inputs.inflation_rate / 100 * 0.5)
+
+
+def net_worth_at(inputs: FireInputs, year: int) -> float:
+    """Net worth at the start of year index `year` (0 = today)"""
+    saving_years = min(year, accumulation_years(inputs))
+    return _accumulate(inputs, saving_years) * retirement_growth(inputs) ** (year - saving_years)
+
+
+def success_probability(inputs: FireInputs) -> float:
+    """Success probability as the projection reports it (before rounding)"""
+    final_net_worth = net_worth_at(inputs, horizon(inputs) + 1)
+    target = fire_number(inputs)
+    probability = 100.0 if final_net_worth > 0 else 0.0
+    if target > 0:
+        probability = min(100.0, (final_net_worth / target) * 100 * 0.5 + 50)
+    return probability
+
+
+def _first_year(reached: Callable[[int], bool], lo: int, hi: int, guess: Optional[float] = None) -> Optional[int]:
+    """
+    First year in [lo, hi] where the monotone predicate holds.
+
+    A closed-form guess is settled by checking its neighbours; without one the
+    range is bisected.
+    """
+    if lo > hi or not reached(hi):
+        return None
+    if guess is not None and math.isfinite(guess):
+        year = min(max(math.ceil(guess), lo), hi)
+        while year > lo and reached(year - 1):
+            year -= 1
+        while not reached(year):
+            year += 1
+        return year
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if reached(mid):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def years_to_fire(inputs: FireInputs) -> Optional[int]:
+    """First year index at which net worth reaches the FIRE number, or None within the horizon"""
+    target = fire_number(inputs)
+    last = horizon(inputs)
+    saving_years = accumulation_years(inputs)
+    nw0, s = inputs.current_net_worth, inputs.annual_savings
+    r = inputs.expected_return / 100
+
+    # Closed forms differ from the simulated sums by float rounding, so exact ties
+    # (e.g. a FIRE number equal to one year's savings) count as reached
+    tie = abs(target) * 1e-12
+
+    def reached(year: int) -> bool:
+        return net_worth_at(inputs, year) >= target - tie
+
+    # Accumulation phase: increasing only while returns plus savings are positive
+    if nw0 >= target:
+        return 0
+    if nw0 * r + s > 0:
+        guess = None
+        if r > 0 and nw0 + s / r > 0:
+            guess = math.log((target + s / r) / (nw0 + s / r)) / math.log(1 + r)
+        elif r == 0:
+            guess = (target - nw0) / s
+        year = _first_year(reached, 0, min(saving_years, last), guess)
+        if year is not None:
+            return year
+
+    # Retirement phase: geometric in the retirement growth factor
+    start = _accumulate(inputs, saving_years)
+    growth = retirement_growth(inputs)
+    if saving_years >= last:
+        return None
+    if growth < 0:
+        # Net worth alternates in sign, so scan the (at most 100) years
+        return next((year for year in range(saving_years + 1, last + 1) if reached(year)), None)
+    if start <= 0 or growth <= 1:
+        return None
+    guess = saving_years + math.log(target / start) / math.log(growth)
+    return _first_year(reached, saving_years + 1, last, guess)
+
+
+def required_savings(inputs: FireInputs, target_age: int) -> Optional[float]:
+    """
+    Annual savings needed to reach the FIRE number by target_age.
+
+    The FIRE number is held at its value for the given inputs (without a
+    target_net_worth the model derives expenses from savings, which would move
+    the goal as savings change). Net worth at any year is affine in savings,
+    so two evaluations determine the answer exactly.
+
+    Returns:
+        Savings (0 if none are needed), or None if no amount of saving reaches
+        the target by then (e.g. no saving years before target_age)
+    """
+    year = target_age - inputs.current_age
+    if year < 0 or year > horizon(inputs):
+        return None
+    target = fire_number(inputs)
+    without_savings = net_worth_at(inputs._replace(annual_savings=0.0), year)
+    if without_savings >= target:
+        return 0.0
+    per_dollar = net_worth_at(inputs._replace(annual_savings=1.0), year) - without_savings
+    if per_dollar <= 0:
+        return None
+    return (target - without_savings) / per_dollar
+
+
+def coast_fire_number(inputs: FireInputs, target_age: int) -> Optional[float]:
+    """Net worth needed today to reach the FIRE number by target_age with no further savings"""
+    year = target_age - inputs.current_age
+    if year < 0 or year > horizon(inputs):
+        return None
+    growth = net_worth_at(inputs._replace(current_net_worth=1.0, annual_savings=0.0), year)
+    if growth <= 0:
+        return None
+    return fire_number(inputs) / growth
+
+
+# Withdrawal rates scanned by max_withdrawal_rate, in percent
+_WITHDRAWAL_GRID = [step / 10 for step in range(1, 1001)]
+
+
+def max_withdrawal_rate(inputs: FireInputs, success_threshold: float) -> Optional[float]:
+    """
+    Highest withdrawal rate (percent) whose success probability meets the threshold.
+
+    The scan finds the highest 0.1% step that meets the threshold (success is
+    not monotone in the rate when the FIRE number depends on it), then Brent
+    refines the crossing above it.
+
+    Returns:
+        Rate in percent rounded down to 0.01%, or None if even a 0.1%
+        withdrawal rate falls short
+    """
+    def margin(rate: float) -> float:
+        return success_probability(inputs._replace(withdrawal_rate=rate)) - success_threshold
+
+    meeting = [rate for rate in _WITHDRAWAL_GRID if margin(rate) >= 0]
+    if not meeting:
+        return None
+    best = meeting[-1]
+    if best >= _WITHDRAWAL_GRID[-1]:
+        return best
+    upper = round(best + 0.1, 1)
+    root = brent(margin, best, upper, margin(best), margin(upper), xtol=1e-6)
+    rate = max(math.floor(root * 100) / 100, best)
+    if margin(rate) < 0:
+        rate = round(rate - 0.01, 2)
+    return rate
@@ -0,0 +1,190 @@
+"""
+Goal Seek
+Solve for the input that makes a property projection hit a target:
+
+    break_even_rent    weekly rent (today's dollars) at which net cashflow is
+                       zero in the weakest year of the horizon
+    max_interest_rate  interest rate offset (percentage points on every loan)
+                       at which net cashflow turns negative in some year
+    target_equity      capital growth rate (% p.a.) needed to reach a given
+                       equity in the final year
+
+Each goal varies one engine pipeline. The pipelines it does not vary
+(e.g. expenses and repayments when solving for rent) are projected once and
+reused; each solver evaluation re-runs only the varied pipeline, and the
+root is found by bracketing plus Brent's method (utils/solver.py).
+
+⚠️ CRITICAL: Solutions are the least favourable value at the goal's
+precision that still meets it (outcome >= 0, or >= target): rent and growth
+round up, the interest rate offset rounds down. The reported outcome is the
+Decimal projection at that value.
+"""
+
+from decimal import Decimal, ROUND_CEILING, ROUND_FLOOR
+from typing import Callable, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from utils.calculations import annualize_amount, to_decimal
+from utils.sensitivity import detached_copy
+from utils.solver import brent, expand_bracket
+
+
+class Goal(NamedTuple):
+    unit: str
+    varied: FrozenSet[str]  # Pipeline re-run per evaluation
+    fixed: FrozenSet[str]  # Pipelines projected once
+    bracket: Tuple[float, float]  # Initial search range
+    limits: Tuple[float, float]  # Furthest the bracket may expand
+    xtol: float
+    precision: Decimal
+    rounding: str  # Towards the side where the goal is met
+
+
+GOALS: Dict[str, Goal] = {
+    "break_even_rent": Goal(
+        "$/week", frozenset({"rent"}), frozenset({"repayments", "expenses"}),
+        (0.0, 1000.0), (0.0, 100000.0), 0.001, Decimal("0.01"), ROUND_CEILING,
+    ),
+    "max_interest_rate": Goal(
+        "pp", frozenset({"repayments"}), frozenset({"rent", "expenses"}),
+        (0.0, 5.0), (-20.0, 50.0), 1e-6, Decimal("0.0001"), ROUND_FLOOR,
+    ),
+    "target_equity": Goal(
+        "%", frozenset({"value"}), frozenset({"debt"}),
+        (0.0, 10.0), (-50.0, 100.0), 1e-6, Decimal("0.0001"), ROUND_CEILING,
+    ),
+}
+
+
+class GoalSeekError(ValueError):
+    """Raised when a goal cannot be solved for a property"""
+
+
+def current_weekly_rent(property_obj, data: dict) -> Decimal:
+    """Today's gross weekly rent from rental records, else the JSON rental details"""
+    from_records = sum(
+        (annualize_amount(to_decimal(r.get("amount", 0)), r.get("frequency", "Weekly")) for r in data.get("rental_incomes", [])),
+        Decimal("0"),
+    ) / 52
+    if from_records > 0:
+        return from_records
+    return to_decimal((property_obj.rental_details or {}).get("income", 0))
+
+
+def with_weekly_rent(property_obj, data: dict, weekly_rent: Decimal, current: Decimal) -> tuple:
+    """
+    Property and engine data with today's gross weekly rent set to weekly_rent.
+
+    Rental records are scaled (keeping their growth and vacancy); a property
+    with no rent gets one weekly record at its rental growth assumption.
+    """
+    data = dict(data)
+    records = data.get("rental_incomes", [])
+    if records and current > 0:
+        scale = weekly_rent / current
+        data["rental_incomes"] = [{**r, "amount": to_decimal(r.get("amount", 0)) * scale} for r in records]
+        # The engine falls back to the JSON details when records sum to zero
+        return detached_copy(property_obj, rental_details=None), data
+    if property_obj.rental_details and current > 0:
+        return detached_copy(property_obj, rental_details={**property_obj.rental_details, "income": weekly_rent}), data
+    assumptions = property_obj.growth_assumptions or {}
+    data["rental_incomes"] = [{
+        "amount": weekly_rent,
+        "frequency": "Weekly",
+        "growth_rate": assumptions.get("rental_growth_rate", 3),
+        "vacancy_weeks_per_year": 2,
+    }]
+    return property_obj, data
+
+
+def _series(rows: List, metric: str) -> List[Decimal]:
+    return [getattr(row, metric) for row in rows]
+
+
+def goal_seek(
+    goal: str,
+    property_obj,
+    data: dict,
+    years: int,
+    generate: Callable[..., list],
+    target: Optional[Decimal] = None,
+    lower: Optional[float] = None,
+    upper: Optional[float] = None,
+) -> dict:
+    """
+    Solve a goal for one property.
+
+    Args:
+        goal: Key of GOALS
+        data: Engine data for the property (all pipelines the goal uses)
+        generate: Projection engine, called as generate(property, data, years, ..., pipelines=...)
+        target: Final-year equity for target_equity
+        lower, upper: Initial search range (defaults per goal)
+
+    Returns:
+        Dict with value, unit, outcome (min yearly net cashflow, or final equity) and evaluations
+
+    Raises:
+        GoalSeekError: The goal cannot apply to this property (e.g. no loans)
+        SolverError: No solution within the goal's search limits
+    """
+    spec = GOALS[goal]
+    fixed = generate(property_obj, data, years, pipelines=spec.fixed)
+    limits = spec.limits
+
+    if goal == "break_even_rent":
+        current = current_weekly_rent(property_obj, data)
+        costs = [rep + exp for rep, exp in zip(_series(fixed, "loan_repayments"), _series(fixed, "expenses"))]
+
+        def outcome(x: Decimal) -> Decimal:
+            rent_obj, rent_data = with_weekly_rent(property_obj, data, x, current)
+            rent = _series(generate(rent_obj, rent_data, years, pipelines=spec.varied), "rental_income")
+            return min(income - cost for income, cost in zip(rent, costs))
+    elif goal == "max_interest_rate":
+        loans = data.get("loans", [])
+        if not loans:
+            raise GoalSeekError("Property has no loans")
+        # Never take a loan below a 0% rate
+        limits = (max(limits[0], -float(min(to_decimal(loan.get("interest_rate", 6)) for loan in loans))), limits[1])
+        income = [rent - exp for rent, exp in zip(_series(fixed, "rental_income"), _series(fixed, "expenses"))]
+
+        def outcome(x: Decimal) -> Decimal:
+            rows = generate(property_obj, data, years, interest_rate_offset=float(x), pipelines=spec.varied)
+            return min(net - rep for net, rep in zip(income, _series(rows, "loan_repayments")))
+    elif goal == "target_equity":
+        if target is None:
+            raise GoalSeekError("target_equity requires a target")
+        final_debt = fixed[-1].total_debt
+
+        def outcome(x: Decimal) -> Decimal:
+            rows = generate(property_obj, data, years, asset_growth_override=float(x), pipelines=spec.varied)
+            return rows[-1].property_value - final_debt
+    else:
+        raise GoalSeekError(f"Unknown goal: {goal}")
+
+    offset = target if goal == "target_equity" else Decimal("0")
+    memo: Dict[Decimal, Decimal] = {}
+
+    def evaluate(x: Decimal) -> Decimal:
+        if x not in memo:
+            memo[x] = outcome(x)
+        return memo[x]
+
+    def f(x: float) -> float:
+        return float(evaluate(Decimal(repr(x))) - offset)
+
+    a = spec.bracket[0] if lower is None else lower
+    b = spec.bracket[1] if upper is None else upper
+    a, b, fa, fb = expand_bracket(f, min(a, b), max(a, b), limits)
+    root = brent(f, a, b, fa, fb, xtol=spec.xtol)
+
+    value = Decimal(repr(root)).quantize(spec.precision, rounding=spec.rounding)
+    # Outcomes are whole cents, so the step back towards the root may still meet the goal
+    closer = value - spec.precision if spec.rounding == ROUND_CEILING else value + spec.precision
+    if evaluate(closer) >= offset:
+        value = closer
+    return {
+        "value": value,
+        "unit": spec.unit,
+        "outcome": evaluate(value),
+        "evaluations": len(memo),
+    }
@@ -0,0 +1,471 @@
+"""
+Background Jobs
+In-process job runner for calculations that can outlast a request timeout
+(50-year portfolio projections, many-variant plan comparisons). The client
+submits a job, gets its id back immediately and polls routes/jobs.py for
+status, progress and the result.
+
+Jobs are rows in the jobs table (models/job.py); a bounded pool of
+JOB_WORKERS asyncio workers takes them off a queue and runs each kind's
+synchronous handler in the batch lane (utils/lanes.py), so jobs never take
+threads or connections from interactive requests. Handlers receive a JobContext to
+report progress and to stop early when the job is cancelled; calculation
+loops that accept a CancelToken (utils/cancellation.py) are passed ctx.token.
+
+Job kinds are registered next to the routes that own the calculation:
+
+    @register_job("projections.portfolio", PortfolioProjectionJobParams, admit=_admit)
+    def _run(ctx: JobContext, params: PortfolioProjectionJobParams):
+        ...
+
+⚠️ CRITICAL: Jobs run in the process that accepted them. Queued jobs left by a
+restart are picked up again on start(); a job is claimed with a conditional
+UPDATE (queued -> running) so two instances never run the same job. Every
+JOB_SWEEP_SECONDS each instance refreshes the heartbeat of the jobs it holds
+(queued locally or running), fails running jobs whose heartbeat has gone
+stale, takes over queued jobs whose heartbeat has gone stale (their instance
+died) and deletes finished jobs past retention, so none of this waits for a
+restart. Results are encoded with utils/cache_codec — handlers must return
+registered models.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, ContextManager, Dict, List, NamedTuple, Optional, Set, Tuple, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import delete, update
+from sqlmodel import Session, func, select
+
+from models.job import Job, JOB_ACTIVE_STATUSES, JOB_FINISHED_STATUSES
+from models.user import User
+from utils.cache_codec import encode
+from utils.cancellation import CancelToken, OperationCancelled
+from utils.lanes import batch_lane
+
+logger = logging.getLogger(__name__)
+
+
+# Jobs run concurrently on this instance
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+
+# Jobs waiting for a worker before new submissions are shed
+JOB_MAX_QUEUE = int(os.getenv("JOB_MAX_QUEUE", "100"))
+
+# Queued or running jobs a single user may have at once
+JOB_MAX_ACTIVE_PER_USER = int(os.getenv("JOB_MAX_ACTIVE_PER_USER", "5"))
+
+# Minimum seconds between progress writes from one job
+JOB_PROGRESS_INTERVAL = float(os.getenv("JOB_PROGRESS_INTERVAL_SECONDS", "0.5"))
+
+# A job with no heartbeat for this long is presumed lost: failed by the sweep if
+# running, taken over by another instance if queued
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "900"))
+
+# How often each instance refreshes its jobs' heartbeats, recovers stale ones and deletes expired ones
+JOB_SWEEP_SECONDS = float(os.getenv("JOB_SWEEP_SECONDS", "60"))
+
+# Finished jobs (and their results) are deleted after this long
+JOB_RETENTION_HOURS = int(os.getenv("JOB_RETENTION_HOURS", "24"))
+
+
+class JobCancelled(OperationCancelled):
+    """Raised inside a handler when its job has been cancelled"""
+
+
+class JobKind(NamedTuple):
+    handler: Callable[["JobContext", BaseModel], Any]  # Synchronous; runs in the batch lane
+    params_model: Type[BaseModel]
+    # Called at submission (ownership checks, cost charging); raises HTTPException to refuse
+    admit: Optional[Callable[[BaseModel, User, Session], Awaitable[None]]]
+
+
+_kinds: Dict[str, JobKind] = {}
+
+
+def register_job(
+    kind: str,
+    params_model: Type[BaseModel],
+    admit: Optional[Callable[[BaseModel, User, Session], Awaitable[None]]] = None,
+):
+    """Register a job handler under a kind name (decorator)"""
+    def decorator(handler: Callable[["JobContext", BaseModel], Any]):
+        _kinds[kind] = JobKind(handler, params_model, admit)
+        return handler
+    return decorator
+
+
+def job_kinds() -> List[str]:
+    """Registered job kinds"""
+    return sorted(_kinds)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobContext:
+    """Handle passed to a running job's handler"""
+
+    def __init__(self, job_id: str, user_id: str, bind, token: CancelToken):
+        self.job_id = job_id
+        self.user_id = user_id
+        self.bind = bind
+        self.token = token
+        self._last_write = 0.0
+
+    def session(self) -> ContextManager[Session]:
+        """A new database session for the handler's own queries (batch-lane connection quota)"""
+        return batch_lane.session(self.bind)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token.cancelled
+
+    def check_cancelled(self) -> None:
+        """
+        Raises:
+            JobCancelled if the job has been cancelled
+        """
+        if self.token.cancelled:
+            raise JobCancelled("cancelled")
+
+    def progress(self, fraction: float) -> None:
+        """
+        Report progress (0.0 - 1.0) and check for cancellation.
+
+        Writes are throttled to one per JOB_PROGRESS_INTERVAL; each write also
+        refreshes the heartbeat and picks up a cancellation requested through
+        another instance.
+        """
+        self.check_cancelled()
+        now = time.monotonic()
+        if now - self._last_write < JOB_PROGRESS_INTERVAL:
+            return
+        self._last_write = now
+        with batch_lane.session(self.bind) as session:
+            session.execute(
+                update(Job)
+                .where(Job.id == self.job_id, Job.status == "running")
+                .values(progress=min(max(fraction, 0.0), 1.0), updated_at=_now())
+            )
+            session.commit()
+            if session.exec(select(Job.cancel_requested).where(Job.id == self.job_id)).first():
+                self.token.cancel()
+        self.check_cancelled()
+
+
+class JobRunner:
+    """Bounded pool of asyncio workers running queued jobs"""
+
+    def __init__(self, name: str, workers: int, max_queue: int):
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._sweeper: Optional[asyncio.Task] = None
+        self._cancel_tokens: Dict[str, CancelToken] = {}
+        self._queued: Set[str] = set()  # Job ids on this instance's queue, not yet taken by a worker
+        self._running = 0
+
+        # Metrics
+        self._submitted = 0
+        self._completed: Dict[str, int] = {status_: 0 for status_ in JOB_FINISHED_STATUSES}
+        self._rejected = 0
+
+    def _ensure_workers(self) -> asyncio.Queue:
+        # Workers live on the running event loop; (re)created on first use
+        loop = asyncio.get_running_loop()
+        if self._queue is None or not self._tasks or self._tasks[0].get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._queued.clear()
+            self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+        return self._queue
+
+    async def start(self, bind) -> None:
+        """
+        Start the workers and the sweep, and recover jobs left by a previous
+        process: queued jobs are queued again, running jobs with a stale
+        heartbeat are failed, and finished jobs past retention are deleted.
+        """
+        self._ensure_workers()
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.ensure_future(self._sweep_loop(bind))
+        self._sweep(bind)
+        with Session(bind) as session:
+            queued = session.exec(select(Job.id).where(Job.status == "queued").order_by(Job.created_at)).all()
+        self._enqueue(queued, bind)
+        if queued:
+            logger.info(f"Job runner '{self.name}': re-queued {len(queued)} jobs")
+
+    def _enqueue(self, job_ids: List[str], bind) -> None:
+        queue = self._ensure_workers()
+        for job_id in job_ids:
+            self._queued.add(job_id)
+            queue.put_nowait((job_id, bind))
+
+    async def stop(self) -> None:
+        """Stop the workers; running handlers are asked to cancel and their jobs left to recovery"""
+        for token in self._cancel_tokens.values():
+            token.cancel()
+        tasks = self._tasks + ([self._sweeper] if self._sweeper is not None else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._sweeper = None
+        self._queue = None
+        self._queued.clear()
+
+    def _sweep(self, bind) -> List[str]:
+        """
+        Refresh the heartbeat of every job this instance holds, fail running
+        jobs and take over queued jobs whose heartbeat is older than
+        JOB_STALE_SECONDS, and delete finished jobs past JOB_RETENTION_HOURS.
+
+        Returns:
+            IDs of the queued jobs taken over, for this instance's queue
+        """
+        now = _now()
+        stale = now - timedelta(seconds=JOB_STALE_SECONDS)
+        with Session(bind) as session:
+            for held, status_ in ((list(self._cancel_tokens), "running"), (list(self._queued), "queued")):
+                if held:
+                    session.execute(
+                        update(Job).where(Job.id.in_(held), Job.status == status_).values(updated_at=now)
+                    )
+            failed = session.execute(
+                update(Job)
+                .where(Job.status == "running", Job.updated_at < stale)
+                .values(status="failed", error="Interrupted by a server restart", finished_at=now, updated_at=now)
+            ).rowcount
+            # Queued jobs nobody has held for a while; the conditional update makes
+            # sure only one instance takes each over
+            orphaned = session.exec(select(Job.id).where(Job.status == "queued", Job.updated_at < stale)).all()
+            taken = [
+                job_id for job_id in orphaned
+                if session.execute(
+                    update(Job)
+                    .where(Job.id == job_id, Job.status == "queued", Job.updated_at < stale)
+                    .values(updated_at=now)
+                ).rowcount
+            ]
+            expired = session.execute(
+                delete(Job).where(
+                    Job.status.in_(JOB_FINISHED_STATUSES),
+                    Job.finished_at < now - timedelta(hours=JOB_RETENTION_HOURS),
+                )
+            ).rowcount
+            session.commit()
+        if failed:
+            logger.warning(f"Job runner '{self.name}': failed {failed} jobs with a stale heartbeat")
+        if taken:
+            logger.warning(f"Job runner '{self.name}': took over {len(taken)} queued jobs with a stale heartbeat")
+        if expired:
+            logger.info(f"Job runner '{self.name}': deleted {expired} expired jobs")
+        return taken
+
+    async def _sweep_loop(self, bind) -> None:
+        while True:
+            await asyncio.sleep(JOB_SWEEP_SECONDS)
+            try:
+                taken = await batch_lane.run(self._sweep, bind)
+            except Exception:
+                logger.exception(f"Job runner '{self.name}' sweep failed")
+                continue
+            self._enqueue(taken, bind)
+
+    async def submit(self, kind: str, params: dict, user: User, session: Session) -> Job:
+        """
+        Validate and queue a job.
+
+        Raises:
+            HTTPException 400 for an unknown kind, 422 for invalid params,
+            429 when the user has too many active jobs, 503 when the queue is full,
+            or whatever the kind's admit hook raises
+        """
+        spec = _kinds.get(kind)
+        if spec is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"message": f"Unknown job kind: {kind}", "kinds": job_kinds()},
+            )
+        try:
+            validated = spec.params_model(**params)
+        except ValidationError as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.errors(include_url=False))
+
+        # Count under a lock on the user's row, held by the transaction that inserts the
+        # job, so concurrent submissions cannot both pass the limit; checked before the
+        # admit hook so a refused submission is never charged
+        session.exec(select(User.id).where(User.id == user.id).with_for_update()).first()
+        try:
+            self._check_active_limit(user, session)
+            queue = self._ensure_workers()
+            if queue.qsize() >= self.max_queue:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="The server is busy. Please try again shortly.",
+                    headers={"Retry-After": "5"},
+                )
+            if spec.admit is not None:
+                await spec.admit(validated, user, session)
+        except HTTPException:
+            session.rollback()
+            raise
+
+        job = Job(user_id=user.id, kind=kind, params=validated.model_dump(mode="json"))
+        session.add(job)
+        session.commit()
+        session.refresh(job)
+
+        self._enqueue([job.id], session.get_bind())
+        self._submitted += 1
+        logger.info(f"Job queued: {job.id} ({kind}) by user: {user.id}")
+        return job
+
+    def _check_active_limit(self, user: User, session: Session) -> None:
+        active = session.exec(select(func.count()).select_from(Job).where(
+            Job.user_id == user.id,
+            Job.status.in_(JOB_ACTIVE_STATUSES),
+        )).one()
+        if active >= JOB_MAX_ACTIVE_PER_USER:
+            self._rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"You already have {JOB_MAX_ACTIVE_PER_USER} jobs in progress",
+                headers={"Retry-After": "5"},
+            )
+
+    def cancel(self, job: Job, session: Session) -> Job:
+        """
+        Cancel a queued or running job. Queued jobs are cancelled at once;
+        running jobs stop at their handler's next progress or cancellation check.
+
+        Raises:
+            HTTPException 409 if the job has already finished
+        """
+        now = _now()
+        cancelled = session.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.status == "queued")
+            .values(status="cancelled", cancel_requested=True, finished_at=now, updated_at=now)
+        ).rowcount
+        if not cancelled:
+            requested = session.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.status == "running")
+                .values(cancel_requested=True)
+            ).rowcount
+            if not requested:
+                session.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail={"message": "Job has already finished", "status": job.status},
+                )
+            token = self._cancel_tokens.get(job.id)
+            if token is not None:
+                token.cancel()
+        else:
+            self._completed["cancelled"] += 1
+        session.commit()
+        session.refresh(job)
+        return job
+
+    async def join(self) -> None:
+        """Wait until every queued job has been processed"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def _worker(self) -> None:
+        while True:
+            job_id, bind = await self._queue.get()
+            self._queued.discard(job_id)
+            try:
+                await self._run(job_id, bind)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(f"Job runner '{self.name}' failed to run job {job_id}")
+            finally:
+                self._queue.task_done()
+
+    def _claim(self, job_id: str, bind) -> Optional[Tuple[str, str, dict]]:
+        now = _now()
+        with batch_lane.session(bind) as session:
+            claimed = session.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == "queued")
+                .values(status="running", started_at=now, updated_at=now)
+            ).rowcount
+            session.commit()
+            if not claimed:
+                return None  # Cancelled while queued, or taken by another instance
+            job = session.get(Job, job_id)
+            return job.kind, job.user_id, job.params
+
+    def _finish(self, job_id: str, bind, status_: str, result: Optional[bytes] = None, error: Optional[str] = None) -> None:
+        now = _now()
+        values = {"status": status_, "result": result, "error": error, "finished_at": now, "updated_at": now}
+        if status_ == "done":
+            values["progress"] = 1.0
+        with batch_lane.session(bind) as session:
+            # A job failed by another instance's sweep in the meantime stays failed
+            finished = session.execute(
+                update(Job).where(Job.id == job_id, Job.status == "running").values(**values)
+            ).rowcount
+            session.commit()
+        if finished:
+            self._completed[status_] += 1
+
+    async def _run(self, job_id: str, bind) -> None:
+        claimed = await batch_lane.run(self._claim, job_id, bind)
+        if claimed is None:
+            return
+        kind, user_id, params = claimed
+        spec = _kinds.get(kind)
+        if spec is None:
+            await batch_lane.run(self._finish, job_id, bind, "failed", None, f"Unknown job kind: {kind}")
+            return
+
+        token = CancelToken()
+        self._cancel_tokens[job_id] = token
+        context = JobContext(job_id, user_id, bind, token)
+        self._running += 1
+        start = time.monotonic()
+        try:
+            result = await batch_lane.run(spec.handler, context, spec.params_model(**params))
+            outcome = ("done", encode(result), None)
+        except OperationCancelled:
+            outcome = ("cancelled", None, None)
+        except HTTPException as e:
+            outcome = ("failed", None, e.detail if isinstance(e.detail, str) else str(e.detail))
+        except Exception:
+            logger.exception(f"Job {job_id} ({kind}) failed")
+            outcome = ("failed", None, "Job failed")
+        finally:
+            self._running -= 1
+            self._cancel_tokens.pop(job_id, None)
+        await batch_lane.run(self._finish, job_id, bind, *outcome)
+        logger.info(f"Job {outcome[0]}: {job_id} ({kind}) in {time.monotonic() - start:.2f}s")
+
+    def snapshot(self) -> dict:
+        """Point-in-time metrics for the health/metrics endpoint"""
+        return {
+            "workers": self.workers,
+            "running": self._running,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "submitted": self._submitted,
+            "completed": dict(self._completed),
+            "rejected": self._rejected,
+        }
+
+
+# Shared runner for all job kinds
+job_runner = JobRunner("jobs", JOB_WORKERS, JOB_MAX_QUEUE)
@@ -0,0 +1,164 @@
+"""
+Fast JSON Responses
+orjson-based response class with Decimal support, registered as the app's
+default response class, plus a trusted path for response models the handler
+built itself.
+
+Default path: FastAPI still validates the return value against response_model
+and converts it to JSON-compatible data; DecimalJSONResponse only replaces the
+final json.dumps with orjson.
+
+Trusted path: routers created with route_class=TrustedModelRoute render a
+returned object whose type IS the declared response_model (calculation output,
+cached results) straight to bytes, skipping FastAPI's dump → re-validate →
+serialize of every nested field. Anything else (dicts, ORM rows, Response
+objects) takes the default path. Handlers still return models, so calling them
+directly (tests, other handlers) is unaffected.
+
+⚠️ CRITICAL: Decimals are sent as strings (str(Decimal), as Pydantic does) so
+the wire format is unchanged and no precision is lost. Only use the trusted
+path for objects whose type IS the declared response model — never for ORM
+table rows, whose attribute values are not coerced to the declared types
+(TrustedModelRoute skips table models).
+"""
+
+import inspect
+from decimal import Decimal
+from typing import Any, List, Optional, get_args, get_origin
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, request_response
+from pydantic import BaseModel
+
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def _fields(obj: BaseModel) -> dict:
+    # Plain models keep exactly their field values in __dict__ (the fast path);
+    # table models also carry SQLAlchemy state there
+    if type(obj).model_config.get("table"):
+        return {name: getattr(obj, name) for name in type(obj).model_fields}
+    return obj.__dict__
+
+
+def _default(obj: Any) -> Any:
+    """orjson fallback for types it does not serialize natively"""
+    if type(obj) is Decimal:
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        return _fields(obj)
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _default_exclude_none(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return {name: value for name, value in _fields(obj).items() if value is not None}
+    return _default(obj)
+
+
+def dumps(content: Any, exclude_none: bool = False) -> bytes:
+    """Serialize to JSON bytes (Decimal → string, models → field dicts)"""
+    return orjson.dumps(content, default=_default_exclude_none if exclude_none else _default, option=ORJSON_OPTIONS)
+
+
+class DecimalJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson; accepts Decimals and Pydantic models"""
+
+    def __init__(self, content: Any, *args, exclude_none: bool = False, **kwargs):
+        self.exclude_none = exclude_none
+        super().__init__(content, *args, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content, exclude_none=getattr(self, "exclude_none", False))
+
+
+def model_response(
+    result: Any,
+    response: Optional[Response] = None,
+    exclude_none: bool = False,
+    status_code: Optional[int] = None,
+) -> DecimalJSONResponse:
+    """
+    Render a handler-built model without re-validating it.
+
+    Args:
+        result: Response model instance (or list of them)
+        response: The request's sub-response; its headers (ETag etc.) and status are kept
+        exclude_none: Omit None fields (matches response_model_exclude_none=True)
+        status_code: The route's declared status code
+    """
+    if response is not None and response.status_code:
+        status_code = response.status_code
+    rendered = DecimalJSONResponse(result, status_code=status_code or 200, exclude_none=exclude_none)
+    if response is not None:
+        rendered.headers.raw.extend(
+            (name, value) for name, value in response.headers.raw
+            if name not in (b"content-length", b"content-type")
+        )
+    return rendered
+
+
+def _trusted_model_type(response_model: Any) -> Optional[tuple]:
+    """(model, is_list) if response_model is a non-table model or List of one"""
+    is_list = get_origin(response_model) in (list, List)
+    model = get_args(response_model)[0] if is_list else response_model
+    if not (inspect.isclass(model) and issubclass(model, BaseModel)):
+        return None
+    if model.model_config.get("table"):
+        return None
+    return model, is_list
+
+
+class TrustedModelRoute(APIRoute):
+    """
+    APIRoute that renders handler-built response models directly.
+
+    Applies to async endpoints whose response_model is a non-table model (or a
+    List of one) without include/exclude/exclude_unset filtering. If the endpoint returns exactly that type, it is rendered
+    with DecimalJSONResponse, honouring response_model_exclude_none, the route
+    status code and headers set on the sub-response; any other return value
+    goes through FastAPI's normal validation.
+    """
+
+    _SUB_RESPONSE_PARAM = "_trusted_sub_response"
+
+    def __init__(self, path: str, endpoint: Any, **kwargs: Any):
+        super().__init__(path, endpoint, **kwargs)
+        trusted = _trusted_model_type(self.response_model) if self.response_model else None
+        filtered = (
+            self.response_model_include or self.response_model_exclude
+            or self.response_model_exclude_unset or self.response_model_exclude_defaults
+        )
+        if trusted is None or filtered or not inspect.iscoroutinefunction(self.dependant.call):
+            return
+
+        model, is_list = trusted
+        original = self.dependant.call
+        injected = self.dependant.response_param_name is None
+        response_param = self._SUB_RESPONSE_PARAM if injected else self.dependant.response_param_name
+        exclude_none = self.response_model_exclude_none
+        route_status = self.status_code
+
+        async def call(**values: Any) -> Any:
+            sub_response = values.pop(response_param) if injected else values[response_param]
+            result = await original(**values)
+            if is_list:
+                is_trusted = isinstance(result, list) and all(type(item) is model for item in result)
+            else:
+                is_trusted = type(result) is model
+            if is_trusted:
+                return model_response(result, sub_response, exclude_none, route_status)
+            return result
+
+        # Ask FastAPI to inject the sub-response so headers set by the handler
+        # or its dependencies survive, then rebuild the ASGI app around the wrapper
+        self.dependant.response_param_name = response_param
+        self.dependant.call = call
+        self.app = request_response(self.get_route_handler())
@@ -0,0 +1,226 @@
+"""
+Priority Lanes
+Keeps batch work (background jobs, plan result refreshes, demo data seeding)
+from starving interactive requests (dashboard, CRUD) of threads and database
+connections.
+
+Batch work runs in the batch lane: its own BATCH_LANE_WORKERS threads (never
+the default threadpool interactive endpoints use) and at most
+BATCH_LANE_CONNECTIONS database sessions at once, so interactive requests
+always keep the rest of the connection pool.
+
+    result = await batch_lane.run(_compute, arg)      # in a batch-lane thread
+    with batch_lane.session(bind) as session:         # inside that thread
+        ...
+
+The interactive lane does not limit anything; it measures every API request
+(see server.py) so both lanes publish queue depth and latency side by side on
+/api/health/metrics.
+
+⚠️ CRITICAL: Quotas are per process. Keep BATCH_LANE_CONNECTIONS well below the
+engine's pool size (pool_size + max_overflow in utils/database_sql.py).
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Iterator, Optional
+
+import anyio
+from anyio import to_thread
+from sqlmodel import Session
+
+from utils.admission import _percentile
+
+logger = logging.getLogger(__name__)
+
+
+# Threads batch work may use at once (separate from the default threadpool)
+BATCH_LANE_WORKERS = int(os.getenv("BATCH_LANE_WORKERS", "2"))
+
+# Database sessions batch work may hold at once; the rest of the pool is interactive headroom
+BATCH_LANE_CONNECTIONS = int(os.getenv("BATCH_LANE_CONNECTIONS", "3"))
+
+# Number of recent wait and run times kept per lane for percentile reporting
+_LATENCY_SAMPLE_SIZE = 1000
+
+
+class Lane:
+    """
+    A class of work with its own worker and connection quotas and metrics.
+
+    workers=None runs on (and reports) the default threadpool without limiting
+    it; connections=None leaves sessions unlimited.
+    """
+
+    def __init__(self, name: str, workers: Optional[int] = None, connections: Optional[int] = None):
+        self.name = name
+        self.workers = workers
+        self.connections = connections
+
+        self._limiter = anyio.CapacityLimiter(workers) if workers else None
+        self._connection_slots = threading.BoundedSemaphore(connections) if connections else None
+        self._held = threading.local()
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._running = 0
+        self._tracked = 0
+        self._connections_waiting = 0
+        self._connections_in_use = 0
+
+        # Metrics
+        self._completed = 0
+        self._failed = 0
+        self._recent_waits: Deque[float] = deque(maxlen=_LATENCY_SAMPLE_SIZE)
+        self._recent_runs: Deque[float] = deque(maxlen=_LATENCY_SAMPLE_SIZE)
+        self._connection_waits: Deque[float] = deque(maxlen=_LATENCY_SAMPLE_SIZE)
+
+    def _record(self, waited: Optional[float], ran: float, failed: bool) -> None:
+        if waited is not None:
+            self._recent_waits.append(waited)
+        self._recent_runs.append(ran)
+        if failed:
+            self._failed += 1
+        else:
+            self._completed += 1
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) in one of the lane's threads, queueing while
+        all of them are busy.
+        """
+        queued = time.monotonic()
+        started = None
+
+        def _call():
+            nonlocal started
+            started = time.monotonic()
+            with self._lock:
+                self._waiting -= 1
+                self._running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        with self._lock:
+            self._waiting += 1
+        failed = True
+        try:
+            result = await to_thread.run_sync(_call, limiter=self._limiter or to_thread.current_default_thread_limiter())
+            failed = False
+            return result
+        finally:
+            if started is None:
+                # Cancelled before a thread picked it up
+                with self._lock:
+                    self._waiting -= 1
+                started = time.monotonic()
+            self._record(started - queued, time.monotonic() - started, failed)
+
+    @asynccontextmanager
+    async def track(self) -> AsyncIterator[None]:
+        """Measure work that runs outside run() (e.g. a whole request) as this lane's"""
+        self._tracked += 1
+        start = time.monotonic()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            self._tracked -= 1
+            self._record(None, time.monotonic() - start, failed)
+
+    @contextmanager
+    def connection(self) -> Iterator[None]:
+        """
+        Hold one of the lane's connection slots (blocking until one is free).
+
+        Re-entrant per thread: nested sessions in one thread share its slot.
+        """
+        if self._connection_slots is None or getattr(self._held, "depth", 0):
+            self._held.depth = getattr(self._held, "depth", 0) + 1
+            try:
+                yield
+            finally:
+                self._held.depth -= 1
+            return
+
+        start = time.monotonic()
+        with self._lock:
+            self._connections_waiting += 1
+        try:
+            self._connection_slots.acquire()
+        finally:
+            with self._lock:
+                self._connections_waiting -= 1
+        self._connection_waits.append(time.monotonic() - start)
+        with self._lock:
+            self._connections_in_use += 1
+        self._held.depth = 1
+        try:
+            yield
+        finally:
+            self._held.depth = 0
+            with self._lock:
+                self._connections_in_use -= 1
+            self._connection_slots.release()
+
+    @contextmanager
+    def session(self, bind) -> Iterator[Session]:
+        """A database session counted against the lane's connection quota"""
+        with self.connection():
+            with Session(bind) as session:
+                yield session
+
+    def snapshot(self) -> dict:
+        """Point-in-time metrics for the health/metrics endpoint"""
+        waits, runs = list(self._recent_waits), list(self._recent_runs)
+        if self._limiter is not None:
+            threads = {"limit": self.workers, "running": self._running, "waiting": self._waiting}
+        else:
+            default = to_thread.current_default_thread_limiter().statistics()
+            threads = {
+                "limit": default.total_tokens,
+                "running": default.borrowed_tokens,
+                "waiting": default.tasks_waiting,
+            }
+        return {
+            "threads": threads,
+            "in_flight": self._tracked + self._running,
+            "queue_depth": threads["waiting"],
+            "connections": {
+                "limit": self.connections,
+                "in_use": self._connections_in_use,
+                "waiting": self._connections_waiting,
+                "wait_p99": round(_percentile(list(self._connection_waits), 99), 6),
+            },
+            "completed": self._completed,
+            "failed": self._failed,
+            "wait_seconds": {
+                "p50": round(_percentile(waits, 50), 6),
+                "p99": round(_percentile(waits, 99), 6),
+                "max": round(max(waits), 6) if waits else 0.0,
+            },
+            "run_seconds": {
+                "p50": round(_percentile(runs, 50), 6),
+                "p99": round(_percentile(runs, 99), 6),
+                "max": round(max(runs), 6) if runs else 0.0,
+            },
+        }
+
+
+# Every API request; measured, never limited
+interactive_lane = Lane("interactive")
+
+# Background jobs, plan result refreshes and demo data seeding
+batch_lane = Lane("batch", workers=BATCH_LANE_WORKERS, connections=BATCH_LANE_CONNECTIONS)
+
+
+def get_lane_metrics() -> dict:
+    """Metrics for every lane, keyed by name"""
+    return {lane.name: lane.snapshot() for lane in (interactive_lane, batch_lane)}
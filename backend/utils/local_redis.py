@@ -0,0 +1,172 @@
+"""
+In-Process Redis Stand-In
+Implements the subset of the redis.asyncio client API used by the shared cache,
+data versions and cost limiter — GET/SET with expiry, SETNX, INCR/DECR, DELETE,
+pipelines and pub/sub — backed by dicts and asyncio queues.
+
+Used by tests and local development to exercise the Redis code paths without a
+server. Several "instances" can share one InMemoryRedis to simulate a
+multi-instance deployment.
+
+⚠️ Not for production: state lives in one process and is lost on restart.
+"""
+
+import time
+import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+class InMemoryPubSub:
+    """Subset of redis.asyncio.client.PubSub"""
+
+    def __init__(self, server: "InMemoryRedis"):
+        self._server = server
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self.channels: Set[str] = set()
+
+    async def subscribe(self, *channels: str) -> None:
+        for channel in channels:
+            self.channels.add(channel)
+            self._server._subscribers.setdefault(channel, set()).add(self)
+            await self._queue.put({"type": "subscribe", "channel": channel, "data": len(self.channels)})
+
+    async def unsubscribe(self, *channels: str) -> None:
+        for channel in channels or tuple(self.channels):
+            self.channels.discard(channel)
+            self._server._subscribers.get(channel, set()).discard(self)
+
+    async def get_message(self, ignore_subscribe_messages: bool = False, timeout: float = 0.0) -> Optional[dict]:
+        try:
+            while True:
+                if timeout:
+                    message = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                else:
+                    message = self._queue.get_nowait()
+                if ignore_subscribe_messages and message["type"] != "message":
+                    continue
+                return message
+        except (asyncio.TimeoutError, asyncio.QueueEmpty):
+            return None
+
+    async def listen(self):
+        while self.channels:
+            yield await self._queue.get()
+
+    async def aclose(self) -> None:
+        await self.unsubscribe()
+
+    close = aclose
+
+
+class InMemoryPipeline:
+    """Queues commands and runs them in order on execute()"""
+
+    def __init__(self, server: "InMemoryRedis"):
+        self._server = server
+        self._commands: List[Tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self) -> list:
+        results = []
+        for name, args, kwargs in self._commands:
+            results.append(await getattr(self._server, name)(*args, **kwargs))
+        self._commands = []
+        return results
+
+
+class InMemoryRedis:
+    """Subset of redis.asyncio.Redis backed by process memory"""
+
+    def __init__(self):
+        self._data: Dict[str, Any] = {}
+        self._expiry: Dict[str, float] = {}
+        self._subscribers: Dict[str, Set[InMemoryPubSub]] = {}
+        self.fail = False  # set True to simulate an outage
+
+    def _check(self) -> None:
+        if self.fail:
+            raise ConnectionError("InMemoryRedis: simulated outage")
+
+    def _purge(self, key: str) -> None:
+        expires_at = self._expiry.get(key)
+        if expires_at is not None and time.monotonic() >= expires_at:
+            self._data.pop(key, None)
+            self._expiry.pop(key, None)
+
+    async def ping(self) -> bool:
+        self._check()
+        return True
+
+    async def get(self, key: str) -> Any:
+        self._check()
+        self._purge(key)
+        return self._data.get(key)
+
+    async def set(self, key: str, value: Any, ex: Optional[int] = None) -> bool:
+        self._check()
+        self._data[key] = value
+        if ex:
+            self._expiry[key] = time.monotonic() + ex
+        else:
+            self._expiry.pop(key, None)
+        return True
+
+    async def setnx(self, key: str, value: Any) -> bool:
+        self._check()
+        self._purge(key)
+        if key in self._data:
+            return False
+        self._data[key] = value
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        self._check()
+        removed = 0
+        for key in keys:
+            if self._data.pop(key, None) is not None:
+                removed += 1
+            self._expiry.pop(key, None)
+        return removed
+
+    async def incrby(self, key: str, amount: int) -> int:
+        self._check()
+        self._purge(key)
+        value = int(self._data.get(key, 0)) + amount
+        self._data[key] = value
+        return value
+
+    async def incr(self, key: str) -> int:
+        return await self.incrby(key, 1)
+
+    async def decrby(self, key: str, amount: int) -> int:
+        return await self.incrby(key, -amount)
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        self._check()
+        if key not in self._data:
+            return False
+        self._expiry[key] = time.monotonic() + seconds
+        return True
+
+    async def publish(self, channel: str, message: Any) -> int:
+        self._check()
+        subscribers = list(self._subscribers.get(channel, ()))
+        for subscriber in subscribers:
+            await subscriber._queue.put({"type": "message", "channel": channel, "data": message})
+        return len(subscribers)
+
+    def pubsub(self) -> InMemoryPubSub:
+        return InMemoryPubSub(self)
+
+    def pipeline(self) -> InMemoryPipeline:
+        return InMemoryPipeline(self)
+
+    async def aclose(self) -> None:
+        return None
+
+    close = aclose
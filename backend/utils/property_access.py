@@ -3,6 +3,8 @@ Shared utility for verifying user access to a property.
 Used by loans.py and valuations.py to avoid duplication.
 """
 
+from typing import Optional
+
 from fastapi import HTTPException, status
 from sqlmodel import Session, select
 
@@ -28,3 +30,10 @@ def verify_property_access(property_id: str, user_id: str, session: Session) ->
         )
 
     return property_obj
+
+
+def get_property_portfolio_id(property_id: str, session: Session) -> Optional[str]:
+    """Return the portfolio a property belongs to (for data version bumps)."""
+    return session.exec(
+        select(Property.portfolio_id).where(Property.id == property_id)
+    ).first()
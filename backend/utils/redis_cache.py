@@ -0,0 +1,178 @@
+"""
+Shared Redis Connection for Caching
+Binary-safe Redis client used by the two-tier caches and data versions, plus the
+pub/sub bus that tells other instances to drop local copies.
+
+Kept separate from the rate limiter's client: that one decodes responses to str,
+while cache payloads are compressed bytes.
+
+⚠️ CRITICAL: Redis is an optimisation here, never a dependency. Every caller must
+treat get_redis() returning None as "local only" and keep working. After an error
+Redis is skipped for REDIS_RETRY_SECONDS so a dead server does not add a timeout
+to every request.
+"""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+REDIS_URL = os.getenv("REDIS_URL")
+SHARED_CACHE_ENABLED = os.getenv("SHARED_CACHE_ENABLED", "True").lower() == "true"
+
+# Pub/sub channel carrying invalidation messages between instances
+INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "propequitylab:invalidate")
+
+# How long to bypass Redis after a failure
+REDIS_RETRY_SECONDS = float(os.getenv("REDIS_RETRY_SECONDS", "30"))
+
+# Identifies this process so it can ignore its own broadcasts
+INSTANCE_ID = uuid.uuid4().hex[:12]
+
+_client: Optional[Any] = None
+_unavailable_until = 0.0
+_listener_task: Optional[asyncio.Task] = None
+_handlers: Dict[str, Callable[[dict], Awaitable[None]]] = {}
+
+if REDIS_URL and SHARED_CACHE_ENABLED:
+    try:
+        import redis.asyncio as redis
+        _client = redis.from_url(
+            REDIS_URL,
+            decode_responses=False,
+            socket_connect_timeout=2,
+            socket_timeout=2,
+        )
+    except Exception as e:
+        logger.warning(f"Shared cache Redis client unavailable, using local caches only: {e}")
+        _client = None
+
+
+def set_redis_client(client: Optional[Any]) -> None:
+    """Replace the cache Redis client (tests inject utils.local_redis.InMemoryRedis)"""
+    global _client, _unavailable_until
+    _client = client
+    _unavailable_until = 0.0
+
+
+def get_redis() -> Optional[Any]:
+    """The cache Redis client, or None when unconfigured or recently failed"""
+    if _client is None or time.monotonic() < _unavailable_until:
+        return None
+    return _client
+
+
+def mark_redis_failure(error: Exception) -> None:
+    """Record a Redis error and bypass Redis for REDIS_RETRY_SECONDS"""
+    global _unavailable_until
+    if time.monotonic() >= _unavailable_until:
+        logger.warning(
+            f"Shared cache Redis error, using local caches only for {REDIS_RETRY_SECONDS:.0f}s: "
+            f"{type(error).__name__}: {error}"
+        )
+    _unavailable_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+
+def redis_status() -> str:
+    """'disabled', 'unavailable' or 'connected' (for metrics)"""
+    if _client is None:
+        return "disabled"
+    if time.monotonic() < _unavailable_until:
+        return "unavailable"
+    return "connected"
+
+
+# ============================================================================
+# PUB/SUB INVALIDATION
+# ============================================================================
+
+def on_invalidation(kind: str, handler: Callable[[dict], Awaitable[None]]) -> None:
+    """Register the handler for invalidation messages of a given kind"""
+    _handlers[kind] = handler
+
+
+async def publish_invalidation(kind: str, payload: dict) -> None:
+    """Tell other instances to drop local state (no-op without Redis)"""
+    client = get_redis()
+    if client is None:
+        return
+    message = json.dumps({"origin": INSTANCE_ID, "kind": kind, **payload})
+    try:
+        await client.publish(INVALIDATION_CHANNEL, message)
+    except Exception as e:
+        mark_redis_failure(e)
+
+
+async def _dispatch(raw: Any) -> None:
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8")
+    try:
+        message = json.loads(raw)
+    except (TypeError, ValueError):
+        return
+    if message.get("origin") == INSTANCE_ID:
+        return
+    handler = _handlers.get(message.get("kind"))
+    if handler:
+        try:
+            await handler(message)
+        except Exception:
+            logger.exception(f"Invalidation handler for {message.get('kind')!r} failed")
+
+
+async def _listen() -> None:
+    """Consume invalidation messages, resubscribing after connection errors"""
+    while True:
+        client = get_redis()
+        if client is None:
+            await asyncio.sleep(REDIS_RETRY_SECONDS if _client is not None else 60)
+            continue
+
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    await _dispatch(message.get("data"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            mark_redis_failure(e)
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+        await asyncio.sleep(1)
+
+
+def start_invalidation_listener() -> None:
+    """Start the background pub/sub listener (called from the app lifespan)"""
+    global _listener_task
+    if _client is None or _listener_task is not None:
+        return
+    _listener_task = asyncio.get_running_loop().create_task(_listen())
+    logger.info("✅ Cache invalidation listener started")
+
+
+async def stop_invalidation_listener() -> None:
+    """Stop the listener and close the cache Redis connection"""
+    global _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        _listener_task = None
+    if _client is not None:
+        try:
+            await _client.aclose()
+        except Exception:
+            pass
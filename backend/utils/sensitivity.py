@@ -0,0 +1,274 @@
+"""
+Sensitivity Analysis Engine
+Stress-test grids and tornado charts built from restricted engine passes
+instead of one full projection per scenario.
+
+Grid: every combination of the stress-test overrides. Each override drives
+exactly one part of the projection engine:
+    asset_growth_override   → property values
+    interest_rate_offset    → debt balances and loan repayments
+    expense_growth_override → expenses
+and rental income depends on none of them. An A × R × E grid therefore needs
+only A value passes, R debt and R repayment passes, E expense passes and one
+rent pass; the cells are then combined from those per-year figures. Outcomes
+that depend on two axes (cashflow: rate × expense, LVR: asset × rate) are
+computed once per pair, not once per cell.
+
+Tornado: each model input (TORNADO_INPUTS) is moved down and up by a fixed
+step for one property at a time. A perturbation re-runs only the pipelines
+that input feeds and that the outcome metric reads; everything else is taken
+from the shared baseline, and inputs the metric cannot depend on (e.g. rent
+growth for equity) are not run at all.
+
+⚠️ CRITICAL: Combination is Decimal arithmetic on the same per-property
+figures the portfolio projection sums: rounded values and debts, and each
+property's cashflow rounded once from its unrounded rent, repayments and
+expenses (as calculate_property_cashflow does). Every grid cell therefore
+matches GET /projections/portfolio/{id} run with the same overrides.
+"""
+
+from decimal import Decimal
+from typing import Callable, Dict, FrozenSet, Iterator, List, NamedTuple, Sequence, Tuple
+
+from utils.calculations import round_currency, to_decimal
+
+
+def portfolio_lvr(total_value: Decimal, total_debt: Decimal) -> Decimal:
+    """Portfolio LVR as the projection totals compute it"""
+    lvr = (total_debt / total_value * 100) if total_value > 0 else Decimal("0")
+    return lvr.quantize(Decimal("0.01"))
+
+
+def portfolio_cashflow(
+    rent: Sequence[List[Decimal]],
+    repayments: Sequence[List[Decimal]],
+    expenses: Sequence[List[Decimal]],
+) -> List[Decimal]:
+    """
+    Yearly portfolio net cashflow from unrounded per-property series (one per
+    property, in the same order), each property's cashflow rounded once
+    """
+    return [
+        sum((round_currency(income - repayment - cost) for income, repayment, cost in zip(*amounts)), Decimal("0"))
+        for amounts in zip(zip(*rent), zip(*repayments), zip(*expenses))
+    ]
+
+
+def _first_extreme(years: Sequence[int], series: Sequence[Decimal], pick) -> Tuple[Decimal, int]:
+    """(value, year) of the first occurrence of pick(series)"""
+    extreme = pick(series)
+    return extreme, years[series.index(extreme)]
+
+
+def evaluate_grid(
+    years: Sequence[int],
+    values: Sequence[List[Decimal]],
+    debts: Sequence[List[Decimal]],
+    repayments: Sequence[Sequence[List[Decimal]]],
+    expenses: Sequence[Sequence[List[Decimal]]],
+    rent: Sequence[List[Decimal]],
+) -> Iterator[Tuple[int, int, int, dict]]:
+    """
+    Combine per-axis figures into grid outcomes.
+
+    Args:
+        years: Projected years
+        values: Total property value per year, one series per asset growth value
+        debts: Total debt per year, one series per interest rate offset
+        repayments: Unrounded per-property loan repayments, one set per interest rate offset
+        expenses: Unrounded per-property expenses, one set per expense growth value
+        rent: Unrounded per-property rental income
+
+    Yields:
+        (rate index, expense index, asset index, outcomes) in that nesting order,
+        outcomes holding final_equity, min_net_cashflow(_year), peak_lvr(_year)
+    """
+    for r, debt in enumerate(debts):
+        peak_lvrs = [
+            _first_extreme(years, [portfolio_lvr(v, d) for v, d in zip(value, debt)], max)
+            for value in values
+        ]
+        for e, expense in enumerate(expenses):
+            cashflow = portfolio_cashflow(rent, repayments[r], expense)
+            min_cashflow, min_cashflow_year = _first_extreme(years, cashflow, min)
+            for a, value in enumerate(values):
+                peak_lvr, peak_lvr_year = peak_lvrs[a]
+                yield r, e, a, {
+                    "final_equity": value[-1] - debt[-1],
+                    "min_net_cashflow": min_cashflow,
+                    "min_net_cashflow_year": min_cashflow_year,
+                    "peak_lvr": peak_lvr,
+                    "peak_lvr_year": peak_lvr_year,
+                }
+
+
+# ============================================================================
+# TORNADO
+# ============================================================================
+
+class TornadoInput(NamedTuple):
+    step: Decimal  # Moved down and up by this much
+    unit: str
+    pipelines: FrozenSet[str]  # Engine pipelines the input feeds
+
+
+TORNADO_INPUTS: Dict[str, TornadoInput] = {
+    "capital_growth": TornadoInput(Decimal("1"), "pp", frozenset({"value"})),
+    "rent_growth": TornadoInput(Decimal("1"), "pp", frozenset({"rent"})),
+    "vacancy_weeks": TornadoInput(Decimal("2"), "weeks", frozenset({"rent"})),
+    "interest_rate": TornadoInput(Decimal("1"), "pp", frozenset({"debt", "repayments"})),
+    "expense_growth": TornadoInput(Decimal("1"), "pp", frozenset({"expenses"})),
+    "offset_balance": TornadoInput(Decimal("10000"), "$", frozenset({"debt", "repayments"})),
+}
+
+# Outcome metrics and the pipelines they read
+TORNADO_METRICS: Dict[str, FrozenSet[str]] = {
+    "equity": frozenset({"value", "debt"}),  # Final-year equity
+    "cumulative_cashflow": frozenset({"rent", "repayments", "expenses"}),  # Net cashflow summed over the horizon
+    "net_position": frozenset({"value", "debt", "rent", "repayments", "expenses"}),  # Both of the above
+}
+
+
+def _components(rows: Sequence, pipelines: FrozenSet[str]) -> Dict[str, Decimal]:
+    """Per-pipeline outcome components of a projection"""
+    extract = {
+        "value": lambda: rows[-1].property_value,
+        "debt": lambda: rows[-1].total_debt,
+        "rent": lambda: sum((row.rental_income for row in rows), Decimal("0")),
+        "repayments": lambda: sum((row.loan_repayments for row in rows), Decimal("0")),
+        "expenses": lambda: sum((row.expenses for row in rows), Decimal("0")),
+    }
+    return {pipeline: extract[pipeline]() for pipeline in pipelines}
+
+
+def outcome(components: Dict[str, Decimal], metric: str) -> Decimal:
+    """Metric value from its pipeline components"""
+    total = Decimal("0")
+    if TORNADO_METRICS["equity"] <= TORNADO_METRICS[metric]:
+        total += components["value"] - components["debt"]
+    if TORNADO_METRICS["cumulative_cashflow"] <= TORNADO_METRICS[metric]:
+        total += components["rent"] - components["repayments"] - components["expenses"]
+    return total
+
+
+def detached_copy(property_obj, **updates):
+    """Session-free copy of a property with some fields replaced (the original is untouched)"""
+    # Table models are not re-validated on construction
+    fields = {name: getattr(property_obj, name) for name in type(property_obj).model_fields}
+    return type(property_obj)(**{**fields, **updates})
+
+
+def perturb(name: str, step: Decimal, property_obj, data: dict, base_year: int) -> tuple:
+    """
+    Copy of a property and its engine data with one input moved by step.
+
+    Rates and balances are clamped at zero (offsets at the loan balance) and
+    vacancy to 0–52 weeks. The property itself is only copied when its JSON
+    assumptions are read by the engine.
+    """
+    data = dict(data)
+    assumptions = property_obj.growth_assumptions or {}
+    if name == "capital_growth":
+        # Materialise the engine's fallback rate so it can be moved
+        rates = data.get("growth_rates") or [
+            {"start_year": base_year, "end_year": None, "growth_rate": assumptions.get("capital_growth_rate", 5.0)}
+        ]
+        data["growth_rates"] = [{**r, "growth_rate": to_decimal(r["growth_rate"]) + step} for r in rates]
+    elif name == "rent_growth":
+        data["rental_incomes"] = [
+            {**r, "growth_rate": to_decimal(r.get("growth_rate", 3)) + step} for r in data.get("rental_incomes", [])
+        ]
+        if property_obj.rental_details:
+            property_obj = detached_copy(property_obj, growth_assumptions={
+                **assumptions,
+                "rental_growth_rate": to_decimal(assumptions.get("rental_growth_rate", 3)) + step,
+            })
+    elif name == "vacancy_weeks":
+        data["rental_incomes"] = [
+            {**r, "vacancy_weeks_per_year": min(52, max(0, int(r.get("vacancy_weeks_per_year", 2) + step)))}
+            for r in data.get("rental_incomes", [])
+        ]
+    elif name == "interest_rate":
+        data["loans"] = [
+            {**loan, "interest_rate": max(Decimal("0"), to_decimal(loan.get("interest_rate", 6)) + step)}
+            for loan in data.get("loans", [])
+        ]
+    elif name == "expense_growth":
+        data["expenses"] = [
+            {**e, "growth_rate": to_decimal(e.get("growth_rate", 2.5)) + step} for e in data.get("expenses", [])
+        ]
+    elif name == "offset_balance":
+        data["loans"] = [
+            {
+                **loan,
+                "offset_balance": min(
+                    to_decimal(loan.get("current_amount", loan.get("original_amount", 0))),
+                    max(Decimal("0"), to_decimal(loan.get("offset_balance", 0)) + step),
+                ),
+            }
+            for loan in data.get("loans", [])
+        ]
+    else:
+        raise ValueError(f"Unknown tornado input: {name}")
+    return property_obj, data
+
+
+def property_tornado(
+    property_obj,
+    data: dict,
+    years: int,
+    metric: str,
+    base_year: int,
+    generate: Callable[..., list],
+) -> Tuple[Decimal, Dict[str, Tuple[Decimal, Decimal]]]:
+    """
+    Baseline metric and (low, high) metric per input for one property.
+
+    Args:
+        generate: Projection engine, called as generate(property, data, years, pipelines=...)
+
+    Returns:
+        (baseline, {input: (value at -step, value at +step)}) for every input in TORNADO_INPUTS
+    """
+    needed = TORNADO_METRICS[metric]
+    baseline_components = _components(generate(property_obj, data, years, pipelines=needed), needed)
+    baseline = outcome(baseline_components, metric)
+    
+    bars = {}
+    for name, spec in TORNADO_INPUTS.items():
+        rerun = spec.pipelines & needed
+        if not rerun:
+            bars[name] = (baseline, baseline)
+            continue
+        ends = []
+        for step in (-spec.step, spec.step):
+            perturbed_obj, perturbed_data = perturb(name, step, property_obj, data, base_year)
+            rows = generate(perturbed_obj, perturbed_data, years, pipelines=rerun)
+            ends.append(outcome({**baseline_components, **_components(rows, rerun)}, metric))
+        bars[name] = (ends[0], ends[1])
+    return baseline, bars
+
+
+def tornado_passes(metric: str) -> int:
+    """Restricted engine passes per property for a tornado analysis"""
+    needed = TORNADO_METRICS[metric]
+    return 1 + 2 * sum(1 for spec in TORNADO_INPUTS.values() if spec.pipelines & needed)
+
+
+def rank_bars(baseline: Decimal, bars: Dict[str, Tuple[Decimal, Decimal]]) -> List[dict]:
+    """Tornado bars, largest swing first (ties keep TORNADO_INPUTS order)"""
+    ranked = [
+        {
+            "input": name,
+            "step": TORNADO_INPUTS[name].step,
+            "unit": TORNADO_INPUTS[name].unit,
+            "low": low,
+            "high": high,
+            "low_impact": low - baseline,
+            "high_impact": high - baseline,
+            "swing": abs(high - low),
+        }
+        for name, (low, high) in bars.items()
+    ]
+    return sorted(ranked, key=lambda bar: bar["swing"], reverse=True)
+
@@ -0,0 +1,136 @@
+"""
+Request Coalescing (Single-Flight)
+Concurrent identical requests share one in-flight computation instead of each
+loading the portfolio and recomputing.
+
+The first caller for a key (the leader) runs the computation in the threadpool so
+the event loop stays free to accept followers; followers with the same key await
+the leader's result. Nothing is kept once the computation finishes — this is not
+a cache.
+
+Callers may pass a CancelToken (utils/cancellation.py); the computation is then
+given a SharedCancelToken that is cancelled only once every caller waiting on it
+has given up, so one caller's disconnect never cancels another's result.
+
+⚠️ CRITICAL: Keys must include the user id and the data version so callers never
+receive another user's data or a result computed before their own write. Never
+pass a request's Session as an argument: it is not thread-safe and closes when
+the leader's request ends, while followers may still be waiting. Pass bind= and
+the computation gets a Session of its own.
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from utils.cancellation import CancelToken, OperationCancelled, SharedCancelToken
+
+logger = logging.getLogger(__name__)
+
+
+def make_key(user_id: str, endpoint: str, params: Optional[dict], version: str) -> Tuple:
+    """
+    Build a coalescing key from normalized request parameters.
+
+    None-valued params are dropped and the rest sorted, so requests that differ only
+    in parameter order or omitted defaults share a key.
+    """
+    normalized = tuple(sorted(
+        (name, value) for name, value in (params or {}).items() if value is not None
+    ))
+    return (user_id, endpoint, normalized, version)
+
+
+def _run_in_session(fn: Callable[..., Any], bind: Any, *args, **kwargs) -> Any:
+    """Call fn with session= set to a Session of its own, opened and closed in this thread"""
+    with Session(bind) as session:
+        return fn(*args, session=session, **kwargs)
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, Tuple[asyncio.Task, Optional[SharedCancelToken]]] = {}
+        self._leaders = 0
+        self._followers = 0
+        self._abandoned = 0
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[..., Any],
+        *args,
+        cancel: Optional[CancelToken] = None,
+        bind: Optional[Union[Engine, Connection]] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Run fn(*args, **kwargs) in the threadpool, or join an identical in-flight call.
+
+        The computation runs as its own task, so a caller that disconnects does not
+        cancel the result other callers are waiting on. Exceptions propagate to
+        every caller that shares the key.
+
+        Args:
+            cancel: The caller's token; when given, fn is called with a cancel=
+                keyword argument holding the computation's shared token
+            bind: Engine or connection (usually session.get_bind()); when given,
+                fn is called with a session= keyword argument holding a Session
+                opened in the worker thread for this computation alone
+        """
+        if bind is not None:
+            args = (fn, bind, *args)
+            fn = _run_in_session
+        while True:
+            flight = self._inflight.get(key)
+            if flight is not None:
+                task, shared = flight
+                if shared is not None:
+                    shared.join(cancel)
+                self._followers += 1
+            else:
+                shared = None
+                if cancel is not None:
+                    shared = SharedCancelToken()
+                    shared.join(cancel)
+                    kwargs["cancel"] = shared
+                self._leaders += 1
+                task = asyncio.ensure_future(run_in_threadpool(fn, *args, **kwargs))
+                self._inflight[key] = (task, shared)
+                task.add_done_callback(lambda t: self._on_done(key, t))
+            try:
+                return await asyncio.shield(task)
+            except OperationCancelled:
+                if cancel is None or cancel.cancelled:
+                    raise
+                # Every earlier caller gave up just as this one joined; compute afresh
+                kwargs.pop("cancel", None)
+
+    def _on_done(self, key: Hashable, task: asyncio.Task) -> None:
+        flight = self._inflight.get(key)
+        if flight is not None and flight[0] is task:
+            del self._inflight[key]
+        # Mark the exception retrieved if every caller has gone away
+        if not task.cancelled() and isinstance(task.exception(), OperationCancelled):
+            self._abandoned += 1
+
+    def snapshot(self) -> dict:
+        """Point-in-time metrics for the health/metrics endpoint"""
+        total = self._leaders + self._followers
+        return {
+            "inflight": len(self._inflight),
+            "computations": self._leaders,
+            "coalesced": self._followers,
+            "abandoned": self._abandoned,
+            "coalesced_ratio": round(self._followers / total, 4) if total else 0.0,
+        }
+
+
+# Shared instance for summary and projection endpoints
+single_flight = SingleFlight("summaries")
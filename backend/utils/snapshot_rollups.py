@@ -0,0 +1,393 @@
+"""
+Net Worth Rollups
+Weekly, monthly and quarterly net worth per portfolio (net_worth_rollups), so
+multi-year charts read one small row per period instead of every daily
+snapshot with its JSON breakdowns.
+
+Each rollup holds the period's closing figures (its last snapshot day), its
+opening net worth, the min/max net worth and the number of days sampled.
+Several snapshots on one day count as that day's latest.
+
+Rollups are maintained incrementally: whoever writes snapshots merges them in
+the same transaction (merge_into_rollups), locking the affected rollups while
+it does and writing them back with an upsert. Raw snapshots older than
+SNAPSHOT_RAW_RETENTION_DAYS are compacted nightly — the periods they touch are
+rebuilt exactly from the raw rows, which are then deleted. Daily resolution is
+served from the raw snapshots still inside the retention horizon.
+
+    merge_into_rollups(session, rows)        # after inserting snapshots, before commit
+    points = get_series(session, portfolio_id, "monthly", date_from, date_to)
+
+⚠️ CRITICAL: Once compacted, a period's rollup is its only history. A rollup
+whose first day predates the raw snapshots left in its period is never
+rebuilt from them — it is merged into instead.
+"""
+
+import os
+import logging
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, func, select
+
+from models.net_worth import NetWorthRollup, NetWorthSeriesPoint, NetWorthSnapshot
+from utils.cancellation import CancelToken
+from utils.lanes import batch_lane
+
+logger = logging.getLogger(__name__)
+
+
+# Daily snapshots older than this are compacted into rollups (counted back from the run date)
+SNAPSHOT_RAW_RETENTION_DAYS = int(os.getenv("SNAPSHOT_RAW_RETENTION_DAYS", "730"))
+
+# Portfolios rebuilt and compacted per transaction
+ROLLUP_COMPACTION_CHUNK_SIZE = int(os.getenv("ROLLUP_COMPACTION_CHUNK_SIZE", "200"))
+
+ROLLUP_RESOLUTIONS = ("weekly", "monthly", "quarterly")
+RESOLUTIONS = ("daily",) + ROLLUP_RESOLUTIONS
+
+_FIGURES = ("net_worth", "total_assets", "total_liabilities")
+
+# INSERT ... ON CONFLICT DO UPDATE constructors for the supported databases
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _decimal(value) -> Decimal:
+    # SQLite returns DECIMAL columns read through Core as float
+    if value is None:
+        return Decimal("0")
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def period_bounds(resolution: str, day: date) -> Tuple[date, date]:
+    """First and last day of the period containing day (weeks start on Monday)"""
+    if resolution == "daily":
+        return day, day
+    if resolution == "weekly":
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=6)
+    if resolution == "monthly":
+        start = day.replace(day=1)
+    elif resolution == "quarterly":
+        start = date(day.year, 3 * ((day.month - 1) // 3) + 1, 1)
+    else:
+        raise ValueError(f"Unknown resolution: {resolution}")
+    months = 1 if resolution == "monthly" else 3
+    month = start.month - 1 + months
+    return start, date(start.year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+
+
+def compaction_cutoff(today: date) -> date:
+    """
+    Raw snapshots before this date are compacted: the first of the month
+    SNAPSHOT_RAW_RETENTION_DAYS ago, so compaction does real work once a month.
+    """
+    return (today - timedelta(days=SNAPSHOT_RAW_RETENTION_DAYS)).replace(day=1)
+
+
+def _daily_closes(session: Session, portfolio_ids: List[str], date_from: Optional[date],
+                  date_to: Optional[date]) -> List[dict]:
+    """Each portfolio's latest snapshot per day, light columns only, by portfolio then date"""
+    filters = [NetWorthSnapshot.portfolio_id.in_(portfolio_ids)]
+    if date_from is not None:
+        filters.append(NetWorthSnapshot.date >= date_from)
+    if date_to is not None:
+        filters.append(NetWorthSnapshot.date <= date_to)
+    ranked = (
+        select(
+            NetWorthSnapshot.portfolio_id,
+            NetWorthSnapshot.user_id,
+            NetWorthSnapshot.date,
+            NetWorthSnapshot.net_worth,
+            NetWorthSnapshot.total_assets,
+            NetWorthSnapshot.total_liabilities,
+            func.row_number().over(
+                partition_by=(NetWorthSnapshot.portfolio_id, NetWorthSnapshot.date),
+                order_by=NetWorthSnapshot.created_at.desc(),
+            ).label("position"),
+        )
+        .where(*filters)
+        .subquery()
+    )
+    rows = session.execute(
+        select(
+            ranked.c.portfolio_id, ranked.c.user_id, ranked.c.date,
+            ranked.c.net_worth, ranked.c.total_assets, ranked.c.total_liabilities,
+        )
+        .where(ranked.c.position == 1)
+        .order_by(ranked.c.portfolio_id, ranked.c.date)
+    ).mappings().all()
+    return [{**row, **{name: _decimal(row[name]) for name in _FIGURES}} for row in rows]
+
+
+def _new_rollup(resolution: str, close: dict) -> dict:
+    start, end = period_bounds(resolution, close["date"])
+    return {
+        "portfolio_id": close["portfolio_id"],
+        "resolution": resolution,
+        "period_start": start,
+        "user_id": close["user_id"],
+        "period_end": end,
+        "first_date": close["date"],
+        "last_date": close["date"],
+        "samples": 1,
+        **{name: close[name] for name in _FIGURES},
+        "open_net_worth": close["net_worth"],
+        "min_net_worth": close["net_worth"],
+        "max_net_worth": close["net_worth"],
+    }
+
+
+def _merge(rollup: dict, close: dict) -> bool:
+    """
+    Fold one day's snapshot into a rollup (a day already sampled is replaced).
+
+    Returns:
+        True if the day falls strictly inside the sampled range, where the
+        rollup alone cannot tell a new day from a re-sampled one; samples is
+        then left for _recount_samples
+    """
+    day, net_worth = close["date"], close["net_worth"]
+    if rollup["samples"] == 1 and day == rollup["last_date"]:
+        rollup.update(_new_rollup(rollup["resolution"], close))
+        return False
+    inside = rollup["first_date"] < day < rollup["last_date"]
+    if day > rollup["last_date"] or day < rollup["first_date"]:
+        rollup["samples"] += 1
+    if day >= rollup["last_date"]:
+        rollup["last_date"] = day
+        rollup.update({name: close[name] for name in _FIGURES})
+    if day <= rollup["first_date"]:
+        rollup["first_date"] = day
+        rollup["open_net_worth"] = net_worth
+    # A replaced day's old value may linger in min/max until the period is rebuilt
+    rollup["min_net_worth"] = min(rollup["min_net_worth"], net_worth)
+    rollup["max_net_worth"] = max(rollup["max_net_worth"], net_worth)
+    return inside
+
+
+def _recount_samples(session: Session, rollups: List[dict]) -> None:
+    """
+    Raise each rollup's samples to the number of distinct days with a raw
+    snapshot in its sampled range (including snapshots written in this
+    transaction). Days already compacted have no raw rows, so a backfilled day
+    inside a compacted range is not counted until the period is rebuilt.
+    """
+    if not rollups:
+        return
+    days = session.execute(
+        select(NetWorthSnapshot.portfolio_id, NetWorthSnapshot.date)
+        .distinct()
+        .where(
+            NetWorthSnapshot.portfolio_id.in_({rollup["portfolio_id"] for rollup in rollups}),
+            NetWorthSnapshot.date >= min(rollup["first_date"] for rollup in rollups),
+            NetWorthSnapshot.date <= max(rollup["last_date"] for rollup in rollups),
+        )
+    ).all()
+    for rollup in rollups:
+        sampled = sum(
+            1 for portfolio_id, day in days
+            if portfolio_id == rollup["portfolio_id"] and rollup["first_date"] <= day <= rollup["last_date"]
+        )
+        rollup["samples"] = max(rollup["samples"], sampled)
+
+
+def _load(session: Session, resolution: str, keys: Iterable[Tuple[str, date]]) -> Dict[Tuple[str, date], dict]:
+    keys = list(keys)
+    if not keys:
+        return {}
+    table = NetWorthRollup.__table__
+    # Locked until the caller commits, so concurrent writers merge one after the other
+    rows = session.execute(
+        select(table).where(
+            table.c.resolution == resolution,
+            tuple_(table.c.portfolio_id, table.c.period_start).in_(keys),
+        ).with_for_update()
+    ).mappings().all()
+    loaded = {}
+    for row in rows:
+        rollup = dict(row)
+        for name in _FIGURES + ("open_net_worth", "min_net_worth", "max_net_worth"):
+            rollup[name] = _decimal(rollup[name])
+        loaded[(rollup["portfolio_id"], rollup["period_start"])] = rollup
+    return loaded
+
+
+def _upsert(session: Session, rollups: Dict[Tuple[str, date], dict]) -> None:
+    """Write rollups with INSERT ... ON CONFLICT DO UPDATE, so a period created concurrently never collides"""
+    if not rollups:
+        return
+    table = NetWorthRollup.__table__
+    keys = [column.name for column in table.primary_key.columns]
+    stmt = _UPSERT_INSERTS[session.get_bind().dialect.name](table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=keys,
+        set_={column.name: stmt.excluded[column.name] for column in table.columns if column.name not in keys},
+    )
+    updated_at = _now()
+    session.execute(stmt, [{**rollup, "updated_at": updated_at} for rollup in rollups.values()])
+
+
+def merge_into_rollups(session: Session, snapshots: List[dict]) -> None:
+    """
+    Fold newly written snapshots into every resolution's rollups (does not commit).
+
+    Args:
+        snapshots: Dicts with portfolio_id, user_id, date, net_worth,
+            total_assets and total_liabilities
+    """
+    if not snapshots:
+        return
+    closes = [{**snapshot, **{name: _decimal(snapshot[name]) for name in _FIGURES}} for snapshot in snapshots]
+    for resolution in ROLLUP_RESOLUTIONS:
+        keyed = [((close["portfolio_id"], period_bounds(resolution, close["date"])[0]), close) for close in closes]
+        rollups = _load(session, resolution, {key for key, _ in keyed})
+        recount = set()
+        for key, close in keyed:
+            if key not in rollups:
+                rollups[key] = _new_rollup(resolution, close)
+            elif _merge(rollups[key], close):
+                recount.add(key)
+        _recount_samples(session, [rollups[key] for key in recount])
+        _upsert(session, rollups)
+
+
+def rebuild_rollups(session: Session, portfolio_ids: List[str], date_from: Optional[date] = None,
+                    date_to: Optional[date] = None) -> int:
+    """
+    Recompute, from raw snapshots, every rollup period of these portfolios that
+    overlaps [date_from, date_to] (unbounded when None). Does not commit.
+
+    Periods already partly compacted keep their rollup; the raw days left in
+    them were merged in when written.
+
+    Returns:
+        Number of rollups rewritten
+    """
+    span_from = min(period_bounds(r, date_from)[0] for r in ROLLUP_RESOLUTIONS) if date_from else None
+    span_to = max(period_bounds(r, date_to)[1] for r in ROLLUP_RESOLUTIONS) if date_to else None
+    closes = _daily_closes(session, portfolio_ids, span_from, span_to)
+
+    rewritten = 0
+    for resolution in ROLLUP_RESOLUTIONS:
+        lower = period_bounds(resolution, date_from)[0] if date_from else None
+        upper = period_bounds(resolution, date_to)[1] if date_to else None
+        rebuilt: Dict[Tuple[str, date], dict] = {}
+        for close in closes:
+            if (lower and close["date"] < lower) or (upper and close["date"] > upper):
+                continue
+            key = (close["portfolio_id"], period_bounds(resolution, close["date"])[0])
+            if key in rebuilt:
+                _merge(rebuilt[key], close)
+            else:
+                rebuilt[key] = _new_rollup(resolution, close)
+
+        existing = _load(session, resolution, rebuilt)
+        for key, rollup in existing.items():
+            if rollup["first_date"] < rebuilt[key]["first_date"]:
+                del rebuilt[key]
+        _upsert(session, rebuilt)
+        rewritten += len(rebuilt)
+    return rewritten
+
+
+def compact_snapshots(bind, today: Optional[date] = None, chunk_size: Optional[int] = None,
+                      cancel: Optional[CancelToken] = None) -> dict:
+    """
+    Rebuild the rollups covering raw snapshots older than the retention
+    horizon, then delete those snapshots (synchronous; run it in the batch lane).
+
+    Returns:
+        {"cutoff", "portfolios", "deleted"}
+    """
+    cutoff = compaction_cutoff(today or _now().date())
+    chunk_size = chunk_size or ROLLUP_COMPACTION_CHUNK_SIZE
+    portfolios = deleted = 0
+    after = None
+    while True:
+        if cancel is not None:
+            cancel.check()
+        with batch_lane.session(bind) as session:
+            stmt = (
+                select(NetWorthSnapshot.portfolio_id)
+                .where(NetWorthSnapshot.date < cutoff)
+                .group_by(NetWorthSnapshot.portfolio_id)
+                .order_by(NetWorthSnapshot.portfolio_id)
+                .limit(chunk_size)
+            )
+            if after is not None:
+                stmt = stmt.where(NetWorthSnapshot.portfolio_id > after)
+            ids = list(session.exec(stmt).all())
+            if not ids:
+                break
+            rebuild_rollups(session, ids, date_to=cutoff - timedelta(days=1))
+            deleted += session.execute(
+                delete(NetWorthSnapshot).where(
+                    NetWorthSnapshot.portfolio_id.in_(ids),
+                    NetWorthSnapshot.date < cutoff,
+                )
+            ).rowcount
+            session.commit()
+        portfolios += len(ids)
+        after = ids[-1]
+        if len(ids) < chunk_size:
+            break
+
+    if deleted:
+        logger.info(f"Compacted {deleted} net worth snapshots before {cutoff} for {portfolios} portfolios")
+    return {"cutoff": cutoff.isoformat(), "portfolios": portfolios, "deleted": deleted}
+
+
+def get_series(session: Session, portfolio_id: str, resolution: str, date_from: Optional[date] = None,
+               date_to: Optional[date] = None) -> List[NetWorthSeriesPoint]:
+    """
+    Net worth points for one portfolio, oldest first: raw daily snapshots for
+    "daily", otherwise the rollups whose periods overlap [date_from, date_to].
+    """
+    if resolution == "daily":
+        return [
+            NetWorthSeriesPoint(
+                period_start=close["date"],
+                period_end=close["date"],
+                date=close["date"],
+                net_worth=close["net_worth"],
+                total_assets=close["total_assets"],
+                total_liabilities=close["total_liabilities"],
+                open_net_worth=close["net_worth"],
+                min_net_worth=close["net_worth"],
+                max_net_worth=close["net_worth"],
+                samples=1,
+            )
+            for close in _daily_closes(session, [portfolio_id], date_from, date_to)
+        ]
+
+    stmt = select(NetWorthRollup).where(
+        NetWorthRollup.portfolio_id == portfolio_id,
+        NetWorthRollup.resolution == resolution,
+    )
+    if date_from is not None:
+        stmt = stmt.where(NetWorthRollup.period_end >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(NetWorthRollup.period_start <= date_to)
+    return [
+        NetWorthSeriesPoint(
+            period_start=rollup.period_start,
+            period_end=rollup.period_end,
+            date=rollup.last_date,
+            net_worth=rollup.net_worth,
+            total_assets=rollup.total_assets,
+            total_liabilities=rollup.total_liabilities,
+            open_net_worth=rollup.open_net_worth,
+            min_net_worth=rollup.min_net_worth,
+            max_net_worth=rollup.max_net_worth,
+            samples=rollup.samples,
+        )
+        for rollup in session.exec(stmt.order_by(NetWorthRollup.period_start)).all()
+    ]
@@ -0,0 +1,495 @@
+"""
+Nightly Net Worth Snapshots
+Writes one calculated NetWorthSnapshot per actual portfolio per day, so net
+worth history fills in without users pressing "snapshot".
+
+Portfolios are processed in keyset-paged chunks of SNAPSHOT_CHUNK_SIZE. Each
+chunk costs a fixed number of queries however many portfolios it holds:
+GROUP BY aggregates over properties, assets, liabilities, income and expenses,
+one ROW_NUMBER() window query for every portfolio's previous snapshot (to fill
+change_from_previous and change_percentage), then a single bulk INSERT merged
+into the weekly/monthly/quarterly rollups (utils/snapshot_rollups.py). After
+generating a day the scheduler compacts raw snapshots past the retention
+horizon into those rollups.
+
+The totals match the dashboard summary (routes/dashboard.py): all properties,
+active assets, liabilities, income and expenses, one-time amounts excluded
+from monthly figures.
+
+    stats = await batch_lane.run(generate_daily_snapshots, engine, date.today())
+
+snapshot_scheduler runs this in the batch lane (utils/lanes.py) once a day at
+SNAPSHOT_HOUR_UTC; scripts/generate_snapshots.py runs it from the command line
+(cron, backfills).
+
+⚠️ CRITICAL: Runs are idempotent per day — a chunk's calculated snapshots for
+the date are deleted and rewritten in one transaction, and portfolios with a
+manual snapshot that day are left alone. The snapshot_runs row for the date is
+claimed with an INSERT so only one instance generates it.
+"""
+
+import os
+import time
+import uuid
+import asyncio
+import logging
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, func, or_, select
+
+from models.asset import Asset
+from models.expense import Expense
+from models.income import IncomeSource
+from models.liability import Liability
+from models.net_worth import NetWorthSnapshot, SnapshotRun
+from models.portfolio import Portfolio
+from models.property import Property
+from models.user import User
+from utils.calculations import FREQUENCY_MULTIPLIERS
+from utils.cancellation import CancelToken, OperationCancelled
+from utils.lanes import batch_lane
+from utils.snapshot_rollups import compact_snapshots, merge_into_rollups
+
+logger = logging.getLogger(__name__)
+
+
+# Portfolios aggregated and inserted per transaction
+SNAPSHOT_CHUNK_SIZE = int(os.getenv("SNAPSHOT_CHUNK_SIZE", "1000"))
+
+# Hour of the day (UTC) the nightly run starts
+SNAPSHOT_HOUR_UTC = int(os.getenv("SNAPSHOT_HOUR_UTC", "2"))
+
+# Set to "false" on instances that should never generate snapshots
+SNAPSHOT_SCHEDULER_ENABLED = os.getenv("SNAPSHOT_SCHEDULER_ENABLED", "true").lower() == "true"
+
+# A running run with no heartbeat for this long is presumed lost and may be claimed again
+SNAPSHOT_STALE_SECONDS = int(os.getenv("SNAPSHOT_STALE_SECONDS", "900"))
+
+# Asset/liability types with their own breakdown entry (same as the dashboard summary)
+ASSET_BREAKDOWN_TYPES = {
+    "super": "super", "shares": "shares", "etf": "etf", "crypto": "crypto",
+    "cash": "cash", "bonds": "bonds", "other": "other",
+}
+LIABILITY_BREAKDOWN_TYPES = {
+    "car_loan": "car_loans", "credit_card": "credit_cards", "hecs": "hecs",
+    "personal_loan": "personal_loans", "other": "other",
+}
+
+_ONE_TIME_FREQUENCIES = {"one_time", "OneTime", "one-time", "One Time"}
+
+_ZERO = Decimal("0")
+_CURRENCY = Decimal("0.0001")
+_PERCENT = Decimal("0.01")
+# Largest value a DECIMAL(5, 2) percentage column holds
+_PERCENT_LIMIT = Decimal("999.99")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _decimal(value) -> Decimal:
+    # SQLite returns SUM() over DECIMAL columns as float
+    if value is None:
+        return _ZERO
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def _monthly_multiplier(frequency: Optional[str]) -> Decimal:
+    """Factor turning an amount at this frequency into a monthly amount"""
+    if frequency in _ONE_TIME_FREQUENCIES:
+        return _ZERO
+    return FREQUENCY_MULTIPLIERS.get(frequency, Decimal("12")) / Decimal("12")
+
+
+def _percentage(numerator: Decimal, denominator: Decimal) -> Decimal:
+    """numerator / denominator as a percentage that fits DECIMAL(5, 2) (0 when undefined)"""
+    if denominator == 0:
+        return Decimal("0.00")
+    value = (numerator / denominator * 100).quantize(_PERCENT)
+    return max(-_PERCENT_LIMIT, min(_PERCENT_LIMIT, value))
+
+
+def _next_portfolios(session: Session, after: Optional[str], limit: int) -> List[Tuple[str, str]]:
+    """The next chunk of (portfolio_id, user_id) for actual portfolios of active users, by id"""
+    stmt = (
+        select(Portfolio.id, Portfolio.user_id)
+        .join(User, User.id == Portfolio.user_id)
+        .where(
+            Portfolio.type == "actual",
+            User.is_active == True,
+            User.deleted_at == None,
+        )
+        .order_by(Portfolio.id)
+        .limit(limit)
+    )
+    if after is not None:
+        stmt = stmt.where(Portfolio.id > after)
+    return list(session.exec(stmt).all())
+
+
+def _aggregate_totals(session: Session, portfolios: List[Tuple[str, str]]) -> Dict[str, dict]:
+    """
+    Dashboard summary figures for every portfolio in the chunk, from one
+    GROUP BY query per table.
+    """
+    ids = [portfolio_id for portfolio_id, _ in portfolios]
+    totals = {
+        portfolio_id: {
+            "property_value": _ZERO,
+            "property_loans": _ZERO,
+            "assets": {field: _ZERO for field in ASSET_BREAKDOWN_TYPES.values()},
+            "other_assets": _ZERO,  # types without a breakdown entry still count in the total
+            "liabilities": {field: _ZERO for field in LIABILITY_BREAKDOWN_TYPES.values()},
+            "other_liabilities": _ZERO,
+            "monthly_income": _ZERO,
+            "monthly_expenses": _ZERO,
+        }
+        for portfolio_id in ids
+    }
+
+    # Properties belong to the portfolio's owner (data isolation, as on the dashboard)
+    loan_amount = func.coalesce(Property.loan_details["amount"].as_float(), 0)
+    for portfolio_id, value, loans in session.exec(
+        select(Property.portfolio_id, func.sum(Property.current_value), func.sum(loan_amount))
+        .join(Portfolio, (Portfolio.id == Property.portfolio_id) & (Portfolio.user_id == Property.user_id))
+        .where(Property.portfolio_id.in_(ids))
+        .group_by(Property.portfolio_id)
+    ).all():
+        totals[portfolio_id]["property_value"] = _decimal(value)
+        totals[portfolio_id]["property_loans"] = _decimal(loans)
+
+    for portfolio_id, type_, value in session.exec(
+        select(Asset.portfolio_id, Asset.type, func.sum(Asset.current_value))
+        .join(Portfolio, (Portfolio.id == Asset.portfolio_id) & (Portfolio.user_id == Asset.user_id))
+        .where(Asset.portfolio_id.in_(ids), Asset.is_active == True)
+        .group_by(Asset.portfolio_id, Asset.type)
+    ).all():
+        field = ASSET_BREAKDOWN_TYPES.get(type_)
+        if field is None:
+            totals[portfolio_id]["other_assets"] += _decimal(value)
+        else:
+            totals[portfolio_id]["assets"][field] += _decimal(value)
+
+    for portfolio_id, type_, balance in session.exec(
+        select(Liability.portfolio_id, Liability.type, func.sum(Liability.current_balance))
+        .join(Portfolio, (Portfolio.id == Liability.portfolio_id) & (Portfolio.user_id == Liability.user_id))
+        .where(Liability.portfolio_id.in_(ids), Liability.is_active == True)
+        .group_by(Liability.portfolio_id, Liability.type)
+    ).all():
+        field = LIABILITY_BREAKDOWN_TYPES.get(type_)
+        if field is None:
+            totals[portfolio_id]["other_liabilities"] += _decimal(balance)
+        else:
+            totals[portfolio_id]["liabilities"][field] += _decimal(balance)
+
+    for model, key in ((IncomeSource, "monthly_income"), (Expense, "monthly_expenses")):
+        for portfolio_id, frequency, amount in session.exec(
+            select(model.portfolio_id, model.frequency, func.sum(model.amount))
+            .join(Portfolio, (Portfolio.id == model.portfolio_id) & (Portfolio.user_id == model.user_id))
+            .where(model.portfolio_id.in_(ids), model.is_active == True)
+            .group_by(model.portfolio_id, model.frequency)
+        ).all():
+            totals[portfolio_id][key] += _decimal(amount) * _monthly_multiplier(frequency)
+
+    return totals
+
+
+def _previous_net_worth(session: Session, ids: List[str], snapshot_date: date) -> Dict[str, Decimal]:
+    """Net worth of each portfolio's latest snapshot before snapshot_date (one window query)"""
+    ranked = (
+        select(
+            NetWorthSnapshot.portfolio_id,
+            NetWorthSnapshot.net_worth,
+            func.row_number().over(
+                partition_by=NetWorthSnapshot.portfolio_id,
+                order_by=(NetWorthSnapshot.date.desc(), NetWorthSnapshot.created_at.desc()),
+            ).label("position"),
+        )
+        .where(NetWorthSnapshot.portfolio_id.in_(ids), NetWorthSnapshot.date < snapshot_date)
+        .subquery()
+    )
+    rows = session.exec(select(ranked.c.portfolio_id, ranked.c.net_worth).where(ranked.c.position == 1)).all()
+    return {portfolio_id: _decimal(net_worth) for portfolio_id, net_worth in rows}
+
+
+def _snapshot_row(portfolio_id: str, user_id: str, snapshot_date: date, totals: dict,
+                  previous: Optional[Decimal], created_at: datetime) -> dict:
+    """Column values for one calculated snapshot"""
+    property_value, property_loans = totals["property_value"], totals["property_loans"]
+    total_assets = property_value + sum(totals["assets"].values()) + totals["other_assets"]
+    total_liabilities = property_loans + sum(totals["liabilities"].values()) + totals["other_liabilities"]
+    net_worth = (total_assets - total_liabilities).quantize(_CURRENCY)
+    monthly_income = totals["monthly_income"].quantize(_CURRENCY)
+    monthly_expenses = totals["monthly_expenses"].quantize(_CURRENCY)
+    monthly_cashflow = monthly_income - monthly_expenses
+    change = net_worth - previous if previous is not None else _ZERO
+
+    # Breakdowns hold floats, like every other writer of these JSON columns
+    asset_breakdown = {"properties": float(property_value)}
+    asset_breakdown.update({field: float(value) for field, value in totals["assets"].items()})
+    liability_breakdown = {"property_loans": float(property_loans)}
+    liability_breakdown.update({field: float(value) for field, value in totals["liabilities"].items()})
+
+    return {
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "portfolio_id": portfolio_id,
+        "date": snapshot_date,
+        "total_assets": total_assets.quantize(_CURRENCY),
+        "total_liabilities": total_liabilities.quantize(_CURRENCY),
+        "net_worth": net_worth,
+        "asset_breakdown": asset_breakdown,
+        "liability_breakdown": liability_breakdown,
+        "monthly_income": monthly_income,
+        "monthly_expenses": monthly_expenses,
+        "monthly_cashflow": monthly_cashflow,
+        "savings_rate": _percentage(monthly_cashflow, monthly_income) if monthly_income > 0 else Decimal("0.00"),
+        "property_equity": (property_value - property_loans).quantize(_CURRENCY),
+        "property_ltv": _percentage(property_loans, property_value),
+        "change_from_previous": change.quantize(_CURRENCY),
+        "change_percentage": _percentage(change, abs(previous)) if previous is not None else Decimal("0.00"),
+        "is_manual": False,
+        "notes": "",
+        "created_at": created_at,
+    }
+
+
+def _write_chunk(session: Session, portfolios: List[Tuple[str, str]], snapshot_date: date) -> int:
+    """Replace the chunk's calculated snapshots for snapshot_date; returns rows written"""
+    ids = [portfolio_id for portfolio_id, _ in portfolios]
+    manual = set(session.exec(
+        select(NetWorthSnapshot.portfolio_id).where(
+            NetWorthSnapshot.portfolio_id.in_(ids),
+            NetWorthSnapshot.date == snapshot_date,
+            NetWorthSnapshot.is_manual == True,
+        )
+    ).all())
+    pending = [(portfolio_id, user_id) for portfolio_id, user_id in portfolios if portfolio_id not in manual]
+    if not pending:
+        return 0
+
+    totals = _aggregate_totals(session, pending)
+    previous = _previous_net_worth(session, [portfolio_id for portfolio_id, _ in pending], snapshot_date)
+    created_at = _now()
+    rows = [
+        _snapshot_row(portfolio_id, user_id, snapshot_date, totals[portfolio_id], previous.get(portfolio_id), created_at)
+        for portfolio_id, user_id in pending
+    ]
+
+    session.execute(
+        delete(NetWorthSnapshot).where(
+            NetWorthSnapshot.portfolio_id.in_(ids),
+            NetWorthSnapshot.date == snapshot_date,
+            NetWorthSnapshot.is_manual == False,
+        )
+    )
+    session.execute(insert(NetWorthSnapshot), rows)
+    merge_into_rollups(session, rows)
+    session.commit()
+    return len(rows)
+
+
+def generate_daily_snapshots(
+    bind,
+    snapshot_date: Optional[date] = None,
+    chunk_size: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancel: Optional[CancelToken] = None,
+) -> dict:
+    """
+    Write snapshot_date's calculated snapshot for every actual portfolio
+    (synchronous; run it in the batch lane).
+
+    Args:
+        bind: Engine to read and write through
+        snapshot_date: Day to snapshot (default today, UTC)
+        chunk_size: Portfolios per transaction (default SNAPSHOT_CHUNK_SIZE)
+        progress: Called after each chunk with (portfolios, snapshots) so far
+        cancel: Checked between chunks; committed chunks are kept
+
+    Returns:
+        {"date", "portfolios", "snapshots", "seconds"}
+
+    Raises:
+        OperationCancelled if cancel is cancelled part way through
+    """
+    snapshot_date = snapshot_date or _now().date()
+    chunk_size = chunk_size or SNAPSHOT_CHUNK_SIZE
+    start = time.monotonic()
+    processed = written = 0
+    after = None
+    while True:
+        if cancel is not None:
+            cancel.check()
+        with batch_lane.session(bind) as session:
+            portfolios = _next_portfolios(session, after, chunk_size)
+            if not portfolios:
+                break
+            written += _write_chunk(session, portfolios, snapshot_date)
+        processed += len(portfolios)
+        after = portfolios[-1][0]
+        if progress is not None:
+            progress(processed, written)
+        if len(portfolios) < chunk_size:
+            break
+
+    seconds = round(time.monotonic() - start, 3)
+    logger.info(f"Net worth snapshots for {snapshot_date}: {written} written for {processed} portfolios in {seconds}s")
+    return {"date": snapshot_date.isoformat(), "portfolios": processed, "snapshots": written, "seconds": seconds}
+
+
+def claim_run(bind, snapshot_date: date, force: bool = False) -> bool:
+    """
+    Claim snapshot_date's run for this process. A date can be claimed when it
+    has no run yet, its run failed, or its run's heartbeat is stale; force
+    also re-claims completed runs (backfills).
+    """
+    now = _now()
+    with batch_lane.session(bind) as session:
+        session.add(SnapshotRun(date=snapshot_date, started_at=now, updated_at=now))
+        try:
+            session.commit()
+            return True
+        except IntegrityError:
+            session.rollback()
+
+        claimable = or_(
+            SnapshotRun.status == "failed",
+            (SnapshotRun.status == "running") & (SnapshotRun.updated_at < now - timedelta(seconds=SNAPSHOT_STALE_SECONDS)),
+        )
+        if force:
+            claimable = or_(claimable, SnapshotRun.status == "completed")
+        claimed = session.execute(
+            update(SnapshotRun)
+            .where(SnapshotRun.date == snapshot_date, claimable)
+            .values(status="running", portfolios=0, snapshots=0, error=None,
+                    started_at=now, finished_at=None, updated_at=now)
+        ).rowcount
+        session.commit()
+        return bool(claimed)
+
+
+def _record_run(bind, snapshot_date: date, **values) -> None:
+    values["updated_at"] = _now()
+    with batch_lane.session(bind) as session:
+        session.execute(update(SnapshotRun).where(SnapshotRun.date == snapshot_date).values(**values))
+        session.commit()
+
+
+class SnapshotScheduler:
+    """Runs generate_daily_snapshots once a day at SNAPSHOT_HOUR_UTC"""
+
+    def __init__(self, name: str, hour: int):
+        self.name = name
+        self.hour = hour
+        self._task: Optional[asyncio.Task] = None
+        self._token: Optional[CancelToken] = None
+        self._next_run: Optional[datetime] = None
+
+        # Metrics
+        self._runs = 0
+        self._failures = 0
+        self._last_run: Optional[dict] = None
+
+    async def start(self, bind) -> None:
+        """Start the schedule; a day whose run time has passed without a completed run is generated at once"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._loop(bind))
+
+    async def stop(self) -> None:
+        """Stop the schedule; a run in progress stops after its current chunk and is retried later"""
+        if self._token is not None:
+            self._token.cancel()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run(self, bind, snapshot_date: Optional[date] = None, force: bool = False,
+                  chunk_size: Optional[int] = None) -> Optional[dict]:
+        """
+        Claim and generate one day's snapshots.
+
+        Returns:
+            The run's stats, or None when another instance has (or had) the day
+            or the run failed
+        """
+        snapshot_date = snapshot_date or _now().date()
+        if not await batch_lane.run(claim_run, bind, snapshot_date, force):
+            return None
+
+        def heartbeat(portfolios: int, snapshots: int) -> None:
+            _record_run(bind, snapshot_date, portfolios=portfolios, snapshots=snapshots)
+
+        self._token = CancelToken()
+        try:
+            stats = await batch_lane.run(generate_daily_snapshots, bind, snapshot_date, chunk_size, heartbeat, self._token)
+            stats["compaction"] = await batch_lane.run(compact_snapshots, bind, snapshot_date, None, self._token)
+        except OperationCancelled:
+            await batch_lane.run(_record_run, bind, snapshot_date, status="failed",
+                                 error="Interrupted by a server restart", finished_at=_now())
+            raise
+        except Exception:
+            logger.exception(f"Snapshot run for {snapshot_date} failed")
+            self._failures += 1
+            await batch_lane.run(_record_run, bind, snapshot_date, status="failed",
+                                 error="Snapshot run failed", finished_at=_now())
+            return None
+        finally:
+            self._token = None
+
+        await batch_lane.run(_record_run, bind, snapshot_date, status="completed", finished_at=_now(),
+                             portfolios=stats["portfolios"], snapshots=stats["snapshots"])
+        self._runs += 1
+        self._last_run = stats
+        return stats
+
+    def _due(self, day: date) -> datetime:
+        return datetime.combine(day, dt_time(self.hour), tzinfo=timezone.utc)
+
+    async def _loop(self, bind) -> None:
+        while True:
+            now = _now()
+            if now >= self._due(now.date()):
+                try:
+                    stats = await self.run(bind, now.date())
+                    # Another instance's run (or a failure) may need picking up once its heartbeat goes stale
+                    retry = stats is None and await batch_lane.run(self._incomplete, bind, now.date())
+                except OperationCancelled:
+                    return
+                except Exception:
+                    logger.exception(f"Snapshot scheduler '{self.name}' could not run {now.date()}")
+                    retry = True
+                self._next_run = (
+                    _now() + timedelta(seconds=SNAPSHOT_STALE_SECONDS) if retry
+                    else self._due(now.date() + timedelta(days=1))
+                )
+            else:
+                self._next_run = self._due(now.date())
+            await asyncio.sleep(max((self._next_run - _now()).total_seconds(), 0))
+
+    @staticmethod
+    def _incomplete(bind, snapshot_date: date) -> bool:
+        with batch_lane.session(bind) as session:
+            run = session.get(SnapshotRun, snapshot_date)
+            return run is None or run.status != "completed"
+
+    def snapshot(self) -> dict:
+        """Point-in-time metrics for the health/metrics endpoint"""
+        return {
+            "enabled": SNAPSHOT_SCHEDULER_ENABLED,
+            "running": self._token is not None,
+            "next_run": self._next_run.isoformat() if self._next_run else None,
+            "runs": self._runs,
+            "failures": self._failures,
+            "last_run": self._last_run,
+        }
+
+
+# Shared scheduler started by the application lifespan
+snapshot_scheduler = SnapshotScheduler("net_worth", SNAPSHOT_HOUR_UTC)
@@ -0,0 +1,129 @@
+"""
+Root Finding
+Bracketing and Brent's method for solving f(x) = 0 over the projection engine
+(goal seek, FIRE targets).
+
+The engine returns Decimal outcomes; the solver works on the float search
+variable (a rate or an amount) and converts each outcome with float(). The
+caller rounds the solution to its own precision and re-evaluates it in Decimal.
+"""
+
+import math
+from typing import Callable, Optional, Tuple
+
+
+class SolverError(ValueError):
+    """Raised when no sign change is found within the search limits"""
+
+    def __init__(self, message: str, lower: float, upper: float, f_lower: float, f_upper: float):
+        super().__init__(message)
+        self.lower = lower
+        self.upper = upper
+        self.f_lower = f_lower
+        self.f_upper = f_upper
+
+
+def expand_bracket(
+    f: Callable[[float], float],
+    lower: float,
+    upper: float,
+    limits: Tuple[float, float],
+    max_expansions: int = 8,
+) -> Tuple[float, float, float, float]:
+    """
+    Widen [lower, upper] until f changes sign, doubling the width each step
+    and never going past limits.
+
+    Returns:
+        (lower, upper, f(lower), f(upper)) with f(lower) and f(upper) of opposite sign (or one zero)
+
+    Raises:
+        SolverError: f has the same sign at both limits
+    """
+    lower, upper = max(lower, limits[0]), min(upper, limits[1])
+    f_lower, f_upper = f(lower), f(upper)
+    for _ in range(max_expansions):
+        if f_lower * f_upper <= 0:
+            return lower, upper, f_lower, f_upper
+        width = upper - lower
+        if lower > limits[0]:
+            lower = max(limits[0], lower - width)
+            f_lower = f(lower)
+        if upper < limits[1]:
+            upper = min(limits[1], upper + width)
+            f_upper = f(upper)
+        if lower == limits[0] and upper == limits[1] and f_lower * f_upper > 0:
+            break
+    if f_lower * f_upper <= 0:
+        return lower, upper, f_lower, f_upper
+    raise SolverError("No sign change within the search limits", lower, upper, f_lower, f_upper)
+
+
+def brent(
+    f: Callable[[float], float],
+    a: float,
+    b: float,
+    fa: Optional[float] = None,
+    fb: Optional[float] = None,
+    xtol: float = 1e-6,
+    max_iterations: int = 60,
+) -> float:
+    """
+    Brent's method: inverse quadratic / secant steps, falling back to
+    bisection, on a bracket [a, b] where f changes sign.
+
+    Args:
+        fa, fb: f(a) and f(b) if already known (saves two evaluations)
+        xtol: Absolute tolerance on x
+
+    Returns:
+        x with |x - root| <= xtol (or an exact root)
+    """
+    fa = f(a) if fa is None else fa
+    fb = f(b) if fb is None else fb
+    if fa == 0:
+        return a
+    if fb == 0:
+        return b
+    if fa * fb > 0:
+        raise SolverError("Root is not bracketed", a, b, fa, fb)
+
+    c, fc = b, fb
+    d = e = b - a
+    for _ in range(max_iterations):
+        if (fb > 0) == (fc > 0):
+            # Keep the root between b and c
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol = 2 * 2.2e-16 * abs(b) + 0.5 * xtol
+        midpoint = 0.5 * (c - b)
+        if abs(midpoint) <= tol or fb == 0:
+            return b
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                # Secant step
+                p = 2 * midpoint * s
+                q = 1 - s
+            else:
+                # Inverse quadratic interpolation
+                q = fa / fc
+                r = fb / fc
+                p = s * (2 * midpoint * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * midpoint * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = midpoint
+        else:
+            d = e = midpoint
+        a, fa = b, fb
+        b += d if abs(d) > tol else math.copysign(tol, midpoint)
+        fb = f(b)
+    return b